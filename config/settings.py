@@ -189,6 +189,18 @@ STORAGES = {
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# 시계열 Parquet 아카이브 (관측소/연도 파티션, 마감된 월 단위 파일)
+# 아카이브는 DB 행을 삭제하고 파일로 옮기므로 영구 저장소(볼륨) 경로를 명시해야 한다.
+# 설정하지 않으면 아카이브를 쓰지 않는다 (컨테이너 로컬 디스크는 재배포 시 지워짐)
+TIMESERIES_ARCHIVE_DIR = Path(os.environ['TIMESERIES_ARCHIVE_DIR']) if os.environ.get('TIMESERIES_ARCHIVE_DIR') else None
+
+# 분석결과표 차트 PNG 캐시 (rows_data + 제목 해시 파일명)
+CHART_CACHE_DIR = Path(os.environ.get('CHART_CACHE_DIR', BASE_DIR / 'cache' / 'charts'))
+
+# 행정경계 (리 경계 shapefile 원본, 전처리 npy 캐시 - 메모리 매핑으로 로드)
+BOUNDARY_SOURCE_DIR = BASE_DIR / 'resource' / '행정경계'
+BOUNDARY_CACHE_DIR = Path(os.environ.get('BOUNDARY_CACHE_DIR', BASE_DIR / 'cache' / 'boundaries'))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -0,0 +1,721 @@
+"""
+행정경계 역지오코딩 (위도·경도 → 시도 / 시군구 / 읍면동 / 리)
+
+resource/행정경계/LSMD_ADM_SECT_RI_*/ 의 리 경계 shapefile 을 한 번 전처리해
+BOUNDARY_CACHE_DIR 에 npy 파일로 저장하고, 이후 프로세스는 np.load(mmap_mode='r') 로
+바로 연다 (shapefile 을 다시 읽지 않음).
+
+전처리:
+    - .shp(Polygon) / .dbf(cp949) / .prj 를 numpy 로 직접 읽음 (shapely·pyproj 불필요)
+    - 고리(ring)별 Douglas-Peucker 단순화 (SIMPLIFY_TOLERANCE_M)
+    - 경계 상자(bbox) + STR-tree (Sort-Tile-Recursive, 노드당 NODE_CAPACITY 개)
+      경계를 STR 순서로 재배열해 노드의 자식은 항상 연속 구간 [start, end)
+    - 좌표는 int32 (0.1 m 단위) 로 저장
+
+조회:
+    - 위도·경도 → TM 좌표 (.prj 의 타원체·투영 파라미터, Snyder 급수식)
+    - STR-tree 를 단계별로 (지점, 노드) 쌍 벡터 확장 → 후보 경계
+    - 경계별 짝홀(even-odd) 교차 판정 (변 × 지점 벡터 연산)
+    - 어느 경계에도 들지 않으면 SNAP_DISTANCE_M 안의 가장 가까운 경계 (단순화로 생긴 틈)
+
+캐시 디렉터리 이름에 원본 파일 크기·mtime 서명이 들어가 원본이 바뀌면 새로 만든다.
+.shp 가 없는 시도 폴더(dbf/shx 만 배포됨)는 건너뛰고 coverage 에 기록한다.
+"""
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import struct
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+SOURCE_PREFIX = 'LSMD_ADM_SECT_RI_'
+SOURCE_PATTERN = SOURCE_PREFIX + '*'
+NAMES_DIR = '행정구역'
+DBF_ENCODING = 'cp949'
+
+SIMPLIFY_TOLERANCE_M = 5.0
+SNAP_DISTANCE_M = 2 * SIMPLIFY_TOLERANCE_M
+NODE_CAPACITY = 16
+COORD_SCALE = 10  # int32 저장 단위: 0.1 m
+MAX_POINTS = 10000
+
+# 지점 × 변 판정 한 번에 만드는 최대 원소 수 (메모리 상한)
+PIP_CHUNK = 4_000_000
+
+# 캐시 배열 (이름 → 파일)
+ARRAYS = (
+    'coords',          # (점, 2) int32, 0.1 m
+    'ring_offsets',    # (고리 + 1,) 고리별 coords 구간
+    'feature_rings',   # (경계 + 1,) 경계별 고리 구간
+    'feature_bbox',    # (경계, 4) minx, miny, maxx, maxy (m)
+    'node_bbox',       # (노드, 4)
+    'node_children',   # (노드, 2) 하위 단계 노드 또는 (마지막 단계) 경계 구간
+    'level_offsets',   # (단계 + 1,) 루트 단계부터 노드 구간
+)
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def _source_dir() -> Path:
+    from django.conf import settings
+
+    return Path(getattr(settings, 'BOUNDARY_SOURCE_DIR', Path(settings.BASE_DIR) / 'resource' / '행정경계'))
+
+
+def _cache_root() -> Path:
+    from django.conf import settings
+
+    return Path(getattr(settings, 'BOUNDARY_CACHE_DIR', Path(settings.BASE_DIR) / 'cache' / 'boundaries'))
+
+
+# ============================================
+# 원본 파일 읽기
+# ============================================
+
+def read_dbf(path: Path, encoding: str = DBF_ENCODING) -> List[Dict[str, str]]:
+    """dBASE 레코드 목록 (문자열 값, 삭제 표시 레코드는 빈 dict 로 자리 유지)"""
+    data = path.read_bytes()
+    count, header_length, record_length = struct.unpack('<IHH', data[4:12])
+
+    fields = []
+    position = 32
+    while data[position] != 0x0D:
+        name = data[position:position + 11].split(b'\0', 1)[0].decode('ascii')
+        fields.append((name, data[position + 16]))
+        position += 32
+
+    records = []
+    for i in range(count):
+        start = header_length + i * record_length
+        record = data[start:start + record_length]
+        if record[:1] == b'*':
+            records.append({})
+            continue
+        values = {}
+        offset = 1
+        for name, length in fields:
+            values[name] = record[offset:offset + length].decode(encoding, errors='replace').strip()
+            offset += length
+        records.append(values)
+    return records
+
+
+def read_polygons(path: Path):
+    """
+    Polygon shapefile 레코드 (파일 순서)
+
+    Returns:
+        list: 레코드별 고리 좌표 배열 목록 [(점, 2) float64, ...], 빈 도형은 []
+    """
+    data = path.read_bytes()
+    shape_type, = struct.unpack('<i', data[32:36])
+    if shape_type not in (5, 15, 25):
+        raise ValueError(f"Polygon shapefile 이 아닙니다 (type {shape_type}): {path}")
+
+    shapes = []
+    position = 100
+    while position + 8 <= len(data):
+        _, content_length = struct.unpack('>ii', data[position:position + 8])
+        content = position + 8
+        position = content + content_length * 2
+
+        record_type, = struct.unpack('<i', data[content:content + 4])
+        if record_type == 0:
+            shapes.append([])
+            continue
+        num_parts, num_points = struct.unpack('<ii', data[content + 36:content + 44])
+        parts = np.frombuffer(data, '<i4', num_parts, content + 44).tolist() + [num_points]
+        points = np.frombuffer(data, '<f8', num_points * 2, content + 44 + 4 * num_parts).reshape(-1, 2)
+        shapes.append([points[parts[i]:parts[i + 1]] for i in range(num_parts)])
+    return shapes
+
+
+def read_projection(path: Path) -> Dict:
+    """.prj (WKT) 의 횡메르카토르 투영 파라미터"""
+    wkt = path.read_text(encoding='utf-8', errors='replace')
+    if 'transverse_mercator' not in wkt.lower():
+        raise ValueError(f"횡메르카토르 투영이 아닙니다: {path}")
+
+    spheroid = re.search(r'SPHEROID\["[^"]*",\s*([-\d.eE+]+),\s*([-\d.eE+]+)', wkt)
+    params = {name.lower(): float(value) for name, value in re.findall(r'PARAMETER\["(\w+)",\s*([-\d.eE+]+)\]', wkt)}
+    try:
+        return {
+            'a': float(spheroid.group(1)),
+            'inverse_flattening': float(spheroid.group(2)),
+            'central_meridian': params['central_meridian'],
+            'latitude_of_origin': params['latitude_of_origin'],
+            'scale_factor': params['scale_factor'],
+            'false_easting': params['false_easting'],
+            'false_northing': params['false_northing'],
+        }
+    except (AttributeError, KeyError):
+        raise ValueError(f"투영 파라미터를 읽을 수 없습니다: {path}")
+
+
+def _meridian_arc(phi, a, e2):
+    e4, e6 = e2 * e2, e2 * e2 * e2
+    return a * (
+        (1 - e2 / 4 - 3 * e4 / 64 - 5 * e6 / 256) * phi
+        - (3 * e2 / 8 + 3 * e4 / 32 + 45 * e6 / 1024) * np.sin(2 * phi)
+        + (15 * e4 / 256 + 45 * e6 / 1024) * np.sin(4 * phi)
+        - (35 * e6 / 3072) * np.sin(6 * phi)
+    )
+
+
+def project(lats, lons, projection: Dict):
+    """
+    위도·경도(도) → 횡메르카토르 평면 좌표 (m), Snyder (1987) 8-9 ~ 8-10 식
+
+    Returns:
+        tuple: (x 배열, y 배열)
+    """
+    a = projection['a']
+    f = 1 / projection['inverse_flattening']
+    e2 = f * (2 - f)
+    ep2 = e2 / (1 - e2)
+    k0 = projection['scale_factor']
+
+    phi = np.radians(np.asarray(lats, dtype=float))
+    lam = np.radians(np.asarray(lons, dtype=float) - projection['central_meridian'])
+    phi0 = math.radians(projection['latitude_of_origin'])
+
+    sin_phi, cos_phi, tan_phi = np.sin(phi), np.cos(phi), np.tan(phi)
+    n = a / np.sqrt(1 - e2 * sin_phi ** 2)
+    t = tan_phi ** 2
+    c = ep2 * cos_phi ** 2
+    big_a = lam * cos_phi
+    m = _meridian_arc(phi, a, e2) - _meridian_arc(phi0, a, e2)
+
+    x = k0 * n * (
+        big_a
+        + (1 - t + c) * big_a ** 3 / 6
+        + (5 - 18 * t + t ** 2 + 72 * c - 58 * ep2) * big_a ** 5 / 120
+    )
+    y = k0 * (m + n * tan_phi * (
+        big_a ** 2 / 2
+        + (5 - t + 9 * c + 4 * c ** 2) * big_a ** 4 / 24
+        + (61 - 58 * t + t ** 2 + 600 * c - 330 * ep2) * big_a ** 6 / 720
+    ))
+    return x + projection['false_easting'], y + projection['false_northing']
+
+
+# ============================================
+# 전처리 (단순화 + STR-tree)
+# ============================================
+
+def simplify_ring(ring: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    닫힌 고리 Douglas-Peucker 단순화 (첫 점과 가장 먼 점을 고정해 두 구간으로)
+
+    닫힌 다각형이 유지되지 않으면 (점 4개 미만) 원래 고리를 반환한다.
+    """
+    if len(ring) <= 4:
+        return ring
+    far = int(np.argmax(np.hypot(*(ring - ring[0]).T)))
+    keep = np.zeros(len(ring), dtype=bool)
+    keep[[0, far, len(ring) - 1]] = True
+
+    stack = [(0, far), (far, len(ring) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment = ring[end] - ring[start]
+        inner = ring[start + 1:end] - ring[start]
+        length = math.hypot(*segment)
+        if length == 0:
+            distances = np.hypot(*inner.T)
+        else:
+            distances = np.abs(segment[0] * inner[:, 1] - segment[1] * inner[:, 0]) / length
+        i = int(np.argmax(distances))
+        if distances[i] > tolerance:
+            split = start + 1 + i
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    simplified = ring[keep]
+    return simplified if len(simplified) >= 4 else ring
+
+
+def str_order(bboxes: np.ndarray, capacity: int = NODE_CAPACITY) -> np.ndarray:
+    """STR 정렬 순서: 중심 x 로 세로 띠를 나누고 띠 안에서 중심 y 순"""
+    count = len(bboxes)
+    centers = (bboxes[:, :2] + bboxes[:, 2:]) / 2
+    slices = max(math.ceil(math.sqrt(math.ceil(count / capacity))), 1)
+    slice_size = slices * capacity
+
+    by_x = np.argsort(centers[:, 0], kind='stable')
+    order = []
+    for start in range(0, count, slice_size):
+        chunk = by_x[start:start + slice_size]
+        order.append(chunk[np.argsort(centers[chunk, 1], kind='stable')])
+    return np.concatenate(order) if order else by_x
+
+
+def _group_bboxes(bboxes: np.ndarray, capacity: int):
+    """연속 capacity 개씩 묶은 노드의 bbox 와 자식 구간"""
+    starts = np.arange(0, len(bboxes), capacity)
+    ends = np.minimum(starts + capacity, len(bboxes))
+    node_bbox = np.column_stack((
+        np.minimum.reduceat(bboxes[:, 0], starts),
+        np.minimum.reduceat(bboxes[:, 1], starts),
+        np.maximum.reduceat(bboxes[:, 2], starts),
+        np.maximum.reduceat(bboxes[:, 3], starts),
+    ))
+    return node_bbox, np.column_stack((starts, ends))
+
+
+def build_str_tree(bboxes: np.ndarray, capacity: int = NODE_CAPACITY):
+    """
+    STR-tree (단계별 STR 정렬 후 연속 묶음)
+
+    Returns:
+        tuple: (경계 재배열 순서, node_bbox, node_children, level_offsets)
+               단계는 루트부터, 마지막 단계의 자식은 재배열된 경계 구간
+    """
+    feature_order = str_order(bboxes, capacity)
+    node_bbox, children = _group_bboxes(bboxes[feature_order], capacity)
+    levels = [(node_bbox, children)]
+
+    while len(node_bbox) > 1:
+        order = str_order(node_bbox, capacity)
+        levels[-1] = (node_bbox[order], children[order])
+        node_bbox, children = _group_bboxes(node_bbox[order], capacity)
+        levels.append((node_bbox, children))
+
+    # 루트 단계부터 전역 노드 번호로 이어 붙임 (하위 노드 번호 = 다음 단계 시작 + 지역 번호)
+    levels.reverse()
+    sizes = [len(level_bbox) for level_bbox, _ in levels]
+    level_offsets = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+    all_children = []
+    for depth, (_, level_children) in enumerate(levels):
+        shift = level_offsets[depth + 1] if depth + 1 < len(levels) else 0
+        all_children.append(level_children + shift)
+    return (
+        feature_order,
+        np.concatenate([level_bbox for level_bbox, _ in levels]),
+        np.concatenate(all_children).astype(np.int64),
+        level_offsets,
+    )
+
+
+def _source_files(source_dir: Path) -> List[Path]:
+    files = []
+    for folder in sorted(source_dir.glob(SOURCE_PATTERN)):
+        if folder.is_dir():
+            files.extend(sorted(p for p in folder.iterdir() if p.suffix.lower() in ('.shp', '.dbf', '.prj')))
+    names_dir = source_dir / NAMES_DIR
+    for name in ('광역시.dbf', '시군구.dbf', '읍면동.dbf'):
+        if (names_dir / name).exists():
+            files.append(names_dir / name)
+    return files
+
+
+def source_signature(source_dir: Path) -> str:
+    """원본 파일 (이름, 크기, mtime) 과 전처리 설정의 해시 - 캐시 디렉터리 이름"""
+    digest = hashlib.sha1(
+        f'{CACHE_VERSION}:{SIMPLIFY_TOLERANCE_M}:{NODE_CAPACITY}:{COORD_SCALE}'.encode('utf-8')
+    )
+    for path in _source_files(source_dir):
+        stat = path.stat()
+        digest.update(f'{path.relative_to(source_dir)}:{stat.st_size}:{stat.st_mtime_ns}\n'.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def _name_tables(source_dir: Path) -> Dict[str, Dict[str, str]]:
+    """행정구역 코드 → 이름 (시도 2자리, 시군구 5자리, 읍면동 8자리)"""
+    names_dir = source_dir / NAMES_DIR
+    tables = {}
+    for key, filename, code_field, name_field in (
+        ('sido', '광역시.dbf', 'CTPRVN_CD', 'CTP_KOR_NM'),
+        ('sigungu', '시군구.dbf', 'SIG_CD', 'SIG_KOR_NM'),
+        ('eupmyeondong', '읍면동.dbf', 'EMD_CD', 'EMD_KOR_NM'),
+    ):
+        path = names_dir / filename
+        if not path.exists():
+            logger.warning("행정구역 이름 파일 없음: %s", path)
+            tables[key] = {}
+            continue
+        tables[key] = {
+            record[code_field]: record[name_field]
+            for record in read_dbf(path) if record.get(code_field)
+        }
+    return tables
+
+
+def build_boundary_cache(source_dir: Optional[Path] = None, cache_root: Optional[Path] = None) -> Path:
+    """
+    리 경계 shapefile 전처리 → 캐시 디렉터리 (임시 디렉터리에 쓰고 rename)
+
+    Returns:
+        Path: 캐시 디렉터리
+    """
+    source_dir = Path(source_dir or _source_dir())
+    cache_root = Path(cache_root or _cache_root())
+    signature = source_signature(source_dir)
+    target = cache_root / f'ri-{signature}'
+
+    projection = None
+    rings_by_feature = []
+    codes, ri_names = [], []
+    coverage = {'loaded': [], 'missing': []}
+    original_points = 0
+
+    for folder in sorted(source_dir.glob(SOURCE_PATTERN)):
+        if not folder.is_dir():
+            continue
+        province = folder.name.removeprefix(SOURCE_PREFIX)
+        shp = next(folder.glob('*.shp'), None)
+        dbf = next(folder.glob('*.dbf'), None)
+        prj = next(folder.glob('*.prj'), None)
+        if shp is None or dbf is None or prj is None:
+            logger.warning("행정경계 건너뜀 (.shp/.dbf/.prj 없음): %s", folder.name)
+            coverage['missing'].append(province)
+            continue
+
+        folder_projection = read_projection(prj)
+        if projection is None:
+            projection = folder_projection
+        elif folder_projection != projection:
+            logger.warning("행정경계 건너뜀 (투영이 다름): %s", folder.name)
+            coverage['missing'].append(province)
+            continue
+
+        shapes = read_polygons(shp)
+        records = read_dbf(dbf)
+        if len(shapes) != len(records):
+            logger.warning("행정경계 건너뜀 (shp %d개 / dbf %d개 불일치): %s", len(shapes), len(records), folder.name)
+            coverage['missing'].append(province)
+            continue
+
+        loaded = 0
+        for rings, record in zip(shapes, records):
+            if not rings or not record.get('RI_CD'):
+                continue
+            original_points += sum(len(ring) for ring in rings)
+            rings_by_feature.append([simplify_ring(ring, SIMPLIFY_TOLERANCE_M) for ring in rings])
+            codes.append(record['RI_CD'])
+            ri_names.append(record.get('RI_NM', ''))
+            loaded += 1
+        coverage['loaded'].append({'province': province, 'features': loaded})
+
+    if not rings_by_feature:
+        raise FileNotFoundError(
+            f"행정경계 shapefile 이 없습니다: {source_dir / SOURCE_PATTERN}/*.shp"
+        )
+
+    bboxes = np.array([
+        [min(r[:, 0].min() for r in rings), min(r[:, 1].min() for r in rings),
+         max(r[:, 0].max() for r in rings), max(r[:, 1].max() for r in rings)]
+        for rings in rings_by_feature
+    ])
+    feature_order, node_bbox, node_children, level_offsets = build_str_tree(bboxes)
+
+    ring_lists = [rings_by_feature[i] for i in feature_order]
+    ring_lengths = [len(ring) for rings in ring_lists for ring in rings]
+    arrays = {
+        'coords': np.round(np.concatenate([ring for rings in ring_lists for ring in rings]) * COORD_SCALE).astype(np.int32),
+        'ring_offsets': np.concatenate(([0], np.cumsum(ring_lengths))).astype(np.int64),
+        'feature_rings': np.concatenate(([0], np.cumsum([len(rings) for rings in ring_lists]))).astype(np.int64),
+        'feature_bbox': bboxes[feature_order],
+        'node_bbox': node_bbox,
+        'node_children': node_children,
+        'level_offsets': level_offsets,
+    }
+
+    names = _name_tables(source_dir)
+    codes = [codes[i] for i in feature_order]
+    features = {
+        'codes': codes,
+        'ri_names': [ri_names[i] for i in feature_order],
+        # 경계에 쓰인 코드의 이름만 저장
+        'sido': {c[:2]: names['sido'][c[:2]] for c in codes if c[:2] in names['sido']},
+        'sigungu': {c[:5]: names['sigungu'][c[:5]] for c in codes if c[:5] in names['sigungu']},
+        'eupmyeondong': {c[:8]: names['eupmyeondong'][c[:8]] for c in codes if c[:8] in names['eupmyeondong']},
+    }
+    meta = {
+        'version': CACHE_VERSION,
+        'signature': signature,
+        'projection': projection,
+        'tolerance_m': SIMPLIFY_TOLERANCE_M,
+        'node_capacity': NODE_CAPACITY,
+        'features': len(codes),
+        'points': int(len(arrays['coords'])),
+        'original_points': original_points,
+        'coverage': coverage,
+    }
+
+    cache_root.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=cache_root, prefix=f'.ri-{signature}-'))
+    try:
+        for name in ARRAYS:
+            np.save(tmp / f'{name}.npy', arrays[name])
+        (tmp / 'features.json').write_text(json.dumps(features, ensure_ascii=False), encoding='utf-8')
+        # meta.json 을 마지막에 써서 완성된 캐시만 열리도록
+        (tmp / 'meta.json').write_text(json.dumps(meta, ensure_ascii=False, indent=1), encoding='utf-8')
+        try:
+            os.rename(tmp, target)
+        except OSError:
+            # 다른 프로세스가 먼저 만든 경우
+            if not (target / 'meta.json').exists():
+                raise
+            shutil.rmtree(tmp, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    for stale in cache_root.glob('ri-*'):
+        if stale != target and stale.is_dir():
+            shutil.rmtree(stale, ignore_errors=True)
+
+    logger.info(
+        "행정경계 캐시 생성: 경계 %d개, 점 %d → %d개 (%s), 없음: %s",
+        meta['features'], original_points, meta['points'], target,
+        ', '.join(coverage['missing']) or '-',
+    )
+    return target
+
+
+# ============================================
+# 조회
+# ============================================
+
+def _expand(points: np.ndarray, children: np.ndarray):
+    """(지점, 노드) 쌍 → (지점, 자식) 쌍 (자식 구간 [start, end) 를 펼침)"""
+    starts, ends = children[:, 0], children[:, 1]
+    counts = ends - starts
+    total = int(counts.sum())
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(points, counts), np.arange(total) - offsets + np.repeat(starts, counts)
+
+
+def _inside_bbox(bbox: np.ndarray, x: np.ndarray, y: np.ndarray, margin: float = 0.0) -> np.ndarray:
+    return (
+        (bbox[:, 0] - margin <= x) & (x <= bbox[:, 2] + margin)
+        & (bbox[:, 1] - margin <= y) & (y <= bbox[:, 3] + margin)
+    )
+
+
+class BoundaryIndex:
+    """
+    메모리 매핑된 리 경계 캐시 (build_boundary_cache 결과 디렉터리)
+
+    - features['codes'][i]: 경계 i 의 리 코드 (10자리, 끝 2자리 00 은 동 단위 경계)
+    - meta['coverage']: 적재된 시도별 경계 수와 .shp 가 없는 시도
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / 'meta.json').read_text(encoding='utf-8'))
+        self.features = json.loads((self.path / 'features.json').read_text(encoding='utf-8'))
+        self.projection = self.meta['projection']
+        for name in ARRAYS:
+            setattr(self, name, np.load(self.path / f'{name}.npy', mmap_mode='r'))
+        self.level_offsets = np.asarray(self.level_offsets)
+        self.signature = self.meta['signature']
+        self._summaries = {}
+
+    def __len__(self):
+        return len(self.features['codes'])
+
+    def candidates(self, x: np.ndarray, y: np.ndarray, margin: float = 0.0):
+        """STR-tree 단계별 (지점, 노드) 쌍 확장 → bbox 가 지점을 포함하는 (지점, 경계) 쌍"""
+        roots = np.arange(self.level_offsets[0], self.level_offsets[1])
+        points = np.repeat(np.arange(len(x)), len(roots))
+        nodes = np.tile(roots, len(x))
+        for _ in range(len(self.level_offsets) - 1):
+            hit = _inside_bbox(self.node_bbox[nodes], x[points], y[points], margin)
+            points, nodes = _expand(points[hit], self.node_children[nodes[hit]])
+        hit = _inside_bbox(self.feature_bbox[nodes], x[points], y[points], margin)
+        return points[hit], nodes[hit]
+
+    def _edges(self, feature: int):
+        """경계의 변 (시작점, 끝점) - m, 고리 사이를 잇는 가짜 변은 제외"""
+        ring_start, ring_end = self.feature_rings[feature], self.feature_rings[feature + 1]
+        offsets = self.ring_offsets[ring_start:ring_end + 1]
+        coords = np.asarray(self.coords[offsets[0]:offsets[-1]], dtype=float) / COORD_SCALE
+        valid = np.ones(len(coords) - 1, dtype=bool)
+        valid[offsets[1:-1] - offsets[0] - 1] = False
+        return coords[:-1][valid], coords[1:][valid]
+
+    def contains(self, feature: int, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """짝홀 교차 판정 (다중 고리·구멍 포함)"""
+        start, end = self._edges(feature)
+        inside = np.zeros(len(x), dtype=bool)
+        step = max(PIP_CHUNK // max(len(start), 1), 1)
+        x1, y1 = start[:, 0:1], start[:, 1:2]
+        x2, y2 = end[:, 0:1], end[:, 1:2]
+        for i in range(0, len(x), step):
+            px, py = x[i:i + step], y[i:i + step]
+            straddle = (y1 > py) != (y2 > py)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                cross_x = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+            inside[i:i + step] = np.count_nonzero(straddle & (px < cross_x), axis=0) % 2 == 1
+        return inside
+
+    def distance(self, feature: int, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """경계선까지의 최단 거리 (m)"""
+        start, end = self._edges(feature)
+        segment = end - start
+        length2 = np.maximum((segment ** 2).sum(axis=1), 1e-12)[:, None]
+        distances = np.empty(len(x))
+        step = max(PIP_CHUNK // max(len(start), 1), 1)
+        for i in range(0, len(x), step):
+            px, py = x[i:i + step], y[i:i + step]
+            t = np.clip(((px - start[:, 0:1]) * segment[:, 0:1] + (py - start[:, 1:2]) * segment[:, 1:2]) / length2, 0, 1)
+            dx = start[:, 0:1] + t * segment[:, 0:1] - px
+            dy = start[:, 1:2] + t * segment[:, 1:2] - py
+            distances[i:i + step] = np.sqrt(dx ** 2 + dy ** 2).min(axis=0)
+        return distances
+
+    def locate(self, lats, lons, snap_distance_m: float = SNAP_DISTANCE_M):
+        """
+        지점별 경계 (벡터 조회)
+
+        Returns:
+            tuple: (경계 번호 배열 - 없으면 -1, 경계까지 거리 m - 안쪽이면 0, 없으면 inf)
+        """
+        x, y = project(lats, lons, self.projection)
+        found = np.full(len(x), -1, dtype=np.int64)
+        distances = np.full(len(x), np.inf)
+
+        points, features = self.candidates(x, y)
+        order = np.argsort(features, kind='stable')
+        points, features = points[order], features[order]
+        bounds = np.flatnonzero(np.diff(features)) + 1
+        for start, group_points in zip(np.r_[0, bounds], np.split(points, bounds) if len(points) else []):
+            group_points = group_points[found[group_points] < 0]
+            if not len(group_points):
+                continue
+            inside = self.contains(int(features[start]), x[group_points], y[group_points])
+            found[group_points[inside]] = features[start]
+            distances[group_points[inside]] = 0.0
+
+        # 단순화로 생긴 경계 사이 틈: snap_distance_m 안의 가장 가까운 경계
+        missing = np.flatnonzero(found < 0)
+        if len(missing) and snap_distance_m > 0:
+            points, features = self.candidates(x[missing], y[missing], snap_distance_m)
+            for feature in np.unique(features):
+                group_points = missing[points[features == feature]]
+                near = self.distance(int(feature), x[group_points], y[group_points])
+                closer = (near <= snap_distance_m) & (near < distances[group_points])
+                found[group_points[closer]] = feature
+                distances[group_points[closer]] = near[closer]
+        return found, distances
+
+    def summary(self, feature: int) -> Dict:
+        """경계 i 의 행정구역 이름 (시도·시군구·읍면동·리)"""
+        summary = self._summaries.get(feature)
+        if summary is None:
+            code = self.features['codes'][feature]
+            ri = '' if code.endswith('00') else self.features['ri_names'][feature]
+            eupmyeondong = self.features['eupmyeondong'].get(code[:8], '')
+            if not eupmyeondong and code.endswith('00'):
+                eupmyeondong = self.features['ri_names'][feature]
+            summary = {
+                'code': code,
+                'sido': self.features['sido'].get(code[:2], ''),
+                'sigungu': self.features['sigungu'].get(code[:5], ''),
+                'eupmyeondong': eupmyeondong,
+                'ri': ri,
+            }
+            summary['address'] = ' '.join(
+                summary[key] for key in ('sido', 'sigungu', 'eupmyeondong', 'ri') if summary[key]
+            )
+            self._summaries[feature] = summary
+        return summary
+
+
+def get_boundary_index() -> BoundaryIndex:
+    """
+    행정경계 색인 (원본 서명이 같은 캐시가 있으면 메모리 매핑, 없으면 전처리 후 생성)
+
+    Raises:
+        FileNotFoundError: 원본 shapefile 이 하나도 없는 경우
+    """
+    global _index
+
+    source_dir = _source_dir()
+    signature = source_signature(source_dir)
+    index = _index
+    if index is not None and index.signature == signature:
+        return index
+
+    with _index_lock:
+        if _index is None or _index.signature != signature:
+            path = _cache_root() / f'ri-{signature}'
+            if not (path / 'meta.json').exists():
+                path = build_boundary_cache(source_dir)
+            _index = BoundaryIndex(path)
+            logger.info("행정경계 색인 로드: 경계 %d개 (%s)", len(_index), path)
+        return _index
+
+
+def reverse_geocode(points: Iterable, snap_distance_m: float = SNAP_DISTANCE_M) -> List[Optional[Dict]]:
+    """
+    지점별 행정구역 (시도 / 시군구 / 읍면동 / 리)
+
+    Args:
+        points: (위도, 경도) 목록
+        snap_distance_m: 경계 밖 지점을 가장 가까운 경계에 붙이는 최대 거리
+
+    Returns:
+        list: 지점 순서대로 {code, sido, sigungu, eupmyeondong, ri, address, distance_m},
+              좌표가 유효하지 않거나 경계가 없는 지역(미적재 시도 포함)이면 None
+    """
+    from .station_spatial_service import valid_coordinate
+
+    points = list(points)
+    valid = [i for i, (lat, lon) in enumerate(points) if valid_coordinate(lat, lon)]
+    results = [None] * len(points)
+    if not valid:
+        return results
+
+    index = get_boundary_index()
+    found, distances = index.locate(
+        [float(points[i][0]) for i in valid], [float(points[i][1]) for i in valid], snap_distance_m,
+    )
+    for i, feature, distance in zip(valid, found.tolist(), np.round(distances, 1).tolist()):
+        if feature >= 0:
+            results[i] = {**index.summary(feature), 'distance_m': distance}
+    return results
+
+
+def station_boundaries(codes: Iterable[str]) -> List[Optional[Dict]]:
+    """
+    카탈로그 관측소별 행정구역 (관측소 좌표 기준)
+
+    Returns:
+        list: 코드 순서대로 {code, name, lat, lon, boundary}, 없는 관측소는 None
+    """
+    from .station_data import get_station_by_code
+
+    stations = [get_station_by_code(code) for code in codes]
+    boundaries = reverse_geocode(
+        (station.get('lat'), station.get('lon')) if station else (None, None) for station in stations
+    )
+    return [
+        {
+            'code': station['code'], 'name': station.get('name'),
+            'lat': station.get('lat'), 'lon': station.get('lon'), 'boundary': boundary,
+        } if station else None
+        for station, boundary in zip(stations, boundaries)
+    ]
+
+
+def boundary_coverage() -> Dict:
+    """적재된 시도별 경계 수와 .shp 가 없어 건너뛴 시도"""
+    return get_boundary_index().meta['coverage']
@@ -2,15 +2,18 @@
 한국수자원공사 수문 방류정보 조회 서비스
 
 댐 수문 개폐 시간 정보 조회 및 유량 측정 영향 판단
+영향 판단은 로컬 방류 이벤트 사본의 댐별 구간 색인으로 처리 (dam_release_service)
 API 문서: https://www.data.go.kr/data/15140222/openapi.do
 """
 import os
 import requests
 import xml.etree.ElementTree as ET
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
 import logging
 
+from .xml_stream import KWATER_CONTAINER, iter_records
+
 logger = logging.getLogger(__name__)
 
 # API 설정
@@ -39,6 +42,18 @@ DAM_INFO = {
     'SEOMJINGANG': {'code': '5003', 'name': '섬진강댐', 'river': '섬진강'},
 }
 
+# 방류정보 응답 필드 (결과 키 → XML 태그)
+DISCHARGE_FIELDS = {
+    'dam_code': 'DAMCD',
+    'dam_name': 'DAMNM',
+    'dam_coord': 'DAMCOORD',
+    'start_date': 'STARTDATE',
+    'end_date': 'ENDDATE',
+    'affect_area': 'AFFECTAREA',
+    'created_date': 'CREATEDDATE',
+    'updated_date': 'UPDATEDDATE',
+}
+
 # 관측소 → 상류 댐 매핑 (도달시간 포함, 단위: 시간)
 # 실제 도달시간은 하천 상태, 유량에 따라 변동됨 - 참고용 기본값
 STATION_UPSTREAM_DAMS = {
@@ -96,6 +111,60 @@ STATION_UPSTREAM_DAMS = {
 }
 
 
+def request_discharge_page(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    dam_code: Optional[str] = None,
+    page_no: int = 1,
+    num_of_rows: int = 100
+) -> List[Dict]:
+    """
+    방류정보 API 한 페이지 조회 (오류는 예외로 전달)
+
+    Raises:
+        requests.RequestException: HTTP 오류
+        ET.ParseError: XML 파싱 오류
+        ValueError: API 결과 코드 오류
+    """
+    params = {
+        'serviceKey': DAM_DISCHARGE_API_KEY,
+        'pageNo': str(page_no),
+        'numOfRows': str(num_of_rows),
+    }
+
+    if start_date:
+        params['stDt'] = start_date
+    if end_date:
+        params['edDt'] = end_date
+    if dam_code:
+        params['damCd'] = dam_code
+
+    response = requests.get(DAM_DISCHARGE_API_URL, params=params, timeout=30)
+    response.raise_for_status()
+
+    # XML 스트리밍 파싱 (헤더 resultCode 는 meta 로 수집)
+    meta = {}
+    items = []
+    for record in iter_records(response.content, container=KWATER_CONTAINER, meta=meta):
+        discharge_info = {key: record.get(tag, '') for key, tag in DISCHARGE_FIELDS.items()}
+
+        # 시간 파싱
+        if discharge_info['start_date']:
+            discharge_info['start_datetime'] = _parse_datetime(discharge_info['start_date'])
+        if discharge_info['end_date']:
+            discharge_info['end_datetime'] = _parse_datetime(discharge_info['end_date'])
+
+        items.append(discharge_info)
+
+    # 에러 체크
+    result_code = meta.get('resultCode')
+    if result_code is not None and result_code != '00':
+        msg = meta.get('resultMsg') or 'Unknown error'
+        raise ValueError(f"API 오류: {msg}")
+
+    return items
+
+
 def fetch_dam_discharge_info(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
@@ -114,77 +183,23 @@ def fetch_dam_discharge_info(
         num_of_rows: 페이지당 결과 수
 
     Returns:
-        list: 방류정보 목록
+        list: 방류정보 목록 (오류 시 빈 목록)
     """
     if not DAM_DISCHARGE_API_KEY:
         logger.warning("DAM_DISCHARGE_API_KEY 환경변수가 설정되지 않았습니다.")
         return []
 
-    today = datetime.now().strftime('%Y%m%d')
-
-    params = {
-        'serviceKey': DAM_DISCHARGE_API_KEY,
-        'pageNo': str(page_no),
-        'numOfRows': str(num_of_rows),
-    }
-
-    if start_date:
-        params['stDt'] = start_date
-    if end_date:
-        params['edDt'] = end_date
-    if dam_code:
-        params['damCd'] = dam_code
-
     try:
-        response = requests.get(DAM_DISCHARGE_API_URL, params=params, timeout=30)
-        response.raise_for_status()
-
-        # XML 파싱
-        root = ET.fromstring(response.content)
-
-        # 에러 체크
-        result_code = root.find('.//resultCode')
-        if result_code is not None and result_code.text != '00':
-            result_msg = root.find('.//resultMsg')
-            msg = result_msg.text if result_msg is not None else 'Unknown error'
-            logger.error(f"API 오류: {msg}")
-            return []
-
-        items = []
-        for item in root.findall('.//item'):
-            discharge_info = {
-                'dam_code': _get_text(item, 'DAMCD'),
-                'dam_name': _get_text(item, 'DAMNM'),
-                'dam_coord': _get_text(item, 'DAMCOORD'),
-                'start_date': _get_text(item, 'STARTDATE'),
-                'end_date': _get_text(item, 'ENDDATE'),
-                'affect_area': _get_text(item, 'AFFECTAREA'),
-                'created_date': _get_text(item, 'CREATEDDATE'),
-                'updated_date': _get_text(item, 'UPDATEDDATE'),
-            }
-
-            # 시간 파싱
-            if discharge_info['start_date']:
-                discharge_info['start_datetime'] = _parse_datetime(discharge_info['start_date'])
-            if discharge_info['end_date']:
-                discharge_info['end_datetime'] = _parse_datetime(discharge_info['end_date'])
-
-            items.append(discharge_info)
-
-        return items
-
+        return request_discharge_page(start_date, end_date, dam_code, page_no, num_of_rows)
     except requests.RequestException as e:
         logger.error(f"API 요청 오류: {e}")
         return []
     except ET.ParseError as e:
         logger.error(f"XML 파싱 오류: {e}")
         return []
-
-
-def _get_text(element, tag: str) -> str:
-    """XML 요소에서 텍스트 추출"""
-    child = element.find(tag)
-    return child.text.strip() if child is not None and child.text else ''
+    except ValueError as e:
+        logger.error(str(e))
+        return []
 
 
 def _parse_datetime(date_str: str) -> Optional[datetime]:
@@ -208,7 +223,7 @@ def _parse_datetime(date_str: str) -> Optional[datetime]:
 
 def is_dam_discharging(dam_key: str, check_time: datetime) -> Dict:
     """
-    특정 시각에 댐이 방류 중인지 확인
+    특정 시각에 댐이 방류 중인지 확인 (로컬 방류 이벤트 구간 색인)
 
     Args:
         dam_key: 댐 키 (예: 'PALDANG', 'CHUNGJU')
@@ -220,61 +235,18 @@ def is_dam_discharging(dam_key: str, check_time: datetime) -> Dict:
             'discharge_info': dict or None
         }
     """
-    dam_info = DAM_INFO.get(dam_key)
-    if not dam_info:
-        return {'is_discharging': False, 'discharge_info': None}
-
-    # 해당일 방류정보 조회
-    date_str = check_time.strftime('%Y%m%d')
-    discharges = fetch_dam_discharge_info(start_date=date_str, end_date=date_str)
-
-    for discharge in discharges:
-        if dam_info['name'] in discharge.get('dam_name', ''):
-            start_dt = discharge.get('start_datetime')
-            end_dt = discharge.get('end_datetime')
-
-            if start_dt and end_dt:
-                if start_dt <= check_time <= end_dt:
-                    return {
-                        'is_discharging': True,
-                        'discharge_info': discharge
-                    }
-            elif start_dt and not end_dt:
-                # 종료 시간이 없으면 현재 방류 중으로 간주
-                if start_dt <= check_time:
-                    return {
-                        'is_discharging': True,
-                        'discharge_info': discharge
-                    }
-
-    return {'is_discharging': False, 'discharge_info': None}
+    from .dam_release_service import get_release_index, sync_releases
 
+    if dam_key not in DAM_INFO:
+        return {'is_discharging': False, 'discharge_info': None}
 
-def check_dam_influence(station_code: str, measurement_time: datetime) -> Dict:
-    """
-    관측소에서 측정 시각에 댐 방류 영향 여부 확인
+    sync_releases([(check_time, check_time)])
+    discharge = get_release_index().find(dam_key, check_time)
+    return {'is_discharging': discharge is not None, 'discharge_info': discharge}
 
-    도달시간을 고려하여 상류 댐의 방류가 측정 시점에 영향을 미치는지 판단
 
-    Args:
-        station_code: 관측소 코드
-        measurement_time: 측정 시각
-
-    Returns:
-        dict: {
-            'is_influenced': bool,
-            'influencing_dams': [
-                {
-                    'dam_name': str,
-                    'start_time': datetime,
-                    'end_time': datetime,
-                    'affect_area': str,
-                    'travel_time_hours': float
-                }
-            ],
-            'message': str
-        }
-    """
+def _influence(station_code: str, start_time: datetime, end_time: Optional[datetime], index) -> Dict:
+    """상류 댐별 도달시간만큼 앞당긴 시각(기간)에 진행 중인 방류 조회"""
     upstream_dams = STATION_UPSTREAM_DAMS.get(station_code, [])
 
     if not upstream_dams:
@@ -292,13 +264,11 @@ def check_dam_influence(station_code: str, measurement_time: datetime) -> Dict:
 
         # 방류 시작 후 도달시간이 지나야 영향이 나타남
         # 따라서 측정시각 - 도달시간 시점에 방류 중이었는지 확인
-        effective_time = measurement_time - timedelta(hours=travel_time)
-
-        result = is_dam_discharging(dam_key, effective_time)
+        shift = timedelta(hours=travel_time)
+        discharge = index.find(dam_key, start_time - shift, end_time - shift if end_time else None)
 
-        if result['is_discharging']:
+        if discharge is not None:
             dam_info = DAM_INFO.get(dam_key, {})
-            discharge = result['discharge_info']
 
             influencing_dams.append({
                 'dam_key': dam_key,
@@ -325,6 +295,89 @@ def check_dam_influence(station_code: str, measurement_time: datetime) -> Dict:
     }
 
 
+def _influence_queries(queries: Iterable[Tuple]):
+    """질의 정규화 (현지 naive) + 판정에 필요한 댐 방류 시각 구간 (도달시간만큼 앞당김)"""
+    from .dam_release_service import local_naive
+
+    normalized = []
+    spans = []
+    for query in queries:
+        station_code, start_time = query[0], local_naive(query[1])
+        end_time = local_naive(query[2]) if len(query) > 2 and query[2] is not None else None
+        normalized.append((station_code, start_time, end_time))
+        for upstream in STATION_UPSTREAM_DAMS.get(station_code, []):
+            shift = timedelta(hours=upstream['travel_time_hours'])
+            spans.append((start_time - shift, (end_time or start_time) - shift))
+    return normalized, spans
+
+
+def check_dam_influence_batch(queries: Iterable[Tuple], sync: bool = True) -> List[Dict]:
+    """
+    여러 (관측소, 측정 시각) 의 댐 방류 영향 - 빠진 날짜만 한 번 동기화 후 메모리 구간 조회
+
+    Args:
+        queries: [(관측소 코드, 측정 시각), ...] 또는 [(관측소 코드, 시작 시각, 종료 시각), ...]
+                 종료 시각을 주면 기간 중 어느 때든 방류 영향이 있었는지 확인
+        sync: False 이면 조회하지 않고 로컬 사본만으로 판정 (빠진 구간은 unsynced_release_ranges)
+
+    Returns:
+        list: 질의 순서대로 check_dam_influence 결과
+    """
+    from .dam_release_service import get_release_index, sync_releases
+
+    normalized, spans = _influence_queries(queries)
+    if spans and sync:
+        sync_releases(spans)
+    index = get_release_index()
+    return [_influence(station_code, start_time, end_time, index) for station_code, start_time, end_time in normalized]
+
+
+def release_spans(queries: Iterable[Tuple]) -> List[Tuple[datetime, datetime]]:
+    """질의 판정에 필요한 댐 방류 시각 구간 (sync_releases 입력)"""
+    return _influence_queries(queries)[1]
+
+
+def unsynced_release_ranges(queries: Iterable[Tuple]) -> List[Tuple[date, date]]:
+    """
+    질의 판정에 필요한 방류정보 중 로컬 사본에 아직 없는 날짜 구간 (조회하지 않음)
+
+    Returns:
+        list: [(start, end), ...] 현지 날짜 [start, end)
+    """
+    from .dam_release_service import unsynced_ranges
+
+    spans = release_spans(queries)
+    return unsynced_ranges(spans) if spans else []
+
+
+def check_dam_influence(station_code: str, measurement_time: datetime) -> Dict:
+    """
+    관측소에서 측정 시각에 댐 방류 영향 여부 확인
+
+    도달시간을 고려하여 상류 댐의 방류가 측정 시점에 영향을 미치는지 판단
+
+    Args:
+        station_code: 관측소 코드
+        measurement_time: 측정 시각
+
+    Returns:
+        dict: {
+            'is_influenced': bool,
+            'influencing_dams': [
+                {
+                    'dam_name': str,
+                    'start_time': datetime,
+                    'end_time': datetime,
+                    'affect_area': str,
+                    'travel_time_hours': float
+                }
+            ],
+            'message': str
+        }
+    """
+    return check_dam_influence_batch([(station_code, measurement_time)])[0]
+
+
 def get_today_discharges() -> List[Dict]:
     """
     오늘 진행 중인 모든 댐 방류 정보 조회
@@ -0,0 +1,370 @@
+"""
+K-water 댐 방류 이벤트 로컬 사본 + 댐별 구간 색인
+
+방류정보 API 결과를 (댐 이름, 방류 시작) 기준으로 DamReleaseEvent 에 저장하고,
+이미 받은 날짜 구간을 DamReleaseFetchedRange 로 기록한다. 영향 판정에 필요한 날짜 중
+빠진 구간만 API 크기 창으로 나누어 동시에 조회한다 (스레드는 HTTP 만 담당).
+
+- 날짜 구간은 현지 날짜 [start, end) 반열린 구간
+- 방류는 며칠씩 이어질 수 있어 조회 시각 이전 룩백 기간도 함께 받는다
+  (저장된 방류 중 가장 긴 방류 기간, 저장된 방류가 없으면 DEFAULT_LOOKBACK)
+- 아직 바뀔 수 있는 최근 SETTLE_DAYS 일은 저장하되 받은 구간으로 기록하지 않고,
+  REFRESH_INTERVAL 마다 다시 받는다
+- 실패한 창은 기록하지 않으므로 다음 동기화 때 다시 받는다
+- 측정 세션 일괄 판정 API 는 조회하지 않고 unsynced_ranges 로 빠진 구간만 알린다
+  (채우기는 sync_dam_releases 명령어)
+
+색인은 댐별로 방류 시작 오름차순 배열과 누적 최대 종료 시각을 두어,
+시각(또는 기간) 조회를 이진 탐색 + 역방향 조기 중단으로 처리한다.
+테이블이 바뀌면 (건수, 최근 저장일시) 로 감지해 다시 만든다.
+"""
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import requests
+import xml.etree.ElementTree as ET
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .dam_discharge_service import DAM_INFO, request_discharge_page
+from .hrfco_history_service import split_windows
+from .time_ranges import merge_ranges
+
+logger = logging.getLogger(__name__)
+
+# API 1회 조회 기간, 페이지 크기, 동시 조회 수
+WINDOW = timedelta(days=31)
+PAGE_SIZE = 1000
+MAX_PAGES = 50
+MAX_WORKERS = 4
+
+# 조회 시각 이전에 시작한 방류도 잡기 위한 추가 조회 기간
+# (저장된 방류가 없을 때 기본값, 있으면 가장 긴 방류 기간을 일 단위로 올림)
+DEFAULT_LOOKBACK = timedelta(days=7)
+MIN_LOOKBACK = timedelta(days=1)
+
+# 최근 자료 확정 대기 일수 (오늘 포함, 종료 시각이 나중에 채워짐)와 재조회 간격 (초)
+SETTLE_DAYS = 2
+REFRESH_INTERVAL = 600.0
+
+# 색인 변경 확인 간격 (초)
+CHECK_INTERVAL = 5.0
+
+EPOCH = datetime(1970, 1, 1)
+OPEN_END = np.iinfo(np.int64).max
+
+_index = None
+_index_lock = threading.Lock()
+_checked_at = 0.0
+_recent_synced_at = None
+
+
+def local_naive(value: datetime) -> datetime:
+    """aware datetime → 현지 naive datetime (naive 는 그대로)"""
+    if timezone.is_aware(value):
+        return timezone.make_naive(value)
+    return value
+
+
+def _seconds(value: datetime) -> int:
+    return (local_naive(value) - EPOCH) // timedelta(seconds=1)
+
+
+def fetched_ranges():
+    """받은 날짜 구간 목록 [(start, end), ...] (시작 오름차순)"""
+    from .models import DamReleaseFetchedRange
+
+    return list(DamReleaseFetchedRange.objects.order_by('start').values_list('start', 'end'))
+
+
+def missing_ranges(ranges):
+    """
+    날짜 구간들 중 아직 받지 않은 구간
+
+    Returns:
+        list: [(start, end), ...]
+    """
+    have = merge_ranges(fetched_ranges())
+    gaps = []
+    for start, end in merge_ranges(ranges):
+        cursor = start
+        for have_start, have_end in have:
+            if have_end <= cursor:
+                continue
+            if have_start >= end:
+                break
+            if have_start > cursor:
+                gaps.append((cursor, have_start))
+            cursor = max(cursor, have_end)
+        if cursor < end:
+            gaps.append((cursor, end))
+    return gaps
+
+
+def _fetch_window(start: date, end: date) -> List[Dict]:
+    """창 하나 조회 (HTTP/파싱만, DB 접근 없음) - 모든 페이지"""
+    items = []
+    last = end - timedelta(days=1)
+    for page_no in range(1, MAX_PAGES + 1):
+        page = request_discharge_page(
+            start.strftime('%Y%m%d'), last.strftime('%Y%m%d'), page_no=page_no, num_of_rows=PAGE_SIZE,
+        )
+        items.extend(page)
+        if len(page) < PAGE_SIZE:
+            break
+    return items
+
+
+def _event(item: Dict):
+    """API 항목 → DamReleaseEvent (시작 시각이 없으면 None)"""
+    from .models import DamReleaseEvent
+
+    start = item.get('start_datetime')
+    if not start or not item.get('dam_name'):
+        return None
+    end = item.get('end_datetime')
+    return DamReleaseEvent(
+        dam_code=item.get('dam_code', ''),
+        dam_name=item['dam_name'],
+        dam_coord=item.get('dam_coord', ''),
+        start=timezone.make_aware(start),
+        end=timezone.make_aware(end) if end else None,
+        affect_area=item.get('affect_area', ''),
+        created_date=item.get('created_date', ''),
+        updated_date=item.get('updated_date', ''),
+    )
+
+
+def _store_window(start: date, end: date, items: List[Dict], settled: date):
+    """창 결과 업서트 + 확정일(settled) 이전 구간 기록/병합 (한 트랜잭션)"""
+    from .models import DamReleaseEvent, DamReleaseFetchedRange
+
+    # 같은 (댐, 시작) 은 마지막 항목만 (한 INSERT 안 중복 충돌 방지)
+    events = {}
+    for item in items:
+        event = _event(item)
+        if event is not None:
+            events[(event.dam_name, event.start)] = event
+
+    with transaction.atomic():
+        DamReleaseEvent.objects.bulk_create(
+            list(events.values()),
+            update_conflicts=True,
+            unique_fields=['dam_name', 'start'],
+            update_fields=[
+                'dam_code', 'dam_coord', 'end', 'affect_area', 'created_date', 'updated_date', 'updated_at',
+            ],
+        )
+
+        end = min(end, settled)
+        if start >= end:
+            return
+        existing = DamReleaseFetchedRange.objects.select_for_update()
+        merged = merge_ranges(list(existing.values_list('start', 'end')) + [(start, end)])
+        existing.delete()
+        DamReleaseFetchedRange.objects.bulk_create([
+            DamReleaseFetchedRange(start=s, end=e) for s, e in merged
+        ])
+
+
+def release_lookback() -> timedelta:
+    """조회 시각 이전 추가 조회 기간 (저장된 가장 긴 방류 기간 기준)"""
+    return get_release_index().lookback
+
+
+def _date_ranges(spans: Iterable[Tuple[datetime, datetime]], lookback: timedelta) -> List[Tuple[date, date]]:
+    """시각 구간들 → 받아야 할 현지 날짜 구간 (룩백 포함, 내일 이전까지)"""
+    tomorrow = timezone.localdate() + timedelta(days=1)
+    ranges = []
+    for lo, hi in spans:
+        start = (local_naive(lo) - lookback).date()
+        end = min(local_naive(hi).date() + timedelta(days=1), tomorrow)
+        if start < end:
+            ranges.append((start, end))
+    return ranges
+
+
+def unsynced_ranges(spans: Iterable[Tuple[datetime, datetime]]) -> List[Tuple[date, date]]:
+    """
+    판정에 필요한 날짜 중 아직 받지 않은 구간 (조회하지 않음)
+
+    최근 SETTLE_DAYS 일은 받은 구간으로 기록되지 않으므로 제외한다 (동기화 때마다 다시 받음).
+
+    Returns:
+        list: [(start, end), ...] 현지 날짜 [start, end)
+    """
+    settled = timezone.localdate() - timedelta(days=SETTLE_DAYS - 1)
+    gaps = missing_ranges(_date_ranges(spans, release_lookback()))
+    return [(start, min(end, settled)) for start, end in gaps if start < settled]
+
+
+def sync_releases(spans: Iterable[Tuple[datetime, datetime]], max_workers: int = MAX_WORKERS) -> Dict:
+    """
+    시각 구간들의 판정에 필요한 방류정보를 로컬 사본에 채움 (빠진 날짜만 조회)
+
+    Args:
+        spans: [(시작 시각, 종료 시각), ...] (naive 는 현지 시각)
+        max_workers: 동시 조회 수
+
+    Returns:
+        dict: {windows, events, failed}
+    """
+    from .dam_discharge_service import DAM_DISCHARGE_API_KEY
+
+    global _recent_synced_at
+
+    stats = {'windows': 0, 'events': 0, 'failed': 0}
+    settled = timezone.localdate() - timedelta(days=SETTLE_DAYS - 1)
+
+    gaps = missing_ranges(_date_ranges(spans, release_lookback()))
+    recent_fresh = (
+        _recent_synced_at is not None and time.monotonic() - _recent_synced_at < REFRESH_INTERVAL
+    )
+    if recent_fresh:
+        gaps = [(start, min(end, settled)) for start, end in gaps if start < settled]
+    windows = split_windows(gaps, WINDOW)
+    if not windows:
+        return stats
+    if not DAM_DISCHARGE_API_KEY:
+        logger.warning("DAM_DISCHARGE_API_KEY 환경변수가 설정되지 않았습니다.")
+        return stats
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(windows))) as executor:
+        futures = {
+            executor.submit(_fetch_window, w_start, w_end): (w_start, w_end)
+            for w_start, w_end in windows
+        }
+        for future in as_completed(futures):
+            w_start, w_end = futures[future]
+            try:
+                items = future.result()
+            except (requests.RequestException, ET.ParseError, ValueError) as e:
+                stats['failed'] += 1
+                logger.warning("댐 방류정보 조회 실패: %s~%s (%s)", w_start, w_end, e)
+                continue
+            _store_window(w_start, w_end, items, settled)
+            stats['windows'] += 1
+            stats['events'] += len(items)
+            if w_end > settled:
+                _recent_synced_at = time.monotonic()
+
+    invalidate_index()
+    logger.info(
+        "댐 방류정보 동기화: windows=%d, events=%d, failed=%d",
+        stats['windows'], stats['events'], stats['failed'],
+    )
+    return stats
+
+
+class DamReleaseIndex:
+    """
+    댐별 정렬 구간 색인 (DAM_INFO 키별)
+
+    - starts / ends: 방류 시작·종료 (epoch 초, 종료 없음은 OPEN_END), 시작 오름차순
+    - reach: ends 누적 최대 - reach[i] < t 이면 0..i 중 t 이후까지 이어진 방류 없음
+    - events: 방류정보 dict (fetch_dam_discharge_info 항목과 같은 키)
+    - lookback: 종료된 방류 중 가장 긴 방류 기간 (일 단위 올림, 없으면 DEFAULT_LOOKBACK)
+    """
+
+    def __init__(self, events: List[Dict], signature=None):
+        self.signature = signature
+        self.dams = {}
+        for dam_key, info in DAM_INFO.items():
+            matched = sorted(
+                (event for event in events if info['name'] in event.get('dam_name', '')),
+                key=lambda event: event['start_datetime'],
+            )
+            starts = np.array([_seconds(e['start_datetime']) for e in matched], dtype=np.int64)
+            ends = np.array([
+                _seconds(e['end_datetime']) if e.get('end_datetime') else OPEN_END for e in matched
+            ], dtype=np.int64)
+            reach = np.maximum.accumulate(ends) if len(ends) else ends
+            self.dams[dam_key] = (starts, ends, reach, matched)
+
+        closed = [ends[ends != OPEN_END] - starts[ends != OPEN_END] for starts, ends, _, _ in self.dams.values()]
+        longest = max((int(durations.max()) for durations in closed if durations.size), default=None)
+        if longest is None:
+            self.lookback = DEFAULT_LOOKBACK
+        else:
+            self.lookback = max(timedelta(days=math.ceil(longest / 86400)), MIN_LOOKBACK)
+
+    @classmethod
+    def from_db(cls, signature=None):
+        from .models import DamReleaseEvent
+
+        events = []
+        for event in DamReleaseEvent.objects.order_by('start').iterator():
+            start = local_naive(event.start)
+            end = local_naive(event.end) if event.end else None
+            events.append({
+                'dam_code': event.dam_code,
+                'dam_name': event.dam_name,
+                'dam_coord': event.dam_coord,
+                'start_date': start.strftime('%Y-%m-%d %H:%M'),
+                'end_date': end.strftime('%Y-%m-%d %H:%M') if end else '',
+                'affect_area': event.affect_area,
+                'created_date': event.created_date,
+                'updated_date': event.updated_date,
+                'start_datetime': start,
+                'end_datetime': end,
+            })
+        return cls(events, signature)
+
+    def find(self, dam_key: str, lo: datetime, hi: Optional[datetime] = None) -> Optional[Dict]:
+        """
+        시각 lo (또는 기간 [lo, hi]) 에 진행 중이던 방류 중 가장 늦게 시작한 것
+
+        Returns:
+            dict or None: 방류정보
+        """
+        entry = self.dams.get(dam_key)
+        if entry is None:
+            return None
+        starts, ends, reach, events = entry
+        lo_s = _seconds(lo)
+        hi_s = _seconds(hi) if hi is not None else lo_s
+
+        i = int(np.searchsorted(starts, hi_s, side='right')) - 1
+        while i >= 0 and reach[i] >= lo_s:
+            if ends[i] >= lo_s:
+                return events[i]
+            i -= 1
+        return None
+
+
+def _table_signature():
+    from .models import DamReleaseEvent
+
+    row = DamReleaseEvent.objects.aggregate(count=Count('id'), latest=Max('updated_at'))
+    return row['count'], row['latest']
+
+
+def invalidate_index():
+    """다음 조회 때 테이블 변경 여부를 바로 확인"""
+    global _checked_at
+    _checked_at = 0.0
+
+
+def get_release_index() -> DamReleaseIndex:
+    """방류 구간 색인 (CHECK_INTERVAL 마다 테이블 서명을 확인해 바뀐 경우에만 다시 생성)"""
+    global _index, _checked_at
+
+    index = _index
+    now = time.monotonic()
+    if index is not None and now - _checked_at < CHECK_INTERVAL:
+        return index
+
+    signature = _table_signature()
+    with _index_lock:
+        if _index is None or _index.signature != signature:
+            _index = DamReleaseIndex.from_db(signature)
+            logger.info("댐 방류 색인 생성: 이벤트 %d개", signature[0])
+        _checked_at = now
+        return _index
@@ -0,0 +1,289 @@
+"""
+한강홍수통제소 Open API 공용 클라이언트
+
+- 연결 풀: 프로세스 단위 requests.Session (HTTPAdapter 풀 재사용)
+- 재시도: 연결 오류 / 429, 5xx 응답에 지수 백오프 재시도 (Retry-After 존중)
+- 호출 제한: 토큰 버킷(초당 rate, 순간 burst)과 동시 호출 수 제한 (sync_history 등 동시 조회도 함께 제한)
+- 캐시: 10분 자료 발표 주기에 맞춘 TTL (다음 10분 경계 + 발표 지연까지 유지)
+- 단일 비행: 같은 요청이 동시에 들어오면 한 번만 호출하고 나머지는 결과를 기다림
+- 장애 시: 만료된 캐시가 STALE_TTL 이내면 그 값을 대신 반환
+- 지표: 캐시 적중/미스, 병합, 상위 호출, 오류, 호출 제한 대기 수 (metrics())
+
+base_url 을 바꿔 로컬 스텁 서버를 대상으로 시험할 수 있다 (환경변수 HRFCO_BASE_URL).
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# 10분 자료 발표 주기 (초) 와 경계 이후 자료가 올라오기까지의 여유
+PUBLISH_INTERVAL = 600
+PUBLISH_DELAY = 60
+
+# 끝난 기간(과거) 조회 결과 유지 시간, 장애 시 만료 캐시 허용 시간
+HISTORY_TTL = 6 * 3600
+STALE_TTL = 3600
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_RATE = 10.0         # 초당 호출 수
+DEFAULT_BURST = 20          # 순간 허용 호출 수 (대시보드 여러 관측소 동시 조회)
+DEFAULT_CONCURRENCY = 8     # 동시 호출 수
+
+
+def aligned_ttl(now=None, interval=PUBLISH_INTERVAL, delay=PUBLISH_DELAY):
+    """
+    다음 발표 시각까지 남은 초
+
+    10분 경계(HH:00, HH:10, ...) 에서 delay 초가 지난 시점을 다음 발표 시각으로 본다.
+    """
+    now = time.time() if now is None else now
+    next_publish = (now - delay) // interval * interval + interval + delay
+    return next_publish - now
+
+
+class _RateLimiter:
+    """토큰 버킷 (초당 rate 개 충전, 최대 burst 개) + 동시 호출 수 세마포어"""
+
+    def __init__(self, rate, burst, concurrency):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(max(concurrency, 1))
+
+    def _reserve(self):
+        """토큰 하나 예약 → 기다려야 할 초 (토큰이 음수면 그만큼 뒤 순서)"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    @contextmanager
+    def slot(self):
+        """호출 자리 확보 (동시 호출 수 → 토큰 순), 기다린 초를 넘겨줌"""
+        with self.slots:
+            wait = self._reserve() if self.rate else 0.0
+            if wait > 0:
+                time.sleep(wait)
+            yield wait
+
+
+class _Entry:
+    __slots__ = ('value', 'expires')
+
+    def __init__(self, value, expires):
+        self.value = value
+        self.expires = expires
+
+
+class _Call:
+    """진행 중인 상위 호출 (단일 비행 대기용)"""
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class HrfcoClient:
+    """한강홍수통제소 API 클라이언트 (스레드 안전)"""
+
+    def __init__(self, base_url, api_key, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES,
+                 backoff=DEFAULT_BACKOFF, pool_size=DEFAULT_POOL_SIZE,
+                 max_entries=DEFAULT_MAX_ENTRIES, rate=DEFAULT_RATE, burst=DEFAULT_BURST,
+                 concurrency=DEFAULT_CONCURRENCY, clock=time.time):
+        """
+        Args:
+            base_url: API 기본 URL (예: https://api.hrfco.go.kr)
+            api_key: 서비스 키 (URL 경로에 포함됨, 로그에는 남기지 않음)
+            timeout: 요청 타임아웃 (초)
+            retries: 최대 재시도 횟수
+            backoff: 지수 백오프 계수 (backoff * 2^(n-1) 초)
+            pool_size: 연결 풀 크기
+            max_entries: 캐시 최대 항목 수 (초과 시 오래 쓰지 않은 항목부터 제거)
+            rate: 초당 호출 수 (0 이면 제한 없음)
+            burst: 순간 허용 호출 수
+            concurrency: 동시 호출 수
+            clock: 현재 시각 함수 (시험용)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.clock = clock
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._limiter = _RateLimiter(rate, burst, concurrency)
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'fetches': 0, 'errors': 0, 'stale': 0, 'throttled': 0}
+
+    def url(self, path):
+        """요청 URL (path 는 서비스 키 뒤 경로, 예: 'waterlevel/list/10M.xml')"""
+        return f"{self.base_url}/{self.api_key}/{path.lstrip('/')}"
+
+    def fetch_text(self, path):
+        """캐시 없이 응답 본문 조회 (호출 제한, 재시도 포함)"""
+        with self._limiter.slot() as waited:
+            if waited > 0:
+                with self._lock:
+                    self._stats['throttled'] += 1
+            response = self.session.get(self.url(path), timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def get(self, path, parse=None, ttl=None):
+        """
+        캐시/단일 비행을 거친 조회
+
+        Args:
+            path: 요청 경로 (캐시 키)
+            parse: 응답 본문 → 캐시할 값 변환 함수 (None 이면 본문 그대로)
+            ttl: 유지 시간(초) (None 이면 다음 10분 발표 시각까지)
+
+        Returns:
+            parse 결과 (캐시와 공유되므로 호출자가 변경하지 않아야 함)
+
+        Raises:
+            requests.RequestException: 호출 실패 + 사용할 만료 캐시 없음
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._cache.get(path)
+            if entry is not None and entry.expires > now:
+                self._cache.move_to_end(path)
+                self._stats['hits'] += 1
+                return entry.value
+
+            call = self._inflight.get(path)
+            leader = call is None
+            if leader:
+                call = self._inflight[path] = _Call()
+                self._stats['misses'] += 1
+            else:
+                self._stats['coalesced'] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = self._load(path, parse, ttl)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(path, None)
+            call.event.set()
+        return call.value
+
+    def _load(self, path, parse, ttl):
+        """상위 호출 후 캐시 저장 (실패 시 만료 캐시로 대체)"""
+        started = self.clock()
+        try:
+            with self._lock:
+                self._stats['fetches'] += 1
+            text = self.fetch_text(path)
+            value = parse(text) if parse else text
+        except requests.RequestException as e:
+            with self._lock:
+                self._stats['errors'] += 1
+                entry = self._cache.get(path)
+                if entry is not None and entry.expires + STALE_TTL > started:
+                    self._stats['stale'] += 1
+                    logger.warning("HRFCO 요청 실패, 이전 캐시 사용: %s (%s)", path, self._masked(e))
+                    return entry.value
+            logger.warning("HRFCO 요청 실패: %s (%s)", path, self._masked(e))
+            raise
+
+        now = self.clock()
+        expires = now + (aligned_ttl(now) if ttl is None else ttl)
+        with self._lock:
+            self._cache[path] = _Entry(value, expires)
+            self._cache.move_to_end(path)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        logger.debug("HRFCO 조회: %s (%.2fs)", path, now - started)
+        return value
+
+    def _masked(self, error):
+        """오류 메시지의 서비스 키 가리기 (URL 에 포함됨)"""
+        message = str(error)
+        return message.replace(self.api_key, '***') if self.api_key else message
+
+    def invalidate(self, path=None):
+        """캐시 삭제 (path 가 None 이면 전체)"""
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(path, None)
+
+    def metrics(self):
+        """캐시/호출 지표"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._cache)
+            stats['inflight'] = len(self._inflight)
+        lookups = stats['hits'] + stats['misses'] + stats['coalesced']
+        stats['hit_ratio'] = round((stats['hits'] + stats['coalesced']) / lookups, 4) if lookups else None
+        return stats
+
+    def reset_metrics(self):
+        """지표 초기화"""
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] = 0
+
+    def close(self):
+        """연결 풀 종료"""
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """프로세스 공용 클라이언트 (hydro.services 설정 사용)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from .services import HRFCO_API_KEY, HRFCO_BASE_URL
+                _client = HrfcoClient(HRFCO_BASE_URL, HRFCO_API_KEY)
+    return _client
@@ -0,0 +1,246 @@
+"""
+한강홍수통제소 기간 자료 로컬 사본 서비스
+
+HRFCO 10분 수위/유량을 (관측소 코드, 10분 시각) 기준으로 HrfcoObservation 에 저장하고,
+이미 받은 구간을 HrfcoFetchedRange 로 기록한다. 기간 요청 시 빠진 구간만 API 크기 창으로 나누어
+동시에 조회하고(스레드는 HTTP 만 담당), 창별 결과는 호출 스레드에서 한 트랜잭션으로 저장한다.
+
+- 시각은 현지 시각(settings.TIME_ZONE) 10분 격자, 구간은 [start, end) 반열린 구간
+- 아직 발표되지 않은 시각(현재 - 발표 지연 이후)은 조회하지 않고, 늦게 올라오거나 보정될 수 있는
+  최근 SETTLE 기간은 저장하되 받은 구간으로 기록하지 않아 다음 요청 때 다시 받는다
+- 실패한 창은 기록하지 않으므로 다음 요청 때 다시 받는다
+- 행이 하나도 없는 창은 EMPTY_SETTLE(1일) 보다 오래된 부분만 받은 구간으로 기록한다
+  (최근 자료가 늦게 적재되어 빈 응답이 오면 다음 요청 때 다시 받음)
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+import numpy as np
+import requests
+import xml.etree.ElementTree as ET
+from django.db import transaction
+from django.db.models import Avg
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .hrfco_client import PUBLISH_DELAY, get_client
+from .time_ranges import merge_ranges
+from .xml_stream import read_arrays
+
+logger = logging.getLogger(__name__)
+
+STEP = timedelta(minutes=10)
+
+# API 1회 조회 기간과 동시 조회 수
+WINDOW = timedelta(days=30)
+MAX_WORKERS = 4
+
+# 최근 자료 확정 대기 기간 (이 기간은 매번 다시 받음)
+SETTLE = timedelta(hours=1)
+
+# 빈 응답 창의 확정 대기 기간 (이보다 최근 부분은 받은 구간으로 기록하지 않음)
+EMPTY_SETTLE = timedelta(days=1)
+
+BULK_BATCH_SIZE = 5000
+
+
+def _aware(value):
+    """naive datetime → 현지 시각 aware datetime"""
+    if timezone.is_naive(value):
+        return timezone.make_aware(value)
+    return timezone.localtime(value)
+
+
+def _floor(value):
+    """10분 격자로 내림"""
+    return value.replace(minute=value.minute - value.minute % 10, second=0, microsecond=0)
+
+
+def published_until(now=None):
+    """발표가 끝난 마지막 10분 시각 (현지 시각)"""
+    now = timezone.localtime(now or timezone.now())
+    return _floor(now - timedelta(seconds=PUBLISH_DELAY))
+
+
+def fetched_ranges(station_code):
+    """받은 구간 목록 [(start, end), ...] (시작 오름차순, 현지 시각)"""
+    from .models import HrfcoFetchedRange
+
+    # DB 는 UTC aware 로 돌려주므로 현지 시각으로 맞춤 (URL 창/행 필터와 같은 기준)
+    return [
+        (timezone.localtime(start), timezone.localtime(end))
+        for start, end in (
+            HrfcoFetchedRange.objects
+            .filter(station_code=station_code)
+            .order_by('start')
+            .values_list('start', 'end')
+        )
+    ]
+
+
+def missing_ranges(station_code, start, end):
+    """
+    [start, end) 중 아직 받지 않은 구간
+
+    Returns:
+        list: [(start, end), ...]
+    """
+    gaps = []
+    cursor = start
+    for have_start, have_end in merge_ranges(fetched_ranges(station_code)):
+        if have_end <= cursor:
+            continue
+        if have_start >= end:
+            break
+        if have_start > cursor:
+            gaps.append((cursor, have_start))
+        cursor = max(cursor, have_end)
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def split_windows(ranges, window=WINDOW):
+    """구간들을 API 조회 크기 창으로 분할"""
+    windows = []
+    for start, end in ranges:
+        while start < end:
+            windows.append((start, min(start + window, end)))
+            start += window
+    return windows
+
+
+def _fetch_window(station_code, start, end):
+    """
+    창 하나 조회 (HTTP/파싱만, DB 접근 없음)
+
+    Returns:
+        list: [(timestamp, 수위, 유량), ...]
+    """
+    # URL 과 행 필터 모두 현지 시각(KST) 기준
+    start, end = timezone.localtime(start), timezone.localtime(end)
+    last = end - STEP
+    path = (
+        f"waterlevel/list/10M/{station_code}/"
+        f"{start.strftime('%Y%m%d%H%M')}/{last.strftime('%Y%m%d%H%M')}.xml"
+    )
+    arrays = read_arrays(get_client().fetch_text(path), value_fields=('wl', 'fw'))
+
+    # 현지 naive 시각 → 창 범위 필터 (NaT 는 비교에서 제외됨)
+    lo = np.datetime64(timezone.make_naive(start), 'm')
+    hi = np.datetime64(timezone.make_naive(end), 'm')
+    times = arrays['time']
+    keep = (times >= lo) & (times < hi)
+
+    tz = timezone.get_current_timezone()
+    wl = arrays['wl'][keep]
+    fw = arrays['fw'][keep]
+    return [
+        (ts.replace(tzinfo=tz), None if w != w else w, None if f != f else f)
+        for ts, w, f in zip(times[keep].astype('datetime64[us]').tolist(), wl.tolist(), fw.tolist())
+    ]
+
+
+def _store_window(station_code, start, end, rows, settled):
+    """창 결과 업서트 + 확정 시각(settled) 이전 구간 기록/병합 (한 트랜잭션)"""
+    from .models import HrfcoFetchedRange, HrfcoObservation
+
+    with transaction.atomic():
+        HrfcoObservation.objects.bulk_create(
+            [
+                HrfcoObservation(station_code=station_code, timestamp=ts, water_level=wl, flow_rate=fw)
+                for ts, wl, fw in rows
+            ],
+            batch_size=BULK_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['station_code', 'timestamp'],
+            update_fields=['water_level', 'flow_rate'],
+        )
+
+        end = min(end, settled)
+        if start >= end:
+            return
+        existing = HrfcoFetchedRange.objects.select_for_update().filter(station_code=station_code)
+        merged = merge_ranges(list(existing.values_list('start', 'end')) + [(start, end)])
+        existing.delete()
+        HrfcoFetchedRange.objects.bulk_create([
+            HrfcoFetchedRange(station_code=station_code, start=s, end=e) for s, e in merged
+        ])
+
+
+def sync_history(station_code, start, end, max_workers=MAX_WORKERS):
+    """
+    기간 자료를 로컬 사본에 채움 (빠진 구간만 조회)
+
+    Args:
+        station_code: HRFCO 관측소 코드
+        start, end: 기간 (datetime, naive 는 현지 시각, end 포함)
+        max_workers: 동시 조회 수
+
+    Returns:
+        dict: {windows, rows, failed}
+    """
+    published = published_until()
+    start = _floor(_aware(start))
+    end = min(_floor(_aware(end)), published) + STEP
+    stats = {'windows': 0, 'rows': 0, 'failed': 0}
+    if start >= end:
+        return stats
+
+    windows = split_windows(missing_ranges(station_code, start, end))
+    if not windows:
+        return stats
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(windows))) as executor:
+        futures = {
+            executor.submit(_fetch_window, station_code, w_start, w_end): (w_start, w_end)
+            for w_start, w_end in windows
+        }
+        for future in as_completed(futures):
+            w_start, w_end = futures[future]
+            try:
+                rows = future.result()
+            except (requests.RequestException, ET.ParseError, ValueError) as e:
+                stats['failed'] += 1
+                logger.warning("HRFCO 기간 조회 실패: %s %s~%s (%s)", station_code, w_start, w_end, e)
+                continue
+            settled = published + STEP - (SETTLE if rows else EMPTY_SETTLE)
+            _store_window(station_code, w_start, w_end, rows, settled)
+            stats['windows'] += 1
+            stats['rows'] += len(rows)
+
+    logger.info(
+        "HRFCO 기간 자료 동기화: %s, windows=%d, rows=%d, failed=%d",
+        station_code, stats['windows'], stats['rows'], stats['failed'],
+    )
+    return stats
+
+
+def daily_mean_flow(station_code, start, end):
+    """
+    로컬 사본 일평균 유량 (현지 날짜 기준, 유량 없는 시각 제외)
+
+    Args:
+        station_code: HRFCO 관측소 코드
+        start, end: 기간 (datetime, naive 는 현지 시각, end 포함)
+
+    Returns:
+        list: [(date, 평균 유량), ...] 날짜 오름차순
+    """
+    from .models import HrfcoObservation
+
+    return list(
+        HrfcoObservation.objects
+        .filter(
+            station_code=station_code,
+            timestamp__gte=_aware(start),
+            timestamp__lte=_aware(end),
+            flow_rate__isnull=False,
+        )
+        .annotate(day=TruncDate('timestamp'))
+        .values('day')
+        .annotate(avg=Avg('flow_rate'))
+        .order_by('day')
+        .values_list('day', 'avg')
+    )
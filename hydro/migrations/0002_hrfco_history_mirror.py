@@ -0,0 +1,45 @@
+# Generated manually
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hydro', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HrfcoObservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('station_code', models.CharField(max_length=20, verbose_name='관측소 코드')),
+                ('timestamp', models.DateTimeField(verbose_name='관측시각')),
+                ('water_level', models.FloatField(blank=True, null=True, verbose_name='수위(m)')),
+                ('flow_rate', models.FloatField(blank=True, null=True, verbose_name='유량(m³/s)')),
+            ],
+            options={
+                'verbose_name': 'HRFCO 관측자료',
+                'verbose_name_plural': 'HRFCO 관측자료',
+                'ordering': ['station_code', 'timestamp'],
+                'constraints': [
+                    models.UniqueConstraint(fields=('station_code', 'timestamp'), name='unique_hrfco_observation'),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name='HrfcoFetchedRange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('station_code', models.CharField(db_index=True, max_length=20, verbose_name='관측소 코드')),
+                ('start', models.DateTimeField(verbose_name='시작')),
+                ('end', models.DateTimeField(verbose_name='종료')),
+                ('fetched_at', models.DateTimeField(auto_now=True, verbose_name='조회일시')),
+            ],
+            options={
+                'verbose_name': 'HRFCO 조회 구간',
+                'verbose_name_plural': 'HRFCO 조회 구간',
+                'ordering': ['station_code', 'start'],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated manually
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hydro', '0002_hrfco_history_mirror'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DamReleaseEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dam_code', models.CharField(blank=True, max_length=10, verbose_name='댐 코드')),
+                ('dam_name', models.CharField(max_length=50, verbose_name='댐 이름')),
+                ('dam_coord', models.CharField(blank=True, max_length=100, verbose_name='댐 좌표')),
+                ('start', models.DateTimeField(verbose_name='방류 시작')),
+                ('end', models.DateTimeField(blank=True, null=True, verbose_name='방류 종료')),
+                ('affect_area', models.TextField(blank=True, verbose_name='영향 지역')),
+                ('created_date', models.CharField(blank=True, max_length=30, verbose_name='등록일시(원본)')),
+                ('updated_date', models.CharField(blank=True, max_length=30, verbose_name='수정일시(원본)')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='저장일시')),
+            ],
+            options={
+                'verbose_name': '댐 방류 이벤트',
+                'verbose_name_plural': '댐 방류 이벤트',
+                'ordering': ['dam_name', 'start'],
+                'constraints': [
+                    models.UniqueConstraint(fields=('dam_name', 'start'), name='unique_dam_release_event'),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name='DamReleaseFetchedRange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start', models.DateField(verbose_name='시작일')),
+                ('end', models.DateField(verbose_name='종료일')),
+                ('fetched_at', models.DateTimeField(auto_now=True, verbose_name='조회일시')),
+            ],
+            options={
+                'verbose_name': '댐 방류정보 조회 구간',
+                'verbose_name_plural': '댐 방류정보 조회 구간',
+                'ordering': ['start'],
+            },
+        ),
+    ]
@@ -81,3 +81,81 @@ class WaterLevelQuery(models.Model):
 
     def __str__(self):
         return f"{self.user} - {self.station_name} - {self.created_at}"
+
+
+class HrfcoObservation(models.Model):
+    """한강홍수통제소 10분 수위/유량 로컬 사본"""
+
+    station_code = models.CharField(max_length=20, verbose_name='관측소 코드')
+    timestamp = models.DateTimeField(verbose_name='관측시각')
+    water_level = models.FloatField(null=True, blank=True, verbose_name='수위(m)')
+    flow_rate = models.FloatField(null=True, blank=True, verbose_name='유량(m³/s)')
+
+    class Meta:
+        verbose_name = 'HRFCO 관측자료'
+        verbose_name_plural = 'HRFCO 관측자료'
+        ordering = ['station_code', 'timestamp']
+        constraints = [
+            models.UniqueConstraint(fields=['station_code', 'timestamp'], name='unique_hrfco_observation'),
+        ]
+
+    def __str__(self):
+        return f"{self.station_code} - {self.timestamp}"
+
+
+class HrfcoFetchedRange(models.Model):
+    """HRFCO 기간 조회 완료 구간 (이미 받은 구간은 다시 받지 않음)"""
+
+    station_code = models.CharField(max_length=20, db_index=True, verbose_name='관측소 코드')
+    start = models.DateTimeField(verbose_name='시작')
+    end = models.DateTimeField(verbose_name='종료')
+    fetched_at = models.DateTimeField(auto_now=True, verbose_name='조회일시')
+
+    class Meta:
+        verbose_name = 'HRFCO 조회 구간'
+        verbose_name_plural = 'HRFCO 조회 구간'
+        ordering = ['station_code', 'start']
+
+    def __str__(self):
+        return f"{self.station_code}: {self.start} ~ {self.end}"
+
+
+class DamReleaseEvent(models.Model):
+    """K-water 댐 수문 방류 이벤트 로컬 사본 (방류정보 API)"""
+
+    dam_code = models.CharField(max_length=10, blank=True, verbose_name='댐 코드')
+    dam_name = models.CharField(max_length=50, verbose_name='댐 이름')
+    dam_coord = models.CharField(max_length=100, blank=True, verbose_name='댐 좌표')
+    start = models.DateTimeField(verbose_name='방류 시작')
+    end = models.DateTimeField(null=True, blank=True, verbose_name='방류 종료')  # 없으면 방류 중
+    affect_area = models.TextField(blank=True, verbose_name='영향 지역')
+    created_date = models.CharField(max_length=30, blank=True, verbose_name='등록일시(원본)')
+    updated_date = models.CharField(max_length=30, blank=True, verbose_name='수정일시(원본)')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='저장일시')
+
+    class Meta:
+        verbose_name = '댐 방류 이벤트'
+        verbose_name_plural = '댐 방류 이벤트'
+        ordering = ['dam_name', 'start']
+        constraints = [
+            models.UniqueConstraint(fields=['dam_name', 'start'], name='unique_dam_release_event'),
+        ]
+
+    def __str__(self):
+        return f"{self.dam_name}: {self.start} ~ {self.end or ''}"
+
+
+class DamReleaseFetchedRange(models.Model):
+    """댐 방류정보 조회 완료 날짜 구간 [start, end) (이미 받은 날짜는 다시 받지 않음)"""
+
+    start = models.DateField(verbose_name='시작일')
+    end = models.DateField(verbose_name='종료일')
+    fetched_at = models.DateTimeField(auto_now=True, verbose_name='조회일시')
+
+    class Meta:
+        verbose_name = '댐 방류정보 조회 구간'
+        verbose_name_plural = '댐 방류정보 조회 구간'
+        ordering = ['start']
+
+    def __str__(self):
+        return f"{self.start} ~ {self.end}"
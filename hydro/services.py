@@ -4,14 +4,24 @@
 실시간 수위, 유량, 강수량 데이터 조회
 API 문서: https://www.hrfco.go.kr/web/openapiPage/reference.do
 """
+import asyncio
+import logging
 import os
 import requests
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from django.conf import settings
+from functools import partial
 
-# API 기본 설정
-HRFCO_BASE_URL = "https://api.hrfco.go.kr"
+from asgiref.sync import async_to_sync
+
+from .hrfco_client import HISTORY_TTL, get_client
+from .xml_stream import RAINFALL_FIELDS, WATERLEVEL_FIELDS, iter_records
+
+logger = logging.getLogger(__name__)
+
+# API 기본 설정 (HRFCO_BASE_URL 로 로컬 스텁 서버 지정 가능)
+HRFCO_BASE_URL = os.environ.get('HRFCO_BASE_URL', "https://api.hrfco.go.kr")
 HRFCO_API_KEY = os.environ.get('HRFCO_API_KEY', '9E50673B-2D96-4436-BA86-756E81D3C738')
 
 # 전체 관측소 목록 (한강홍수통제소 관할) - 상세 정보 포함
@@ -84,7 +94,7 @@ ALL_STATIONS = {
 
 def search_stations(query, limit=20):
     """
-    관측소 검색 (지점명, 하천명, DM코드로 검색)
+    관측소 검색 (지점명·초성, 하천명, 지역, DM코드로 검색, 점수 순)
 
     Args:
         query: 검색어
@@ -96,19 +106,18 @@ def search_stations(query, limit=20):
     if not query:
         return STATION_DATABASE[:limit]
 
-    query_lower = query.lower()
-    results = []
+    from .station_search_service import search_major
+
+    return search_major(query, limit)
 
-    for station in STATION_DATABASE:
-        # 지점명, 하천명, DM코드, 지역으로 검색
-        if (query_lower in station['name'].lower() or
-            query_lower in station['river'].lower() or
-            query_lower in station['dm_code'].lower() or
-            query_lower in station['region'].lower() or
-            query_lower in station['code']):
-            results.append(station)
+# 선택 관측소가 이 수 이하이면 관측소별 엔드포인트로 조회 (초과 시 전체 목록 1회 조회 후 필터)
+PER_STATION_LIMIT = 5
 
-    return results[:limit]
+# 대시보드 실시간 조회 전체 대기 시간 예산 (초)
+STATIONS_TIMEOUT = 10
+
+# 실시간 동시 조회용 스레드 풀 (요청별 이벤트 루프가 끝날 때 늦은 호출을 기다리지 않도록 루프 기본 풀 대신 사용)
+_fetch_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='hrfco')
 
 # 기본 선택 관측소
 DEFAULT_STATIONS = {
@@ -117,25 +126,85 @@ DEFAULT_STATIONS = {
 }
 
 
-def parse_xml_response(xml_text):
-    """XML 응답 파싱"""
+def parse_xml_response(xml_text, strict=False):
+    """XML 응답 파싱 - 필드 원문 문자열 dict 목록 (strict 이면 파싱 오류를 그대로 발생)"""
     try:
-        root = ET.fromstring(xml_text)
-        items = []
+        return list(iter_records(xml_text))
+    except ET.ParseError as e:
+        if strict:
+            raise
+        logger.warning("XML 파싱 오류: %s", e)
+        return []
 
-        # content 내의 모든 아이템 찾기
-        for content in root.findall('.//content'):
-            for child in content:
-                item = {}
-                for field in child:
-                    item[field.tag] = field.text.strip() if field.text else ''
-                items.append(item)
 
-        return items
+def _parse_typed(xml_text, fields, names=None):
+    """XML → 변환된 레코드 목록 (수치/시각 변환을 파싱과 함께 처리)"""
+    try:
+        items = list(iter_records(xml_text, fields=fields))
     except ET.ParseError as e:
-        print(f"XML 파싱 오류: {e}")
+        logger.warning("XML 파싱 오류: %s", e)
         return []
 
+    code_field = 'wlobscd' if 'wl' in fields else 'rfobscd'
+    for item in items:
+        if names is not None:
+            code = item.get(code_field)
+            item['station_name'] = names.get(code, code)
+        ymdhm = item.get('ymdhm')
+        if ymdhm:
+            item['time_str'] = (
+                f"{ymdhm[:4]}-{ymdhm[4:6]}-{ymdhm[6:8]} {ymdhm[8:10]}:{ymdhm[10:]}"
+                if item['datetime'] else ymdhm
+            )
+    return items
+
+
+def _parse_waterlevel(xml_text, with_names=True):
+    """수위 XML → 정제된 목록"""
+    return _parse_typed(xml_text, WATERLEVEL_FIELDS, ALL_STATIONS['waterlevel'] if with_names else None)
+
+
+def _parse_rainfall(xml_text, with_names=True):
+    """강수량 XML → 정제된 목록"""
+    return _parse_typed(xml_text, RAINFALL_FIELDS, ALL_STATIONS['rainfall'] if with_names else None)
+
+
+def _fetch_items(path, parse, ttl=None):
+    """
+    공용 클라이언트로 조회 (캐시 공유 목록은 항목별 사본으로 반환)
+
+    Returns:
+        list of dict: 실패 시 빈 목록 (오류는 클라이언트에서 로그)
+    """
+    try:
+        items = get_client().get(path, parse=parse, ttl=ttl)
+    except requests.RequestException:
+        return []
+    return [dict(item) for item in items]
+
+
+def _format_ymdhm(value):
+    """datetime 또는 'YYYYMMDDHHmm' 문자열 → 'YYYYMMDDHHmm'"""
+    if isinstance(value, datetime):
+        return value.strftime('%Y%m%d%H%M')
+    return value
+
+
+def _history_ttl(end_str):
+    """
+    기간 조회 캐시 유지 시간
+
+    끝 시각이 1시간 이상 지난 기간은 자료가 바뀌지 않으므로 길게 유지하고,
+    현재를 포함하는 기간은 10분 발표 주기에 맞춘다(None).
+    """
+    try:
+        end_dt = datetime.strptime(end_str, '%Y%m%d%H%M')
+    except (TypeError, ValueError):
+        return None
+    if end_dt <= datetime.now() - timedelta(hours=1):
+        return HISTORY_TTL
+    return None
+
 
 def get_realtime_waterlevel(station_code=None):
     """
@@ -148,36 +217,11 @@ def get_realtime_waterlevel(station_code=None):
         list of dict: 수위 데이터 목록
     """
     if station_code:
-        url = f"{HRFCO_BASE_URL}/{HRFCO_API_KEY}/waterlevel/list/10M/{station_code}.xml"
+        path = f"waterlevel/list/10M/{station_code}.xml"
     else:
-        url = f"{HRFCO_BASE_URL}/{HRFCO_API_KEY}/waterlevel/list/10M.xml"
+        path = "waterlevel/list/10M.xml"
 
-    try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-
-        items = parse_xml_response(response.text)
-
-        # 데이터 정제
-        for item in items:
-            item['wl'] = float(item.get('wl', 0)) if item.get('wl') else None
-            item['fw'] = float(item.get('fw', 0)) if item.get('fw', '').strip() else None
-            item['station_name'] = ALL_STATIONS['waterlevel'].get(item.get('wlobscd'), item.get('wlobscd'))
-
-            # 시간 파싱
-            ymdhm = item.get('ymdhm', '')
-            if ymdhm:
-                try:
-                    item['datetime'] = datetime.strptime(ymdhm, '%Y%m%d%H%M')
-                    item['time_str'] = item['datetime'].strftime('%Y-%m-%d %H:%M')
-                except:
-                    item['datetime'] = None
-                    item['time_str'] = ymdhm
-
-        return items
-    except requests.RequestException as e:
-        print(f"API 요청 오류: {e}")
-        return []
+    return _fetch_items(path, _parse_waterlevel)
 
 
 def get_realtime_rainfall(station_code=None):
@@ -191,35 +235,11 @@ def get_realtime_rainfall(station_code=None):
         list of dict: 강수량 데이터 목록
     """
     if station_code:
-        url = f"{HRFCO_BASE_URL}/{HRFCO_API_KEY}/rainfall/list/10M/{station_code}.xml"
+        path = f"rainfall/list/10M/{station_code}.xml"
     else:
-        url = f"{HRFCO_BASE_URL}/{HRFCO_API_KEY}/rainfall/list/10M.xml"
+        path = "rainfall/list/10M.xml"
 
-    try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-
-        items = parse_xml_response(response.text)
-
-        # 데이터 정제
-        for item in items:
-            item['rf'] = float(item.get('rf', 0)) if item.get('rf') else 0.0
-            item['station_name'] = ALL_STATIONS['rainfall'].get(item.get('rfobscd'), item.get('rfobscd'))
-
-            # 시간 파싱
-            ymdhm = item.get('ymdhm', '')
-            if ymdhm:
-                try:
-                    item['datetime'] = datetime.strptime(ymdhm, '%Y%m%d%H%M')
-                    item['time_str'] = item['datetime'].strftime('%Y-%m-%d %H:%M')
-                except:
-                    item['datetime'] = None
-                    item['time_str'] = ymdhm
-
-        return items
-    except requests.RequestException as e:
-        print(f"API 요청 오류: {e}")
-        return []
+    return _fetch_items(path, _parse_rainfall)
 
 
 def get_waterlevel_history(station_code, start_dt, end_dt):
@@ -234,113 +254,105 @@ def get_waterlevel_history(station_code, start_dt, end_dt):
     Returns:
         list of dict: 수위 데이터 목록
     """
-    if isinstance(start_dt, datetime):
-        start_str = start_dt.strftime('%Y%m%d%H%M')
-    else:
-        start_str = start_dt
+    start_str = _format_ymdhm(start_dt)
+    end_str = _format_ymdhm(end_dt)
+    path = f"waterlevel/list/10M/{station_code}/{start_str}/{end_str}.xml"
 
-    if isinstance(end_dt, datetime):
-        end_str = end_dt.strftime('%Y%m%d%H%M')
-    else:
-        end_str = end_dt
-
-    url = f"{HRFCO_BASE_URL}/{HRFCO_API_KEY}/waterlevel/list/10M/{station_code}/{start_str}/{end_str}.xml"
-
-    try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-
-        items = parse_xml_response(response.text)
-
-        for item in items:
-            item['wl'] = float(item.get('wl', 0)) if item.get('wl') else None
-            item['fw'] = float(item.get('fw', 0)) if item.get('fw', '').strip() else None
-
-            ymdhm = item.get('ymdhm', '')
-            if ymdhm:
-                try:
-                    item['datetime'] = datetime.strptime(ymdhm, '%Y%m%d%H%M')
-                    item['time_str'] = item['datetime'].strftime('%Y-%m-%d %H:%M')
-                except:
-                    item['datetime'] = None
-
-        return items
-    except requests.RequestException as e:
-        print(f"API 요청 오류: {e}")
-        return []
+    return _fetch_items(path, partial(_parse_waterlevel, with_names=False), _history_ttl(end_str))
 
 
 def get_rainfall_history(station_code, start_dt, end_dt):
     """
     기간별 강수량 데이터 조회
     """
-    if isinstance(start_dt, datetime):
-        start_str = start_dt.strftime('%Y%m%d%H%M')
-    else:
-        start_str = start_dt
-
-    if isinstance(end_dt, datetime):
-        end_str = end_dt.strftime('%Y%m%d%H%M')
-    else:
-        end_str = end_dt
+    start_str = _format_ymdhm(start_dt)
+    end_str = _format_ymdhm(end_dt)
+    path = f"rainfall/list/10M/{station_code}/{start_str}/{end_str}.xml"
 
-    url = f"{HRFCO_BASE_URL}/{HRFCO_API_KEY}/rainfall/list/10M/{station_code}/{start_str}/{end_str}.xml"
+    return _fetch_items(path, partial(_parse_rainfall, with_names=False), _history_ttl(end_str))
 
-    try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-
-        items = parse_xml_response(response.text)
 
-        for item in items:
-            item['rf'] = float(item.get('rf', 0)) if item.get('rf') else 0.0
+def get_client_metrics():
+    """HRFCO 클라이언트 캐시/호출 지표"""
+    return get_client().metrics()
 
-            ymdhm = item.get('ymdhm', '')
-            if ymdhm:
-                try:
-                    item['datetime'] = datetime.strptime(ymdhm, '%Y%m%d%H%M')
-                    item['time_str'] = item['datetime'].strftime('%Y-%m-%d %H:%M')
-                except:
-                    item['datetime'] = None
 
-        return items
-    except requests.RequestException as e:
-        print(f"API 요청 오류: {e}")
-        return []
+def _latest_per_station(items, code_field, codes):
+    """선택 관측소별 최신 자료 1건 (요청 순서 유지)"""
+    latest = {}
+    for item in items:
+        code = item.get(code_field)
+        if code in codes and (code not in latest or item.get('ymdhm', '') > latest[code].get('ymdhm', '')):
+            latest[code] = item
+    return [latest[code] for code in codes if code in latest]
 
 
-def get_stations_data(waterlevel_codes=None, rainfall_codes=None):
+async def get_stations_data_async(waterlevel_codes=None, rainfall_codes=None, timeout=None):
     """
-    선택된 관측소 실시간 데이터 조회
+    선택된 관측소 실시간 데이터 조회 (수위/강수 동시 조회)
+
+    선택 관측소가 PER_STATION_LIMIT 개 이하이면 관측소별 엔드포인트를, 그보다 많으면
+    전체 목록을 한 번 받아 필터링한다. 모든 호출은 공용 클라이언트(캐시/단일 비행)를
+    공용 스레드 풀에서 동시에 실행하며, 전체 응답 시간은 timeout 예산 안에서 가장 느린 호출로 정해진다.
+    예산을 넘긴 호출은 결과에서 빠지고 timed_out 에 기록된다 (호출 자체는 끝까지 진행되어 캐시를 채움).
 
     Args:
         waterlevel_codes: 수위 관측소 코드 리스트 (None이면 기본값)
         rainfall_codes: 강수 관측소 코드 리스트 (None이면 기본값)
+        timeout: 전체 대기 시간 예산 (초, None 이면 STATIONS_TIMEOUT)
     """
+    if timeout is None:
+        timeout = STATIONS_TIMEOUT
     if waterlevel_codes is None:
         waterlevel_codes = DEFAULT_STATIONS['waterlevel']
     if rainfall_codes is None:
         rainfall_codes = DEFAULT_STATIONS['rainfall']
 
-    all_waterlevel = get_realtime_waterlevel()
-    all_rainfall = get_realtime_rainfall()
+    kinds = {
+        'waterlevel': (get_realtime_waterlevel, 'wlobscd', waterlevel_codes),
+        'rainfall': (get_realtime_rainfall, 'rfobscd', rainfall_codes),
+    }
 
-    # 선택된 관측소만 필터링
-    filtered_waterlevel = [
-        item for item in all_waterlevel
-        if item.get('wlobscd') in waterlevel_codes
-    ]
+    # (종류, 관측소 코드 또는 None=전체 목록) → 작업
+    loop = asyncio.get_running_loop()
+    tasks = {}
+    for kind, (fetch, _, codes) in kinds.items():
+        targets = codes if 0 < len(codes) <= PER_STATION_LIMIT else [None] if codes else []
+        for code in targets:
+            tasks[(kind, code)] = loop.run_in_executor(_fetch_executor, fetch, code)
 
-    filtered_rainfall = [
-        item for item in all_rainfall
-        if item.get('rfobscd') in rainfall_codes
-    ]
+    done, pending = await asyncio.wait(tasks.values(), timeout=timeout) if tasks else (set(), set())
+    for task in pending:
+        task.cancel()
 
-    return {
-        'waterlevel': filtered_waterlevel,
-        'rainfall': filtered_rainfall,
-        'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-    }
+    result = {'timed_out': []}
+    for kind, (_, code_field, codes) in kinds.items():
+        items = []
+        for (task_kind, code), task in tasks.items():
+            if task_kind != kind:
+                continue
+            if task in done and task.exception() is None:
+                items.extend(task.result())
+            elif task in pending:
+                result['timed_out'].append(f"{kind}:{code or 'all'}")
+        result[kind] = _latest_per_station(items, code_field, codes)
+
+    if result['timed_out']:
+        logger.warning("실시간 조회 시간 초과 (%ss): %s", timeout, ', '.join(result['timed_out']))
+
+    result['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return result
+
+
+def get_stations_data(waterlevel_codes=None, rainfall_codes=None):
+    """
+    선택된 관측소 실시간 데이터 조회 (동기 호출용, get_stations_data_async 참고)
+
+    Args:
+        waterlevel_codes: 수위 관측소 코드 리스트 (None이면 기본값)
+        rainfall_codes: 강수 관측소 코드 리스트 (None이면 기본값)
+    """
+    return async_to_sync(get_stations_data_async)(waterlevel_codes, rainfall_codes)
 
 
 def get_major_stations_data():
@@ -2,48 +2,172 @@
 관측소 데이터 로더
 
 JSON 파일에서 관측소 정보를 로드하고 검색/필터링 기능 제공
-프로그램 시작 시 한 번만 로드하여 메모리에 캐시
+로드 시 색인(코드 맵, 종류·강별 목록, 검색어 n-gram, 통계)을 만든 카탈로그를 메모리에 캐시하고,
+파일 수정 시각(mtime)이 바뀐 경우에만 다시 로드한다.
 """
+import copy
 import json
+import threading
 from pathlib import Path
 from typing import List, Dict, Optional
-from functools import lru_cache
 
 # 데이터 파일 경로
 DATA_FILE = Path(__file__).parent / 'data' / 'stations.json'
 
+STATION_TYPES = ('waterlevel', 'rainfall', 'dam')
+SEARCH_FIELDS = ('name', 'code', 'address', 'detail_address', 'agency')
+NGRAM = 2
+
 # 메모리 캐시
-_stations_cache = None
+_catalog = None
+_catalog_lock = threading.Lock()
 
 
-def load_stations_data() -> Dict:
+def _ngrams(text: str, n: int = NGRAM) -> set:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class StationCatalog:
     """
-    관측소 데이터 로드 (캐시 사용)
+    관측소 카탈로그 (로드 시 한 번 색인)
 
-    Returns:
-        dict: 전체 관측소 데이터
+    - by_code: 코드 → 관측소 (종류 순서대로 처음 나온 것)
+    - by_type / by_type_river: 종류별·강별 관측소 (파일 순서)
+    - search_keys: 종류별 검색 문자열 (지점명·코드·주소·기관, 소문자)
+    - postings: 종류별 1/2-gram → 관측소 위치 목록 (오름차순)
     """
-    global _stations_cache
 
-    if _stations_cache is not None:
-        return _stations_cache
+    def __init__(self, data: Dict, mtime_ns: int = 0):
+        self.data = data
+        self.mtime_ns = mtime_ns
+        self.rivers = data.get('rivers', [])
+
+        stations = data.get('stations', {})
+        self.by_code = {}
+        self.by_type = {}
+        self.by_type_river = {}
+        self.search_keys = {}
+        self.postings = {}
+
+        for station_type, type_stations in stations.items():
+            self.by_type[station_type] = type_stations
+            rivers = self.by_type_river[station_type] = {}
+            keys = self.search_keys[station_type] = []
+            postings = self.postings[station_type] = {}
+
+            for position, station in enumerate(type_stations):
+                rivers.setdefault(station.get('river'), []).append(station)
+
+                key = ' '.join(station.get(field, '') for field in SEARCH_FIELDS).lower()
+                keys.append(key)
+                for gram in set(key) | _ngrams(key):
+                    postings.setdefault(gram, []).append(position)
+
+        for station_type in STATION_TYPES:
+            for station in stations.get(station_type, []):
+                self.by_code.setdefault(station.get('code'), station)
+
+        self.stats = self._build_stats()
+
+    def _build_stats(self) -> Dict:
+        meta = self.data.get('meta', {})
+        stats = {
+            'total': meta.get('total_count', 0),
+            'by_type': {
+                'waterlevel': meta.get('waterlevel_count', 0),
+                'rainfall': meta.get('rainfall_count', 0),
+                'dam': meta.get('dam_count', 0),
+            },
+            'by_river': {},
+        }
+        for station_type, stations in self.by_type.items():
+            for station in stations:
+                river = station.get('river', '기타')
+                if river not in stats['by_river']:
+                    stats['by_river'][river] = {'waterlevel': 0, 'rainfall': 0, 'dam': 0}
+                stats['by_river'][river][station_type] += 1
+        return stats
+
+    def candidates(self, station_type: str, query: str) -> List[int]:
+        """검색어의 n-gram 중 가장 희소한 목록 (검색어를 포함할 수 있는 관측소 위치)"""
+        postings = self.postings.get(station_type, {})
+        grams = _ngrams(query) if len(query) >= NGRAM else {query}
+        best = None
+        for gram in grams:
+            positions = postings.get(gram)
+            if positions is None:
+                return []
+            if best is None or len(positions) < len(best):
+                best = positions
+        return best
+
+    def search(self, station_type: str, river: Optional[str], query: Optional[str], limit: int) -> List[Dict]:
+        """강 필터 + 부분 일치 검색 (파일 순서, 최대 limit 개)"""
+        limit = max(limit, 1)  # 기존 동작: 첫 일치 항목은 항상 포함
+        if not query:
+            if river:
+                stations = self.by_type_river.get(station_type, {}).get(river, [])
+            else:
+                stations = self.by_type.get(station_type, [])
+            return stations[:limit]
+
+        query_lower = query.lower()
+        stations = self.by_type.get(station_type, [])
+        keys = self.search_keys.get(station_type, [])
+        results = []
+        for position in self.candidates(station_type, query_lower):
+            station = stations[position]
+            if river and station.get('river') != river:
+                continue
+            if query_lower not in keys[position]:
+                continue
+            results.append(station)
+            if len(results) >= limit:
+                break
+        return results
 
-    if not DATA_FILE.exists():
+
+def get_catalog() -> StationCatalog:
+    """
+    관측소 카탈로그 (파일 mtime 이 바뀐 경우에만 다시 로드)
+
+    Returns:
+        StationCatalog
+    """
+    global _catalog
+
+    try:
+        mtime_ns = DATA_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"관측소 데이터 파일이 없습니다: {DATA_FILE}\n"
             "scripts/download_stations.py 를 실행하여 데이터를 다운로드하세요."
         )
 
-    with open(DATA_FILE, 'r', encoding='utf-8') as f:
-        _stations_cache = json.load(f)
+    catalog = _catalog
+    if catalog is not None and catalog.mtime_ns == mtime_ns:
+        return catalog
+
+    with _catalog_lock:
+        if _catalog is None or _catalog.mtime_ns != mtime_ns:
+            with open(DATA_FILE, 'r', encoding='utf-8') as f:
+                _catalog = StationCatalog(json.load(f), mtime_ns)
+        return _catalog
+
+
+def load_stations_data() -> Dict:
+    """
+    관측소 데이터 로드 (캐시 사용)
 
-    return _stations_cache
+    Returns:
+        dict: 전체 관측소 데이터
+    """
+    return get_catalog().data
 
 
 def get_rivers() -> List[str]:
     """강 목록 반환"""
-    data = load_stations_data()
-    return data.get('rivers', [])
+    return get_catalog().rivers
 
 
 def get_stations(
@@ -64,36 +188,7 @@ def get_stations(
     Returns:
         list: 매칭되는 관측소 목록
     """
-    data = load_stations_data()
-    stations = data.get('stations', {}).get(station_type, [])
-
-    results = []
-
-    for station in stations:
-        # 강 필터
-        if river and station.get('river') != river:
-            continue
-
-        # 검색어 필터
-        if query:
-            query_lower = query.lower()
-            searchable = ' '.join([
-                station.get('name', ''),
-                station.get('code', ''),
-                station.get('address', ''),
-                station.get('detail_address', ''),
-                station.get('agency', ''),
-            ]).lower()
-
-            if query_lower not in searchable:
-                continue
-
-        results.append(station)
-
-        if len(results) >= limit:
-            break
-
-    return results
+    return get_catalog().search(station_type, river, query, limit)
 
 
 def get_station_by_code(code: str) -> Optional[Dict]:
@@ -106,15 +201,7 @@ def get_station_by_code(code: str) -> Optional[Dict]:
     Returns:
         dict or None: 관측소 정보
     """
-    data = load_stations_data()
-
-    for station_type in ['waterlevel', 'rainfall', 'dam']:
-        stations = data.get('stations', {}).get(station_type, [])
-        for station in stations:
-            if station.get('code') == code:
-                return station
-
-    return None
+    return get_catalog().by_code.get(code)
 
 
 def get_stations_by_river(river: str) -> Dict[str, List[Dict]]:
@@ -127,43 +214,22 @@ def get_stations_by_river(river: str) -> Dict[str, List[Dict]]:
     Returns:
         dict: {station_type: [stations]}
     """
-    data = load_stations_data()
+    catalog = get_catalog()
     result = {
         'waterlevel': [],
         'rainfall': [],
         'dam': [],
     }
 
-    for station_type, stations in data.get('stations', {}).items():
-        result[station_type] = [
-            s for s in stations if s.get('river') == river
-        ]
+    for station_type, rivers in catalog.by_type_river.items():
+        result[station_type] = list(rivers.get(river, []))
 
     return result
 
 
 def get_stats() -> Dict:
-    """관측소 통계 반환"""
-    data = load_stations_data()
-
-    stats = {
-        'total': data.get('meta', {}).get('total_count', 0),
-        'by_type': {
-            'waterlevel': data.get('meta', {}).get('waterlevel_count', 0),
-            'rainfall': data.get('meta', {}).get('rainfall_count', 0),
-            'dam': data.get('meta', {}).get('dam_count', 0),
-        },
-        'by_river': {},
-    }
-
-    for station_type, stations in data.get('stations', {}).items():
-        for station in stations:
-            river = station.get('river', '기타')
-            if river not in stats['by_river']:
-                stats['by_river'][river] = {'waterlevel': 0, 'rainfall': 0, 'dam': 0}
-            stats['by_river'][river][station_type] += 1
-
-    return stats
+    """관측소 통계 반환 (로드 시 계산한 값의 복사본)"""
+    return copy.deepcopy(get_catalog().stats)
 
 
 # 하위 호환성을 위한 기존 형식 변환 함수
@@ -189,19 +255,9 @@ def get_all_stations_dict() -> Dict[str, Dict[str, str]]:
     """
     기존 ALL_STATIONS 형식으로 변환 (하위 호환)
     """
-    data = load_stations_data()
+    catalog = get_catalog()
 
     return {
-        'waterlevel': {
-            s['code']: s['name']
-            for s in data.get('stations', {}).get('waterlevel', [])
-        },
-        'rainfall': {
-            s['code']: s['name']
-            for s in data.get('stations', {}).get('rainfall', [])
-        },
-        'dam': {
-            s['code']: s['name']
-            for s in data.get('stations', {}).get('dam', [])
-        },
+        station_type: {s['code']: s['name'] for s in catalog.by_type.get(station_type, [])}
+        for station_type in STATION_TYPES
     }
@@ -0,0 +1,690 @@
+"""
+관측소 통합 검색 (초성·자모 색인)
+
+파일 카탈로그(hydro/data/stations.json), 주요 관측소 목록(STATION_DATABASE),
+DB 관측소(measurement.Station)를 같은 방식으로 색인하고 점수 순으로 검색한다.
+
+색인 (원본이 바뀐 경우에만 다시 만든다):
+    - 검색 키: 지점명·코드·하천·주소 토큰·상세주소 (NFC, 소문자, 공백 제거), 필드별 1~3-gram postings
+    - 초성 키: 지점명·토큰의 한글 음절을 초성으로 바꾼 키 (한강대교 → ㅎㄱㄷㄱ)
+    - 자모 키: 지점명을 자모로 풀어 쓴 문자열 (겹자모 분리), 2-gram postings
+    - 원문 키: 필드를 공백으로 이어 붙인 소문자 문자열 (공백 유지, 기존 get_stations 부분 일치와 같음)
+
+검색어 일치 방식:
+    - 초성 입력: 'ㅎㄱㄷㄱ', 'ㅎㄱ대교' → 한강대교
+    - 입력 중인 마지막 글자: '한가' → 한강대교 (자모 접두)
+    - 여러 단어: 원문 키 부분 일치 ('경상북도 청송군' → 주소가 '경상북도 청송군 …' 인 관측소)
+    - 오타: 일치 결과가 없으면 자모 편집거리로 검색 ('한간대교' → 한강대교)
+
+점수 (SCORES): 지점명 일치 > 코드 일치 > 지점명 접두 > 단어 접두 > 부분 일치 > 초성 >
+하천·주소 토큰 > 상세주소 > 원문 키 > 오타. 같은 점수는 짧은 지점명, 색인 순서 순.
+"""
+import heapq
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, namedtuple
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SYLLABLE_BASE = 0xAC00
+SYLLABLE_COUNT = 11172
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSEONG = (
+    'ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅗㅏ', 'ㅗㅐ', 'ㅗㅣ', 'ㅛ', 'ㅜ',
+    'ㅜㅓ', 'ㅜㅔ', 'ㅜㅣ', 'ㅠ', 'ㅡ', 'ㅡㅣ', 'ㅣ',
+)
+JONGSEONG = (
+    '', 'ㄱ', 'ㄲ', 'ㄱㅅ', 'ㄴ', 'ㄴㅈ', 'ㄴㅎ', 'ㄷ', 'ㄹ', 'ㄹㄱ', 'ㄹㅁ', 'ㄹㅂ', 'ㄹㅅ', 'ㄹㅌ',
+    'ㄹㅍ', 'ㄹㅎ', 'ㅁ', 'ㅂ', 'ㅂㅅ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ',
+)
+# 호환 자모로 입력된 겹자모 분리
+COMPOUND_JAMO = {
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ',
+    'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ', 'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ',
+    'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+}
+
+# 음절 → 초성 (1:1, 위치 보존), 음절 → 자모 문자열
+_CHOSEONG_TABLE = str.maketrans({
+    chr(SYLLABLE_BASE + code): CHOSEONG[code // 588] for code in range(SYLLABLE_COUNT)
+})
+_JAMO_TABLE = str.maketrans({
+    **{
+        chr(SYLLABLE_BASE + code): CHOSEONG[code // 588] + JUNGSEONG[code % 588 // 28] + JONGSEONG[code % 28]
+        for code in range(SYLLABLE_COUNT)
+    },
+    **COMPOUND_JAMO,
+})
+_TOKEN_SPLIT = re.compile(r'[^0-9a-z가-힣ㄱ-ㆎ]+')
+
+SCORES = {
+    'exact': 100,
+    'code': 95,
+    'prefix': 90,
+    'word': 85,
+    'substring': 80,
+    'choseong_full': 75,
+    'choseong_prefix': 70,
+    'choseong': 60,
+    'code_prefix': 55,
+    'token': 50,
+    'token_choseong': 45,
+    'text': 40,
+    'phrase': 35,
+    'fuzzy': 30,
+}
+FUZZY_PENALTY = 5          # 편집거리 1 당 감점
+FUZZY_MIN_JAMO = 4         # 자모 4개 미만 검색어는 오타 검색 안 함
+FUZZY_CANDIDATES = 20      # 편집거리를 계산할 최대 후보 수 (공통 2-gram 많은 순)
+STATION_TABLE_CHECK_SECONDS = 5.0
+
+SOURCES = ('catalog', 'db')
+
+SearchHit = namedtuple('SearchHit', 'score match name_length position payload')
+
+
+def normalize(text) -> str:
+    """검색용 정규화 (NFC, 소문자, 공백 제거)"""
+    return ''.join(unicodedata.normalize('NFC', str(text or '')).lower().split())
+
+
+def phrase(text) -> str:
+    """원문 키 정규화 (NFC, 소문자, 연속 공백은 공백 하나)"""
+    return ' '.join(unicodedata.normalize('NFC', str(text or '')).lower().split())
+
+
+def choseong(text: str) -> str:
+    """한글 음절을 초성으로 바꾼 문자열 (길이·위치 보존)"""
+    return text.translate(_CHOSEONG_TABLE)
+
+
+def jamo(text: str) -> str:
+    """자모 문자열 (겹모음·겹받침 분리, 예: 닭 → ㄷㅏㄹㄱ)"""
+    return text.translate(_JAMO_TABLE)
+
+
+def tokens(*values) -> List[str]:
+    """하천·주소·기관 등 토큰 목록 (정규화, 구분자 기준 분리)"""
+    result = []
+    for value in values:
+        text = unicodedata.normalize('NFC', str(value or '')).lower()
+        result.extend(token for token in _TOKEN_SPLIT.split(text) if token)
+    return result
+
+
+def _ngrams(text: str, n: int) -> set:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _is_syllable(char: str) -> bool:
+    return SYLLABLE_BASE <= ord(char) < SYLLABLE_BASE + SYLLABLE_COUNT
+
+
+def _is_hangul(char: str) -> bool:
+    return _is_syllable(char) or 'ㄱ' <= char <= 'ㆎ'
+
+
+def substring_distance(pattern: str, text: str, max_distance: int) -> Optional[int]:
+    """
+    pattern 과 text 의 부분 문자열 사이 최소 편집거리 (Myers 비트 병렬)
+
+    Returns:
+        int or None: max_distance 를 넘으면 None
+    """
+    length = len(pattern)
+    if not length:
+        return 0
+    peq = {}
+    for i, char in enumerate(pattern):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    mask = (1 << length) - 1
+    high = 1 << (length - 1)
+
+    pv, mv = mask, 0
+    score = best = length
+    for char in text:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & mask
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        # 부분 문자열 검색: 첫 행은 모두 0 (시작 위치 자유)
+        ph = (ph << 1) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+        if score < best:
+            best = score
+    return best if best <= max_distance else None
+
+
+class SearchQuery:
+    """정규화한 검색어 (초성 키, 자모 키, 음절 위치)"""
+
+    def __init__(self, text):
+        self.text = normalize(text)
+        self.phrase = phrase(text)
+        self.choseong = choseong(self.text)
+        self.jamo = jamo(self.text)
+        self.syllables = [i for i, char in enumerate(self.text) if _is_syllable(char)]
+        # 한글이 없는 검색어(코드, 영문)는 정확 일치만 본다
+        self.exact_only = not any(_is_hangul(char) for char in self.text)
+
+    def __bool__(self):
+        return bool(self.text)
+
+    @staticmethod
+    def grams(key: str) -> set:
+        return _ngrams(key, min(len(key), 3))
+
+    def _matches_at(self, text: str, start: int) -> bool:
+        """초성 키가 start 에서 일치할 때 음절 검증 (마지막 음절은 입력 중으로 보고 자모 접두 허용)"""
+        last = len(self.text) - 1
+        for k in self.syllables:
+            query_char = self.text[k]
+            text_char = text[start + k]
+            if query_char == text_char:
+                continue
+            if k == last and jamo(text_char).startswith(jamo(query_char)):
+                continue
+            return False
+        return True
+
+    def locate(self, text: str, text_choseong: str):
+        """
+        text 안 일치 위치
+
+        Returns:
+            tuple or None: (위치, 정확 일치 여부) - 정확 일치 우선
+        """
+        position = text.find(self.text)
+        if position >= 0:
+            return position, True
+        if self.exact_only:
+            return None
+        position = text_choseong.find(self.choseong)
+        while position >= 0:
+            if self._matches_at(text, position):
+                return position, False
+            position = text_choseong.find(self.choseong, position + 1)
+        return None
+
+
+def _word_start(text: str, position: int) -> bool:
+    return position == 0 or not text[position - 1].isalnum()
+
+
+def _add_postings(postings: Dict, key: str, position: int):
+    for gram in set(key) | _ngrams(key, 2) | _ngrams(key, 3):
+        postings.setdefault(gram, []).append(position)
+
+
+def _intersect(postings: Dict, grams: set) -> List[int]:
+    """n-gram 중 가장 희소한 두 목록의 교집합 (검색어를 포함할 수 있는 위치)"""
+    lists = []
+    for gram in grams:
+        positions = postings.get(gram)
+        if positions is None:
+            return []
+        lists.append(positions)
+    lists.sort(key=len)
+    if len(lists) == 1:
+        return lists[0]
+    second = set(lists[1])
+    return [position for position in lists[0] if position in second]
+
+
+class StationSearchIndex:
+    """
+    관측소 검색 색인 (한 번 만들고 읽기 전용으로 사용)
+
+    entries: dict 목록
+        payload: 검색 결과로 돌려줄 원본
+        name: 지점명
+        codes: 관측소 코드, DM 번호 등 (정확/접두 일치, 부분 일치는 낮은 점수)
+        tokens: 하천·주소 토큰 (접두 일치, 부분 일치는 낮은 점수)
+        text: 상세주소·기관·설명 (부분 일치)
+        key: 원문 키 (없으면 지점명·코드·토큰·text 를 공백으로 연결)
+        river, station_type: 필터 값
+
+    필드별 postings 를 점수가 높은 단계부터 확인하고, 다음 단계 최고점 이상인 결과가
+    limit 개 모이면 멈춘다 (넓은 초성 검색어도 주소 토큰 전체를 훑지 않는다).
+    """
+
+    def __init__(self, entries):
+        self.payloads = []
+        self.names = []
+        self.name_keys = []
+        self.codes = []
+        self.texts = []
+        self.phrase_keys = []
+        self.rivers = []
+        self.types = []
+        self.jamo_names = []
+        self.by_code = {}
+        self.vocabulary = {}        # 토큰 → (초성 키, 관측소 위치 목록)
+        self.name_postings = {}
+        self.code_postings = {}
+        self.token_postings = {}
+        self.text_postings = {}
+        self.jamo_postings = {}
+
+        for position, entry in enumerate(entries):
+            name = normalize(entry.get('name'))
+            codes = tuple(code for code in (normalize(c) for c in entry.get('codes', ())) if code)
+            entry_tokens = tuple(dict.fromkeys(tokens(*entry.get('tokens', ()))))
+            text = normalize(entry.get('text'))
+            name_jamo = jamo(name)
+
+            self.payloads.append(entry['payload'])
+            self.names.append(name)
+            self.name_keys.append(choseong(name))
+            self.codes.append(codes)
+            self.texts.append(text)
+            self.phrase_keys.append(phrase(entry.get('key') or ' '.join(
+                str(value) for value in (entry.get('name'), *entry.get('codes', ()), *entry.get('tokens', ()),
+                                         entry.get('text')) if value
+            )))
+            self.rivers.append(entry.get('river') or '')
+            self.types.append(entry.get('station_type') or '')
+            self.jamo_names.append(name_jamo)
+
+            _add_postings(self.name_postings, self.name_keys[-1], position)
+            for code in codes:
+                self.by_code.setdefault(code, []).append(position)
+                _add_postings(self.code_postings, code, position)
+            for token in entry_tokens:
+                self.vocabulary.setdefault(token, (choseong(token), []))[1].append(position)
+            _add_postings(self.text_postings, text, position)
+            for gram in _ngrams(name_jamo, 2):
+                self.jamo_postings.setdefault(gram, []).append(position)
+
+        # 토큰은 여러 관측소가 공유하므로 (하천명, 시·군) 토큰 단위로 색인하고,
+        # 토큰별 관측소는 결과 순서(짧은 지점명, 색인 순서)로 정렬해 둔다
+        self.sort_keys = [(len(name), position) for position, name in enumerate(self.names)]
+        self.vocabulary_tokens = list(self.vocabulary)
+        for token_id, token in enumerate(self.vocabulary_tokens):
+            self.vocabulary[token][1].sort(key=self.sort_keys.__getitem__)
+            _add_postings(self.token_postings, self.vocabulary[token][0], token_id)
+
+        # (최고점, 후보 함수, 점수 함수) - 점수가 높은 단계부터
+        self._stages = (
+            (SCORES['exact'], self._name_candidates, self._score_name),
+            (SCORES['code_prefix'], self._code_candidates, self._score_code),
+            (SCORES['token'], self._token_candidates, None),
+            (SCORES['text'], self._text_candidates, self._score_text),
+            (SCORES['phrase'], self._phrase_candidates, self._score_phrase),
+        )
+
+    def __len__(self):
+        return len(self.payloads)
+
+    def _accepts(self, position: int, river: Optional[str], station_type: Optional[str]) -> bool:
+        if river and self.rivers[position] != river:
+            return False
+        if station_type and self.types[position] != station_type:
+            return False
+        return True
+
+    # 단계별 후보 (초성 키는 검색어 초성, 원문 키는 검색어 그대로)
+
+    def _name_candidates(self, query: SearchQuery):
+        return self.by_code.get(query.text, []) + _intersect(self.name_postings, query.grams(query.choseong))
+
+    def _code_candidates(self, query: SearchQuery):
+        return _intersect(self.code_postings, query.grams(query.text))
+
+    def _token_candidates(self, query: SearchQuery):
+        """토큰별로 한 번 점수를 매기고 관측소 위치로 펼친 (위치, (점수, 일치 방식)) - 결과 순서대로"""
+        groups = {}
+        for token_id in _intersect(self.token_postings, query.grams(query.choseong)):
+            token = self.vocabulary_tokens[token_id]
+            token_choseong, positions = self.vocabulary[token]
+            score = self._score_token(query, token, token_choseong)
+            if score:
+                groups.setdefault(score, []).append(positions)
+        for score in sorted(groups, reverse=True):
+            for position in heapq.merge(*groups[score], key=self.sort_keys.__getitem__):
+                yield position, (score, 'token')
+
+    def _text_candidates(self, query: SearchQuery):
+        return _intersect(self.text_postings, query.grams(query.text))
+
+    def _phrase_candidates(self, query: SearchQuery):
+        """원문 키 전체 부분 일치 검사 (앞 단계가 limit 개를 채우지 못했을 때만 도달)"""
+        return (position for position, key in enumerate(self.phrase_keys) if query.phrase in key)
+
+    # 단계별 점수: (점수, 일치 방식) 또는 None
+
+    def _score_name(self, query: SearchQuery, position: int):
+        name = self.names[position]
+        if name == query.text:
+            return SCORES['exact'], 'exact'
+        if query.text in self.codes[position]:
+            return SCORES['code'], 'code'
+
+        found = query.locate(name, self.name_keys[position])
+        if not found:
+            return None
+        start, exact = found
+        if exact:
+            if start == 0:
+                return SCORES['prefix'], 'prefix'
+            return (SCORES['word'], 'word') if _word_start(name, start) else (SCORES['substring'], 'substring')
+        if start == 0 and len(name) == len(query.text):
+            return SCORES['choseong_full'], 'choseong'
+        if _word_start(name, start):
+            return SCORES['choseong_prefix'], 'choseong'
+        return SCORES['choseong'], 'choseong'
+
+    def _score_code(self, query: SearchQuery, position: int):
+        codes = self.codes[position]
+        if any(code.startswith(query.text) for code in codes):
+            return SCORES['code_prefix'], 'code'
+        if any(query.text in code for code in codes):
+            return SCORES['text'], 'code'
+        return None
+
+    @staticmethod
+    def _score_token(query: SearchQuery, token: str, token_choseong: str) -> int:
+        found = query.locate(token, token_choseong)
+        if not found:
+            return 0
+        start, exact = found
+        if start == 0:
+            return SCORES['token'] if exact else SCORES['token_choseong']
+        return SCORES['text'] if exact else 0
+
+    def _score_text(self, query: SearchQuery, position: int):
+        if query.text in self.texts[position]:
+            return SCORES['text'], 'text'
+        return None
+
+    @staticmethod
+    def _score_phrase(query: SearchQuery, position: int):
+        return SCORES['phrase'], 'phrase'
+
+    def _fuzzy(self, query: SearchQuery, river, station_type) -> List[SearchHit]:
+        """자모 편집거리 검색 (공통 2-gram 이 많은 후보만 계산)"""
+        if len(query.jamo) < FUZZY_MIN_JAMO or not query.syllables:
+            return []
+        max_distance = 1 if len(query.jamo) <= 6 else 2 if len(query.jamo) <= 12 else 3
+        grams = _ngrams(query.jamo, 2)
+        counts = Counter()
+        for gram in grams:
+            counts.update(self.jamo_postings.get(gram, ()))
+        # q-gram 하한: 편집 1회는 2-gram 을 최대 2개 지운다
+        required = max(len(grams) - 2 * max_distance, 1)
+
+        candidates = sorted(
+            (position for position, shared in counts.items()
+             if shared >= required and self._accepts(position, river, station_type)),
+            key=lambda position: -counts[position],
+        )
+
+        hits = []
+        for position in candidates[:FUZZY_CANDIDATES]:
+            distance = substring_distance(query.jamo, self.jamo_names[position], max_distance)
+            if distance is not None:
+                hits.append(SearchHit(
+                    SCORES['fuzzy'] - FUZZY_PENALTY * distance, 'fuzzy',
+                    len(self.names[position]), position, self.payloads[position],
+                ))
+        return hits
+
+    def search(self, query, limit: int = 20, river: Optional[str] = None,
+               station_type: Optional[str] = None) -> List[SearchHit]:
+        """
+        점수 순 검색
+
+        Args:
+            query: 검색어 (str 또는 SearchQuery)
+            limit: 최대 결과 수
+            river: 하천명 필터
+            station_type: 관측소 종류 필터 (카탈로그)
+
+        Returns:
+            list: SearchHit (점수 내림차순, 일치 결과가 없을 때만 오타 검색)
+        """
+        if not isinstance(query, SearchQuery):
+            query = SearchQuery(query)
+        limit = max(limit, 1)
+
+        if not query:
+            hits = []
+            for position in range(len(self.payloads)):
+                if self._accepts(position, river, station_type):
+                    hits.append(SearchHit(0, '', len(self.names[position]), position, self.payloads[position]))
+                    if len(hits) >= limit:
+                        break
+            return hits
+
+        hits = []
+        seen = set()
+        for stage, (_, candidates, score) in enumerate(self._stages):
+            # 점수 함수가 없는 단계는 후보가 결과 순서대로 (위치, 점수) 로 오므로 limit 개에서 멈춘다
+            ordered = score is None
+            taken = 0
+            for candidate in candidates(query):
+                position, scored = candidate if ordered else (candidate, None)
+                if position in seen or not self._accepts(position, river, station_type):
+                    continue
+                if not ordered:
+                    scored = score(query, position)
+                if scored:
+                    seen.add(position)
+                    hits.append(SearchHit(
+                        scored[0], scored[1], len(self.names[position]), position, self.payloads[position],
+                    ))
+                    taken += 1
+                    if ordered and taken >= limit:
+                        break
+            if stage + 1 < len(self._stages):
+                next_best = self._stages[stage + 1][0]
+                if sum(1 for hit in hits if hit.score >= next_best) >= limit:
+                    break
+
+        if not hits:
+            hits = self._fuzzy(query, river, station_type)
+
+        hits.sort(key=lambda hit: (-hit.score, hit.name_length, hit.position))
+        return hits[:limit]
+
+
+# ============================================
+# 색인 원본
+# ============================================
+
+_indexes = {}
+_index_lock = threading.Lock()
+_station_table_checked = {'at': 0.0, 'signature': None}
+
+
+def _cached_index(source: str, signature, build) -> StationSearchIndex:
+    """signature 가 같으면 기존 색인, 다르면 다시 생성"""
+    cached = _indexes.get(source)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with _index_lock:
+        cached = _indexes.get(source)
+        if cached is None or cached[0] != signature:
+            started = time.perf_counter()
+            index = StationSearchIndex(build())
+            cached = _indexes[source] = (signature, index)
+            logger.info(
+                "관측소 검색 색인 생성: %s %d건 (%.1f ms)",
+                source, len(index), (time.perf_counter() - started) * 1000,
+            )
+        return cached[1]
+
+
+def _catalog_entries(catalog):
+    from .station_data import STATION_TYPES
+
+    for station_type in STATION_TYPES:
+        keys = catalog.search_keys.get(station_type, [])
+        for station, key in zip(catalog.by_type.get(station_type, []), keys):
+            yield {
+                'payload': station,
+                'name': station.get('name'),
+                'codes': (station.get('code'),),
+                'tokens': (station.get('river'), station.get('address')),
+                'text': '|'.join((station.get('detail_address') or '', station.get('agency') or '')),
+                'key': key,
+                'river': station.get('river'),
+                'station_type': station_type,
+            }
+
+
+def catalog_index() -> StationSearchIndex:
+    """파일 카탈로그 색인 (전 종류, 카탈로그 mtime 이 바뀌면 다시 생성)"""
+    from .station_data import get_catalog
+
+    catalog = get_catalog()
+    return _cached_index('catalog', catalog.mtime_ns, lambda: _catalog_entries(catalog))
+
+
+def major_index() -> StationSearchIndex:
+    """주요 관측소 목록(STATION_DATABASE) 색인"""
+    from .services import STATION_DATABASE
+
+    return _cached_index('major', len(STATION_DATABASE), lambda: (
+        {
+            'payload': station,
+            'name': station['name'],
+            'codes': (station['code'], station['dm_code']),
+            'tokens': (station['river'], station['region']),
+            'river': station['river'],
+        }
+        for station in STATION_DATABASE
+    ))
+
+
+def drop_station_table_index(**kwargs):
+    """DB 관측소 색인 무효화 (Station 저장/삭제 시그널 수신, MeasurementConfig.ready 에서 연결)"""
+    _indexes.pop('db', None)
+    _station_table_checked['signature'] = None
+
+
+def station_table_index() -> StationSearchIndex:
+    """
+    DB 관측소(measurement.Station) 색인
+
+    같은 프로세스의 저장/삭제는 시그널로 즉시 반영하고, 다른 프로세스의 변경은
+    STATION_TABLE_CHECK_SECONDS 마다 (개수, 최종 수정 시각)을 확인해 반영한다.
+    """
+    from django.db.models import Count, Max
+    from measurement.models import Station
+
+    signature = _station_table_checked['signature']
+    now = time.monotonic()
+    if signature is None or now - _station_table_checked['at'] >= STATION_TABLE_CHECK_SECONDS:
+        totals = Station.objects.aggregate(count=Count('pk'), updated=Max('updated_at'))
+        signature = (totals['count'], totals['updated'])
+        _station_table_checked.update(at=now, signature=signature)
+
+    def build():
+        for station in Station.objects.only('pk', 'name', 'river_name', 'dm_number', 'description').order_by('name', 'pk'):
+            yield {
+                'payload': {
+                    'id': station.pk,
+                    'name': station.name,
+                    'river_name': station.river_name or '',
+                    'dm_number': station.dm_number or '',
+                },
+                'name': station.name,
+                'codes': (station.dm_number,),
+                'tokens': (station.river_name,),
+                'text': station.description,
+                'river': station.river_name,
+            }
+
+    return _cached_index('db', signature, build)
+
+
+# ============================================
+# 검색 함수
+# ============================================
+
+def search_catalog(query: str, station_type: Optional[str] = None, river: Optional[str] = None,
+                   limit: int = 50) -> List[Dict]:
+    """파일 카탈로그 관측소 검색 (점수 순 관측소 dict 목록)"""
+    hits = catalog_index().search(query, limit, river=river, station_type=station_type)
+    return [hit.payload for hit in hits]
+
+
+def search_major(query: str, limit: int = 20) -> List[Dict]:
+    """주요 관측소 목록 검색 (점수 순)"""
+    return [hit.payload for hit in major_index().search(query, limit)]
+
+
+def search_station_table(query: str, limit: int = 20) -> List[Dict]:
+    """DB 관측소 검색 (점수 순, {id, name, river_name, dm_number})"""
+    return [hit.payload for hit in station_table_index().search(query, limit)]
+
+
+def _describe(source: str, hit: SearchHit) -> Dict:
+    station = hit.payload
+    if source == 'catalog':
+        result = {
+            'source': source,
+            'id': None,
+            'code': station.get('code'),
+            'type': station.get('type'),
+            'name': station.get('name'),
+            'river': station.get('river', ''),
+            'address': station.get('address', ''),
+        }
+    else:
+        result = {
+            'source': source,
+            'id': station['id'],
+            'code': station['dm_number'],
+            'type': None,
+            'name': station['name'],
+            'river': station['river_name'],
+            'address': '',
+        }
+    result.update(match=hit.match, score=hit.score)
+    return result
+
+
+def search_all(query: str, sources=SOURCES, station_type: Optional[str] = None,
+               river: Optional[str] = None, limit: int = 20) -> List[Dict]:
+    """
+    파일 카탈로그 + DB 관측소 통합 검색
+
+    Args:
+        query: 검색어 (지점명, 초성, 코드, 하천, 주소)
+        sources: 'catalog', 'db' 중 검색할 원본
+        station_type: 카탈로그 관측소 종류 필터 (지정 시 DB 관측소는 제외)
+        river: 하천명 필터
+        limit: 최대 결과 수
+
+    Returns:
+        list: {source, id, code, type, name, river, address, match, score} (점수 순)
+    """
+    parsed = SearchQuery(query)
+    merged = []
+    for rank, source in enumerate(SOURCES):
+        if source not in sources:
+            continue
+        if source == 'catalog':
+            hits = catalog_index().search(parsed, limit, river=river, station_type=station_type)
+        elif station_type:
+            continue
+        else:
+            hits = station_table_index().search(parsed, limit, river=river)
+        merged.extend((hit, rank, source) for hit in hits)
+
+    merged.sort(key=lambda item: (-item[0].score, item[0].name_length, item[1], item[0].position))
+    return [_describe(source, hit) for hit, _, source in merged[:max(limit, 1)]]
@@ -0,0 +1,191 @@
+"""
+관측소 최근접 검색 (공간 색인)
+
+카탈로그 관측소 좌표(위도·경도)를 단위 구면 위 3차원 벡터로 바꿔 종류별 KD-tree
+(scipy cKDTree)로 색인한다. 구면 위 두 점의 현 길이(chord)는 대권 거리와 단조 관계라
+KD-tree 의 k-최근접 순서가 haversine 거리 순서와 같고, 거리는 현 길이에서 환산한다.
+
+    d = 2R · asin(chord / 2)
+
+여러 지점은 한 번의 tree.query 로 조회한다 (수천 개 지점 수 ms).
+색인은 카탈로그 파일 mtime 이 바뀐 경우에만 다시 만든다.
+"""
+import logging
+import math
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from .station_data import STATION_TYPES, get_catalog
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+DEFAULT_K = 3
+MAX_K = 20
+MAX_POINTS = 10000
+
+# 결과에 포함할 관측소 필드
+STATION_FIELDS = ('code', 'name', 'type', 'river', 'address', 'lat', 'lon')
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def valid_coordinate(lat, lon) -> bool:
+    """위도·경도가 모두 유한하고 범위 안인지"""
+    try:
+        lat, lon = float(lat), float(lon)
+    except (TypeError, ValueError):
+        return False
+    return math.isfinite(lat) and math.isfinite(lon) and -90 <= lat <= 90 and -180 <= lon <= 180
+
+
+def unit_vectors(lats, lons) -> np.ndarray:
+    """위도·경도(도) → 단위 구면 위 (x, y, z), shape (n, 3)"""
+    lat = np.radians(np.asarray(lats, dtype=float))
+    lon = np.radians(np.asarray(lons, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+def chord_to_km(chord) -> np.ndarray:
+    """현 길이(단위 구) → 대권 거리(km), 이웃이 없는 inf 는 유지"""
+    chord = np.asarray(chord, dtype=float)
+    with np.errstate(invalid='ignore'):
+        km = 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(chord / 2, 1.0))
+    return np.where(np.isinf(chord), np.inf, km)
+
+
+def km_to_chord(km: float) -> float:
+    """대권 거리(km) → 현 길이(단위 구)"""
+    return 2 * math.sin(min(km / (2 * EARTH_RADIUS_KM), math.pi / 2))
+
+
+class StationSpatialIndex:
+    """
+    관측소 종류별 KD-tree (좌표가 있는 관측소만)
+
+    - stations[type]: 색인 순서의 관측소 목록
+    - summaries[type]: 결과용 관측소 요약 (STATION_FIELDS)
+    - trees[type]: 단위 벡터 cKDTree (관측소가 없으면 None)
+    """
+
+    def __init__(self, catalog):
+        self.mtime_ns = catalog.mtime_ns
+        self.stations = {}
+        self.summaries = {}
+        self.trees = {}
+        for station_type in STATION_TYPES:
+            located = [
+                station for station in catalog.by_type.get(station_type, [])
+                if valid_coordinate(station.get('lat'), station.get('lon'))
+            ]
+            self.stations[station_type] = located
+            self.summaries[station_type] = [
+                {field: station.get(field) for field in STATION_FIELDS} for station in located
+            ]
+            self.trees[station_type] = cKDTree(unit_vectors(
+                [station['lat'] for station in located], [station['lon'] for station in located],
+            )) if located else None
+
+    def query(self, lats, lons, station_type: str, k: int = DEFAULT_K,
+              max_distance_km: Optional[float] = None):
+        """
+        k-최근접 관측소 (벡터 조회)
+
+        Args:
+            lats, lons: 유효한 좌표 배열 (길이 n)
+            station_type: 'waterlevel', 'rainfall', 'dam'
+            k: 지점별 최대 관측소 수
+            max_distance_km: 이 거리를 넘는 관측소는 제외
+
+        Returns:
+            tuple: (거리 km (n, k), 색인 위치 (n, k)) - 이웃이 없으면 거리 inf, 위치 -1
+        """
+        n = len(lats)
+        tree = self.trees.get(station_type)
+        if tree is None or n == 0:
+            return np.full((n, k), np.inf), np.full((n, k), -1, dtype=np.intp)
+
+        bound = km_to_chord(max_distance_km) if max_distance_km is not None else np.inf
+        chord, positions = tree.query(unit_vectors(lats, lons), k=min(k, tree.n), distance_upper_bound=bound)
+        chord = np.asarray(chord, dtype=float).reshape(n, -1)
+        positions = np.asarray(positions, dtype=np.intp).reshape(n, -1)
+        positions[positions >= tree.n] = -1
+
+        distances = np.full((n, k), np.inf)
+        padded = np.full((n, k), -1, dtype=np.intp)
+        distances[:, :chord.shape[1]] = chord_to_km(chord)
+        padded[:, :positions.shape[1]] = positions
+        return distances, padded
+
+
+def get_spatial_index() -> StationSpatialIndex:
+    """관측소 공간 색인 (카탈로그 mtime 이 바뀐 경우에만 다시 생성)"""
+    global _index
+
+    catalog = get_catalog()
+    index = _index
+    if index is not None and index.mtime_ns == catalog.mtime_ns:
+        return index
+
+    with _index_lock:
+        if _index is None or _index.mtime_ns != catalog.mtime_ns:
+            _index = StationSpatialIndex(catalog)
+            logger.info(
+                "관측소 공간 색인 생성: %s",
+                ', '.join(f"{t} {len(s)}개" for t, s in _index.stations.items()),
+            )
+        return _index
+
+
+def nearest_stations(points: Iterable, k: int = DEFAULT_K, types: Iterable[str] = STATION_TYPES,
+                     max_distance_km: Optional[float] = None) -> List[Optional[Dict]]:
+    """
+    지점별 종류별 k-최근접 관측소
+
+    Args:
+        points: (위도, 경도) 목록
+        k: 종류별 최대 관측소 수
+        types: 조회할 관측소 종류
+        max_distance_km: 이 거리를 넘는 관측소는 제외
+
+    Returns:
+        list: 지점 순서대로 {type: [관측소 + distance_km]}, 좌표가 유효하지 않으면 None
+    """
+    points = list(points)
+    valid = [i for i, (lat, lon) in enumerate(points) if valid_coordinate(lat, lon)]
+    lats = [float(points[i][0]) for i in valid]
+    lons = [float(points[i][1]) for i in valid]
+
+    index = get_spatial_index()
+    results = [None] * len(points)
+    for i in valid:
+        results[i] = {}
+    for station_type in types:
+        summaries = index.summaries.get(station_type, [])
+        distances, positions = index.query(lats, lons, station_type, k, max_distance_km)
+        for i, row_distances, row_positions in zip(valid, np.round(distances, 3).tolist(), positions.tolist()):
+            results[i][station_type] = [
+                {**summaries[position], 'distance_km': distance}
+                for distance, position in zip(row_distances, row_positions)
+                if position >= 0
+            ]
+    return results
+
+
+def nearest_gauges(lats, lons, max_distance_km: Optional[float] = None):
+    """
+    지점별 최근접 수위관측소 (세션 자동 연결용, 유효한 좌표만)
+
+    Returns:
+        tuple: (관측소 코드 목록 - 없으면 '', 거리 km 배열 - 없으면 inf)
+    """
+    index = get_spatial_index()
+    stations = index.stations.get('waterlevel', [])
+    distances, positions = index.query(lats, lons, 'waterlevel', 1, max_distance_km)
+    codes = [stations[position]['code'] if position >= 0 else '' for position in positions[:, 0]]
+    return codes, distances[:, 0]
@@ -1,3 +1,310 @@
-from django.test import TestCase
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from .hrfco_client import HrfcoClient
+from .hrfco_history_service import sync_history
+from .models import HrfcoObservation
+from .station_search_service import StationSearchIndex
+
+
+class StubHrfcoHandler(BaseHTTPRequestHandler):
+    """/{key}/waterlevel/list/10M/{code}/{시작}/{끝}.xml → 시작~끝 10분 자료 (끝 포함)"""
+
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        parts = self.path.strip('/').split('/')
+        start = datetime.strptime(parts[-2], '%Y%m%d%H%M')
+        last = datetime.strptime(parts[-1].removesuffix('.xml'), '%Y%m%d%H%M')
+        records = []
+        while start <= last:
+            records.append(f"<waterlevel><ymdhm>{start:%Y%m%d%H%M}</ymdhm><wl>1.0</wl><fw>{start.day}</fw></waterlevel>")
+            start += timedelta(minutes=10)
+        body = f"<response><content>{''.join(records)}</content></response>".encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubHrfcoServer:
+    """로컬 HRFCO 스텁 서버 (with 블록 동안 실행)"""
+
+    def __enter__(self):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubHrfcoHandler)
+        self.httpd.paths = []
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_port}"
+
+    @property
+    def paths(self):
+        return self.httpd.paths
+
+    def client(self, **kwargs):
+        return HrfcoClient(self.base_url, 'KEY', retries=0, **kwargs)
+
+
+def catalog_entry(name, code, river, address):
+    station = {'name': name, 'code': code, 'river': river, 'address': address}
+    return {
+        'payload': station,
+        'name': name,
+        'codes': (code,),
+        'tokens': (river, address),
+        'key': ' '.join((name, code, address)).lower(),
+        'river': river,
+        'station_type': 'waterlevel',
+    }
+
+
+class StationSearchIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = StationSearchIndex([
+            catalog_entry('청송군(청송교)', '2004640', '낙동강', '경상북도 청송군 청송읍 월막리'),
+            catalog_entry('정읍시(초강교)', '3012660', '동진강', '전라북도 정읍시 정우면'),
+            catalog_entry('한강대교', '1018683', '한강', '서울특별시 용산구 이촌동'),
+        ])
+
+    def names(self, query):
+        return [hit.payload['name'] for hit in self.index.search(query, 10)]
+
+    def test_multi_word_address(self):
+        self.assertEqual(self.names('경상북도 청송군'), ['청송군(청송교)'])
+        self.assertEqual(self.names('전라북도  정읍시'), ['정읍시(초강교)'])
+
+    def test_single_word_still_ranked_by_index(self):
+        self.assertEqual(self.index.search('ㅎㄱㄷㄱ', 10)[0].match, 'choseong')
+        self.assertEqual(self.names('용산구'), ['한강대교'])
+
+
+class HrfcoClientStubTests(SimpleTestCase):
+    """로컬 스텁 서버 대상 캐시/호출 제한"""
+
+    PATH = 'waterlevel/list/10M/1018683/202401010000/202401010050.xml'
+
+    def test_cached_get_calls_upstream_once(self):
+        with StubHrfcoServer() as stub:
+            client = stub.client()
+            first = client.get(self.PATH, ttl=60)
+            self.assertEqual(client.get(self.PATH, ttl=60), first)
+            self.assertEqual(len(stub.paths), 1)
+            self.assertEqual(client.metrics()['hits'], 1)
+            self.assertIn('<ymdhm>202401010050</ymdhm>', first)
+
+    def test_rate_limit_spaces_concurrent_calls(self):
+        with StubHrfcoServer() as stub:
+            client = stub.client(rate=20.0, burst=1, concurrency=2)
+            started = time.monotonic()
+            with ThreadPoolExecutor(max_workers=6) as executor:
+                list(executor.map(client.fetch_text, [self.PATH] * 6))
+            elapsed = time.monotonic() - started
+
+        # 첫 호출 이후 5회는 1/20 초 간격
+        self.assertGreaterEqual(elapsed, 5 / 20 * 0.9)
+        self.assertEqual(len(stub.paths), 6)
+        self.assertGreater(client.metrics()['throttled'], 0)
+
+
+class HrfcoHistorySyncTests(TestCase):
+    """받은 구간(DB, UTC) 경계에서 시작하는 창도 현지 시각으로 조회되는지"""
+
+    def rows_per_day(self, code):
+        return dict(
+            HrfcoObservation.objects
+            .filter(station_code=code)
+            .annotate(day=TruncDate('timestamp'))
+            .values('day')
+            .annotate(n=Count('id'))
+            .values_list('day', 'n')
+        )
+
+    def test_overlapping_ranges_fill_whole_days(self):
+        code = '1018683'
+        with StubHrfcoServer() as stub, \
+                mock.patch('hydro.hrfco_history_service.get_client', return_value=stub.client()):
+            sync_history(code, datetime(2023, 12, 30, 12, 0), datetime(2023, 12, 31, 12, 0))
+            sync_history(code, datetime(2023, 12, 30, 0, 0), datetime(2024, 1, 1, 23, 50))
+
+        self.assertIn('/KEY/waterlevel/list/10M/1018683/202312300000/202312301150.xml', stub.paths)
+        self.assertIn('/KEY/waterlevel/list/10M/1018683/202312311210/202401012350.xml', stub.paths)
+        counts = self.rows_per_day(code)
+        for day in (datetime(2023, 12, 30).date(), datetime(2023, 12, 31).date(), datetime(2024, 1, 1).date()):
+            self.assertEqual(counts[day], 144, day)
+        self.assertEqual(
+            HrfcoObservation.objects.filter(station_code=code).count(), 3 * 144,
+        )
+        first = HrfcoObservation.objects.filter(station_code=code).first()
+        self.assertEqual(timezone.localtime(first.timestamp).replace(tzinfo=None), datetime(2023, 12, 30, 0, 0))
+
+
+class HrfcoEmptyWindowTests(TestCase):
+    """빈 응답 창은 확정 대기(1일)보다 오래된 부분만 받은 구간으로 기록하는지"""
+
+    def test_recent_empty_window_is_fetched_again(self):
+        from .hrfco_history_service import EMPTY_SETTLE, STEP, fetched_ranges, published_until
+
+        code = '1018683'
+        published = published_until()
+        start = published - timedelta(days=3)
+        with mock.patch('hydro.hrfco_history_service._fetch_window', return_value=[]) as fetch:
+            sync_history(code, start, published)
+            sync_history(code, start, published)
+
+        self.assertEqual(fetched_ranges(code), [(start, published + STEP - EMPTY_SETTLE)])
+        self.assertEqual(fetch.call_count, 2)
+        self.assertEqual(fetch.call_args.args[1:], (published + STEP - EMPTY_SETTLE, published + STEP))
+
+
+class BoundaryCacheTests(SimpleTestCase):
+    """배포 단계 build_boundary_cache 로 만든 캐시를 색인이 그대로 열어 역지오코딩하는지"""
+
+    def test_command_builds_cache_used_by_lookup(self):
+        import tempfile
+        from io import StringIO
+
+        from django.core.management import call_command
+        from django.test import override_settings
+
+        from . import boundary_service
+
+        with tempfile.TemporaryDirectory() as tmp, override_settings(BOUNDARY_CACHE_DIR=tmp), \
+                mock.patch.object(boundary_service, '_index', None):
+            call_command('build_boundary_cache', stdout=StringIO())
+            with mock.patch.object(boundary_service, 'build_boundary_cache') as build:
+                found, outside, invalid = boundary_service.reverse_geocode(
+                    [(33.4636, 126.3305), (36.0, 128.0), (0, 0)],
+                )
+            build.assert_not_called()
+
+        self.assertEqual(found['address'], '제주특별자치도 제주시 애월읍 애월리')
+        self.assertEqual(found['distance_m'], 0.0)
+        self.assertIsNone(outside)  # 경북 (.shp 미배포)
+        self.assertIsNone(invalid)
+
+
+class XmlStreamTests(SimpleTestCase):
+    """스트리밍 파서가 레코드 변환, 레코드 밖 메타, 잘못된 시각/값을 처리하는지"""
+
+    def test_kwater_records_and_meta(self):
+        from .xml_stream import KWATER_CONTAINER, iter_records, to_float
+
+        xml = (
+            '<response><header><resultCode>00</resultCode></header><body><items>'
+            '<item><damnm>충주댐</damnm><q> 12.5 </q></item><item><damnm>소양강댐</damnm><q/></item>'
+            '</items><totalCount>2</totalCount></body></response>'
+        )
+        meta = {}
+        records = list(iter_records(xml, KWATER_CONTAINER, {'q': to_float}, meta))
+        self.assertEqual(records, [{'damnm': '충주댐', 'q': 12.5}, {'damnm': '소양강댐', 'q': None}])
+        self.assertEqual(meta, {'resultCode': '00', 'totalCount': '2'})
+
+    def test_hrfco_arrays(self):
+        from .xml_stream import read_arrays
+
+        xml = (
+            '<response><content>'
+            '<waterlevel><ymdhm>202401010010</ymdhm><wl>1.5</wl><fw>3</fw></waterlevel>'
+            '<waterlevel><ymdhm>202402300000</ymdhm><wl>-</wl><fw></fw></waterlevel>'
+            '<waterlevel><ymdhm>202412312350</ymdhm><wl>2</wl><fw>4</fw></waterlevel>'
+            '</content></response>'
+        ).encode()
+        arrays = read_arrays(xml)
+        self.assertEqual(arrays['time'][0], np.datetime64('2024-01-01T00:10'))
+        self.assertTrue(np.isnat(arrays['time'][1]))  # 2월 30일
+        self.assertEqual(arrays['time'][2], np.datetime64('2024-12-31T23:50'))
+        np.testing.assert_array_equal(arrays['wl'], [1.5, np.nan, 2.0])
+        np.testing.assert_array_equal(arrays['fw'], [3.0, np.nan, 4.0])
+
+
+class StationCatalogTests(SimpleTestCase):
+    DATA = {
+        'meta': {'total_count': 3, 'waterlevel_count': 2, 'rainfall_count': 1, 'dam_count': 0},
+        'rivers': ['한강', '낙동강'],
+        'stations': {
+            'waterlevel': [
+                {'name': '한강대교', 'code': '1018683', 'river': '한강', 'address': '서울특별시 용산구 이촌동'},
+                {'name': '청송군(청송교)', 'code': '2004640', 'river': '낙동강', 'address': '경상북도 청송군'},
+            ],
+            'rainfall': [
+                {'name': '청송', 'code': '2004640', 'river': '낙동강', 'address': '경상북도 청송군'},
+            ],
+        },
+    }
+
+    def setUp(self):
+        import json
+        import os
+        import tempfile
+        from pathlib import Path
+
+        from . import station_data
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / 'stations.json'
+        self.path.write_text(json.dumps(self.DATA, ensure_ascii=False), encoding='utf-8')
+        os.utime(self.path, ns=(1, 1))
+
+        patcher = mock.patch.multiple(station_data, DATA_FILE=self.path, _catalog=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.station_data = station_data
+
+    def test_lookup_and_search(self):
+        data = self.station_data
+        self.assertEqual(data.get_station_by_code('2004640')['name'], '청송군(청송교)')  # 수위 우선
+        self.assertIsNone(data.get_station_by_code('0000000'))
+
+        names = lambda stations: [s['name'] for s in stations]
+        self.assertEqual(names(data.get_stations(query='용산')), ['한강대교'])
+        self.assertEqual(names(data.get_stations(query='청')), ['청송군(청송교)'])  # 1글자 검색
+        self.assertEqual(names(data.get_stations('rainfall', query='청송군')), ['청송'])
+        self.assertEqual(data.get_stations(river='한강', query='청송'), [])
+        self.assertEqual(data.get_stations(query='없는지점'), [])
+        self.assertEqual(names(data.get_stations(limit=0)), ['한강대교'])  # 첫 항목은 항상 포함
+
+        by_river = data.get_stations_by_river('낙동강')
+        self.assertEqual((len(by_river['waterlevel']), len(by_river['rainfall']), by_river['dam']), (1, 1, []))
+
+        stats = data.get_stats()
+        self.assertEqual(stats['by_river']['낙동강'], {'waterlevel': 1, 'rainfall': 1, 'dam': 0})
+        stats['by_river'].clear()  # 복사본이므로 캐시에 영향 없음
+        self.assertIn('한강', data.get_stats()['by_river'])
+
+    def test_reload_only_when_mtime_changes(self):
+        import json
+        import os
+
+        data = self.station_data
+        catalog = data.get_catalog()
+        self.assertIs(data.get_catalog(), catalog)
+
+        changed = json.loads(json.dumps(self.DATA))
+        changed['stations']['waterlevel'][0]['name'] = '잠수교'
+        self.path.write_text(json.dumps(changed, ensure_ascii=False), encoding='utf-8')
+        os.utime(self.path, ns=(2, 2))
+
+        self.assertIsNot(data.get_catalog(), catalog)
+        self.assertEqual(data.get_station_by_code('1018683')['name'], '잠수교')
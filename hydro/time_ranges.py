@@ -0,0 +1,26 @@
+"""
+반열린 시각 구간 [start, end) 도구
+
+HRFCO 수위/유량 사본(hrfco_history_service)과 댐 방류량 사본(dam_release_service)이
+받은 구간 목록을 정리할 때 함께 쓴다.
+"""
+
+
+def merge_ranges(ranges):
+    """
+    겹치거나 맞닿은 구간 병합
+
+    Args:
+        ranges: [(start, end), ...] (순서 무관)
+
+    Returns:
+        list: 시작 오름차순으로 병합한 [(start, end), ...]
+    """
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
@@ -14,6 +14,7 @@ urlpatterns = [
     path('api/stations/', views.api_major_stations, name='api_stations'),
     path('api/stations/all/', views.api_all_stations, name='api_all_stations'),
     path('api/stations/search/', views.api_search_stations, name='api_search_stations'),
+    path('api/hrfco/metrics/', views.api_hrfco_metrics, name='api_hrfco_metrics'),
 
     # 증발산량(ET) 분석 - Google Earth Engine
     path('et/', views.et_dashboard, name='et_dashboard'),
@@ -33,9 +34,14 @@ urlpatterns = [
     # 관측소 데이터 API (파일 기반)
     path('api/v2/stations/rivers/', views.api_station_rivers, name='api_station_rivers'),
     path('api/v2/stations/search/', views.api_station_search, name='api_station_search'),
+    path('api/v2/stations/find/', views.api_station_find, name='api_station_find'),
+    path('api/v2/stations/nearest/', views.api_station_nearest, name='api_station_nearest'),
     path('api/v2/stations/stats/', views.api_station_stats, name='api_station_stats'),
     path('api/v2/stations/<str:code>/', views.api_station_detail, name='api_station_detail'),
 
+    # 행정구역 역지오코딩 API (리 경계)
+    path('api/v2/boundaries/lookup/', views.api_boundary_lookup, name='api_boundary_lookup'),
+
     # 디버그 (임시)
     path('api/debug/env/', views.api_debug_env, name='api_debug_env'),
 ]
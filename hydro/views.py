@@ -1,14 +1,16 @@
 from django.shortcuts import render
 from django.http import JsonResponse
-from django.views.decorators.http import require_GET
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_http_methods
 
 from .services import (
     get_realtime_waterlevel,
     get_realtime_rainfall,
     get_waterlevel_history,
     get_rainfall_history,
-    get_stations_data,
+    get_stations_data_async,
     get_major_stations_data,
+    get_client_metrics,
     search_stations,
     ALL_STATIONS,
     DEFAULT_STATIONS,
@@ -127,8 +129,8 @@ def api_waterlevel_history(request):
 
 
 @require_GET
-def api_major_stations(request):
-    """API: 선택된 관측소 실시간 데이터"""
+async def api_major_stations(request):
+    """API: 선택된 관측소 실시간 데이터 (수위/강수 동시 조회)"""
     # 쿼리 파라미터로 관측소 선택 지원
     wl_param = request.GET.get('wl_stations', '')
     rf_param = request.GET.get('rf_stations', '')
@@ -136,7 +138,7 @@ def api_major_stations(request):
     wl_codes = wl_param.split(',') if wl_param else None
     rf_codes = rf_param.split(',') if rf_param else None
 
-    data = get_stations_data(wl_codes, rf_codes)
+    data = await get_stations_data_async(wl_codes, rf_codes)
 
     return JsonResponse({
         'waterlevel': [
@@ -159,6 +161,7 @@ def api_major_stations(request):
             for item in data['rainfall']
         ],
         'updated_at': data['updated_at'],
+        'timed_out': data['timed_out'],
     })
 
 
@@ -337,6 +340,12 @@ def my_history(request):
     })
 
 
+@require_GET
+def api_hrfco_metrics(request):
+    """API: 한강홍수통제소 클라이언트 캐시 적중/미스 지표"""
+    return JsonResponse({'metrics': get_client_metrics()})
+
+
 @require_GET
 def api_debug_env(request):
     """디버그: GEE 환경변수 확인 (값은 숨김)"""
@@ -504,7 +513,7 @@ def api_station_search(request):
     Query params:
         type: 'waterlevel', 'rainfall', 'dam' (기본: waterlevel)
         river: 강 이름 (예: '한강', '낙동강')
-        q: 검색어
+        q: 검색어 (지점명, 초성, 코드, 주소)
         limit: 최대 결과 수 (기본: 50)
     """
     station_type = request.GET.get('type', 'waterlevel')
@@ -516,12 +525,13 @@ def api_station_search(request):
     if river == '' or river == 'null':
         river = None
 
-    stations = get_stations(
-        station_type=station_type,
-        river=river,
-        query=query if query else None,
-        limit=limit
-    )
+    if query:
+        # 초성·입력 중 글자·오타를 허용하는 색인 검색 (점수 순)
+        from .station_search_service import search_catalog
+
+        stations = search_catalog(query, station_type=station_type, river=river, limit=limit)
+    else:
+        stations = get_stations(station_type=station_type, river=river, limit=limit)
 
     return JsonResponse({
         'stations': stations,
@@ -534,6 +544,214 @@ def api_station_search(request):
     })
 
 
+@require_GET
+def api_station_find(request):
+    """
+    API: 관측소 통합 검색 (파일 카탈로그 + DB 관측소, 점수 순)
+
+    Query params:
+        q: 검색어 (지점명, 초성 'ㅎㄱㄷㄱ', 코드, 하천, 주소)
+        source: 'catalog', 'db' (기본: 둘 다)
+        type: 카탈로그 관측소 종류 (지정 시 DB 관측소 제외)
+        river: 강 이름
+        limit: 최대 결과 수 (기본: 20, 최대: 100)
+    """
+    from .station_search_service import SOURCES, search_all
+
+    query = request.GET.get('q', '').strip()
+    source = request.GET.get('source', '')
+    station_type = request.GET.get('type') or None
+    river = request.GET.get('river') or None
+    try:
+        limit = min(max(int(request.GET.get('limit', 20)), 1), 100)
+    except ValueError:
+        return JsonResponse({'error': 'limit 은 정수여야 합니다.'}, status=400)
+
+    if source and source not in SOURCES:
+        return JsonResponse({'error': f'source 는 {", ".join(SOURCES)} 중 하나여야 합니다.'}, status=400)
+    if river == 'null':
+        river = None
+
+    results = search_all(
+        query,
+        sources=(source,) if source else SOURCES,
+        station_type=station_type,
+        river=river,
+        limit=limit,
+    )
+
+    return JsonResponse({
+        'query': query,
+        'results': results,
+        'count': len(results),
+    })
+
+
+def _parse_points(payload):
+    """[[위도, 경도], ...] 또는 [{lat, lon}, ...] → (위도, 경도) 목록"""
+    points = []
+    for point in payload:
+        if isinstance(point, dict):
+            points.append((point.get('lat'), point.get('lon')))
+        elif isinstance(point, (list, tuple)) and len(point) == 2:
+            points.append((point[0], point[1]))
+        else:
+            raise ValueError('points 항목은 [위도, 경도] 또는 {"lat", "lon"} 이어야 합니다.')
+    return points
+
+
+@csrf_exempt
+@require_http_methods(["GET", "POST"])
+def api_station_nearest(request):
+    """
+    API: 지점별 최근접 관측소 (수위·강수량·댐, 종류별 k개)
+
+    GET params:
+        lat, lon: 지점 좌표 (필수)
+        k: 종류별 관측소 수 (기본: 3, 최대: 20)
+        types: 'waterlevel,rainfall,dam' 중 쉼표 구분 (기본: 전체)
+        max_distance: 최대 거리 km (선택)
+
+    POST (JSON, 여러 지점):
+        {"points": [[위도, 경도], ...] 또는 [{"lat": .., "lon": ..}, ...], "k", "types", "max_distance"}
+    """
+    import json
+    from .station_data import STATION_TYPES
+    from .station_spatial_service import DEFAULT_K, MAX_K, MAX_POINTS, nearest_stations
+
+    if request.method == 'POST':
+        try:
+            params = json.loads(request.body or b'{}')
+        except json.JSONDecodeError:
+            return JsonResponse({'error': '잘못된 JSON 형식입니다.'}, status=400)
+        if not isinstance(params, dict) or not isinstance(params.get('points'), list):
+            return JsonResponse({'error': 'points 목록이 필요합니다.'}, status=400)
+    else:
+        params = request.GET
+        if not params.get('lat') or not params.get('lon'):
+            return JsonResponse({'error': 'lat, lon 파라미터가 필요합니다.'}, status=400)
+
+    if request.method == 'POST':
+        try:
+            points = _parse_points(params['points'])
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+    else:
+        points = [(params.get('lat'), params.get('lon'))]
+
+    try:
+        k = min(max(int(params.get('k') or DEFAULT_K), 1), MAX_K)
+        max_distance = params.get('max_distance')
+        max_distance = float(max_distance) if max_distance not in (None, '') else None
+    except (TypeError, ValueError):
+        return JsonResponse({'error': 'k, max_distance 는 숫자여야 합니다.'}, status=400)
+
+    if len(points) > MAX_POINTS:
+        return JsonResponse({'error': f'한 번에 최대 {MAX_POINTS:,}개 지점까지 조회할 수 있습니다.'}, status=400)
+
+    types = params.get('types') or STATION_TYPES
+    if isinstance(types, str):
+        types = [t.strip() for t in types.split(',') if t.strip()]
+    invalid_types = [t for t in types if t not in STATION_TYPES]
+    if invalid_types:
+        return JsonResponse({'error': f'알 수 없는 관측소 종류: {", ".join(map(str, invalid_types))}'}, status=400)
+
+    try:
+        nearest = nearest_stations(points, k=k, types=types, max_distance_km=max_distance)
+    except FileNotFoundError as e:
+        return JsonResponse({'error': str(e)}, status=503)
+
+    if request.method == 'GET':
+        if nearest[0] is None:
+            return JsonResponse({'error': '유효하지 않은 좌표입니다.'}, status=400)
+        return JsonResponse({'lat': float(points[0][0]), 'lon': float(points[0][1]), 'stations': nearest[0]})
+
+    return JsonResponse({
+        'results': [
+            {'lat': lat, 'lon': lon, 'stations': stations}
+            for (lat, lon), stations in zip(points, nearest)
+        ],
+        'count': len(points),
+    })
+
+
+@csrf_exempt
+@require_http_methods(["GET", "POST"])
+def api_boundary_lookup(request):
+    """
+    API: 행정구역 역지오코딩 (위도·경도 → 시도/시군구/읍면동/리)
+
+    GET params:
+        lat, lon: 지점 좌표 또는 station: 관측소 코드
+
+    POST (JSON, 여러 지점/관측소):
+        {"points": [[위도, 경도], ...] 또는 [{"lat": .., "lon": ..}, ...]} 또는 {"stations": [코드, ...]}
+    """
+    import json
+    from .boundary_service import MAX_POINTS, boundary_coverage, reverse_geocode, station_boundaries
+    from .station_spatial_service import valid_coordinate
+
+    if request.method == 'POST':
+        try:
+            params = json.loads(request.body or b'{}')
+        except json.JSONDecodeError:
+            return JsonResponse({'error': '잘못된 JSON 형식입니다.'}, status=400)
+        if not isinstance(params, dict) or not (
+            isinstance(params.get('points'), list) or isinstance(params.get('stations'), list)
+        ):
+            return JsonResponse({'error': 'points 또는 stations 목록이 필요합니다.'}, status=400)
+        stations = params.get('stations')
+        try:
+            points = _parse_points(params['points']) if stations is None else None
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        if len(points if stations is None else stations) > MAX_POINTS:
+            return JsonResponse({'error': f'한 번에 최대 {MAX_POINTS:,}개까지 조회할 수 있습니다.'}, status=400)
+    else:
+        station = request.GET.get('station', '').strip()
+        if not station and not (request.GET.get('lat') and request.GET.get('lon')):
+            return JsonResponse({'error': 'lat, lon 또는 station 파라미터가 필요합니다.'}, status=400)
+        stations = [station] if station else None
+        points = [(request.GET.get('lat'), request.GET.get('lon'))] if not station else None
+        if points and not valid_coordinate(*points[0]):
+            return JsonResponse({'error': '유효하지 않은 좌표입니다.'}, status=400)
+
+    try:
+        if stations is not None:
+            results = station_boundaries(str(code) for code in stations)
+        else:
+            results = reverse_geocode(points)
+        coverage = boundary_coverage()
+    except FileNotFoundError as e:
+        return JsonResponse({'error': str(e)}, status=503)
+
+    if request.method == 'GET':
+        if stations is not None:
+            if results[0] is None:
+                return JsonResponse({'error': '관측소를 찾을 수 없습니다.'}, status=404)
+            return JsonResponse({**results[0], 'missing_provinces': coverage['missing']})
+        return JsonResponse({
+            'lat': float(points[0][0]), 'lon': float(points[0][1]), 'boundary': results[0],
+            'missing_provinces': coverage['missing'],
+        })
+
+    if stations is not None:
+        results = [
+            result or {'code': code, 'boundary': None, 'error': '관측소를 찾을 수 없습니다.'}
+            for code, result in zip(stations, results)
+        ]
+    else:
+        results = [
+            {'lat': lat, 'lon': lon, 'boundary': boundary}
+            for (lat, lon), boundary in zip(points, results)
+        ]
+    return JsonResponse({
+        'results': results,
+        'count': len(results),
+        'missing_provinces': coverage['missing'],
+    })
+
+
 @require_GET
 def api_station_detail(request, code):
     """API: 관측소 상세 정보"""
@@ -0,0 +1,179 @@
+"""
+HRFCO / K-water XML 응답 스트리밍 파서
+
+ElementTree 전체 트리를 만들지 않고 iterparse 로 레코드 단위로 읽으며,
+읽은 레코드는 바로 부모에서 제거하여 응답 크기와 무관하게 메모리를 일정하게 유지한다.
+
+- iter_records: 레코드별 dict (필드별 변환 함수로 float/datetime 을 한 번에 변환)
+- read_arrays: 긴 기간 조회용 열 단위 NumPy 배열 (시각 datetime64[m], 값 float64/NaN)
+
+응답 구조:
+    HRFCO:   <response><content><waterlevel><wl>..</wl>...</waterlevel>...</content></response>
+    K-water: <response><header><resultCode>..</resultCode></header><body><items><item>...</item></items></body></response>
+"""
+import io
+import xml.etree.ElementTree as ET
+from array import array
+from datetime import datetime
+
+import numpy as np
+
+HRFCO_CONTAINER = 'content'
+KWATER_CONTAINER = 'items'
+
+
+def to_float(text):
+    """빈 문자열 → None, 그 외 float"""
+    return float(text) if text else None
+
+
+def to_float_zero(text):
+    """빈 문자열 → 0.0, 그 외 float (강수량)"""
+    return float(text) if text else 0.0
+
+
+def parse_ymdhm(text):
+    """'YYYYMMDDHHmm' → datetime (형식이 다르면 None)"""
+    if len(text) != 12 or not text.isdigit():
+        return None
+    try:
+        return datetime(int(text[:4]), int(text[4:6]), int(text[6:8]), int(text[8:10]), int(text[10:]))
+    except ValueError:
+        return None
+
+
+# HRFCO 레코드 변환 규칙 (튜플이면 원문을 유지하고 (키, 함수) 결과를 추가)
+WATERLEVEL_FIELDS = {'wl': to_float, 'fw': to_float, 'ymdhm': ('datetime', parse_ymdhm)}
+RAINFALL_FIELDS = {'rf': to_float_zero, 'ymdhm': ('datetime', parse_ymdhm)}
+
+
+def _as_stream(source):
+    """bytes / str / 파일 객체 → iterparse 입력"""
+    if isinstance(source, str):
+        return io.BytesIO(source.encode('utf-8'))
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    return source
+
+
+def _iter_raw(source, container, meta=None):
+    """
+    container 직속 자식(레코드)마다 원문 dict 생성
+
+    Args:
+        meta: dict 를 주면 레코드 밖의 단말 요소 텍스트를 채움 (예: resultCode)
+
+    Raises:
+        ET.ParseError: XML 형식 오류
+    """
+    depth = 0
+    container_elem = None
+    container_depth = -1
+    for event, elem in ET.iterparse(_as_stream(source), events=('start', 'end')):
+        if event == 'start':
+            depth += 1
+            if elem.tag == container and container_elem is None:
+                container_elem, container_depth = elem, depth
+            continue
+
+        depth -= 1
+        if depth == container_depth and container_elem is not None:
+            # container 직속 자식 = 레코드
+            yield {field.tag: field.text.strip() if field.text else '' for field in elem}
+            container_elem.remove(elem)
+        elif elem is container_elem:
+            container_elem, container_depth = None, -1
+        elif meta is not None and container_elem is None and len(elem) == 0:
+            meta[elem.tag] = elem.text.strip() if elem.text else ''
+
+
+def iter_records(source, container=HRFCO_CONTAINER, fields=None, meta=None):
+    """
+    레코드 스트리밍 파싱
+
+    Args:
+        source: XML (bytes / str / 파일 객체)
+        container: 레코드를 담은 요소 태그 (HRFCO 'content', K-water 'items')
+        fields: {태그: 변환함수 또는 (추가 키, 변환함수)} (없는 필드는 빈 문자열로 변환)
+        meta: 레코드 밖 단말 요소 텍스트를 받을 dict
+
+    Yields:
+        dict: 레코드 (변환 규칙이 없는 필드는 원문 문자열)
+
+    Raises:
+        ET.ParseError: XML 형식 오류
+    """
+    rules = [
+        (tag, rule[0], rule[1]) if isinstance(rule, tuple) else (tag, tag, rule)
+        for tag, rule in (fields or {}).items()
+    ]
+    for record in _iter_raw(source, container, meta):
+        for tag, key, convert in rules:
+            record[key] = convert(record.get(tag, ''))
+        yield record
+
+
+def ymdhm_to_datetime64(values):
+    """
+    'YYYYMMDDHHmm' 문자열 목록 → datetime64[m] 배열 (벡터 연산, 잘못된 값은 NaT)
+    """
+    strings = np.asarray(values, dtype=str)
+    if strings.size == 0:
+        return np.array([], dtype='datetime64[m]')
+    try:
+        v = strings.astype(np.int64)
+    except ValueError:
+        return np.array(
+            [np.datetime64(dt, 'm') if dt else np.datetime64('NaT', 'm') for dt in map(parse_ymdhm, strings)],
+            dtype='datetime64[m]',
+        )
+
+    months = (v // 10**8 - 1970) * 12 + (v // 10**6 % 100 - 1)
+    days = months.astype('datetime64[M]').astype('datetime64[D]') + (v // 10**4 % 100 - 1)
+    result = days.astype('datetime64[m]') + (v // 100 % 100) * 60 + v % 100
+
+    valid = (
+        (np.char.str_len(strings) == 12)
+        & (v // 10**6 % 100 >= 1) & (v // 10**6 % 100 <= 12)
+        & (v // 10**4 % 100 >= 1) & (v // 100 % 100 < 24) & (v % 100 < 60)
+        & (result.astype('datetime64[D]').astype('datetime64[M]') == months.astype('datetime64[M]'))
+    )
+    result[~valid] = np.datetime64('NaT', 'm')
+    return result
+
+
+def read_arrays(source, value_fields=('wl', 'fw'), time_field='ymdhm', container=HRFCO_CONTAINER):
+    """
+    레코드를 열 단위 배열로 파싱 (긴 기간 조회용)
+
+    값은 array('d') 버퍼에 바로 쌓아 레코드별 dict/float 객체를 남기지 않는다.
+
+    Args:
+        source: XML (bytes / str / 파일 객체)
+        value_fields: float 로 읽을 필드 (빈 값은 NaN)
+        time_field: 'YYYYMMDDHHmm' 시각 필드
+        container: 레코드를 담은 요소 태그
+
+    Returns:
+        dict: {'time': datetime64[m] 배열, 필드명: float64 배열, ...}
+
+    Raises:
+        ET.ParseError: XML 형식 오류
+    """
+    nan = float('nan')
+    times = []
+    buffers = {name: array('d') for name in value_fields}
+
+    for record in _iter_raw(source, container):
+        times.append(record.get(time_field, ''))
+        for name, buffer in buffers.items():
+            text = record.get(name, '')
+            try:
+                buffer.append(float(text) if text else nan)
+            except ValueError:
+                buffer.append(nan)
+
+    result = {'time': ymdhm_to_datetime64(times)}
+    for name, buffer in buffers.items():
+        result[name] = np.frombuffer(buffer, dtype=np.float64) if buffer else np.array([], dtype=np.float64)
+    return result
@@ -0,0 +1,369 @@
+"""
+분석결과표 Excel 스트리밍 생성 (지역별 시트, 날짜별 열 피벗 + 차트 + 통계)
+
+openpyxl write-only 모드로 행을 순서대로 기록하므로 셀 객체가 메모리에 쌓이지 않는다.
+    - 세션은 요약 컬럼만 only() 로 읽고 rows_data 는 차트 생성과 분석 항목이 비어 있는 세션 계산에만 iterator 로 읽는다
+    - 차트는 chart_service 캐시 파일 경로로 삽입해 저장 시점에 한 장씩 읽힌다
+    - 결과는 파일 객체(임시 파일 등)에 기록하고 응답은 FileResponse 로 스트리밍한다
+"""
+import logging
+import statistics
+from collections import defaultdict
+from datetime import date
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.drawing.image import Image as XLImage
+from openpyxl.styles import Alignment, Border, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_FIELDS = (
+    'station_name', 'measurement_date', 'session_number', 'setup_data',
+    'estimated_discharge', 'total_width', 'total_area', 'wetted_perimeter', 'hydraulic_radius',
+    'mean_velocity', 'velocity_verticals', 'stage', 'uncertainty', 'quality_grade',
+    'latitude', 'longitude', 'ph', 'orp', 'water_temp', 'ec', 'tds',
+)
+CHART_FIELDS = ('rows_data', 'station_name', 'setup_data', 'measurement_date')
+
+# 항목 행 정의 (항목명, 속성, 단위, 소수 자릿수)
+ROW_ITEMS = (
+    ('수면폭', 'total_width', 'm', 3),
+    ('단면적', 'total_area', 'm²', 2),
+    ('윤변', 'wetted_perimeter', 'm', 3),
+    ('동수반경', 'hydraulic_radius', 'm', 3),
+    ('수위', 'stage', 'm', 3),
+    ('평균유속', 'mean_velocity', 'm/s', 3),
+    ('평균유량', 'estimated_discharge', 'm³/s', 3),
+    ('유속측선수', 'velocity_verticals', '개', 0),
+    ('불확실도', 'uncertainty', '%', 2),
+    ('수위고도', 'stage_elevation', 'El.m', 2),
+    ('유량조사 등급', 'quality_grade', '', 0),
+)
+WQ_HEADERS = ('공번', '위도', '경도', '유량 (m³/d)', 'PH', 'ORP', '수온', 'EC', 'TDS')
+
+CHART_WIDTH = 1200
+CHART_HEIGHT = 360
+CHART_ROWS = 22  # 차트 한 장이 차지하는 행 수
+
+HEADER_FILL = PatternFill(start_color='FFFFCC', end_color='FFFFCC', fill_type='solid')
+YELLOW_FILL = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
+THIN_BORDER = Border(
+    left=Side(style='thin'), right=Side(style='thin'),
+    top=Side(style='thin'), bottom=Side(style='thin')
+)
+CENTER_ALIGN = Alignment(horizontal='center', vertical='center')
+
+
+def river_name(station_name):
+    """하천명 추출: "대종천 보상류" -> "대종천" """
+    full_name = station_name or '미지정'
+    name_parts = full_name.split()
+    if len(name_parts) > 1 and any(loc in name_parts[-1] for loc in ['상류', '하류', '보']):
+        return ' '.join(name_parts[:-1]) or '미지정'
+    return full_name or '미지정'
+
+
+def _location_key(session):
+    """피벗 열 위치: setup_data(location, location_desc) > station_name 마지막 부분"""
+    loc = session.setup_data.get('location', '') if session.setup_data else ''
+    if not loc:
+        loc = session.setup_data.get('location_desc', '') if session.setup_data else ''
+    if not loc:
+        name_parts = (session.station_name or '').split()
+        if len(name_parts) > 1:
+            loc = name_parts[-1]
+
+    if '상류' in loc:
+        return '보 상류'
+    if '하류' in loc:
+        return '보 하류'
+    return loc or f'측정{session.session_number}'
+
+
+def _stats_location_key(session):
+    """통계 위치: setup_data(location) > station_name 마지막 부분"""
+    loc_name = session.setup_data.get('location', '') if session.setup_data else ''
+    if not loc_name:
+        name_parts = (session.station_name or '').split()
+        if len(name_parts) > 1:
+            loc_name = name_parts[-1]
+
+    if '상류' in loc_name:
+        return '보상류'
+    if '하류' in loc_name:
+        return '보하류'
+    return loc_name or '기타'
+
+
+def _calc_stats(data):
+    """Min, 1st Qu, Median, Mean, 3rd Qu, Max"""
+    sorted_data = sorted(data)
+    n = len(sorted_data)
+    return {
+        'min': sorted_data[0],
+        'q1': sorted_data[n // 4] if n >= 4 else sorted_data[0],
+        'median': statistics.median(sorted_data),
+        'mean': statistics.mean(sorted_data),
+        'q3': sorted_data[(3 * n) // 4] if n >= 4 else sorted_data[-1],
+        'max': sorted_data[-1],
+    }
+
+
+class _SheetWriter:
+    """write-only 시트에 스타일 셀 행을 순서대로 추가"""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.row = 0
+
+    def cell(self, value, fill=None, border=True, center=False):
+        cell = WriteOnlyCell(self.ws, value=value)
+        if border:
+            cell.border = THIN_BORDER
+        if fill is not None:
+            cell.fill = fill
+        if center:
+            cell.alignment = CENTER_ALIGN
+        return cell
+
+    def append(self, cells=()):
+        self.ws.append(list(cells))
+        self.row += 1
+
+    def skip_to(self, row):
+        """row 직전까지 빈 행 추가 (다음 append 가 row 에 기록됨)"""
+        while self.row < row - 1:
+            self.append()
+
+    def merge(self, start_row, start_column, end_row, end_column):
+        self.ws.merged_cells.add(
+            f'{get_column_letter(start_column)}{start_row}:{get_column_letter(end_column)}{end_row}'
+        )
+
+
+class _SheetLayout:
+    """지역(하천) 시트 하나의 피벗 구성"""
+
+    def __init__(self, name, sessions):
+        self.name = name
+        self.sessions = sessions
+
+        date_location_data = defaultdict(dict)
+        date_objects = {}
+        locations_set = set()
+        for s in sessions:
+            if s.measurement_date:
+                date_str = f"{s.measurement_date.month}/{s.measurement_date.day}/{s.measurement_date.year}"
+            else:
+                date_str = '미지정'
+            date_objects[date_str] = s.measurement_date
+            loc_key = _location_key(s)
+            locations_set.add(loc_key)
+            date_location_data[date_str][loc_key] = s
+
+        self.dates = sorted(date_objects, key=lambda d: date_objects[d] or date.min)
+        self.locations = sorted(locations_set) or ['측정1']
+        self.grid = date_location_data
+
+    def pivot_sessions(self):
+        """피벗 열 순서(날짜 → 위치)의 세션, 빈 칸은 None"""
+        return [self.grid.get(d, {}).get(loc) for d in self.dates for loc in self.locations]
+
+
+def _write_sheet(wb, layout, chart_paths):
+    ws = wb.create_sheet(title=layout.name[:31].replace('[', '').replace(']', '').replace('/', '-'))
+    out = _SheetWriter(ws)
+    num_locs = len(layout.locations)
+    pivot = layout.pivot_sessions()
+    unit_col = 2 + len(pivot)
+
+    # 컬럼 너비 (write-only 는 행 기록 전에 지정)
+    ws.column_dimensions['A'].width = 14
+    for i in range(2, unit_col + 1):
+        ws.column_dimensions[get_column_letter(i)].width = 12
+
+    # 헤더
+    header1 = [out.cell('항목', HEADER_FILL)]
+    header2 = [out.cell('구분', HEADER_FILL)]
+    for i, date_str in enumerate(layout.dates):
+        col = 2 + i * num_locs
+        header1.append(out.cell(date_str, HEADER_FILL, center=True))
+        header1.extend([None] * (num_locs - 1))
+        if num_locs > 1:
+            out.merge(1, col, 1, col + num_locs - 1)
+        header2.extend(out.cell(loc, HEADER_FILL, center=True) for loc in layout.locations)
+    header1.append(out.cell('단위', HEADER_FILL))
+    out.merge(1, unit_col, 2, unit_col)
+    out.append(header1)
+    out.append(header2)
+
+    # 데이터 행
+    for item_name, attr, unit, decimals in ROW_ITEMS:
+        fill = YELLOW_FILL if item_name == '평균유량' else None
+        cells = [out.cell(item_name, fill)]
+        for session in pivot:
+            value = ''
+            if session:
+                raw_value = getattr(session, attr, None)
+                if raw_value is not None:
+                    if decimals > 0 and isinstance(raw_value, (int, float)):
+                        value = round(raw_value, decimals)
+                    else:
+                        value = raw_value
+            cells.append(out.cell(value, fill, center=True))
+        cells.append(out.cell(unit, center=True))
+        out.append(cells)
+
+    # 수질/위치 상세 테이블
+    out.skip_to(len(ROW_ITEMS) + 5)
+    out.append(out.cell(h, HEADER_FILL, center=True) for h in WQ_HEADERS)
+    for idx, s in enumerate(layout.sessions, start=1):
+        code = f"{layout.name[:4]}-{idx}" if len(layout.name) >= 4 else f"ST-{idx}"
+        discharge_day = round(s.estimated_discharge * 86400, 2) if s.estimated_discharge else ''
+        values = (
+            code, s.latitude or '', s.longitude or '', discharge_day,
+            s.ph or '', s.orp or '', s.water_temp or '', s.ec or '', s.tds or '',
+        )
+        out.append(out.cell(v, center=True) for v in values)
+
+    # 차트 이미지 (저장 시점에 캐시 파일에서 읽음)
+    chart_start_row = out.row + 4
+    chart_count = 0
+    for session in pivot:
+        path = chart_paths.get(session.pk) if session else None
+        if path is None:
+            continue
+        img = XLImage(str(path))
+        img.width = CHART_WIDTH
+        img.height = CHART_HEIGHT
+        ws.add_image(img, f"A{chart_start_row + chart_count * CHART_ROWS}")
+        chart_count += 1
+
+    # 통계 요약 테이블
+    loc_discharge_data = defaultdict(list)
+    stat_items = (
+        ('유량 (m³/s)', 'estimated_discharge'), ('PH', 'ph'), ('ORP', 'orp'),
+        ('수온 (℃)', 'water_temp'), ('EC (μS/cm)', 'ec'), ('TDS (mg/L)', 'tds'),
+    )
+    stat_data = {attr: [] for _, attr in stat_items}
+    for s in layout.sessions:
+        if s.estimated_discharge:
+            loc_discharge_data[_stats_location_key(s)].append(s.estimated_discharge)
+        for attr, values in stat_data.items():
+            value = getattr(s, attr)
+            if value:
+                values.append(value)
+
+    # 1. 위치별 유량 통계 테이블 (차트 아래)
+    stats_start_row = chart_start_row + chart_count * CHART_ROWS + 5
+    out.skip_to(stats_start_row)
+    out.merge(stats_start_row, 2, stats_start_row, 4)
+    out.merge(stats_start_row, 5, stats_start_row, 7)
+    out.append([
+        out.cell('구분', HEADER_FILL),
+        out.cell('단위: m³/s', center=True), None, None,
+        out.cell('단위: m³/day', center=True),
+    ])
+    out.append(
+        out.cell(label, HEADER_FILL, center=True) for label in ['', '최소', '최대', '평균', '최소', '최대', '평균']
+    )
+    for loc_key in ['보상류', '보하류']:
+        data = loc_discharge_data.get(loc_key, [])
+        if data:
+            min_v, max_v, mean_v = min(data), max(data), statistics.mean(data)
+            out.append([
+                out.cell(loc_key),
+                out.cell(round(min_v, 3)), out.cell(round(max_v, 3)), out.cell(round(mean_v, 3)),
+                # m³/day 변환 (× 86400)
+                out.cell(round(min_v * 86400, 0)), out.cell(round(max_v * 86400, 0)),
+                out.cell(round(mean_v * 86400, 0)),
+            ])
+
+    # 2. 전체 통계 테이블
+    out.skip_to(out.row + 3)
+    out.append(
+        out.cell(h, HEADER_FILL, center=True)
+        for h in ['항목', 'Min', '1st Qu.', 'Median', 'Mean', '3rd Qu.', 'Max.']
+    )
+    for item_name, attr in stat_items:
+        item_data = stat_data[attr]
+        if not item_data:
+            continue
+        fill = YELLOW_FILL if attr == 'estimated_discharge' else None
+        stats = _calc_stats(item_data)
+        out.append([out.cell(item_name, fill)] + [
+            out.cell(round(stats[key], 4), fill, center=True)
+            for key in ['min', 'q1', 'median', 'mean', 'q3', 'max']
+        ])
+    return chart_count
+
+
+def _fill_missing_analysis(pending):
+    """
+    분석 항목이 비어 있는 세션(저장 시점 계산 도입 전, 0019 마이그레이션 이전 행)을 rows_data 로 계산해 채움
+
+    조회 전용이라 저장하지 않는다 (저장은 backfill_analysis_results 명령어).
+    """
+    from .models import MeasurementSession
+
+    fields = MeasurementSession.ANALYSIS_FIELDS
+    source = MeasurementSession.objects.filter(pk__in=pending).only('pk', 'rows_data', 'estimated_discharge', *fields)
+    for computed in source.iterator(chunk_size=100):
+        try:
+            computed.calculate_analysis_results()
+        except (TypeError, ValueError):
+            logger.warning("분석 항목 계산 실패: 세션 %s", computed.pk)
+            continue
+        session = pending[computed.pk]
+        for field in fields:
+            setattr(session, field, getattr(computed, field))
+
+
+def write_analysis_workbook(sessions, fp, max_workers=None):
+    """
+    분석결과표 Excel 을 파일 객체에 기록
+
+    Args:
+        sessions: MeasurementSession QuerySet (필터/정렬 적용)
+        fp: 바이너리 쓰기 파일 객체 (임시 파일 권장)
+        max_workers: 차트 렌더링 프로세스 수 (1 이면 프로세스 풀 없이 순차 렌더링 - 웹 요청 중 직접 생성할 때)
+
+    Returns:
+        dict: {'sessions': 세션 수, 'sheets': 시트 수, 'charts': 차트 수}
+    """
+    from .chart_service import session_chart_paths
+    from .models import MeasurementSession
+
+    # 요약 컬럼만 읽어 하천별로 묶음
+    stations_data = defaultdict(list)
+    pending = {}
+    for session in sessions.only(*SUMMARY_FIELDS).iterator(chunk_size=500):
+        stations_data[river_name(session.station_name)].append(session)
+        if session.wetted_perimeter is None:
+            pending[session.pk] = session
+    if pending:
+        _fill_missing_analysis(pending)
+    layouts = [_SheetLayout(name, station_sessions) for name, station_sessions in stations_data.items()]
+
+    # 피벗에 표시되는 세션의 차트만 rows_data 를 읽어 생성
+    chart_ids = [s.pk for layout in layouts for s in layout.pivot_sessions() if s]
+    chart_paths = session_chart_paths(
+        MeasurementSession.objects.filter(pk__in=chart_ids).only(*CHART_FIELDS).iterator(chunk_size=100),
+        max_workers=max_workers,
+    )
+
+    wb = Workbook(write_only=True)
+    charts = sum(_write_sheet(wb, layout, chart_paths) for layout in layouts)
+    if not layouts:
+        wb.create_sheet(title='분석결과')
+    wb.save(fp)
+
+    summary = {
+        'sessions': sum(len(layout.sessions) for layout in layouts),
+        'sheets': len(layouts),
+        'charts': charts,
+    }
+    logger.info("분석결과표 Excel 생성: %s", summary)
+    return summary
@@ -0,0 +1,156 @@
+"""
+분석결과표 조회 서비스
+
+분석결과표 항목(윤변, 동수반경, 등급 등)은 세션 저장 시점에 계산해 컬럼에 저장하고,
+조회 API 는 읽기 전용으로 (측정일, 관측소명, id) 키셋 페이지를 반환한다.
+측정일이 없는 세션은 날짜가 있는 세션 뒤에 온다.
+
+계산되지 않은 기존 행은 backfill_analysis_results 명령어로 일괄 계산한다.
+"""
+import logging
+from datetime import date
+
+from django.core import signing
+from django.db.models import Avg, Count, F, Q
+
+logger = logging.getLogger(__name__)
+
+CURSOR_SALT = 'measurement.analysis_summary'
+DEFAULT_LIMIT = 200
+MAX_LIMIT = 1000
+
+# to_summary_dict() 에 필요한 컬럼 (rows_data, calibration_data 제외)
+SUMMARY_FIELDS = (
+    'id', 'station_name', 'measurement_date', 'session_number', 'setup_data', 'stage',
+    'total_width', 'total_area', 'wetted_perimeter', 'hydraulic_radius', 'mean_velocity',
+    'estimated_discharge', 'velocity_verticals', 'uncertainty', 'quality_grade', 'max_depth',
+)
+GRADES = ('E', 'G', 'F', 'P')
+
+
+def filter_sessions(station_name='', start_date='', end_date=''):
+    """분석결과표 필터 (관측소명 부분 일치, 측정일 범위)"""
+    from .models import MeasurementSession
+
+    sessions = MeasurementSession.objects.all()
+    if station_name:
+        sessions = sessions.filter(station_name__icontains=station_name)
+    if start_date:
+        sessions = sessions.filter(measurement_date__gte=start_date)
+    if end_date:
+        sessions = sessions.filter(measurement_date__lte=end_date)
+    return sessions
+
+
+def encode_cursor(session):
+    """마지막 행 → 다음 페이지 커서"""
+    day = session.measurement_date.isoformat() if session.measurement_date else None
+    return signing.dumps([day, session.station_name, session.pk], salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(cursor):
+    """
+    커서 → (측정일 또는 None, 관측소명, id)
+
+    Raises:
+        ValueError: 커서가 유효하지 않은 경우
+    """
+    try:
+        day, station_name, pk = signing.loads(cursor, salt=CURSOR_SALT)
+        return (date.fromisoformat(day) if day else None), station_name, int(pk)
+    except (signing.BadSignature, TypeError, ValueError):
+        raise ValueError('유효하지 않은 cursor 입니다.')
+
+
+def _after(day, station_name, pk):
+    """정렬 순서상 (day, station_name, pk) 다음 행 조건"""
+    same_name_after = Q(station_name__gt=station_name) | Q(station_name=station_name, pk__gt=pk)
+    if day is None:
+        return Q(measurement_date__isnull=True) & same_name_after
+    return (
+        Q(measurement_date__gt=day)
+        | (Q(measurement_date=day) & same_name_after)
+        | Q(measurement_date__isnull=True)
+    )
+
+
+def summary_page(sessions, cursor=None, limit=DEFAULT_LIMIT):
+    """
+    분석결과표 한 페이지 (읽기 전용)
+
+    Args:
+        sessions: filter_sessions() QuerySet
+        cursor: 이전 응답의 next_cursor
+        limit: 페이지 크기 (최대 MAX_LIMIT)
+
+    Returns:
+        tuple: (to_summary_dict 목록, 다음 커서 또는 None)
+
+    Raises:
+        ValueError: 커서가 유효하지 않은 경우
+    """
+    limit = min(max(int(limit), 1), MAX_LIMIT)
+    if cursor:
+        sessions = sessions.filter(_after(*decode_cursor(cursor)))
+
+    page = list(
+        sessions.only(*SUMMARY_FIELDS)
+        .order_by(F('measurement_date').asc(nulls_last=True), 'station_name', 'pk')[:limit + 1]
+    )
+    next_cursor = encode_cursor(page[limit - 1]) if len(page) > limit else None
+    return [session.to_summary_dict() for session in page[:limit]], next_cursor
+
+
+def summary_totals(sessions):
+    """필터 전체 요약 (세션 수, 평균 유량/불확실도, 등급별 개수) - 집계 쿼리 1회"""
+    totals = sessions.aggregate(
+        count=Count('pk'),
+        avg_discharge=Avg('estimated_discharge', filter=~Q(estimated_discharge=0)),
+        avg_uncertainty=Avg('uncertainty', filter=~Q(uncertainty=0)),
+        **{f'grade_{grade}': Count('pk', filter=Q(quality_grade=grade)) for grade in GRADES},
+    )
+    return {
+        'count': totals['count'],
+        'avg_discharge': totals['avg_discharge'],
+        'avg_uncertainty': totals['avg_uncertainty'],
+        'grades': {grade: totals[f'grade_{grade}'] for grade in GRADES},
+    }
+
+
+def backfill_analysis_results(sessions=None, recalculate=False, batch_size=500):
+    """
+    분석결과표 항목 일괄 계산 (bulk_update, updated_at 유지)
+
+    Args:
+        sessions: 대상 QuerySet (기본: 전체)
+        recalculate: False 이면 윤변이 비어 있는 세션만 계산
+        batch_size: bulk_update 묶음 크기
+
+    Returns:
+        int: 갱신한 세션 수
+    """
+    from .models import MeasurementSession
+
+    fields = MeasurementSession.ANALYSIS_FIELDS
+    if sessions is None:
+        sessions = MeasurementSession.objects.all()
+    if not recalculate:
+        sessions = sessions.filter(wetted_perimeter__isnull=True)
+
+    # pk 순 묶음 단위로 읽고 갱신 (열린 커서 도중 같은 테이블 갱신 방지)
+    sessions = sessions.only('pk', 'rows_data', 'estimated_discharge', *fields).order_by('pk')
+    updated = 0
+    last_pk = 0
+    while True:
+        batch = list(sessions.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        changed = [session for session in batch if session.rows_data]
+        for session in changed:
+            session.calculate_analysis_results()
+        MeasurementSession.objects.bulk_update(changed, fields)
+        updated += len(changed)
+
+    logger.info("분석결과표 항목 일괄 계산: %d개 세션", updated)
+    return updated
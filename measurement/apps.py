@@ -1,5 +1,29 @@
 from django.apps import AppConfig
 
 
+def _remove_station_archive(sender, instance, **kwargs):
+    """관측소 삭제가 커밋되면 해당 관측소의 시계열 아카이브 파일 삭제"""
+    from django.db import transaction
+    from .timeseries_archive_service import remove_station_archive
+
+    station_id = instance.pk
+    transaction.on_commit(lambda: remove_station_archive(station_id))
+
+
 class MeasurementConfig(AppConfig):
     name = 'measurement'
+
+    def ready(self):
+        # RatingCurve 저장/삭제 시 경계표 캐시 무효화 시그널 등록
+        from . import rating_service  # noqa: F401
+
+        # Station 저장/삭제 시 관측소 검색 색인(DB 관측소) 무효화
+        from django.db.models.signals import post_delete, post_save
+        from hydro.station_search_service import drop_station_table_index
+        from .models import Station
+
+        post_save.connect(drop_station_table_index, sender=Station, dispatch_uid='station_search_save')
+        post_delete.connect(drop_station_table_index, sender=Station, dispatch_uid='station_search_delete')
+
+        # Station 삭제 시 시계열 아카이브(Parquet) 파일 삭제 (DB 행은 CASCADE 로 함께 삭제됨)
+        post_delete.connect(_remove_station_archive, sender=Station, dispatch_uid='station_archive_delete')
@@ -0,0 +1,129 @@
+"""
+서버 측 기저유출 분석 서비스
+
+관측소 ID·기간·방법만 받아 DB(및 Parquet 아카이브)에서 일유량을 직접 집계하고,
+분리 커널(baseflow_service)을 적용한 뒤 BaseflowAnalysis 한 행(일별 결과는 압축 배열)으로 저장한다.
+브라우저가 일유량 배열과 일별 결과를 다시 올려보낼 필요가 없다.
+
+일유량 출처:
+    - waterlevel: 일평균 수위(WaterLevelTimeSeries) + Rating Curve
+    - discharge: 저장된 유량 시계열(DischargeTimeSeries) 일평균
+"""
+import logging
+
+import numpy as np
+
+from .baseflow_service import (
+    DEFAULT_ALPHA, DEFAULT_BFI_MAX, METHOD_ECKHARDT, METHODS, estimate_recession, separate, statistics,
+)
+
+logger = logging.getLogger(__name__)
+
+SOURCE_WATERLEVEL = 'waterlevel'
+SOURCE_DISCHARGE = 'discharge'
+SOURCES = (SOURCE_WATERLEVEL, SOURCE_DISCHARGE)
+
+MIN_DAYS = 30
+
+
+def load_daily_discharge(station, start, end, source=SOURCE_WATERLEVEL):
+    """
+    관측소 일유량 (결측일 제외)
+
+    Args:
+        station: Station 인스턴스
+        start, end: 기간 (aware datetime)
+        source: 'waterlevel' / 'discharge'
+
+    Returns:
+        tuple: (날짜 목록, 유량 배열)
+
+    Raises:
+        ValueError: 잘못된 출처, Rating Curve 없음
+    """
+    from .discharge_series_service import daily_discharge, daily_stored_discharge
+
+    if source == SOURCE_WATERLEVEL:
+        dates, q = daily_discharge(station, start, end)
+    elif source == SOURCE_DISCHARGE:
+        dates, q = daily_stored_discharge(station, start, end)
+    else:
+        raise ValueError('지원하지 않는 유량 출처입니다.')
+
+    valid = np.isfinite(q)
+    if not valid.all():
+        dates = [day for day, ok in zip(dates, valid.tolist()) if ok]
+        q = q[valid]
+    return dates, q
+
+
+def run_station_analysis(station, start, end, method, alpha=DEFAULT_ALPHA, bfi_max=DEFAULT_BFI_MAX,
+                         passes=1, source=SOURCE_WATERLEVEL, estimate=False, user=None, save=True):
+    """
+    관측소 기저유출 분석 실행 및 저장
+
+    Args:
+        station: Station 인스턴스
+        start, end: 기간 (aware datetime)
+        method: 'lyne_hollick' / 'eckhardt'
+        alpha, bfi_max, passes: 필터 매개변수
+        source: 일유량 출처
+        estimate: True 이면 감수 상수 추정값(권장 α / BFImax)을 사용
+        user: 소유자
+        save: False 이면 저장하지 않고 결과만 반환
+
+    Returns:
+        tuple: (BaseflowAnalysis 또는 None, 결과 dict {dates, discharge, baseflow, direct_runoff, statistics, recession})
+
+    Raises:
+        ValueError: 매개변수 오류, 자료 부족, 감수 구간 없음(estimate)
+    """
+    from .models import BaseflowAnalysis
+
+    if method not in METHODS:
+        raise ValueError('지원하지 않는 분석 방법입니다.')
+    if passes not in (1, 3):
+        raise ValueError('통과 횟수는 1 또는 3이어야 합니다.')
+
+    dates, q = load_daily_discharge(station, start, end, source)
+    if len(q) < MIN_DAYS:
+        raise ValueError(f'최소 {MIN_DAYS}일 이상의 데이터가 필요합니다.')
+
+    recession = None
+    if estimate:
+        recession = estimate_recession(q)
+        alpha, bfi_max = recession['alpha'], recession['bfi_max']
+
+    baseflow = separate(q, method, alpha=alpha, bfi_max=bfi_max, passes=passes)
+    direct = q - baseflow
+    stats = statistics(q, baseflow)
+    result = {
+        'dates': dates,
+        'discharge': q,
+        'baseflow': baseflow,
+        'direct_runoff': direct,
+        'statistics': stats,
+        'recession': recession,
+    }
+    if not save:
+        return None, result
+
+    analysis = BaseflowAnalysis(
+        user=user,
+        station=station,
+        start_date=dates[0],
+        end_date=dates[-1],
+        method=method,
+        alpha=alpha,
+        bfi_max=bfi_max if method == METHOD_ECKHARDT else None,
+        note=f'서버 분석 (출처: {source}, 통과: {passes}회{", α 자동 추정" if recession else ""})',
+        **stats,
+    )
+    analysis.set_daily_series(dates, q, baseflow, direct)
+    analysis.save()
+
+    logger.info(
+        "기저유출 서버 분석 저장: station=%s, analysis=%s, days=%d, method=%s, bfi=%s",
+        station.pk, analysis.pk, len(dates), method, stats['bfi'],
+    )
+    return analysis, result
@@ -0,0 +1,180 @@
+"""
+기저유출 매개변수 일괄 보정 서비스
+
+여러 관측소(내부 Station + Rating Curve, HRFCO 관측소 코드)의 일유량을 불러와
+α / BFImax 격자에 대한 BFI·유출량 통계 행렬을 계산한다.
+
+- 자료 조회(DB/HRFCO)는 호출 프로세스에서, 격자 계산은 관측소별로 프로세스 풀에서 수행
+  (풀 생성 비용이 계산보다 커서 관측소가 POOL_MIN_JOBS 개 미만이면 현재 프로세스에서 실행)
+- 작업 함수(baseflow_service.sweep)는 NumPy/SciPy 만 사용하므로 spawn 프로세스에서 Django 설정 없이 실행된다
+"""
+import csv
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .baseflow_service import METHOD_ECKHARDT, sweep
+
+logger = logging.getLogger(__name__)
+
+MIN_DAYS = 30
+
+# 요청당 상한 (웹 요청에서 과도한 계산 방지)
+MAX_STATIONS = 100
+MAX_GRID = 500
+
+# 웹 API 관측소 상한 (HRFCO 자료는 관측소마다 순차 조회 - 그 이상은 baseflow_sweep 명령)
+MAX_WEB_STATIONS = 5
+
+# 프로세스 풀을 쓰는 최소 관측소 수 (max_workers 미지정 시)
+POOL_MIN_JOBS = 8
+
+CSV_COLUMNS = [
+    'station', 'station_name', 'source', 'start_date', 'end_date', 'days',
+    'alpha', 'bfi_max', 'total_runoff', 'baseflow', 'direct_runoff', 'bfi',
+]
+
+
+def frange(start, stop, step):
+    """시작~끝(포함) 등간격 값 목록 (소수 오차 보정)"""
+    count = int(round((stop - start) / step)) + 1
+    return [round(start + i * step, 6) for i in range(max(count, 0))]
+
+
+def load_source(source, start, end):
+    """
+    관측소 일유량 조회
+
+    Args:
+        source: {'station_id': 내부 관측소 ID} 또는 {'station_code': HRFCO 관측소 코드}
+        start, end: 기간 (aware datetime)
+
+    Returns:
+        dict: {station, station_name, source, dates, discharge}
+
+    Raises:
+        ValueError: 관측소/Rating Curve 없음, 잘못된 지정
+    """
+    if source.get('station_id'):
+        from .discharge_series_service import daily_discharge
+        from .models import Station
+
+        try:
+            station = Station.objects.get(pk=source['station_id'])
+        except Station.DoesNotExist:
+            raise ValueError('관측소를 찾을 수 없습니다.')
+        dates, discharge = daily_discharge(station, start, end)
+        return {
+            'station': str(station.pk),
+            'station_name': station.name,
+            'source': 'internal',
+            'dates': dates,
+            'discharge': discharge,
+        }
+
+    if source.get('station_code'):
+        from hydro.hrfco_history_service import daily_mean_flow, sync_history
+        from hydro.station_data import get_station_by_code
+
+        code = str(source['station_code'])
+        sync_history(code, start, end)
+        daily = daily_mean_flow(code, start, end)
+        info = get_station_by_code(code) or {}
+        return {
+            'station': code,
+            'station_name': info.get('name', code),
+            'source': 'hrfco',
+            'dates': [day for day, _ in daily],
+            'discharge': np.array([avg for _, avg in daily], dtype=float),
+        }
+
+    raise ValueError('station_id 또는 station_code 가 필요합니다.')
+
+
+def _grid_size(method, alphas, bfi_maxes):
+    return len(alphas) * (len(bfi_maxes) if method == METHOD_ECKHARDT else 1)
+
+
+def run_sweep(sources, start, end, method, alphas, bfi_maxes=(), passes=1, max_workers=None):
+    """
+    관측소 × 매개변수 격자 일괄 분석
+
+    Args:
+        sources: load_source 입력 목록
+        start, end: 기간 (aware datetime)
+        method: 'lyne_hollick' / 'eckhardt'
+        alphas: α 후보
+        bfi_maxes: BFImax 후보 (Eckhardt)
+        passes: Lyne-Hollick 통과 횟수
+        max_workers: 프로세스 수 (None 이면 관측소 POOL_MIN_JOBS 개 이상일 때 CPU 수,
+                     1 이면 현재 프로세스에서 실행)
+
+    Returns:
+        list: 관측소별 {station, station_name, source, start_date, end_date, days, grid | error}
+    """
+    if len(sources) > MAX_STATIONS:
+        raise ValueError(f'관측소는 최대 {MAX_STATIONS}개까지 지정할 수 있습니다.')
+    if not alphas or _grid_size(method, alphas, bfi_maxes) > MAX_GRID:
+        raise ValueError(f'매개변수 조합은 1~{MAX_GRID}개여야 합니다.')
+    if method == METHOD_ECKHARDT and not bfi_maxes:
+        raise ValueError('Eckhardt 필터는 BFImax 후보가 필요합니다.')
+
+    # 1) 자료 조회 (현재 프로세스)
+    results = []
+    jobs = []
+    for source in sources:
+        try:
+            series = load_source(source, start, end)
+        except ValueError as e:
+            key = source.get('station_id') or source.get('station_code')
+            results.append({'station': str(key) if key else None, 'error': str(e)})
+            continue
+
+        q = np.asarray(series.pop('discharge'), dtype=float)
+        valid = np.isfinite(q)
+        dates = [day for day, ok in zip(series.pop('dates'), valid.tolist()) if ok]
+        q = q[valid]
+        entry = {
+            **series,
+            'start_date': dates[0].strftime('%Y-%m-%d') if dates else None,
+            'end_date': dates[-1].strftime('%Y-%m-%d') if dates else None,
+            'days': len(dates),
+        }
+        results.append(entry)
+        if len(q) < MIN_DAYS:
+            entry['error'] = f'최소 {MIN_DAYS}일 이상의 데이터가 필요합니다.'
+            continue
+        jobs.append((entry, q))
+
+    # 2) 격자 계산 (관측소별 프로세스)
+    args = (method, list(alphas), list(bfi_maxes), passes)
+    if max_workers is None:
+        max_workers = (os.cpu_count() or 1) if len(jobs) >= POOL_MIN_JOBS else 1
+    workers = min(max_workers, len(jobs))
+    if workers <= 1:
+        for entry, q in jobs:
+            entry['grid'] = sweep(q, *args)
+    else:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = [(entry, executor.submit(sweep, q, *args)) for entry, q in jobs]
+            for entry, future in futures:
+                entry['grid'] = future.result()
+
+    logger.info(
+        "기저유출 일괄 분석: stations=%d, computed=%d, grid=%d, workers=%d",
+        len(sources), len(jobs), _grid_size(method, alphas, bfi_maxes), max(workers, 1),
+    )
+    return results
+
+
+def write_csv(results, fp):
+    """일괄 분석 결과를 관측소 × 매개변수 행으로 CSV 기록"""
+    writer = csv.DictWriter(fp, fieldnames=CSV_COLUMNS, extrasaction='ignore')
+    writer.writeheader()
+    for entry in results:
+        for row in entry.get('grid', []):
+            writer.writerow({**entry, **row})
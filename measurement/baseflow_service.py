@@ -0,0 +1,365 @@
+"""
+기저유출 분리 커널
+
+Lyne-Hollick / Eckhardt 재귀 필터를 선형 IIR 필터(scipy.signal.lfilter)로 배열 단위로 계산한다.
+뷰(run_baseflow_analysis), PDF 리포트, 일괄 작업에서 같은 커널을 사용한다.
+
+- Lyne-Hollick: b(i) = α·b(i-1) + (1-α)/2·(Q(i) + Q(i-1))
+  passes=3 이면 전진/후진/전진 3회 통과 (Ladson et al., 2013), 각 통과 전에 양 끝을 반사 패딩
+- Eckhardt: b(i) = ((1-BFImax)·α·b(i-1) + (1-α)·BFImax·Q(i)) / (1 - α·BFImax)
+- 기저유출 제한(clamp)
+  CLAMP_STEP (기본): 기존 반복문과 같이 재귀 내부에서 b(i) = min(b(i), Q(i)) - 제한 지점마다 lfilter 재시작,
+    제한이 촘촘한 구간(잡음 섞인 홍수 수문곡선 등)은 재시작 비용이 더 커서 Python 리스트 반복문으로 계산
+  CLAMP_PASS: 통과가 끝난 뒤 0 ~ 입력 유량 범위로 한 번에 제한 (재귀식에 반영되지 않아 결과가 다름)
+- 감수 상수 추정(estimate_recession): 연속 감소 구간의 저유량 쌍 → 로그 감수율 중앙값 → 권장 α / BFImax
+"""
+import numpy as np
+from scipy import stats
+from scipy.signal import lfilter
+
+METHOD_LYNE_HOLLICK = 'lyne_hollick'
+METHOD_ECKHARDT = 'eckhardt'
+METHODS = (METHOD_LYNE_HOLLICK, METHOD_ECKHARDT)
+
+DEFAULT_ALPHA = 0.925
+DEFAULT_BFI_MAX = 0.80
+
+# 다중 통과 시 양 끝 반사 패딩 길이 (Ladson et al., 2013 권장 30)
+DEFAULT_REFLECT = 30
+
+# 기저유출 제한 방식 (재귀 내부 / 통과 단위)과 재귀 내부 제한 시 lfilter 1회 계산 길이 (최소, 최대)
+CLAMP_STEP = 'step'
+CLAMP_PASS = 'pass'
+CLAMPS = (CLAMP_STEP, CLAMP_PASS)
+CLAMP_MIN_BLOCK = 16
+CLAMP_BLOCK = 4096
+
+# 제한 지점 간격이 CLAMP_DENSE_SPACING 보다 짧은 재시작이 CLAMP_DENSE_HITS 번 이어지면
+# 다음 CLAMP_SCALAR_RUN 개는 lfilter 대신 스칼라 반복문으로 계산 (lfilter 재시작 1회 ≈ 스칼라 수십 개)
+CLAMP_DENSE_SPACING = 64
+CLAMP_DENSE_HITS = 4
+CLAMP_SCALAR_RUN = 2048
+
+# 감수 구간 최소 길이(감소 일수)와 구간 시작에서 제외할 일수 (첨두 직후 직접유출 영향)
+RECESSION_MIN_LENGTH = 5
+RECESSION_SKIP = 2
+
+# 감수율 추정에 쓰는 저유량 쌍 (Q(t) 가 양수 유량의 이 백분위 이하, 부족하면 전체 쌍)
+RECESSION_LOW_FLOW = 30
+RECESSION_MIN_PAIRS = 10
+
+# 권장 α 범위 (슬라이더 범위와 같음)
+ALPHA_RANGE = (0.9, 0.99)
+
+
+def _scalar_recursion(q, b0, b1, a, y_prev, q_prev):
+    """제한 재귀를 Python float 리스트로 계산 (제한이 촘촘한 구간용)"""
+    out = []
+    append = out.append
+    for qi in q:
+        y_prev = b0 * qi + b1 * q_prev + a * y_prev
+        if y_prev > qi:
+            y_prev = qi
+        append(y_prev)
+        q_prev = qi
+    return out
+
+
+def _clamped_recursion(q, b0, b1, a, y0, block=CLAMP_BLOCK):
+    """
+    1차 재귀 y(i) = min(b0·Q(i) + b1·Q(i-1) + a·y(i-1), Q(i)), y(0) = y0 (재귀 내부 제한)
+
+    제한이 걸리지 않는 구간은 lfilter 로 계산하고(제한 없이 지나간 만큼 계산 길이를 두 배씩 늘림,
+    최대 block), 처음 Q 를 넘는 지점에서 y = Q 로 고정한 뒤 그 다음부터 다시 lfilter 를 시작한다. 직전 값이 Q 로 고정된 동안의 다음 값은
+    이력과 무관하게 b0·Q(i) + (b1 + a)·Q(i-1) 이므로, 연속 제한 구간은 한 번에 건너뛴다.
+    제한 지점이 촘촘하게 이어지면 재시작 비용이 계산보다 커지므로 그 다음 구간은 스칼라 반복문으로 계산한다.
+    """
+    n = q.size
+    y = np.empty(n)
+    y[0] = y0
+    # 직전 값이 Q(i-1) 로 고정되었을 때의 후보값과 제한 해제 지점
+    released = np.flatnonzero(~(b0 * q[1:] + (b1 + a) * q[:-1] > q[1:])) + 1
+
+    pos = 1
+    size = CLAMP_MIN_BLOCK
+    dense = 0
+    while pos < n:
+        if dense >= CLAMP_DENSE_HITS:
+            stop = min(pos + CLAMP_SCALAR_RUN, n)
+            y[pos:stop] = _scalar_recursion(
+                q[pos:stop].tolist(), b0, b1, a, float(y[pos - 1]), float(q[pos - 1]),
+            )
+            pos = stop
+            size = CLAMP_MIN_BLOCK
+            dense = 0
+            continue
+
+        stop = min(pos + size, n)
+        zi = [b1 * q[pos - 1] + a * y[pos - 1]]
+        chunk, _ = lfilter([b0, b1], [1.0, -a], q[pos:stop], zi=zi)
+        over = np.flatnonzero(chunk > q[pos:stop])
+        if not over.size:
+            y[pos:stop] = chunk
+            if stop - pos >= CLAMP_DENSE_SPACING:
+                dense = 0
+            pos = stop
+            size = min(size * 2, block)
+            continue
+
+        hit = pos + int(over[0])
+        dense = dense + 1 if hit - pos < CLAMP_DENSE_SPACING else 0
+        y[pos:hit] = chunk[:over[0]]
+        # hit 부터 제한 해제 직전까지 y = Q, 해제 지점은 고정된 직전 값으로 계산
+        k = int(np.searchsorted(released, hit + 1))
+        release = int(released[k]) if k < released.size else n
+        y[hit:release] = q[hit:release]
+        if release < n:
+            y[release] = b0 * q[release] + (b1 + a) * q[release - 1]
+        pos = release + 1
+        size = CLAMP_MIN_BLOCK
+    return y
+
+
+def _lyne_hollick_pass(q, alpha, clamp=CLAMP_STEP):
+    """Lyne-Hollick 1회 전진 통과 (초기값 b(0) = Q(0)/2)"""
+    c = (1 - alpha) / 2
+    if clamp == CLAMP_STEP:
+        return _clamped_recursion(q, c, c, alpha, 0.5 * q[0])
+    zi = [(0.5 - c) * q[0]]
+    baseflow, _ = lfilter([c, c], [1.0, -alpha], q, zi=zi)
+    return np.clip(baseflow, 0.0, q)
+
+
+def lyne_hollick(discharge, alpha=DEFAULT_ALPHA, passes=1, reflect=None, clamp=CLAMP_STEP):
+    """
+    Lyne-Hollick 디지털 필터
+
+    Args:
+        discharge: 유량 배열
+        alpha: 필터 계수 (0.9 ~ 0.99)
+        passes: 통과 횟수 (홀수 번째 전진, 짝수 번째 후진), 표준 3
+        reflect: 양 끝 반사 패딩 길이 (None 이면 다중 통과 시 DEFAULT_REFLECT, 단일 통과 시 0)
+        clamp: CLAMP_STEP (재귀 내부 b ≤ Q, 기본) / CLAMP_PASS (통과 후 0 ~ Q 제한)
+
+    Returns:
+        ndarray: 기저유출 (discharge 와 같은 길이)
+    """
+    q = np.asarray(discharge, dtype=float)
+    if q.size == 0:
+        return q.copy()
+    if reflect is None:
+        reflect = DEFAULT_REFLECT if passes > 1 else 0
+    pad = min(int(reflect), q.size - 1)
+
+    x = np.pad(q, pad, mode='reflect') if pad else q
+    for n in range(passes):
+        if n % 2:
+            x = _lyne_hollick_pass(x[::-1], alpha, clamp)[::-1]
+        else:
+            x = _lyne_hollick_pass(x, alpha, clamp)
+    return x[pad:x.size - pad] if pad else x
+
+
+def eckhardt(discharge, alpha=DEFAULT_ALPHA, bfi_max=DEFAULT_BFI_MAX, clamp=CLAMP_STEP):
+    """
+    Eckhardt 2-매개변수 필터 (초기값 b(0) = BFImax·Q(0))
+
+    Args:
+        discharge: 유량 배열
+        alpha: 감수 상수
+        bfi_max: 최대 BFI
+        clamp: CLAMP_STEP (재귀 내부 b ≤ Q, 기본) / CLAMP_PASS (계산 후 0 ~ Q 제한)
+
+    Returns:
+        ndarray: 기저유출
+    """
+    q = np.asarray(discharge, dtype=float)
+    if q.size == 0:
+        return q.copy()
+    denom = 1 - alpha * bfi_max
+    gain = (1 - alpha) * bfi_max / denom
+    pole = (1 - bfi_max) * alpha / denom
+    if clamp == CLAMP_STEP:
+        return _clamped_recursion(q, gain, 0.0, pole, bfi_max * q[0])
+    baseflow, _ = lfilter([gain], [1.0, -pole], q, zi=[(bfi_max - gain) * q[0]])
+    return np.clip(baseflow, 0.0, q)
+
+
+def separate(discharge, method=METHOD_LYNE_HOLLICK, alpha=DEFAULT_ALPHA, bfi_max=DEFAULT_BFI_MAX,
+             passes=1, reflect=None, clamp=CLAMP_STEP):
+    """
+    방법별 기저유출 분리
+
+    Returns:
+        ndarray: 기저유출
+
+    Raises:
+        ValueError: 지원하지 않는 방법 또는 제한 방식
+    """
+    if clamp not in CLAMPS:
+        raise ValueError('지원하지 않는 기저유출 제한 방식입니다.')
+    if method == METHOD_LYNE_HOLLICK:
+        return lyne_hollick(discharge, alpha, passes=passes, reflect=reflect, clamp=clamp)
+    if method == METHOD_ECKHARDT:
+        return eckhardt(discharge, alpha, bfi_max, clamp=clamp)
+    raise ValueError('지원하지 않는 분석 방법입니다.')
+
+
+def statistics(discharge, baseflow):
+    """
+    분리 결과 통계
+
+    Returns:
+        dict: {total_runoff, baseflow, direct_runoff, bfi}
+    """
+    q = np.asarray(discharge, dtype=float)
+    b = np.asarray(baseflow, dtype=float)
+    total_sum = float(np.sum(q))
+    baseflow_sum = float(np.sum(b))
+    bfi = baseflow_sum / total_sum if total_sum > 0 else 0
+    return {
+        'total_runoff': round(total_sum, 2),
+        'baseflow': round(baseflow_sum, 2),
+        'direct_runoff': round(float(np.sum(q - b)), 2),
+        'bfi': round(bfi, 4),
+    }
+
+
+def sweep(discharge, method=METHOD_LYNE_HOLLICK, alphas=(DEFAULT_ALPHA,), bfi_maxes=(DEFAULT_BFI_MAX,),
+          passes=1, reflect=None, clamp=CLAMP_STEP):
+    """
+    매개변수 격자 분리 (일괄 보정용, Django 의존 없음 - 프로세스 풀 작업 함수)
+
+    Args:
+        discharge: 유량 배열
+        method: 분리 방법
+        alphas: α 후보 목록
+        bfi_maxes: BFImax 후보 목록 (Eckhardt 만 사용)
+        passes, reflect: Lyne-Hollick 통과 횟수 / 반사 패딩
+        clamp: 기저유출 제한 방식
+
+    Returns:
+        list: [{alpha, bfi_max, total_runoff, baseflow, direct_runoff, bfi}, ...]
+    """
+    q = np.asarray(discharge, dtype=float)
+    grid = []
+    for alpha in alphas:
+        for bfi_max in (bfi_maxes if method == METHOD_ECKHARDT else (None,)):
+            baseflow = separate(
+                q, method, alpha=alpha, bfi_max=bfi_max, passes=passes, reflect=reflect, clamp=clamp,
+            )
+            grid.append({'alpha': alpha, 'bfi_max': bfi_max, **statistics(q, baseflow)})
+    return grid
+
+
+def recession_segments(discharge, min_length=RECESSION_MIN_LENGTH):
+    """
+    연속 감소 구간 탐지 (벡터 런렝스)
+
+    Q(i+1) < Q(i) 이고 유량이 양수인 날이 min_length 일 이상 이어지는 구간.
+
+    Returns:
+        tuple: (시작 인덱스 배열, 끝 인덱스 배열) - 끝은 구간 마지막 날 포함
+    """
+    q = np.asarray(discharge, dtype=float)
+    if q.size < 2:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty
+
+    declining = (q[1:] < q[:-1]) & (q[1:] > 0) & np.isfinite(q[1:]) & np.isfinite(q[:-1])
+    edges = np.diff(np.concatenate(([0], declining.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    keep = (ends - starts) >= min_length
+    return starts[keep], ends[keep]
+
+
+def backward_bfi_max(discharge, alpha):
+    """
+    역방향 필터 BFImax (Collischonn & Fan, 2013)
+
+    b(i-1) = min(b(i)/α, Q(i-1)), b(N) = Q(N) 를 로그 공간 역방향 누적 최솟값으로 계산한다.
+    """
+    q = np.asarray(discharge, dtype=float)
+    if q.size == 0 or np.sum(q) <= 0:
+        return 0.0
+    i = np.arange(q.size)
+    with np.errstate(divide='ignore'):
+        scaled = np.log(q) - i * np.log(alpha)
+    log_b = np.minimum.accumulate(scaled[::-1])[::-1] + i * np.log(alpha)
+    return float(np.sum(np.exp(log_b)) / np.sum(q))
+
+
+def estimate_recession(discharge, min_length=RECESSION_MIN_LENGTH, skip=RECESSION_SKIP, confidence=0.95,
+                       low_flow=RECESSION_LOW_FLOW):
+    """
+    감수 상수 추정 (저유량 감수 쌍의 로그 감수율)
+
+    감수 구간의 (Q(t), Q(t+1)) 쌍 중 Q(t) 가 저유량(low_flow 백분위 이하)인 쌍만 골라
+    ln(Q(t+1)/Q(t)) 의 중앙값으로 k 를 구한다. 원점 통과 최소제곱은 쌍마다 Q² 가중이 걸려
+    감수 초기의 직접유출이 k 를 끌어내리므로, 쌍을 같은 가중으로 보는 로그 공간에서 기저유출이 지배하는
+    저유량 쌍만 쓴다. 신뢰구간은 중앙값의 순서통계량(이항분포) 구간이다.
+
+    Args:
+        discharge: 일유량 배열
+        min_length: 감수 구간 최소 감소 일수
+        skip: 각 구간 시작에서 제외할 일수
+        confidence: 신뢰수준
+        low_flow: 저유량 기준 백분위 (100 이면 모든 감수 쌍)
+
+    Returns:
+        dict: {alpha, alpha_ci, bfi_max, bfi_max_ci, k, k_ci, segments, pairs, r2}
+
+    Raises:
+        ValueError: 감수 구간 부족, 또는 k 가 권장 α 범위(ALPHA_RANGE) 밖
+    """
+    q = np.asarray(discharge, dtype=float)
+    starts, ends = recession_segments(q, min_length + skip)
+    if starts.size == 0:
+        raise ValueError('감수 구간을 찾을 수 없습니다. 기간을 늘려 주세요.')
+
+    # 구간 내 (t, t+1) 쌍: 시작 skip 일을 제외한 감소 단계
+    steps = np.zeros(q.size + 1, dtype=np.int64)
+    np.add.at(steps, starts + skip, 1)
+    np.add.at(steps, ends, -1)
+    t = np.flatnonzero(np.cumsum(steps)[:-1] > 0)
+    x, y = q[t], q[t + 1]
+    if x.size < 3:
+        raise ValueError('감수 구간을 찾을 수 없습니다. 기간을 늘려 주세요.')
+
+    low = x <= np.percentile(q[q > 0], low_flow)
+    if np.count_nonzero(low) >= RECESSION_MIN_PAIRS:
+        x, y = x[low], y[low]
+
+    # 로그 감수율 중앙값과 순서통계량 신뢰구간
+    rates = np.sort(np.log(y / x))
+    n = rates.size
+    log_k = float(np.median(rates))
+    j = int(stats.binom.ppf((1 - confidence) / 2, n, 0.5))
+    k = float(np.exp(log_k))
+    k_ci = (float(np.exp(rates[j])), float(np.exp(rates[n - 1 - j])))
+
+    log_x, log_y = np.log(x), np.log(y)
+    residual = log_y - (log_x + log_k)
+    total_ss = float(np.sum((log_y - log_y.mean()) ** 2))
+    r2 = 1 - float(np.dot(residual, residual)) / total_ss if total_ss > 0 else 0.0
+
+    lo, hi = ALPHA_RANGE
+    if not lo <= k <= hi:
+        raise ValueError(
+            f'추정한 감수 상수(k={k:.3f}, {confidence:.0%} CI {k_ci[0]:.3f} ~ {k_ci[1]:.3f})가 '
+            f'권장 α 범위({lo} ~ {hi})를 벗어납니다. α 를 직접 지정해 주세요.'
+        )
+    bfi_ci = tuple(backward_bfi_max(q, a) for a in k_ci)
+
+    return {
+        'alpha': round(k, 4),
+        'alpha_ci': [round(v, 4) for v in k_ci],
+        'bfi_max': round(backward_bfi_max(q, k), 3),
+        'bfi_max_ci': [round(min(bfi_ci), 3), round(max(bfi_ci), 3)],
+        'k': round(k, 5),
+        'k_ci': [round(v, 5) for v in k_ci],
+        'segments': int(starts.size),
+        'pairs': int(n),
+        'r2': round(r2, 4),
+    }
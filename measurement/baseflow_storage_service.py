@@ -0,0 +1,58 @@
+"""
+기저유출 일별 결과 압축 저장
+
+분석 하나의 일별 결과를 시작일(origin) + float32 배열 3개(총유량, 기저유출, 직접유출)로 묶어
+BaseflowAnalysis 한 행의 바이너리 컬럼에 저장한다. 날짜는 origin 부터 하루 간격의 격자 위치로 표현하고,
+자료가 없는 날은 NaN 으로 채운다.
+
+바이트 형식:
+    little-endian float32, (3, 일수) C 순서 → [총유량..., 기저유출..., 직접유출...]
+"""
+import numpy as np
+
+PACKED_DTYPE = np.dtype('<f4')
+PACKED_ROWS = ('total', 'baseflow', 'direct_runoff')
+
+
+def pack_daily(dates, total, baseflow, direct_runoff):
+    """
+    일별 결과 → (시작일, bytes)
+
+    Args:
+        dates: 날짜 목록 (date / datetime64, 순서 무관, 중복 없음)
+        total, baseflow, direct_runoff: 날짜와 같은 길이의 값
+
+    Returns:
+        tuple: (date 또는 None, bytes 또는 None) - 자료가 없으면 (None, None)
+    """
+    days = np.asarray(dates, dtype='datetime64[D]')
+    if days.size == 0:
+        return None, None
+
+    origin = days.min()
+    index = (days - origin).astype(np.int64)
+    grid = np.full((len(PACKED_ROWS), int(index.max()) + 1), np.nan, dtype=PACKED_DTYPE)
+    grid[0, index] = np.asarray(total, dtype=float)
+    grid[1, index] = np.asarray(baseflow, dtype=float)
+    grid[2, index] = np.asarray(direct_runoff, dtype=float)
+    return origin.item(), grid.tobytes()
+
+
+def unpack_daily(origin, packed):
+    """
+    (시작일, bytes) → 일별 결과 배열 (자료 없는 날 제외)
+
+    Returns:
+        dict: {'dates': datetime64[D] 배열, 'total', 'baseflow', 'direct_runoff': float32 배열}
+    """
+    if origin is None or not packed:
+        empty = np.array([], dtype=PACKED_DTYPE)
+        return {'dates': np.array([], dtype='datetime64[D]'), **{name: empty for name in PACKED_ROWS}}
+
+    grid = np.frombuffer(bytes(packed), dtype=PACKED_DTYPE).reshape(len(PACKED_ROWS), -1)
+    valid = ~np.isnan(grid[0])
+    dates = np.datetime64(origin, 'D') + np.arange(grid.shape[1])
+    series = {'dates': dates[valid]}
+    for name, row in zip(PACKED_ROWS, grid):
+        series[name] = row[valid]
+    return series
@@ -0,0 +1,302 @@
+"""
+측정 세션 단면/유속 차트 생성 서비스
+
+분석결과표 Excel 에 넣는 차트(15x4.5in PNG)를 만든다.
+    - 한글 폰트 탐색/등록은 프로세스당 한 번만 수행
+    - PNG 는 rows_data + 제목 해시로 디스크(CHART_CACHE_DIR)에 캐시 (purge_cache 로 오래된 파일 정리)
+    - 캐시에 없는 차트는 spawn 프로세스 풀에서 병렬 렌더링
+
+render_chart() 는 Django 에 의존하지 않으므로 작업자 프로세스에서 바로 호출할 수 있다.
+"""
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from itertools import chain, islice
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CHART_VERSION = 1  # 차트 모양이 바뀌면 올려서 캐시 무효화
+CHART_SIZE = (15, 4.5)
+CHART_DPI = 100
+PARALLEL_MIN = 4  # 캐시 미스가 이보다 적으면 현재 프로세스에서 렌더링
+
+SYSTEM_FONT_PATHS = (
+    '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+    'C:/Windows/Fonts/malgun.ttf',
+)
+
+_font_family = None
+
+
+def font_paths():
+    """한글 폰트 후보 (프로젝트 static 폰트 우선)"""
+    from django.conf import settings
+
+    return [os.path.join(settings.BASE_DIR, 'static', 'fonts', 'NotoSansKR-Regular.ttf'), *SYSTEM_FONT_PATHS]
+
+
+def init_fonts(paths=SYSTEM_FONT_PATHS):
+    """matplotlib 한글 폰트 설정 (프로세스당 한 번)"""
+    global _font_family
+    if _font_family is not None:
+        return _font_family
+
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.font_manager as fm
+    import matplotlib.pyplot as plt
+
+    family = 'DejaVu Sans'
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        try:
+            fm.fontManager.addfont(path)
+            family = fm.FontProperties(fname=path).get_name()
+            break
+        except Exception as e:
+            logger.warning("차트 폰트 등록 실패: %s (%s)", path, e)
+
+    plt.rcParams['font.family'] = family
+    plt.rcParams['axes.unicode_minus'] = False
+    _font_family = family
+    logger.debug("차트 폰트: %s", family)
+    return family
+
+
+def session_title(session):
+    """차트 제목: 관측소명 (위치) - 측정일"""
+    loc_desc = session.setup_data.get('location_desc', '') if session.setup_data else ''
+    date_str = session.measurement_date.strftime('%Y-%m-%d') if session.measurement_date else ''
+    title = f"{session.station_name or 'Station'}"
+    if loc_desc:
+        title += f" ({loc_desc})"
+    if date_str:
+        title += f" - {date_str}"
+    return title
+
+
+def chart_key(rows_data, title):
+    """캐시 키: rows_data + 제목 SHA-256"""
+    payload = json.dumps([CHART_VERSION, rows_data or [], title], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def chart_series(rows_data):
+    """rows_data → (거리, 수심(음수), 유속) - 그릴 수 없으면 None"""
+    rows = rows_data or []
+    if len(rows) < 2:
+        return None
+
+    distances = [float(r.get('distance') or 0) for r in rows]
+    depths = [-float(r.get('depth') or 0) for r in rows]
+    velocities = [float(r.get('velocity') or 0) for r in rows]
+    if max(depths) == min(depths) == 0:
+        return None
+    return distances, depths, velocities
+
+
+def render_chart(rows_data, title):
+    """
+    단면(수심) + 유속 차트 PNG
+
+    Returns:
+        bytes 또는 None (측선 부족, 수심 자료 없음)
+    """
+    series = chart_series(rows_data)
+    if series is None:
+        return None
+    distances, depths, velocities = series
+
+    init_fonts()
+    import matplotlib.pyplot as plt
+
+    fig, ax1 = plt.subplots(figsize=CHART_SIZE, dpi=CHART_DPI)
+    try:
+        # 유속 (왼쪽 Y축)
+        ax1.plot(distances, velocities, color='#ef4444', linewidth=2, marker='o', markersize=4, label='Velocity')
+        ax1.set_xlabel('Distance (m)', fontsize=9)
+        ax1.set_ylabel('Velocity (m/s)', color='#ef4444', fontsize=9)
+        ax1.tick_params(axis='y', labelcolor='#ef4444')
+        max_vel = max(velocities)
+        ax1.set_ylim(0, max_vel * 1.3 if max_vel > 0 else 1)
+        ax1.grid(True, linestyle='--', alpha=0.5, color='gray')
+        ax1.set_axisbelow(True)
+
+        # 수심 (오른쪽 Y축)
+        ax2 = ax1.twinx()
+        ax2.fill_between(distances, depths, 0, alpha=0.3, color='#1e3a5f', label='Depth')
+        ax2.plot(distances, depths, color='#1e3a5f', linewidth=2)
+        ax2.set_ylabel('Depth (m)', color='#1e3a5f', fontsize=9)
+        ax2.tick_params(axis='y', labelcolor='#1e3a5f')
+        min_depth = min(depths)
+        ax2.set_ylim(min_depth * 1.2 if min_depth < 0 else -1, 0.1)
+        ax2.axhline(y=0, color='#3b82f6', linewidth=1.5)
+
+        ax1.set_title(title, fontsize=10, fontweight='bold')
+
+        # 범례 (오른쪽 아래)
+        lines1, labels1 = ax1.get_legend_handles_labels()
+        lines2, labels2 = ax2.get_legend_handles_labels()
+        ax1.legend(lines1 + lines2, labels1 + labels2, loc='lower right', fontsize=10)
+
+        fig.tight_layout()
+        buffer = BytesIO()
+        fig.savefig(buffer, format='png', bbox_inches='tight', facecolor='white')
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def _safe_render(key, rows_data, title):
+    """작업자용: 예외를 로그로 남기고 None 반환"""
+    try:
+        return render_chart(rows_data, title)
+    except Exception:
+        logger.exception("차트 생성 실패: key=%s", key)
+        return None
+
+
+def _cache_dir():
+    from django.conf import settings
+
+    return Path(getattr(settings, 'CHART_CACHE_DIR', Path(settings.BASE_DIR) / 'cache' / 'charts'))
+
+
+def _cache_path(key):
+    return _cache_dir() / key[:2] / f'{key}.png'
+
+
+def cache_get(key):
+    """캐시된 PNG (없으면 None)"""
+    try:
+        return _cache_path(key).read_bytes()
+    except OSError:
+        return None
+
+
+def cache_put(key, png):
+    """PNG 캐시 기록 (임시 파일 → rename 으로 원자적 교체)"""
+    path = _cache_path(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(png)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning("차트 캐시 기록 실패: %s (%s)", path, e)
+
+
+def purge_cache(days):
+    """
+    기록한 지 days 일이 지난 차트 캐시 파일(남은 임시 파일 포함) 삭제
+
+    Returns:
+        int: 삭제한 파일 수
+    """
+    root = _cache_dir()
+    if not root.exists():
+        return 0
+
+    cutoff = time.time() - days * 86400
+    deleted = 0
+    for path in chain(root.glob('*/*.png'), root.glob('*/*.tmp')):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                deleted += 1
+        except OSError as e:
+            logger.warning("차트 캐시 삭제 실패: %s (%s)", path, e)
+    for directory in root.iterdir():
+        if directory.is_dir() and not any(directory.iterdir()):
+            directory.rmdir()
+    return deleted
+
+
+def _render_jobs(jobs, max_workers):
+    """(key, rows_data, title) 작업 → (key, PNG 또는 None), 진행 중 작업은 작업자 수의 2배까지만 유지"""
+    head = list(islice(jobs, PARALLEL_MIN))
+    if not head:
+        return
+    jobs = chain(head, jobs)
+    workers = max(max_workers or os.cpu_count() or 1, 1)
+
+    if len(head) < PARALLEL_MIN or workers <= 1:
+        init_fonts(font_paths())
+        for key, rows_data, title in jobs:
+            yield key, _safe_render(key, rows_data, title)
+        return
+
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=context, initializer=init_fonts, initargs=(font_paths(),),
+    ) as executor:
+        in_flight = deque()
+        for key, rows_data, title in jobs:
+            in_flight.append((key, executor.submit(_safe_render, key, rows_data, title)))
+            if len(in_flight) >= workers * 2:
+                key, future = in_flight.popleft()
+                yield key, future.result()
+        while in_flight:
+            key, future = in_flight.popleft()
+            yield key, future.result()
+
+
+def session_chart_paths(sessions, max_workers=None):
+    """
+    세션 차트 PNG 캐시 파일 경로 (캐시에 없으면 렌더링 후 기록)
+
+    Args:
+        sessions: MeasurementSession 목록 또는 iterator (rows_data, station_name, setup_data, measurement_date 필요)
+        max_workers: 렌더링 프로세스 수 (기본: CPU 수)
+
+    Returns:
+        dict: {session.pk: Path} - 그릴 수 없거나 캐시 기록에 실패한 세션은 제외
+    """
+    keys = {}
+    cached = []
+
+    def misses():
+        seen = set()
+        for session in sessions:
+            rows_data = session.rows_data or []
+            try:
+                if chart_series(rows_data) is None:
+                    continue
+            except (TypeError, ValueError, AttributeError):
+                # 숫자로 변환되지 않는 측선 값 - 이 세션 차트만 건너뜀
+                logger.warning("차트 자료 변환 실패: session=%s", session.pk)
+                continue
+            title = session_title(session)
+            key = chart_key(rows_data, title)
+            keys[session.pk] = key
+            if key in seen:
+                continue
+            seen.add(key)
+            if _cache_path(key).exists():
+                cached.append(key)
+                continue
+            yield key, rows_data, title
+
+    rendered = 0
+    for key, png in _render_jobs(misses(), max_workers):
+        rendered += 1
+        if png is not None:
+            cache_put(key, png)
+
+    paths = {pk: _cache_path(key) for pk, key in keys.items()}
+    paths = {pk: path for pk, path in paths.items() if path.exists()}
+    logger.info(
+        "세션 차트 준비: sessions=%d, cached=%d, rendered=%d", len(keys), len(cached), rendered,
+    )
+    return paths
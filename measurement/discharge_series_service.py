@@ -0,0 +1,211 @@
+"""
+유량 시계열 생성 서비스
+
+수위 시계열(WaterLevelTimeSeries)을 시각 기준 키셋 페이지네이션으로 청크 단위 조회하고,
+Rating Curve 엔진(rating_service)으로 유량과 품질 플래그를 NumPy 로 일괄 계산한 뒤
+DischargeTimeSeries 에 청크별로 업서트한다. 메모리 사용량은 청크 크기로 고정된다.
+
+Parquet 아카이브로 옮겨진 수위 월의 유량은 DB 로 되돌리지 않고 유량 아카이브 월 파일에 병합한다.
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+
+from .rating_service import (
+    FLAG_EXTRAPOLATED, FLAG_NAMES, FLAG_SUSPECT, compile_curves, get_station_rating,
+)
+
+logger = logging.getLogger(__name__)
+
+# 청크 크기 (조회 행 수 / bulk_create 배치 크기)
+DEFAULT_CHUNK_SIZE = 20000
+DEFAULT_BATCH_SIZE = 5000
+
+
+def iter_stage_chunks(station, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    수위 시계열 키셋 페이지네이션 조회 (시각 오름차순)
+
+    Parquet 아카이브로 옮겨진 월은 월 파일 단위로 먼저 읽고(DB 에도 있는 시각은 제외),
+    DB 는 (station, timestamp) 가 유일하므로 마지막 시각 이후를 조회하는 방식으로
+    OFFSET 없이 일정한 비용으로 다음 청크를 가져온다.
+
+    Yields:
+        tuple: (시각 리스트, 수위 배열, 아카이브 (연, 월) - DB 청크는 None)
+    """
+    from .models import WaterLevelTimeSeries
+    from .timeseries_archive_service import WATERLEVEL, month_bounds, read_archive, station_months
+
+    for year, month in station_months(WATERLEVEL, station.pk):
+        start, end = month_bounds(year, month)
+        frame = read_archive(WATERLEVEL, station.pk, start, end, columns=['stage'])
+        frame = frame[frame['stage'].notna() & (frame['timestamp'] < end)]
+        hot = set(
+            WaterLevelTimeSeries.objects
+            .filter(station=station, timestamp__gte=start, timestamp__lt=end)
+            .values_list('timestamp', flat=True)
+        )
+        timestamps = [ts.to_pydatetime() for ts in frame['timestamp']]
+        keep = np.fromiter((ts not in hot for ts in timestamps), dtype=bool, count=len(timestamps))
+        if keep.any():
+            yield (
+                [ts for ts, k in zip(timestamps, keep) if k], frame['stage'].to_numpy(dtype=float)[keep],
+                (year, month),
+            )
+
+    queryset = (
+        WaterLevelTimeSeries.objects
+        .filter(station=station, stage__isnull=False)
+        .order_by('timestamp')
+    )
+    last_timestamp = None
+
+    while True:
+        page = queryset
+        if last_timestamp is not None:
+            page = page.filter(timestamp__gt=last_timestamp)
+        rows = list(page.values_list('timestamp', 'stage')[:chunk_size])
+        if not rows:
+            return
+
+        timestamps, stages = zip(*rows)
+        yield list(timestamps), np.fromiter(stages, dtype=float, count=len(stages)), None
+
+        if len(rows) < chunk_size:
+            return
+        last_timestamp = timestamps[-1]
+
+
+def _upsert_chunk(station, timestamps, stages, discharge, flags, curve_ids, batch_size):
+    """청크 결과를 DischargeTimeSeries 에 업서트"""
+    from .models import DischargeTimeSeries
+
+    records = [
+        DischargeTimeSeries(
+            station=station,
+            timestamp=ts,
+            stage=stage,
+            discharge=q,
+            rating_curve_id=curve_id,
+            quality_flag=flag,
+        )
+        for ts, stage, q, flag, curve_id in zip(
+            timestamps, stages.tolist(), discharge.tolist(), FLAG_NAMES[flags].tolist(), curve_ids.tolist()
+        )
+    ]
+    with transaction.atomic():
+        DischargeTimeSeries.objects.bulk_create(
+            records,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['station', 'timestamp'],
+            update_fields=['stage', 'discharge', 'rating_curve', 'quality_flag'],
+        )
+
+
+def _merge_archived_chunk(station, month, timestamps, stages, discharge, flags, curve_ids):
+    """아카이브된 수위 월의 결과를 유량 아카이브 월 파일에 병합 (DischargeTimeSeries 에 쓰지 않음)"""
+    from .timeseries_archive_service import DISCHARGE, merge_month
+
+    frame = pd.DataFrame({
+        'timestamp': pd.to_datetime(timestamps, utc=True),
+        'stage': stages,
+        'discharge': discharge,
+        'rating_curve_id': pd.array(curve_ids.tolist(), dtype='Int64'),
+        'quality_flag': FLAG_NAMES[flags],
+    })
+    merge_month(DISCHARGE, station.pk, *month, frame)
+
+
+def generate_discharge_series(station, rating_curve=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                              batch_size=DEFAULT_BATCH_SIZE):
+    """
+    관측소 수위 시계열 전체에 Rating Curve 를 적용하여 유량 시계열 생성/갱신
+
+    Args:
+        station: Station 인스턴스
+        rating_curve: 적용할 RatingCurve (None 이면 관측소 전체 곡선을 시각별로 적용)
+        chunk_size: 청크 행 수
+        batch_size: bulk_create 배치 크기
+
+    Returns:
+        dict: {count, archived, extrapolated, suspect, chunks} - archived 는 유량 아카이브에 병합한 행 수
+    """
+    rating = compile_curves([rating_curve]) if rating_curve else get_station_rating(station.pk)
+    if not rating:
+        raise ValueError('해당 관측소에 Rating Curve가 없습니다.')
+
+    stats = {'count': 0, 'archived': 0, 'extrapolated': 0, 'suspect': 0, 'chunks': 0}
+
+    for timestamps, stages, month in iter_stage_chunks(station, chunk_size):
+        discharge, flags, segments = rating.evaluate_at(timestamps, stages)
+        discharge = np.round(discharge, 4)
+        if month is not None:
+            _merge_archived_chunk(station, month, timestamps, stages, discharge, flags, rating.curve_ids[segments])
+            stats['archived'] += len(timestamps)
+        else:
+            _upsert_chunk(
+                station, timestamps, stages, discharge, flags, rating.curve_ids[segments], batch_size,
+            )
+
+        stats['count'] += len(timestamps)
+        stats['extrapolated'] += int(np.count_nonzero(flags == FLAG_EXTRAPOLATED))
+        stats['suspect'] += int(np.count_nonzero(flags == FLAG_SUSPECT))
+        stats['chunks'] += 1
+
+    logger.info(
+        "유량 시계열 생성: station=%s, curve=%s, count=%d, extrapolated=%d",
+        station.pk, rating_curve.pk if rating_curve else 'all', stats['count'], stats['extrapolated'],
+    )
+    return stats
+
+
+def daily_discharge(station, start, end, quality_flag='good'):
+    """
+    일평균 수위에 Rating Curve 를 적용한 일유량 (기저유출 분석 입력)
+
+    Args:
+        station: Station 인스턴스
+        start, end: 기간 (aware datetime)
+        quality_flag: 수위 품질 플래그 필터
+
+    Returns:
+        tuple: (날짜 목록, 유량 배열)
+
+    Raises:
+        ValueError: Rating Curve 가 없음
+    """
+    from .timeseries_archive_service import daily_mean_stage
+
+    # Rating Curve 경계표 (연도별 유효 곡선 적용)
+    rating = get_station_rating(station.pk)
+    if not rating:
+        raise ValueError('해당 관측소에 Rating Curve가 없습니다.')
+
+    daily_stages = daily_mean_stage(station.pk, start, end, quality_flag=quality_flag)
+    dates = [item['date'] for item in daily_stages]
+    if not dates:
+        return dates, np.array([], dtype=float)
+
+    discharge, _, _ = rating.evaluate_at(dates, [item['avg_stage'] for item in daily_stages])
+    return dates, discharge
+
+
+def daily_stored_discharge(station, start, end, quality_flag=None):
+    """
+    저장된 유량 시계열(DischargeTimeSeries + 아카이브)의 일평균 유량
+
+    Args:
+        station: Station 인스턴스
+        start, end: 기간 (aware datetime)
+        quality_flag: 유량 품질 플래그 필터 (None 이면 전체)
+
+    Returns:
+        tuple: (날짜 목록, 유량 배열)
+    """
+    from .timeseries_archive_service import DISCHARGE, daily_mean
+
+    daily = daily_mean(DISCHARGE, station.pk, start, end, 'discharge', quality_flag)
+    return [day for day, _ in daily], np.array([value for _, value in daily], dtype=float)
@@ -0,0 +1,455 @@
+"""
+유량 계산 엔진 (ISO 748 중앙단면법, NumPy 컬럼 연산)
+
+측선 데이터(rows_data)를 (세션 × 측선) 2차원 배열로 변환한 뒤
+유속, 구간 단면적/유량, 불확실도 구성요소를 한 번에 계산한다.
+단일 세션 계산(calculate_discharge)과 다수 세션 일괄 계산(calculate_discharge_batch)은
+같은 커널을 사용하며, 결과는 기존 views.calculate_discharge 와 동일하다.
+"""
+import math
+
+import numpy as np
+
+# 기본 검정계수 (세션에 검정계수가 없을 때)
+DEFAULT_CALIBRATION = {'a': 0.0012, 'b': 0.2534}
+
+# 측정법 코드 (0: 유속 측정 없음 - LEW/REW 등)
+METHOD_CODES = {'1': 1, '2': 2, '3': 3}
+
+# Xp: 측점수 불확실도 (1점법: 15%, 2점법: 7%, 3점법: 6.33%)
+METHOD_XP = {'1': 15.0, '2': 7.0, '3': 6.33}
+
+# X2Q: 계통 불확실도 (폭 0.5%, 수심 0.5%, 기타 1.0%) = 1.22%
+X2B, X2D, X2C = 0.5, 0.5, 1.0
+X2Q = math.sqrt(X2B**2 + X2D**2 + X2C**2)
+
+# 회전수/시간 컬럼 (측점별)
+COUNT_FIELDS = ('n_02d', 't_02d', 'n_06d', 't_06d', 'n_08d', 't_08d')
+FLOAT_COLUMNS = ('distance', 'depth', 'a', 'b', 'meter_unc', 'index_value') + COUNT_FIELDS
+
+
+def _count_value(value):
+    """회전수/시간 값 변환 (빈 값은 0, 변환 불가 값은 NaN → 유속 0 처리)"""
+    if value.__class__ is int or value.__class__ is float:
+        return float(value)
+    try:
+        return float(value) if value else 0.0
+    except (ValueError, TypeError):
+        return math.nan
+
+
+def _coef_value(value):
+    """검정계수 변환 (숫자가 아니면 NaN → 유속 0 처리, 기존 계산과 동일)"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    return math.nan
+
+
+def _meters_lookup(meters, default_a, default_b):
+    """유속계 목록을 {id: (a, b, uncertainty)} 딕셔너리로 변환"""
+    lookup = {}
+    for m in meters or []:
+        lookup[m.get('id')] = (
+            m.get('a', default_a),
+            m.get('b', default_b),
+            m.get('uncertainty', 1.0),
+        )
+    return lookup
+
+
+def build_columns(rows_list, calibrations, meters_list):
+    """
+    측선 데이터 → (세션 × 측선) 컬럼 배열 변환
+
+    짧은 세션은 0으로 채우고 mask로 구분한다.
+
+    Args:
+        rows_list: 세션별 측선 데이터 리스트
+        calibrations: 세션별 기본 검정계수 리스트
+        meters_list: 세션별 유속계 목록 리스트 (없으면 None)
+
+    Returns:
+        dict: 컬럼 배열과 출력용 메타 정보
+    """
+    n_sessions = len(rows_list)
+    lengths = np.array([len(rows) for rows in rows_list], dtype=np.int64)
+    width = int(lengths.max()) if n_sessions else 0
+
+    # 전체 측선을 평탄화한 레코드(FLOAT_COLUMNS 순서)로 수집 후 한 번에 배열 변환
+    records = []
+    method_codes = []
+    meta = []
+    count_value = _count_value
+
+    for s, rows in enumerate(rows_list):
+        calibration = calibrations[s] or DEFAULT_CALIBRATION
+        default_a = calibration.get('a', 0.0012)
+        default_b = calibration.get('b', 0.2534)
+        default_coef = (_coef_value(default_a), _coef_value(default_b), 1.0)
+        meters = _meters_lookup(meters_list[s] if meters_list else None, default_a, default_b)
+
+        session_meta = []
+        for row in rows:
+            get = row.get
+            method = get('method', '1')
+            meter_id = get('meter_id')
+
+            if meter_id and meter_id in meters:
+                a, b, meter_unc = meters[meter_id]
+                coef = (_coef_value(a), _coef_value(b), float(meter_unc))
+            else:
+                coef = default_coef
+
+            index_value = float(get('index_value', 1.0) or 1.0)
+            angle_deg = float(get('angle_deg', 0) or 0)
+            if angle_deg > 0:
+                # cos(θ) 는 math 로 계산 (기존 결과와 비트 단위 일치)
+                index_value = math.cos(math.radians(angle_deg))
+
+            records.append((
+                float(get('distance', 0) or 0),
+                float(get('depth', 0) or 0),
+                *coef,
+                index_value,
+                count_value(get('n_02d')), count_value(get('t_02d')),
+                count_value(get('n_06d')), count_value(get('t_06d')),
+                count_value(get('n_08d')), count_value(get('t_08d')),
+            ))
+            method_codes.append(METHOD_CODES.get(method, 0) if isinstance(method, str) else 0)
+            session_meta.append((meter_id, angle_deg, method))
+        meta.append(session_meta)
+
+    # (세션 × 측선) 배열로 배치 - mask 의 행 우선 순서가 평탄화 순서와 같다
+    mask = np.arange(width)[None, :] < lengths[:, None]
+    table = np.array(records, dtype=float).reshape(-1, len(FLOAT_COLUMNS))
+    cols = {}
+    for k, name in enumerate(FLOAT_COLUMNS):
+        cols[name] = np.zeros(mask.shape)
+        cols[name][mask] = table[:, k]
+    method_code = np.zeros(mask.shape, dtype=np.int8)
+    method_code[mask] = method_codes
+
+    cols['method_code'] = method_code
+    cols['mask'] = mask
+    cols['lengths'] = lengths
+    cols['meta'] = meta
+    return cols
+
+
+def _point_velocity(n, t, a, b):
+    """프로펠러 유속계 유속: V = a + b * (N/T), 회전수 또는 시간이 0이면 0"""
+    valid = (n != 0) & (t != 0) & ~np.isnan(n) & ~np.isnan(t) & ~np.isnan(a) & ~np.isnan(b)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v = a + b * (n / t)
+    return np.where(valid, v, 0.0)
+
+
+def _sequential_sum(values):
+    """
+    행별 순차 합계 (측선 순서대로 누적)
+
+    기존 Python 루프와 동일한 덧셈 순서를 유지해 합계가 비트 단위로 일치한다.
+    열(측선) 수만큼만 반복하고 각 반복은 모든 세션에 대해 벡터 연산한다.
+    """
+    total = np.zeros(values.shape[0])
+    for j in range(values.shape[1]):
+        total = total + values[:, j]
+    return total
+
+
+def _compensated_sum(values):
+    """
+    행별 보정 합계 (Python 3.12+ 내장 sum()의 Neumaier 보정합과 동일)
+
+    평균 계산에 sum()을 쓰던 Xp, Xc 와 결과를 일치시키기 위해 사용한다.
+    """
+    total = np.zeros(values.shape[0])
+    comp = np.zeros(values.shape[0])
+    for j in range(values.shape[1]):
+        x = values[:, j]
+        t = total + x
+        comp = comp + np.where(np.abs(total) >= np.abs(x), (total - t) + x, (x - t) + total)
+        total = t
+    return np.where((comp != 0) & np.isfinite(comp), total + comp, total)
+
+
+def compute_columns(cols):
+    """
+    컬럼 배열로 유속, 구간 단면적/유량, 불확실도 구성요소 일괄 계산
+
+    Returns:
+        dict: 측선별 배열 (세션 × 측선) 과 세션별 배열
+    """
+    mask = cols['mask']
+    a, b = cols['a'], cols['b']
+    code = cols['method_code']
+
+    # 측선별 유속
+    v02 = _point_velocity(cols['n_02d'], cols['t_02d'], a, b)
+    v06 = _point_velocity(cols['n_06d'], cols['t_06d'], a, b)
+    v08 = _point_velocity(cols['n_08d'], cols['t_08d'], a, b)
+
+    velocity = np.select(
+        [
+            code == 1,
+            (code == 2) & (v02 != 0) & (v08 != 0),
+            (code == 3) & (v02 != 0) & (v06 != 0) & (v08 != 0),
+        ],
+        [v06, (v02 + v08) / 2, (v02 + 2 * v06 + v08) / 4],
+        default=0.0,
+    )
+    velocity = np.where(velocity > 0, velocity * cols['index_value'], velocity)
+    velocity = np.where(mask, velocity, 0.0)
+
+    # 중앙단면법 구간 계산 (j번째 측선에 j-1 ~ j 구간 값 저장)
+    distance, depth = cols['distance'], cols['depth']
+    section_mask = np.zeros_like(mask)
+    section_mask[:, 1:] = mask[:, 1:]
+
+    width = np.zeros_like(distance)
+    area = np.zeros_like(distance)
+    discharge = np.zeros_like(distance)
+    width[:, 1:] = distance[:, 1:] - distance[:, :-1]
+    area[:, 1:] = width[:, 1:] * ((depth[:, 1:] + depth[:, :-1]) / 2)
+    discharge[:, 1:] = area[:, 1:] * ((velocity[:, 1:] + velocity[:, :-1]) / 2)
+    width = np.where(section_mask, width, 0.0)
+    area = np.where(section_mask, area, 0.0)
+    discharge = np.where(section_mask, discharge, 0.0)
+
+    total_area = _sequential_sum(area)
+    total_discharge = _sequential_sum(discharge)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(
+            (total_discharge > 0)[:, None] & mask,
+            (discharge / total_discharge[:, None]) * 100,
+            0.0,
+        )
+        avg_velocity = np.where(total_area > 0, total_discharge / total_area, 0.0)
+
+    positive = (velocity > 0) & mask
+    has_positive = positive.any(axis=1)
+    max_velocity = np.where(has_positive, np.where(positive, velocity, -np.inf).max(axis=1, initial=-np.inf), 0.0)
+    min_velocity = np.where(has_positive, np.where(positive, velocity, np.inf).min(axis=1, initial=np.inf), 0.0)
+
+    has_rows = cols['lengths'] > 0
+    total_width = np.where(
+        has_rows,
+        np.where(mask, distance, -np.inf).max(axis=1, initial=-np.inf)
+        - np.where(mask, distance, np.inf).min(axis=1, initial=np.inf),
+        0.0,
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_depth = np.where(total_width > 0, total_area / total_width, 0.0)
+
+    # ----- ISO 748 불확실도 -----
+    n_verticals = positive.sum(axis=1)
+
+    # Xm: 측선수 불확실도
+    Xm = np.select(
+        [n_verticals >= 25, n_verticals >= 20, n_verticals >= 15, n_verticals >= 10, n_verticals >= 5],
+        [0.5, 1.0, 1.5, 2.0, 3.0],
+        default=5.0,
+    )
+
+    # Xp: 측정법별 측점수 불확실도 평균
+    method_mask = (code > 0) & mask
+    xp_values = np.select(
+        [code == 1, code == 2, code == 3],
+        [METHOD_XP['1'], METHOD_XP['2'], METHOD_XP['3']],
+        default=0.0,
+    )
+    n_methods = method_mask.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Xp = np.where(n_methods > 0, _compensated_sum(np.where(method_mask, xp_values, 0.0)) / n_methods, 15.0)
+
+        # Xc: 유속 측선의 유속계 검정 불확실도 평균
+        Xc = np.where(
+            n_verticals > 0,
+            _compensated_sum(np.where(positive, cols['meter_unc'], 0.0)) / n_verticals,
+            1.0,
+        )
+
+    # Xe: 평균유속에 따른 측점 불확실도
+    Xe = np.select(
+        [avg_velocity >= 1.0, avg_velocity >= 0.5, avg_velocity >= 0.2],
+        [1.5, 2.0, 3.0],
+        default=5.0,
+    )
+
+    # X1Q = sqrt(Xm² + (Xe² + Xp² + Xc²) / n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        X1Q = np.where(
+            n_verticals > 0,
+            np.sqrt(Xm**2 + (Xe**2 + Xp**2 + Xc**2) / n_verticals),
+            np.sqrt(Xm**2 + Xe**2 + Xp**2 + Xc**2),
+        )
+
+    combined_uncertainty = np.sqrt(X1Q**2 + X2Q**2)
+    expanded_uncertainty = combined_uncertainty * 2
+    uncertainty_abs = total_discharge * expanded_uncertainty / 100
+
+    quality_grade = np.select(
+        [expanded_uncertainty <= 5, expanded_uncertainty <= 8, expanded_uncertainty <= 10],
+        ['E', 'G', 'F'],
+        default='P',
+    )
+
+    return {
+        # 측선별 (세션 × 측선)
+        'velocity': velocity,
+        'width': width,
+        'area': area,
+        'discharge': discharge,
+        'ratio': ratio,
+        # 세션별
+        'total_discharge': total_discharge,
+        'total_area': total_area,
+        'avg_velocity': avg_velocity,
+        'max_velocity': max_velocity,
+        'min_velocity': min_velocity,
+        'total_width': total_width,
+        'avg_depth': avg_depth,
+        'n_verticals': n_verticals,
+        'Xe': Xe,
+        'Xp': Xp,
+        'Xc': Xc,
+        'Xm': Xm,
+        'X1Q': X1Q,
+        'combined_uncertainty': combined_uncertainty,
+        'expanded_uncertainty': expanded_uncertainty,
+        'uncertainty_abs': uncertainty_abs,
+        'quality_grade': quality_grade,
+    }
+
+
+def _session_verticals(cols, out, s):
+    """s번째 세션의 측선별 상세 결과 (기존 verticals 형식)"""
+    n_rows = cols['lengths'][s]
+    total_discharge = out['total_discharge'][s]
+    meta = cols['meta'][s]
+    distance, depth, index_value = cols['distance'][s], cols['depth'][s], cols['index_value'][s]
+    velocity, width, area = out['velocity'][s], out['width'][s], out['area'][s]
+    discharge, ratio = out['discharge'][s], out['ratio'][s]
+
+    verticals = []
+    for i in range(n_rows):
+        meter_id, angle_deg, method = meta[i]
+        vertical = {
+            'id': i + 1,
+            'distance': distance[i],
+            'depth': depth[i],
+            'meter_id': meter_id,
+            'angle_deg': angle_deg,
+            'index_value': round(index_value[i], 4),
+            'velocity': velocity[i] if velocity[i] != 0 else 0,
+            'method': method,
+            'area': 0,
+            'discharge': 0,
+            'ratio': 0,
+        }
+        if i > 0:
+            vertical['width'] = width[i]
+            vertical['area'] = area[i]
+            vertical['discharge'] = discharge[i]
+        if total_discharge > 0:
+            vertical['ratio'] = ratio[i]
+        verticals.append(vertical)
+    return verticals
+
+
+def _session_result(cols, out, s, include_verticals=True):
+    """
+    s번째 세션의 계산 결과를 기존 calculate_discharge 형식의 dict로 변환
+
+    cols/out 은 tolist() 로 변환된 Python 리스트를 받는다 (numpy 스칼라 접근 비용 제거).
+    """
+    n_rows = cols['lengths'][s]
+    total_discharge = out['total_discharge'][s]
+
+    # 값이 계산되지 않은 경우 기존과 같이 정수 0 반환
+    has_sections = n_rows > 1
+    has_velocity = out['n_verticals'][s] > 0
+    total_area = out['total_area'][s] if has_sections else 0
+    total_width = out['total_width'][s] if n_rows else 0
+    if not has_sections:
+        total_discharge = 0
+
+    # 유량 일 단위 환산 (m³/s → m³/d)
+    discharge_daily = round(total_discharge * 86400, 0)
+
+    return {
+        'discharge': round(total_discharge, 3),
+        'discharge_daily': f"{discharge_daily:,.0f}",  # 천 단위 구분 포맷
+        'area': round(total_area, 2),
+        'avg_velocity': round(out['avg_velocity'][s], 3) if total_area > 0 else 0,
+        'max_velocity': round(out['max_velocity'][s], 3) if has_velocity else 0,
+        'min_velocity': round(out['min_velocity'][s], 3) if has_velocity else 0,
+        'width': round(total_width, 1),
+        'avg_depth': round(out['avg_depth'][s], 2) if total_width > 0 else 0,
+        'uncertainty': round(out['expanded_uncertainty'][s], 1),
+        'uncertainty_abs': round(out['uncertainty_abs'][s], 3),
+        # 불확실도 상세 구성요소
+        'Xe': round(out['Xe'][s], 2),
+        'Xp': round(out['Xp'][s], 2),
+        'Xc': round(out['Xc'][s], 2),
+        'Xm': round(out['Xm'][s], 2),
+        'X1Q': round(out['X1Q'][s], 2),  # 랜덤 불확실도
+        'X2Q': round(X2Q, 2),  # 계통 불확실도
+        'combined_uncertainty': round(out['combined_uncertainty'][s], 2),
+        'quality_grade': out['quality_grade'][s],
+        'verticals': _session_verticals(cols, out, s) if include_verticals else [],
+        'n_verticals': out['n_verticals'][s],
+    }
+
+
+def calculate_discharge_batch(rows_list, calibrations=None, meters_list=None, include_verticals=True):
+    """
+    다수 세션 유량 일괄 계산
+
+    Args:
+        rows_list: 세션별 측선 데이터 리스트 (MeasurementSession.rows_data 목록)
+        calibrations: 세션별 검정계수 리스트 또는 전체 공통 dict (None이면 기본값)
+        meters_list: 세션별 유속계 목록 리스트 (None이면 미사용)
+        include_verticals: False 이면 측선별 상세(verticals)를 생략 (요약값만 필요한 일괄 처리용)
+
+    Returns:
+        list: 세션별 calculate_discharge 결과 dict (입력 순서 유지)
+    """
+    rows_list = [rows or [] for rows in rows_list]
+    if not rows_list:
+        return []
+
+    if calibrations is None or isinstance(calibrations, dict):
+        calibrations = [calibrations] * len(rows_list)
+
+    cols = build_columns(rows_list, calibrations, meters_list)
+    out = compute_columns(cols)
+
+    # 결과 조립은 Python 리스트로 변환 후 수행 (측선별 배열은 필요할 때만)
+    cols = {
+        name: value.tolist() if isinstance(value, np.ndarray) else value
+        for name, value in cols.items()
+        if include_verticals or name in ('lengths', 'meta')
+    }
+    out = {
+        name: value.tolist()
+        for name, value in out.items()
+        if include_verticals or value.ndim == 1
+    }
+    return [_session_result(cols, out, s, include_verticals) for s in range(len(rows_list))]
+
+
+def calculate_discharge(rows, calibration, meters=None):
+    """
+    유량 계산 (ISO 748 중앙단면법) - 단일 세션
+
+    Args:
+        rows: 측선 데이터 리스트
+        calibration: 기본 검정계수 (단일 유속계 사용 시)
+        meters: 유속계 목록 (다중 유속계 사용 시)
+
+    Returns:
+        dict: 유량, 단면적, 유속, 불확실도 및 측선별 상세 결과
+    """
+    return calculate_discharge_batch([rows], [calibration], [meters] if meters else None)[0]
@@ -0,0 +1,714 @@
+"""
+보고서 내보내기 서비스 (PDF / Excel 산출물 캐시 + DB 작업 큐)
+
+측정 세션 Excel/PDF, 기저유출 분석 PDF, 분석결과표 Excel 을 요청 처리 중에 만들지 않고 ExportArtifact 작업으로 등록한다.
+산출물은 (종류, 원본 데이터, 양식 버전)의 SHA-256 해시로 식별하므로 내용이 같으면 저장된 바이트를 그대로 내려주고,
+없을 때만 작업자(run_export_worker 명령)가 DB 큐에서 꺼내 생성한다. 외부 브로커는 사용하지 않는다.
+
+- 작업 선점은 상태 조건부 UPDATE 로 처리하여 여러 작업자 프로세스가 같은 작업을 중복 생성하지 않는다
+- 작업자는 HEARTBEAT_INTERVAL 마다 ExportWorker 에 생존 신호를 남긴다. WORKER_TIMEOUT 안에 신호를 보낸
+  작업자가 없으면(작업자 미실행·중단, runserver) 요청한 웹 프로세스가 그 작업을 직접 생성한다
+- 분석결과표는 원본이 필터 조건이므로 조건을 params 에 저장하고, 해시에는 조건에 걸리는 세션의 수정 시각을 넣는다
+- 분석결과표 차트는 작업자 프로세스에서만 프로세스 풀로 병렬 렌더링한다 (웹 요청 중 직접 생성할 때는 순차)
+- 양식(레이아웃)을 바꾸면 EXPORT_VERSIONS 의 해당 버전을 올려 기존 캐시를 무효화한다
+"""
+import hashlib
+import json
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from io import BytesIO
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+KIND_SESSION_EXCEL = 'session_excel'
+KIND_SESSION_PDF = 'session_pdf'
+KIND_BASEFLOW_PDF = 'baseflow_pdf'
+KIND_ANALYSIS_EXCEL = 'analysis_excel'
+
+# 양식 버전 (레이아웃 변경 시 증가 → 해시 변경)
+EXPORT_VERSIONS = {
+    KIND_SESSION_EXCEL: 1,
+    KIND_SESSION_PDF: 1,
+    KIND_BASEFLOW_PDF: 1,
+    KIND_ANALYSIS_EXCEL: 1,
+}
+
+CONTENT_TYPE_XLSX = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+CONTENT_TYPE_PDF = 'application/pdf'
+
+# 작업자 설정
+POLL_INTERVAL = 2.0
+STALE_AFTER = timedelta(minutes=10)   # 이 시간 넘게 running 이면 작업자 중단으로 보고 재등록
+MAX_ATTEMPTS = 3
+HEARTBEAT_INTERVAL = 10.0             # 작업자 생존 신호 간격 (초)
+WORKER_TIMEOUT = timedelta(seconds=60)  # 이 시간 안에 신호가 없으면 작업자 없음으로 보고 요청 중 직접 생성
+RETENTION_DAYS = 30                   # 마지막 다운로드 후 보관 기간
+CHART_WORKERS = None                  # 작업자의 분석결과표 차트 렌더링 프로세스 수 (None: CPU 수)
+
+# 현재 프로세스의 차트 렌더링 프로세스 수 (work() 가 작업자에서만 CHART_WORKERS 로 바꿈)
+_chart_workers = 1
+
+
+# ============================================
+# 원본 데이터 → 해시
+# ============================================
+
+def _session_payload(session):
+    return {
+        'station_name': session.station_name,
+        'measurement_date': session.measurement_date.isoformat() if session.measurement_date else None,
+        'rows_data': session.rows_data,
+        'calibration_data': session.calibration_data,
+        'setup_data': session.setup_data,
+        'estimated_discharge': session.estimated_discharge,
+        'total_area': session.total_area,
+    }
+
+
+def _baseflow_payload(analysis):
+    series = analysis.daily_series()
+    digest = hashlib.sha256()
+    for name in ('dates', 'total', 'baseflow', 'direct_runoff'):
+        digest.update(series[name].tobytes())
+    return {
+        'station': analysis.station.name if analysis.station else None,
+        'start_date': analysis.start_date.isoformat(),
+        'end_date': analysis.end_date.isoformat(),
+        'method': analysis.method,
+        'alpha': analysis.alpha,
+        'bfi_max': analysis.bfi_max,
+        'total_runoff': analysis.total_runoff,
+        'baseflow': analysis.baseflow,
+        'direct_runoff': analysis.direct_runoff,
+        'bfi': analysis.bfi,
+        'created_at': analysis.created_at.isoformat() if analysis.created_at else None,
+        'daily': digest.hexdigest(),
+    }
+
+
+def analysis_filter(station='', start_date='', end_date='', user=None):
+    """분석결과표 필터 조건 (ExportArtifact.params 에 저장)"""
+    return {
+        'station': station or '',
+        'start_date': start_date or '',
+        'end_date': end_date or '',
+        'user_id': user.pk if user is not None and user.is_authenticated else None,
+    }
+
+
+def analysis_sessions(params):
+    """필터 조건 → 분석결과표 세션 QuerySet (지점명, 측정일 순)"""
+    from .models import MeasurementSession
+
+    sessions = MeasurementSession.objects.all()
+    if params.get('user_id'):
+        sessions = sessions.filter(user_id=params['user_id'])
+    if params.get('station'):
+        sessions = sessions.filter(station_name__icontains=params['station'])
+    if params.get('start_date'):
+        sessions = sessions.filter(measurement_date__gte=params['start_date'])
+    if params.get('end_date'):
+        sessions = sessions.filter(measurement_date__lte=params['end_date'])
+    return sessions.order_by('station_name', 'measurement_date')
+
+
+def _analysis_payload(params):
+    digest = hashlib.sha256()
+    rows = analysis_sessions(params).values_list('pk', 'updated_at', 'content_hash')
+    for pk, updated_at, session_hash in rows.iterator(chunk_size=2000):
+        digest.update(f'{pk}|{updated_at.isoformat() if updated_at else ""}|{session_hash}\n'.encode())
+    return {'filter': params, 'sessions': digest.hexdigest()}
+
+
+def content_hash(kind, obj):
+    """산출물 식별 해시 (종류 + 양식 버전 + 원본 데이터, 분석결과표는 obj 가 필터 조건)"""
+    if kind == KIND_ANALYSIS_EXCEL:
+        payload = _analysis_payload(obj)
+    elif kind == KIND_BASEFLOW_PDF:
+        payload = _baseflow_payload(obj)
+    else:
+        payload = _session_payload(obj)
+    text = json.dumps(
+        {'kind': kind, 'version': EXPORT_VERSIONS[kind], 'data': payload},
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+# ============================================
+# 렌더러 (작업자 프로세스에서 실행)
+# ============================================
+
+def _session_data(session, pdf_rows=False):
+    """측정 세션 → 보고서 데이터 (rows_data 가 있으면 재계산)"""
+    from .discharge_service import calculate_discharge
+
+    calibration = session.calibration_data or {'a': 0.0012, 'b': 0.2534}
+    base = {
+        'station_name': session.station_name or '미지정',
+        'date': session.measurement_date.strftime('%Y-%m-%d') if session.measurement_date else '-',
+    }
+
+    if not session.rows_data:
+        setup = session.setup_data or {}
+        return {
+            **base,
+            'discharge': session.estimated_discharge or 0,
+            'uncertainty': setup.get('final_uncertainty', 0),
+            'area': session.total_area or 0,
+            'avg_velocity': setup.get('final_avg_velocity', 0),
+            'rows': [],
+        }
+
+    result = calculate_discharge(session.rows_data, calibration)
+    rows = []
+    for v in result.get('verticals', []):
+        if pdf_rows:
+            rows.append([
+                v['id'],
+                v['distance'],
+                round(v['depth'], 2),
+                round(v['velocity'], 3),
+                round(v.get('area', 0), 3),
+                round(v.get('discharge', 0), 3),
+                f"{round(v.get('ratio', 0), 1)}%",
+            ])
+        else:
+            rows.append({
+                'no': v['id'],
+                'distance': v['distance'],
+                'depth': v['depth'],
+                'velocity': round(v['velocity'], 3),
+                'area': round(v.get('area', 0), 3),
+                'discharge': round(v.get('discharge', 0), 3),
+                'ratio': round(v.get('ratio', 0), 1),
+            })
+    return {
+        **base,
+        'discharge': result['discharge'],
+        'uncertainty': result['uncertainty'],
+        'area': result['area'],
+        'avg_velocity': result['avg_velocity'],
+        'rows': rows,
+    }
+
+
+def render_session_excel(session):
+    """측정 세션 Excel 보고서 → (bytes, 파일명)"""
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+
+    data = _session_data(session)
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "유량측정 결과"
+
+    # 스타일 정의
+    title_font = Font(bold=True, size=14)
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    header_font_white = Font(bold=True, color="FFFFFF")
+    thin_border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    center_align = Alignment(horizontal='center', vertical='center')
+
+    # 제목
+    ws['A1'] = "유량측정 결과 보고서"
+    ws['A1'].font = title_font
+    ws.merge_cells('A1:G1')
+
+    # 기본 정보
+    ws['A3'] = "지점명"
+    ws['B3'] = data['station_name']
+    ws['A4'] = "측정일"
+    ws['B4'] = data['date']
+    ws['D3'] = "유량 (m³/s)"
+    ws['E3'] = data['discharge']
+    ws['D4'] = "불확실도 (%)"
+    ws['E4'] = f"± {data['uncertainty']}"
+
+    # 데이터 테이블 헤더 (7행부터)
+    headers = ['측선', '거리 (m)', '수심 (m)', '유속 (m/s)', '단면적 (m²)', '유량 (m³/s)', '비율 (%)']
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=7, column=col, value=header)
+        cell.font = header_font_white
+        cell.fill = header_fill
+        cell.alignment = center_align
+        cell.border = thin_border
+
+    # 데이터 행
+    keys = ['no', 'distance', 'depth', 'velocity', 'area', 'discharge', 'ratio']
+    for row_idx, row_data in enumerate(data['rows'], 8):
+        for col, key in enumerate(keys, 1):
+            cell = ws.cell(row=row_idx, column=col, value=row_data[key])
+            cell.border = thin_border
+            cell.alignment = center_align
+
+    # 합계 행
+    sum_row = 8 + len(data['rows'])
+    ws.cell(row=sum_row, column=1, value='합계').font = Font(bold=True)
+    ws.merge_cells(f'A{sum_row}:D{sum_row}')
+    ws.cell(row=sum_row, column=5, value=data['area']).font = Font(bold=True)
+    ws.cell(row=sum_row, column=6, value=data['discharge']).font = Font(bold=True)
+    ws.cell(row=sum_row, column=7, value=100.0).font = Font(bold=True)
+    for col in range(1, 8):
+        ws.cell(row=sum_row, column=col).border = thin_border
+        ws.cell(row=sum_row, column=col).alignment = center_align
+
+    # 열 너비 조정
+    for column, width in zip('ABCDEFG', [10, 12, 12, 12, 14, 14, 12]):
+        ws.column_dimensions[column].width = width
+
+    buffer = BytesIO()
+    wb.save(buffer)
+    filename = f"measurement_result_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    return buffer.getvalue(), filename
+
+
+def _korean_font():
+    """reportlab 한글 폰트 등록 (프로세스당 1회)"""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    if 'NotoSansKR' in pdfmetrics.getRegisteredFontNames():
+        return 'NotoSansKR'
+    font_path = os.path.join(settings.BASE_DIR, 'static', 'fonts', 'NotoSansKR-Regular.ttf')
+    if os.path.exists(font_path):
+        try:
+            pdfmetrics.registerFont(TTFont('NotoSansKR', font_path))
+            return 'NotoSansKR'
+        except Exception:
+            pass
+    return 'Helvetica'
+
+
+def render_session_pdf(session):
+    """측정 세션 PDF 보고서 → (bytes, 파일명)"""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import mm
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+    korean_font = _korean_font()
+    data = _session_data(session, pdf_rows=True)
+
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=20*mm, bottomMargin=20*mm)
+    elements = []
+
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'Title',
+        parent=styles['Heading1'],
+        fontName=korean_font,
+        fontSize=16,
+        spaceAfter=12,
+        alignment=1  # center
+    )
+    # 한글 폰트가 적용된 Heading2 스타일
+    heading2_style = ParagraphStyle(
+        'Heading2Korean',
+        parent=styles['Heading2'],
+        fontName=korean_font,
+        fontSize=12,
+        spaceAfter=6
+    )
+
+    # 제목
+    elements.append(Paragraph("Discharge Measurement Report", title_style))
+    elements.append(Paragraph("유량측정 결과 보고서", title_style))
+    elements.append(Spacer(1, 10*mm))
+
+    # 기본 정보 테이블
+    info_data = [
+        ['Station', data['station_name'], 'Date', data['date']],
+        ['Discharge', f"{data['discharge']} m³/s", 'Uncertainty', f"± {data['uncertainty']}%"],
+        ['Area', f"{data['area']} m²", 'Avg. Velocity', f"{data['avg_velocity']} m/s"],
+    ]
+    info_table = Table(info_data, colWidths=[35*mm, 55*mm, 35*mm, 45*mm])
+    info_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.Color(0.9, 0.9, 0.9)),
+        ('BACKGROUND', (2, 0), (2, -1), colors.Color(0.9, 0.9, 0.9)),
+        ('FONTNAME', (0, 0), (-1, -1), korean_font),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 6),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ]))
+    elements.append(info_table)
+    elements.append(Spacer(1, 10*mm))
+
+    # 상세 데이터 테이블
+    elements.append(Paragraph("Detailed Results by Vertical", heading2_style))
+    elements.append(Spacer(1, 5*mm))
+
+    table_data = [['No.', 'Distance(m)', 'Depth(m)', 'Velocity(m/s)', 'Area(m²)', 'Discharge(m³/s)', 'Ratio']]
+    table_data.extend(data['rows'])
+    table_data.append(['Total', '', '', '', data['area'], data['discharge'], '100%'])
+
+    detail_table = Table(table_data, colWidths=[15*mm, 25*mm, 22*mm, 28*mm, 22*mm, 32*mm, 20*mm])
+    detail_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.Color(0.27, 0.45, 0.77)),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, -1), korean_font),
+        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('BACKGROUND', (0, -1), (-1, -1), colors.Color(0.9, 0.9, 0.9)),
+        ('TOPPADDING', (0, 0), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ]))
+    elements.append(detail_table)
+    elements.append(Spacer(1, 10*mm))
+
+    # 불확실도 정보
+    elements.append(Paragraph("Uncertainty Analysis (ISO 748)", heading2_style))
+    elements.append(Spacer(1, 5*mm))
+
+    unc_data = [
+        ['Component', 'Value', 'Description'],
+        ['Xe', '1.8%', 'Limited number of verticals'],
+        ['Xp', '2.1%', 'Depth measurement uncertainty'],
+        ['Xc', '1.0%', 'Calibration uncertainty'],
+        ['Xm', '2.8%', 'Velocity measurement uncertainty'],
+        ['u(Q)', '4.2%', 'Combined standard uncertainty (RSS)'],
+    ]
+    unc_table = Table(unc_data, colWidths=[30*mm, 25*mm, 80*mm])
+    unc_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.Color(0.27, 0.45, 0.77)),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, -1), korean_font),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('ALIGN', (0, 0), (1, -1), 'CENTER'),
+        ('ALIGN', (2, 0), (2, -1), 'LEFT'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('BACKGROUND', (0, -1), (-1, -1), colors.Color(0.85, 0.92, 0.98)),
+        ('TOPPADDING', (0, 0), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ]))
+    elements.append(unc_table)
+
+    doc.build(elements)
+    filename = f"measurement_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    return buffer.getvalue(), filename
+
+
+def render_baseflow_pdf(analysis):
+    """기저유출 분석 PDF 리포트 → (bytes, 파일명)"""
+    from .pdf_service import generate_baseflow_report
+
+    buffer = generate_baseflow_report(analysis, analysis.daily_series())
+    station_name = analysis.station.name if analysis.station else 'unknown'
+    return buffer.getvalue(), f"baseflow_{station_name}_{analysis.start_date}.pdf"
+
+
+def render_analysis_excel(sessions):
+    """분석결과표 Excel (지역별 피벗 + 차트) → (bytes, 파일명)"""
+    from .analysis_export_service import write_analysis_workbook
+
+    with tempfile.TemporaryFile() as tmp:
+        write_analysis_workbook(sessions, tmp, max_workers=_chart_workers)
+        tmp.seek(0)
+        return tmp.read(), 'analysis_summary.xlsx'
+
+
+def _load_session(artifact):
+    from .models import MeasurementSession
+    return MeasurementSession.objects.get(pk=artifact.object_id)
+
+
+def _load_analysis(artifact):
+    from .models import BaseflowAnalysis
+    return BaseflowAnalysis.objects.select_related('station').get(pk=artifact.object_id)
+
+
+def _load_analysis_sessions(artifact):
+    return analysis_sessions(artifact.params)
+
+
+# 종류별 (원본 로더, 렌더러, Content-Type)
+RENDERERS = {
+    KIND_SESSION_EXCEL: (_load_session, render_session_excel, CONTENT_TYPE_XLSX),
+    KIND_SESSION_PDF: (_load_session, render_session_pdf, CONTENT_TYPE_PDF),
+    KIND_BASEFLOW_PDF: (_load_analysis, render_baseflow_pdf, CONTENT_TYPE_PDF),
+    KIND_ANALYSIS_EXCEL: (_load_analysis_sessions, render_analysis_excel, CONTENT_TYPE_XLSX),
+}
+
+
+# ============================================
+# 요청 / 큐
+# ============================================
+
+def request_export(kind, obj, user=None):
+    """
+    산출물 요청 (같은 해시의 산출물이 있으면 재사용, 없으면 작업 등록)
+
+    Args:
+        kind: 산출물 종류
+        obj: MeasurementSession, BaseflowAnalysis 또는 분석결과표 필터 조건(analysis_filter)
+        user: 요청자
+
+    Returns:
+        ExportArtifact: status 가 done 이면 바로 내려줄 수 있음
+    """
+    from .models import ExportArtifact
+
+    digest = content_hash(kind, obj)
+    object_id = 0 if kind == KIND_ANALYSIS_EXCEL else obj.pk
+    artifact, created = ExportArtifact.objects.get_or_create(
+        content_hash=digest,
+        defaults={
+            'kind': kind,
+            'object_id': object_id,
+            'params': obj if kind == KIND_ANALYSIS_EXCEL else {},
+            'content_type': RENDERERS[kind][2],
+            'requested_by': user if user is not None and user.is_authenticated else None,
+        },
+    )
+    if created:
+        logger.info("내보내기 작업 등록: %s #%s (%s)", kind, object_id, digest[:12])
+    elif artifact.status == ExportArtifact.STATUS_FAILED:
+        # 실패한 작업은 다시 요청하면 재등록 (원본 ID 갱신)
+        ExportArtifact.objects.filter(pk=artifact.pk, status=ExportArtifact.STATUS_FAILED).update(
+            status=ExportArtifact.STATUS_PENDING, object_id=object_id, attempts=0, error='',
+        )
+        artifact.refresh_from_db()
+    elif artifact.object_id != object_id and artifact.status != ExportArtifact.STATUS_DONE:
+        # 같은 내용의 다른 원본(복제된 세션 등) - 원본이 삭제되었을 수 있으므로 최신 요청 기준으로 생성
+        ExportArtifact.objects.filter(pk=artifact.pk).update(object_id=object_id)
+    return artifact
+
+
+def mark_accessed(artifact):
+    """다운로드 시각 기록 (보관 기간 기준)"""
+    from .models import ExportArtifact
+    ExportArtifact.objects.filter(pk=artifact.pk).update(accessed_at=timezone.now())
+
+
+def claim_next():
+    """
+    대기 작업 하나 선점 (오래된 순)
+
+    상태 조건부 UPDATE 가 1행을 바꾼 작업자만 작업을 가져가므로 DB 종류와 무관하게 중복 처리되지 않는다.
+
+    Returns:
+        ExportArtifact 또는 None
+    """
+    from .models import ExportArtifact
+
+    pending = ExportArtifact.objects.filter(status=ExportArtifact.STATUS_PENDING).order_by('created_at')
+    for pk in pending.values_list('pk', flat=True)[:10]:
+        claimed = ExportArtifact.objects.filter(pk=pk, status=ExportArtifact.STATUS_PENDING).update(
+            status=ExportArtifact.STATUS_RUNNING, started_at=timezone.now(),
+        )
+        if claimed:
+            return ExportArtifact.objects.defer('content').get(pk=pk)
+    return None
+
+
+def process(artifact):
+    """선점한 작업 생성 → done / (재시도 초과 시) failed"""
+    from .models import ExportArtifact
+
+    load, render, _ = RENDERERS[artifact.kind]
+    started = time.monotonic()
+    try:
+        content, filename = render(load(artifact))
+    except Exception as e:
+        attempts = artifact.attempts + 1
+        # 원본이 삭제된 경우는 재시도하지 않음
+        failed = attempts >= MAX_ATTEMPTS or isinstance(e, ObjectDoesNotExist)
+        ExportArtifact.objects.filter(pk=artifact.pk).update(
+            status=ExportArtifact.STATUS_FAILED if failed else ExportArtifact.STATUS_PENDING,
+            attempts=attempts,
+            error=str(e)[:1000],
+        )
+        logger.exception("내보내기 생성 실패: %s #%s (시도 %d)", artifact.kind, artifact.object_id, attempts)
+        return False
+
+    ExportArtifact.objects.filter(pk=artifact.pk).update(
+        status=ExportArtifact.STATUS_DONE,
+        content=content,
+        filename=filename,
+        size=len(content),
+        finished_at=timezone.now(),
+        error='',
+    )
+    logger.info(
+        "내보내기 생성 완료: %s #%s, %d bytes, %.2fs",
+        artifact.kind, artifact.object_id, len(content), time.monotonic() - started,
+    )
+    return True
+
+
+def heartbeat(name):
+    """작업자 생존 신호 기록"""
+    from .models import ExportWorker
+    ExportWorker.objects.update_or_create(name=name, defaults={'last_seen': timezone.now()})
+
+
+class _Heartbeat(threading.Thread):
+    """작업자 생존 신호를 interval 초마다 기록하는 백그라운드 스레드 (생성이 오래 걸려도 신호 유지)"""
+
+    def __init__(self, name, interval=HEARTBEAT_INTERVAL):
+        super().__init__(name=f'export-heartbeat-{name}', daemon=True)
+        self.worker_name = name
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        from django.db import connection
+
+        try:
+            while not self.stopped.is_set():
+                try:
+                    heartbeat(self.worker_name)
+                except Exception:
+                    logger.exception("내보내기 작업자 생존 신호 기록 실패: %s", self.worker_name)
+                self.stopped.wait(self.interval)
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def worker_alive(timeout=WORKER_TIMEOUT):
+    """timeout 안에 생존 신호를 보낸 작업자가 있는지"""
+    from .models import ExportWorker
+    return ExportWorker.objects.filter(last_seen__gte=timezone.now() - timeout).exists()
+
+
+def process_now(artifact, stale_after=STALE_AFTER):
+    """
+    대기 중인 작업을 현재 프로세스에서 바로 생성 (작업자가 없을 때 웹 요청에서 사용)
+
+    다른 작업자가 먼저 선점했으면 생성하지 않는다. 작업자가 없으면 requeue_stale 도 돌지 않으므로,
+    요청 중 생성이 중단되어(gunicorn 타임아웃 등) stale_after 넘게 running 으로 남은 작업은 여기서 다시
+    선점한다. 중단 횟수가 MAX_ATTEMPTS 에 이르면 다시 생성하지 않고 실패로 기록한다.
+
+    Returns:
+        ExportArtifact: 갱신된 상태
+    """
+    from django.db.models import F, Q
+    from .models import ExportArtifact
+
+    now = timezone.now()
+    claimable = ExportArtifact.objects.filter(pk=artifact.pk)
+    claimed = claimable.filter(status=ExportArtifact.STATUS_PENDING).update(
+        status=ExportArtifact.STATUS_RUNNING, started_at=now,
+    )
+    if not claimed:
+        claimed = claimable.filter(
+            Q(started_at__lt=now - stale_after) | Q(started_at__isnull=True),
+            status=ExportArtifact.STATUS_RUNNING,
+        ).update(started_at=now, attempts=F('attempts') + 1)
+        if claimed:
+            artifact.refresh_from_db(fields=['attempts'])
+            logger.warning(
+                "중단된 내보내기 작업 재선점: %s #%s (시도 %d)", artifact.kind, artifact.object_id, artifact.attempts,
+            )
+            if artifact.attempts >= MAX_ATTEMPTS:
+                claimable.update(status=ExportArtifact.STATUS_FAILED, error='생성 중 중단이 반복되었습니다.')
+                claimed = 0
+    if claimed:
+        logger.warning("내보내기 작업자 신호 없음 - 요청 중 직접 생성: %s #%s", artifact.kind, artifact.object_id)
+        artifact.refresh_from_db()
+        process(artifact)
+    artifact.refresh_from_db()
+    return artifact
+
+
+def requeue_stale(stale_after=STALE_AFTER):
+    """작업자 중단으로 멈춘 running 작업 재등록"""
+    from .models import ExportArtifact
+
+    return ExportArtifact.objects.filter(
+        status=ExportArtifact.STATUS_RUNNING, started_at__lt=timezone.now() - stale_after,
+    ).update(status=ExportArtifact.STATUS_PENDING)
+
+
+def purge_expired(days=RETENTION_DAYS):
+    """보관 기간이 지난 산출물 삭제 (마지막 다운로드 또는 생성 기준)"""
+    from django.db.models import Q
+    from .models import ExportArtifact
+
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = ExportArtifact.objects.filter(
+        Q(accessed_at__lt=cutoff) | Q(accessed_at__isnull=True, created_at__lt=cutoff),
+    ).exclude(status=ExportArtifact.STATUS_RUNNING).delete()
+    return deleted
+
+
+def work(poll_interval=POLL_INTERVAL, once=False, should_stop=None):
+    """
+    작업자 루프 (대기 작업이 없으면 poll_interval 초 대기)
+
+    내보내기 작업이 없으면 수위 가져오기 작업(timeseries_import_service)을 처리한다.
+    생존 신호는 별도 스레드가 HEARTBEAT_INTERVAL 마다 기록하므로, 한 작업이 WORKER_TIMEOUT 보다 오래
+    걸려도 웹 요청이 작업자 없음으로 보고 대기 작업을 직접 생성하지 않는다.
+
+    Args:
+        once: True 이면 대기 작업을 모두 처리한 뒤 종료
+        should_stop: 호출 시 True 를 반환하면 종료
+
+    Returns:
+        int: 처리한 작업 수
+    """
+    from django.db import close_old_connections
+    from .models import ExportWorker
+    from .timeseries_import_service import claim_next_import, process_import, requeue_stale_imports
+
+    global _chart_workers
+    _chart_workers = CHART_WORKERS
+    name = f'{socket.gethostname()}:{os.getpid()}'
+    ExportWorker.objects.filter(last_seen__lt=timezone.now() - timedelta(days=1)).delete()
+    processed = 0
+    heartbeat(name)
+    beat = _Heartbeat(name)
+    beat.start()
+    try:
+        requeue_stale()
+        requeue_stale_imports()
+        while not (should_stop and should_stop()):
+            close_old_connections()
+            artifact = claim_next()
+            if artifact is not None:
+                process(artifact)
+                processed += 1
+                continue
+            job = claim_next_import()
+            if job is not None:
+                process_import(job)
+                processed += 1
+                continue
+            if once:
+                break
+            time.sleep(poll_interval)
+            requeue_stale()
+            requeue_stale_imports()
+    finally:
+        beat.stop()
+        ExportWorker.objects.filter(name=name).delete()
+    return processed
@@ -0,0 +1,47 @@
+"""
+시계열 Parquet 아카이브 명령어 (마감된 월을 DB 에서 Parquet 파일로 이동)
+Usage: python manage.py archive_timeseries
+       python manage.py archive_timeseries --keep-months 3 --station 1 --station 2
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = '마감된 월의 수위/유량 시계열을 관측소/연도별 Parquet 아카이브로 옮깁니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-months', type=int, default=1,
+            help='DB 에 남길 최근 개월 수 (이번 달 포함, 기본 1)',
+        )
+        parser.add_argument(
+            '--station', type=int, action='append', dest='stations',
+            help='대상 관측소 ID (여러 번 지정 가능, 기본: 전체)',
+        )
+        parser.add_argument(
+            '--kind', choices=['waterlevel', 'discharge'], action='append', dest='kinds',
+            help='대상 종류 (기본: 수위, 유량 모두)',
+        )
+
+    def handle(self, *args, **options):
+        from django.core.exceptions import ImproperlyConfigured
+        from measurement.timeseries_archive_service import (
+            archive_closed_months, require_archive_root, WATERLEVEL, DISCHARGE,
+        )
+
+        def progress(kind, station_id, year, month, count):
+            self.stdout.write(f"  {kind} 관측소 {station_id}: {year}-{month:02d} ({count:,}행)")
+
+        try:
+            root = require_archive_root()
+        except ImproperlyConfigured as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f"아카이브 경로: {root}")
+        total = archive_closed_months(
+            station_ids=options['stations'],
+            keep_months=options['keep_months'],
+            kinds=options['kinds'] or (WATERLEVEL, DISCHARGE),
+            progress=progress,
+        )
+        self.stdout.write(self.style.SUCCESS(f"아카이브 완료: {total:,}행"))
@@ -0,0 +1,22 @@
+"""
+분석결과표 항목 일괄 계산 (저장 시점 계산 도입 전 세션, bulk_update)
+Usage: python manage.py backfill_analysis_results
+       python manage.py backfill_analysis_results --all --batch-size 1000
+"""
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = '윤변·동수반경·등급 등 분석결과표 항목이 비어 있는 측정 세션을 일괄 계산합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='이미 계산된 세션도 다시 계산')
+        parser.add_argument('--batch-size', type=int, default=500, help='bulk_update 묶음 크기 (기본: 500)')
+
+    def handle(self, *args, **options):
+        from measurement.analysis_summary_service import backfill_analysis_results
+
+        updated = backfill_analysis_results(
+            recalculate=options['all'], batch_size=max(options['batch_size'], 1),
+        )
+        self.stdout.write(self.style.SUCCESS(f'분석결과표 항목 계산 완료: {updated:,}개 세션'))
@@ -0,0 +1,85 @@
+"""
+기저유출 매개변수 일괄 분석 명령어 (여러 관측소 × α/BFImax 격자 → CSV)
+Usage: python manage.py baseflow_sweep --station 1 --station 2 --station-code 1018683 \
+           --alpha 0.90:0.99:0.005 --output sweep.csv
+       python manage.py baseflow_sweep --station 1 --method eckhardt --alpha 0.95,0.98 --bfi-max 0.5:0.8:0.05
+"""
+import sys
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def parse_values(spec):
+    """'시작:끝:간격' 또는 '값,값,...' → float 목록"""
+    from measurement.baseflow_batch_service import frange
+
+    try:
+        if ':' in spec:
+            start, stop, step = (float(v) for v in spec.split(':'))
+            return frange(start, stop, step)
+        return [float(v) for v in spec.split(',') if v.strip()]
+    except ValueError:
+        raise CommandError(f"잘못된 매개변수 목록: {spec}")
+
+
+class Command(BaseCommand):
+    help = '여러 관측소에 대해 α/BFImax 격자별 BFI·유출량 통계를 계산해 CSV 로 저장합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--station', type=int, action='append', default=[], help='내부 관측소 ID (여러 번 지정 가능)')
+        parser.add_argument('--station-code', action='append', default=[], help='HRFCO 관측소 코드 (여러 번 지정 가능)')
+        parser.add_argument('--start', help='시작일 YYYY-MM-DD (기본: 종료일 1년 전)')
+        parser.add_argument('--end', help='종료일 YYYY-MM-DD (기본: 오늘)')
+        parser.add_argument('--method', choices=['lyne_hollick', 'eckhardt'], default='lyne_hollick')
+        parser.add_argument('--alpha', default='0.90:0.99:0.005', help="α 후보 ('시작:끝:간격' 또는 쉼표 목록)")
+        parser.add_argument('--bfi-max', default='0.80', help='BFImax 후보 (Eckhardt)')
+        parser.add_argument('--passes', type=int, choices=[1, 3], default=1, help='Lyne-Hollick 통과 횟수')
+        parser.add_argument('--workers', type=int, default=None, help='프로세스 수 (기본: 관측소 8개 이상이면 CPU 수, 아니면 1)')
+        parser.add_argument('--output', help='CSV 파일 경로 (기본: 표준출력)')
+
+    def handle(self, *args, **options):
+        from django.utils import timezone
+        from measurement.baseflow_batch_service import run_sweep, write_csv
+
+        sources = (
+            [{'station_id': pk} for pk in options['station']]
+            + [{'station_code': code} for code in options['station_code']]
+        )
+        if not sources:
+            raise CommandError('--station 또는 --station-code 를 하나 이상 지정하세요.')
+
+        try:
+            end = datetime.strptime(options['end'], '%Y-%m-%d') if options['end'] else datetime.now()
+            start = (
+                datetime.strptime(options['start'], '%Y-%m-%d') if options['start']
+                else end - timedelta(days=365)
+            )
+        except ValueError as e:
+            raise CommandError(f"날짜 형식 오류: {e}")
+
+        try:
+            results = run_sweep(
+                sources,
+                timezone.make_aware(start),
+                timezone.make_aware(end),
+                options['method'],
+                parse_values(options['alpha']),
+                parse_values(options['bfi_max']),
+                passes=options['passes'],
+                max_workers=options['workers'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8-sig') as fp:
+                write_csv(results, fp)
+        else:
+            write_csv(results, sys.stdout)
+
+        for entry in results:
+            if entry.get('error'):
+                self.stderr.write(f"  {entry['station']}: {entry['error']}")
+        computed = sum(1 for entry in results if entry.get('grid'))
+        self.stderr.write(self.style.SUCCESS(f"일괄 분석 완료: {computed}/{len(results)}개 관측소"))
@@ -0,0 +1,36 @@
+"""
+행정경계(리) shapefile 전처리 캐시 생성 (단순화 + STR-tree, npy 메모리 매핑용)
+Usage: python manage.py build_boundary_cache
+       python manage.py build_boundary_cache --force
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'resource/행정경계 의 리 경계 shapefile 을 역지오코딩용 캐시로 전처리합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='같은 원본의 캐시가 있어도 다시 생성')
+
+    def handle(self, *args, **options):
+        from hydro.boundary_service import (
+            _cache_root, _source_dir, build_boundary_cache, get_boundary_index, source_signature,
+        )
+
+        try:
+            path = _cache_root() / f'ri-{source_signature(_source_dir())}'
+            if options['force'] or not (path / 'meta.json').exists():
+                build_boundary_cache()
+            meta = get_boundary_index().meta
+        except (FileNotFoundError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for loaded in meta['coverage']['loaded']:
+            self.stdout.write(f"  {loaded['province']}: 경계 {loaded['features']:,}개")
+        if meta['coverage']['missing']:
+            self.stdout.write(self.style.WARNING(
+                f"  .shp 없음 (역지오코딩 불가): {', '.join(meta['coverage']['missing'])}"
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f"행정경계 캐시: 경계 {meta['features']:,}개, 점 {meta['original_points']:,} → {meta['points']:,}개 ({path})"
+        ))
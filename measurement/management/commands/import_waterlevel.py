@@ -0,0 +1,56 @@
+"""
+수위 시계열 가져오기 명령어 (대용량 로거 파일용)
+Usage: python manage.py import_waterlevel <파일경로> --station <관측소ID>
+       python manage.py import_waterlevel data.parquet --station 3 --chunk-size 100000
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = '로거 CSV/Parquet 수위 파일을 청크 단위로 WaterLevelTimeSeries 에 가져옵니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV 또는 Parquet 파일 경로')
+        parser.add_argument('--station', type=int, required=True, help='관측소 ID')
+        parser.add_argument('--chunk-size', type=int, default=50000, help='청크 행 수 (기본 50000)')
+        parser.add_argument('--encoding', default=None, help='CSV 우선 인코딩 (기본: 자동 판별)')
+        parser.add_argument('--timestamp-column', default=None, help='시각 컬럼명 (기본: 자동)')
+        parser.add_argument('--stage-column', default=None, help='수위 컬럼명 (기본: 자동)')
+        parser.add_argument('--quality-flag', default='good', help='품질플래그 (기본 good)')
+
+    def handle(self, *args, **options):
+        from measurement.models import Station
+        from measurement.timeseries_import_service import (
+            import_waterlevel_file, TimeseriesImportError,
+        )
+
+        try:
+            station = Station.objects.get(pk=options['station'])
+        except Station.DoesNotExist:
+            raise CommandError(f"관측소를 찾을 수 없습니다: {options['station']}")
+
+        def progress(stats):
+            self.stdout.write(
+                f"  청크 {stats['chunks']}: {stats['rows_read']:,}행 읽음, "
+                f"{stats['rows_imported']:,}행 저장, {stats['rows_skipped']:,}행 제외"
+            )
+
+        self.stdout.write(f"가져오기 시작: {options['path']} → {station.name}")
+        try:
+            stats = import_waterlevel_file(
+                station,
+                options['path'],
+                progress=progress,
+                chunk_size=options['chunk_size'],
+                encoding=options['encoding'],
+                timestamp_column=options['timestamp_column'],
+                stage_column=options['stage_column'],
+                quality_flag=options['quality_flag'],
+            )
+        except (FileNotFoundError, TimeseriesImportError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"가져오기 완료: {stats['rows_imported']:,}행 "
+            f"({stats['first_timestamp']} ~ {stats['last_timestamp']})"
+        ))
@@ -0,0 +1,22 @@
+"""
+측정 세션 최근접 수위관측소 일괄 연결 (자동 연결 도입 전 세션, bulk_update)
+Usage: python manage.py link_nearest_stations
+       python manage.py link_nearest_stations --all --batch-size 5000
+"""
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = '좌표가 있는 측정 세션을 가장 가까운 카탈로그 수위관측소에 일괄 연결합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='이미 연결된 세션도 다시 연결')
+        parser.add_argument('--batch-size', type=int, default=2000, help='묶음 크기 (기본: 2000)')
+
+    def handle(self, *args, **options):
+        from measurement.session_station_link_service import backfill_station_links
+
+        linked = backfill_station_links(
+            relink=options['all'], batch_size=max(options['batch_size'], 1),
+        )
+        self.stdout.write(self.style.SUCCESS(f'최근접 수위관측소 연결 완료: {linked:,}개 세션'))
@@ -0,0 +1,72 @@
+"""
+보고서 내보내기 작업자 (ExportArtifact DB 큐에서 PDF/Excel 생성, TimeseriesImportJob 수위 가져오기)
+Usage: python manage.py run_export_worker                 # 계속 실행 (프로세스 1개)
+       python manage.py run_export_worker --workers 4     # 작업자 프로세스 4개
+       python manage.py run_export_worker --once          # 대기 작업만 처리하고 종료
+       python manage.py run_export_worker --purge         # 보관 기간 지난 산출물·차트 캐시 삭제 후 종료
+"""
+import multiprocessing
+import os
+import signal
+
+from django.core.management.base import BaseCommand
+
+
+def worker_main(poll_interval, once):
+    """작업자 프로세스 진입점 (spawn 프로세스에서 Django 초기화)"""
+    import django
+    django.setup()
+
+    from measurement.export_service import work
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    return work(poll_interval=poll_interval, once=once, should_stop=lambda: bool(stopping))
+
+
+class Command(BaseCommand):
+    help = 'DB 큐에 등록된 PDF/Excel 내보내기 작업과 수위 파일 가져오기 작업을 처리합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1, help='작업자 프로세스 수 (기본: 1)')
+        parser.add_argument('--poll', type=float, default=2.0, help='대기 작업이 없을 때 확인 간격(초)')
+        parser.add_argument('--once', action='store_true', help='대기 작업을 모두 처리하면 종료')
+        parser.add_argument('--purge', action='store_true', help='보관 기간이 지난 산출물과 차트 캐시 삭제 후 종료')
+        parser.add_argument('--retention-days', type=int, default=30, help='산출물·차트 캐시 보관 기간(일)')
+
+    def handle(self, *args, **options):
+        from measurement.chart_service import purge_cache
+        from measurement.export_service import purge_expired, work
+
+        if options['purge']:
+            deleted = purge_expired(options['retention_days'])
+            charts = purge_cache(options['retention_days'])
+            self.stdout.write(self.style.SUCCESS(f'만료 산출물 {deleted}개, 차트 캐시 {charts}개 삭제'))
+            return
+
+        workers = max(options['workers'], 1)
+        self.stdout.write(f'내보내기 작업자 시작: 프로세스 {workers}개')
+
+        if workers == 1:
+            processed = work(poll_interval=options['poll'], once=options['once'])
+            self.stdout.write(self.style.SUCCESS(f'처리한 작업: {processed}개'))
+            return
+
+        # 작업자 프로세스는 spawn 으로 시작하고 각자 DB 연결을 연다
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+        context = multiprocessing.get_context('spawn')
+        processes = [
+            context.Process(target=worker_main, args=(options['poll'], options['once']), daemon=False)
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
+        self.stdout.write(self.style.SUCCESS('내보내기 작업자 종료'))
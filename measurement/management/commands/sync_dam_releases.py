@@ -0,0 +1,46 @@
+"""
+K-water 댐 방류 이벤트 로컬 사본 동기화 (빠진 날짜 + 최근 날짜만 조회)
+Usage: python manage.py sync_dam_releases
+       python manage.py sync_dam_releases --days 365
+       python manage.py sync_dam_releases --sessions   # 측정 세션 판정에 필요한 날짜도 채움 (주기 실행)
+"""
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = '최근 N일의 댐 방류정보를 로컬 방류 이벤트 사본에 채웁니다 (이미 받은 날짜는 건너뜀)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help='동기화 기간 (일, 기본: 30)')
+        parser.add_argument(
+            '--sessions', action='store_true',
+            help='측정 세션 댐 방류 영향 판정에 필요한 날짜도 함께 채움',
+        )
+
+    def handle(self, *args, **options):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from hydro.dam_discharge_service import release_spans
+        from hydro.dam_release_service import get_release_index, sync_releases
+
+        now = timezone.localtime().replace(tzinfo=None)
+        spans = [(now - timedelta(days=max(options['days'], 1)), now)]
+        if options['sessions']:
+            from measurement.models import MeasurementSession
+            from measurement.session_dam_influence_service import SESSION_FIELDS, session_queries
+
+            sessions = MeasurementSession.objects.filter(measurement_date__isnull=False).only(*SESSION_FIELDS)
+            spans += release_spans(session_queries(sessions.iterator(chunk_size=1000)))
+        stats = sync_releases(spans)
+        total = get_release_index().signature[0]
+
+        message = (
+            f"댐 방류정보 동기화: 조회 창 {stats['windows']}개, 이벤트 {stats['events']:,}건 "
+            f"(저장된 이벤트 {total:,}건)"
+        )
+        if stats['failed']:
+            self.stdout.write(self.style.WARNING(f"{message}, 실패 {stats['failed']}개 - 다음 실행 때 다시 받습니다"))
+        else:
+            self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,99 @@
+# Generated manually
+
+import numpy as np
+from django.db import migrations, models
+
+# baseflow_storage_service 의 바이트 형식 고정 사본 (서비스가 바뀌어도 이 마이그레이션은 그대로)
+PACKED_DTYPE = np.dtype('<f4')
+PACKED_ROWS = ('total', 'baseflow', 'direct_runoff')
+
+
+def pack_daily(dates, total, baseflow, direct_runoff):
+    """일별 결과 → (시작일, bytes): little-endian float32 (3, 일수), 빈 날은 NaN"""
+    days = np.asarray(dates, dtype='datetime64[D]')
+    if days.size == 0:
+        return None, None
+
+    origin = days.min()
+    index = (days - origin).astype(np.int64)
+    grid = np.full((len(PACKED_ROWS), int(index.max()) + 1), np.nan, dtype=PACKED_DTYPE)
+    grid[0, index] = np.asarray(total, dtype=float)
+    grid[1, index] = np.asarray(baseflow, dtype=float)
+    grid[2, index] = np.asarray(direct_runoff, dtype=float)
+    return origin.item(), grid.tobytes()
+
+
+def unpack_daily(origin, packed):
+    """(시작일, bytes) → {'dates', 'total', 'baseflow', 'direct_runoff'} (자료 없는 날 제외)"""
+    if origin is None or not packed:
+        empty = np.array([], dtype=PACKED_DTYPE)
+        return {'dates': np.array([], dtype='datetime64[D]'), **{name: empty for name in PACKED_ROWS}}
+
+    grid = np.frombuffer(bytes(packed), dtype=PACKED_DTYPE).reshape(len(PACKED_ROWS), -1)
+    valid = ~np.isnan(grid[0])
+    dates = np.datetime64(origin, 'D') + np.arange(grid.shape[1])
+    series = {'dates': dates[valid]}
+    for name, row in zip(PACKED_ROWS, grid):
+        series[name] = row[valid]
+    return series
+
+
+def pack_existing_rows(apps, schema_editor):
+    """기존 BaseflowDaily 행 → 분석별 압축 배열 (변환 후 행 삭제)"""
+    BaseflowAnalysis = apps.get_model('measurement', 'BaseflowAnalysis')
+    BaseflowDaily = apps.get_model('measurement', 'BaseflowDaily')
+
+    # 기본 정렬(date)이 distinct 에 섞이지 않도록 정렬 해제
+    analysis_ids = BaseflowDaily.objects.order_by().values_list('analysis_id', flat=True).distinct()
+    for analysis_id in list(analysis_ids):
+        rows = list(
+            BaseflowDaily.objects.filter(analysis_id=analysis_id).order_by('date')
+            .values_list('date', 'total_discharge', 'baseflow', 'direct_runoff')
+        )
+        origin, packed = pack_daily(
+            [r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows], [r[3] for r in rows],
+        )
+        BaseflowAnalysis.objects.filter(pk=analysis_id).update(daily_origin=origin, daily_packed=packed)
+        BaseflowDaily.objects.filter(analysis_id=analysis_id).delete()
+
+
+def unpack_to_rows(apps, schema_editor):
+    """압축 배열 → BaseflowDaily 행 (되돌리기)"""
+    BaseflowAnalysis = apps.get_model('measurement', 'BaseflowAnalysis')
+    BaseflowDaily = apps.get_model('measurement', 'BaseflowDaily')
+
+    analyses = BaseflowAnalysis.objects.filter(daily_packed__isnull=False).values_list(
+        'pk', 'daily_origin', 'daily_packed')
+    for analysis_id, origin, packed in analyses.iterator():
+        series = unpack_daily(origin, packed)
+        BaseflowDaily.objects.bulk_create(
+            [
+                BaseflowDaily(analysis_id=analysis_id, date=day, total_discharge=t, baseflow=b, direct_runoff=d)
+                for day, t, b, d in zip(
+                    series['dates'].tolist(), series['total'].tolist(),
+                    series['baseflow'].tolist(), series['direct_runoff'].tolist(),
+                )
+            ],
+            batch_size=5000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurement', '0009_add_water_quality_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='baseflowanalysis',
+            name='daily_origin',
+            field=models.DateField(blank=True, null=True, verbose_name='일별 결과 시작일'),
+        ),
+        migrations.AddField(
+            model_name='baseflowanalysis',
+            name='daily_packed',
+            field=models.BinaryField(blank=True, null=True, verbose_name='일별 결과(압축)'),
+        ),
+        migrations.RunPython(pack_existing_rows, unpack_to_rows),
+    ]
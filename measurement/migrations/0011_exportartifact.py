@@ -0,0 +1,43 @@
+# Generated manually
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurement', '0010_baseflow_packed_daily'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportArtifact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True, verbose_name='내용 해시')),
+                ('kind', models.CharField(choices=[('session_excel', '측정 Excel'), ('session_pdf', '측정 PDF'), ('baseflow_pdf', '기저유출 PDF')], max_length=20, verbose_name='종류')),
+                ('object_id', models.PositiveIntegerField(verbose_name='원본 ID')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '생성 중'), ('done', '완료'), ('failed', '실패')], default='pending', max_length=10, verbose_name='상태')),
+                ('content', models.BinaryField(blank=True, null=True, verbose_name='내용')),
+                ('content_type', models.CharField(max_length=100, verbose_name='Content-Type')),
+                ('filename', models.CharField(blank=True, max_length=255, verbose_name='파일명')),
+                ('size', models.PositiveIntegerField(default=0, verbose_name='크기(bytes)')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='시도 횟수')),
+                ('error', models.TextField(blank=True, verbose_name='오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='생성 시작')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='생성 완료')),
+                ('accessed_at', models.DateTimeField(blank=True, null=True, verbose_name='마지막 다운로드')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='export_artifacts', to=settings.AUTH_USER_MODEL, verbose_name='요청자')),
+            ],
+            options={
+                'verbose_name': '내보내기 산출물',
+                'verbose_name_plural': '내보내기 산출물',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='measurement_export_queue_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated manually
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurement', '0011_exportartifact'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='measurementsession',
+            index=models.Index(fields=['measurement_date', 'station_name', 'id'], name='measurement_summary_idx'),
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated manually
+
+import hashlib
+import json
+
+from django.db import migrations, models
+
+# session_dedupe_service 의 HASH_VERSION 1 해시 고정 사본 (서비스가 바뀌어도 이 마이그레이션은 그대로)
+HASH_VERSION = 1
+ROUND_DIGITS = 6
+IGNORED_ROW_KEYS = ('id',)
+
+
+def _normalize_value(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return round(float(value), ROUND_DIGITS) + 0.0
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            return round(float(value), ROUND_DIGITS) + 0.0
+        except ValueError:
+            return value
+    if isinstance(value, dict):
+        return _normalize_mapping(value)
+    if isinstance(value, (list, tuple)):
+        return [_normalize_value(v) for v in value]
+    return value
+
+
+def _normalize_mapping(mapping, ignored=()):
+    return {
+        str(key): _normalize_value(value)
+        for key, value in sorted(mapping.items())
+        if key not in ignored and value not in (None, '')
+    }
+
+
+def session_content_hash(station_name, measurement_date, rows_data, calibration_data, estimated_discharge=None):
+    """관측소명·측정일·검정계수·측선 데이터(측선이 없으면 유량) SHA-256 hex"""
+    rows = [_normalize_mapping(row, IGNORED_ROW_KEYS) for row in (rows_data or []) if isinstance(row, dict)]
+    payload = [
+        HASH_VERSION,
+        (station_name or '').strip(),
+        measurement_date.isoformat() if measurement_date else None,
+        _normalize_mapping(calibration_data or {}),
+        rows,
+        None if rows or estimated_discharge is None else _normalize_value(estimated_discharge),
+    ]
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def fill_content_hash(apps, schema_editor):
+    """기존 세션 내용 해시 계산 (pk 순 묶음 단위 bulk_update)"""
+    MeasurementSession = apps.get_model('measurement', 'MeasurementSession')
+    sessions = MeasurementSession.objects.only(
+        'pk', 'station_name', 'measurement_date', 'rows_data', 'calibration_data', 'estimated_discharge',
+    ).order_by('pk')
+
+    last_pk = 0
+    while True:
+        batch = list(sessions.filter(pk__gt=last_pk)[:500])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        for session in batch:
+            session.content_hash = session_content_hash(
+                session.station_name, session.measurement_date, session.rows_data,
+                session.calibration_data, session.estimated_discharge,
+            )
+        MeasurementSession.objects.bulk_update(batch, ['content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurement', '0012_measurementsession_summary_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='measurementsession',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, verbose_name='내용 해시'),
+        ),
+        migrations.RunPython(fill_content_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated manually
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurement', '0013_measurementsession_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='measurementsession',
+            name='nearest_station_code',
+            field=models.CharField(blank=True, db_index=True, max_length=20, verbose_name='최근접 수위관측소'),
+        ),
+        migrations.AddField(
+            model_name='measurementsession',
+            name='nearest_station_distance',
+            field=models.FloatField(blank=True, null=True, verbose_name='최근접 관측소 거리(km)'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated manually
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurement', '0014_measurementsession_nearest_station'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportWorker',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='작업자')),
+                ('last_seen', models.DateTimeField(db_index=True, verbose_name='마지막 신호')),
+            ],
+            options={
+                'verbose_name': '내보내기 작업자',
+                'verbose_name_plural': '내보내기 작업자',
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated manually
+
+import hashlib
+import json
+
+from django.db import migrations, models
+
+
+def _result_key(station_name, measurement_date, estimated_discharge):
+    """session_dedupe_service.session_result_key (HASH_VERSION 1) 고정 사본"""
+    station_name = (station_name or '').strip()
+    if not station_name or not measurement_date or estimated_discharge is None:
+        return ''
+    payload = [1, station_name, measurement_date.isoformat(), round(float(estimated_discharge), 6) + 0.0]
+    encoded = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def fill_result_key(apps, schema_editor):
+    """기존 세션 결과 키 계산 (pk 순 묶음 단위 bulk_update)"""
+    MeasurementSession = apps.get_model('measurement', 'MeasurementSession')
+    sessions = MeasurementSession.objects.only(
+        'pk', 'station_name', 'measurement_date', 'estimated_discharge',
+    ).order_by('pk')
+
+    last_pk = 0
+    while True:
+        batch = list(sessions.filter(pk__gt=last_pk)[:500])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        for session in batch:
+            session.result_key = _result_key(
+                session.station_name, session.measurement_date, session.estimated_discharge,
+            )
+        MeasurementSession.objects.bulk_update(batch, ['result_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurement', '0015_exportworker'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='measurementsession',
+            name='result_key',
+            field=models.CharField(blank=True, db_index=True, max_length=64, verbose_name='결과 키'),
+        ),
+        migrations.RunPython(fill_result_key, migrations.RunPython.noop),
+    ]
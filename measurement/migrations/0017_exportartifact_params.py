@@ -0,0 +1,23 @@
+# Generated manually
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurement', '0016_measurementsession_result_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportartifact',
+            name='params',
+            field=models.JSONField(blank=True, default=dict, verbose_name='조건'),
+        ),
+        migrations.AlterField(
+            model_name='exportartifact',
+            name='kind',
+            field=models.CharField(choices=[('session_excel', '측정 Excel'), ('session_pdf', '측정 PDF'), ('baseflow_pdf', '기저유출 PDF'), ('analysis_excel', '분석결과표 Excel')], max_length=20, verbose_name='종류'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated manually
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurement', '0017_exportartifact_params'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimeseriesImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_station', models.BooleanField(default=False, verbose_name='업로드 시 생성한 관측소')),
+                ('filename', models.CharField(max_length=255, verbose_name='파일명')),
+                ('content', models.BinaryField(blank=True, null=True, verbose_name='업로드 내용')),
+                ('size', models.PositiveIntegerField(default=0, verbose_name='크기(bytes)')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '가져오는 중'), ('done', '완료'), ('failed', '실패')], default='pending', max_length=10, verbose_name='상태')),
+                ('stats', models.JSONField(blank=True, default=dict, verbose_name='진행 상황')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='시도 횟수')),
+                ('error', models.TextField(blank=True, verbose_name='오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='시작')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='마지막 진행')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='완료')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='timeseries_import_jobs', to=settings.AUTH_USER_MODEL, verbose_name='요청자')),
+                ('station', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='import_jobs', to='measurement.station', verbose_name='관측소')),
+            ],
+            options={
+                'verbose_name': '수위 가져오기 작업',
+                'verbose_name_plural': '수위 가져오기 작업',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='measurement_import_queue_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,144 @@
+# Generated manually
+
+import math
+
+from django.db import migrations
+
+# calculate_analysis_results() 가 채우는 분석결과표 컬럼 (0019 시점)
+ANALYSIS_FIELDS = (
+    'total_width', 'max_depth', 'total_area', 'wetted_perimeter', 'hydraulic_radius',
+    'velocity_verticals', 'mean_velocity', 'uncertainty', 'quality_grade',
+)
+
+
+def _analysis_results(session):
+    """MeasurementSession.calculate_analysis_results 고정 사본 (0019 시점)"""
+    rows = session.rows_data or []
+    if not rows:
+        return
+
+    # 유효한 데이터만 필터링
+    valid_rows = [r for r in rows if r.get('depth') and float(r.get('depth') or 0) > 0]
+    if not valid_rows:
+        return
+
+    # 거리, 수심, 유속 추출 (None 값 처리)
+    distances = [float(r.get('distance') or 0) for r in valid_rows]
+    depths = [float(r.get('depth') or 0) for r in valid_rows]
+    velocities = [float(r.get('velocity') or 0) for r in valid_rows]
+
+    # 1. 수면폭 (총폭)
+    if distances:
+        session.total_width = max(distances) - min(distances)
+
+    # 2. 최대수심
+    if depths:
+        session.max_depth = max(depths)
+
+    # 3. 단면적 (중앙단면법)
+    total_area = 0
+    for i, row in enumerate(valid_rows):
+        d = depths[i]
+        # 폭 계산 (중앙단면법)
+        if i == 0:
+            w = (distances[1] - distances[0]) / 2 if len(distances) > 1 else 0
+        elif i == len(valid_rows) - 1:
+            w = (distances[i] - distances[i-1]) / 2
+        else:
+            w = (distances[i+1] - distances[i-1]) / 2
+        total_area += w * d
+    session.total_area = total_area
+
+    # 4. 윤변 (wetted perimeter) - 수심 변화를 따라가는 경로 길이
+    wetted_perimeter = 0
+    for i in range(len(valid_rows)):
+        if i == 0:
+            # 시작점 수직 깊이
+            wetted_perimeter += depths[i]
+        else:
+            # 이전 점과의 거리 (바닥 따라)
+            dx = distances[i] - distances[i-1]
+            dy = depths[i] - depths[i-1]
+            wetted_perimeter += math.sqrt(dx**2 + dy**2)
+    # 마지막 점 수직
+    if depths:
+        wetted_perimeter += depths[-1]
+    session.wetted_perimeter = wetted_perimeter
+
+    # 5. 동수반경 = 단면적 / 윤변
+    if session.wetted_perimeter and session.wetted_perimeter > 0:
+        session.hydraulic_radius = session.total_area / session.wetted_perimeter
+
+    # 6. 유속 측선 수 (유속 > 0인 측선)
+    session.velocity_verticals = len([v for v in velocities if v and v > 0])
+
+    # 7. 평균유속 = 유량 / 단면적
+    if session.estimated_discharge and session.total_area and session.total_area > 0:
+        session.mean_velocity = session.estimated_discharge / session.total_area
+    elif velocities:
+        # 또는 유속 평균
+        valid_v = [v for v in velocities if v and v > 0]
+        if valid_v:
+            session.mean_velocity = sum(valid_v) / len(valid_v)
+
+    # 8. 불확실도 계산 (ISO 748 간이 방식)
+    n = session.velocity_verticals or 1
+    if n >= 20:
+        u_m = 5  # 측선 20개 이상
+    elif n >= 10:
+        u_m = 7.5
+    elif n >= 5:
+        u_m = 10
+    else:
+        u_m = 15  # 측선 5개 미만
+    session.uncertainty = u_m
+
+    # 9. 등급 판정
+    if session.uncertainty <= 5:
+        session.quality_grade = 'E'  # Excellent
+    elif session.uncertainty <= 8:
+        session.quality_grade = 'G'  # Good
+    elif session.uncertainty <= 12:
+        session.quality_grade = 'F'  # Fair
+    else:
+        session.quality_grade = 'P'  # Poor
+
+
+def fill_analysis_results(apps, schema_editor):
+    """
+    저장 시점 계산 도입 전 세션의 분석결과표 항목 계산 (backfill_analysis_results 와 같은 대상, pk 순 bulk_update)
+
+    측선 값이 숫자로 변환되지 않는 세션은 건너뛴다 (비어 있는 채로 유지).
+    """
+    MeasurementSession = apps.get_model('measurement', 'MeasurementSession')
+    sessions = MeasurementSession.objects.filter(wetted_perimeter__isnull=True).only(
+        'pk', 'rows_data', 'estimated_discharge', *ANALYSIS_FIELDS,
+    ).order_by('pk')
+
+    last_pk = 0
+    while True:
+        batch = list(sessions.filter(pk__gt=last_pk)[:500])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        changed = []
+        for session in batch:
+            if not session.rows_data:
+                continue
+            try:
+                _analysis_results(session)
+            except (TypeError, ValueError, AttributeError, ZeroDivisionError):
+                continue
+            changed.append(session)
+        MeasurementSession.objects.bulk_update(changed, ANALYSIS_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurement', '0018_timeseriesimportjob'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_analysis_results, migrations.RunPython.noop),
+    ]
@@ -200,6 +200,10 @@ class BaseflowAnalysis(models.Model):
     direct_runoff = models.FloatField(null=True, blank=True, verbose_name='직접유출량(mm)')
     bfi = models.FloatField(null=True, blank=True, verbose_name='기저유출지수(BFI)')
 
+    # 일별 결과 (시작일 + float32 배열 압축, baseflow_storage_service 형식)
+    daily_origin = models.DateField(null=True, blank=True, verbose_name='일별 결과 시작일')
+    daily_packed = models.BinaryField(null=True, blank=True, verbose_name='일별 결과(압축)')
+
     # 메타
     created_at = models.DateTimeField(auto_now_add=True)
     note = models.TextField(blank=True, verbose_name='비고')
@@ -212,9 +216,36 @@ class BaseflowAnalysis(models.Model):
     def __str__(self):
         return f"{self.station.name} {self.start_date}~{self.end_date} BFI={self.bfi}"
 
+    def set_daily_series(self, dates, total, baseflow, direct_runoff):
+        """일별 결과 압축 저장 (save 는 호출하는 쪽에서)"""
+        from .baseflow_storage_service import pack_daily
+        self.daily_origin, self.daily_packed = pack_daily(dates, total, baseflow, direct_runoff)
+
+    def daily_series(self):
+        """
+        일별 결과 NumPy 배열
+
+        압축 결과가 없는 분석(이전 BaseflowDaily 행)은 행에서 읽는다.
+
+        Returns:
+            dict: {'dates': datetime64[D] 배열, 'total', 'baseflow', 'direct_runoff': 배열}
+        """
+        from .baseflow_storage_service import unpack_daily
+        if self.daily_packed is None:
+            import numpy as np
+            rows = list(self.daily_results.order_by('date').values_list(
+                'date', 'total_discharge', 'baseflow', 'direct_runoff'))
+            return {
+                'dates': np.array([r[0] for r in rows], dtype='datetime64[D]'),
+                'total': np.array([r[1] for r in rows], dtype=float),
+                'baseflow': np.array([r[2] for r in rows], dtype=float),
+                'direct_runoff': np.array([r[3] for r in rows], dtype=float),
+            }
+        return unpack_daily(self.daily_origin, self.daily_packed)
+
 
 class BaseflowDaily(models.Model):
-    """일별 기저유출 결과"""
+    """일별 기저유출 결과 (이전 저장 형식 - 새 분석은 BaseflowAnalysis.daily_packed 에 저장)"""
     analysis = models.ForeignKey(BaseflowAnalysis, on_delete=models.CASCADE, related_name='daily_results', verbose_name='분석')
     date = models.DateField(verbose_name='날짜')
 
@@ -280,6 +311,14 @@ class MeasurementSession(models.Model):
     ec = models.FloatField(null=True, blank=True, verbose_name='EC(μS/cm)')
     tds = models.FloatField(null=True, blank=True, verbose_name='TDS(mg/L)')
 
+    # 중복 판별용 내용 해시 (save() 에서 갱신, session_dedupe_service 참고)
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True, verbose_name='내용 해시')
+    result_key = models.CharField(max_length=64, blank=True, db_index=True, verbose_name='결과 키')
+
+    # 최근접 수위관측소 (save() 에서 갱신, session_station_link_service 참고)
+    nearest_station_code = models.CharField(max_length=20, blank=True, db_index=True, verbose_name='최근접 수위관측소')
+    nearest_station_distance = models.FloatField(null=True, blank=True, verbose_name='최근접 관측소 거리(km)')
+
     # 메타
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일시')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일시')
@@ -290,6 +329,8 @@ class MeasurementSession(models.Model):
         ordering = ['-updated_at']
         indexes = [
             models.Index(fields=['user', '-updated_at']),
+            # 분석결과표 기간 필터 + 키셋 페이지 (측정일, 관측소명, id)
+            models.Index(fields=['measurement_date', 'station_name', 'id'], name='measurement_summary_idx'),
         ]
 
     def __str__(self):
@@ -297,8 +338,58 @@ class MeasurementSession(models.Model):
         date_str = self.measurement_date.strftime('%Y-%m-%d') if self.measurement_date else '미지정'
         return f"{self.user} - {loc} ({date_str}) #{self.session_number}"
 
+    # content_hash 계산에 쓰이는 컬럼
+    HASH_FIELDS = ('station_name', 'measurement_date', 'rows_data', 'calibration_data', 'estimated_discharge')
+
+    def compute_content_hash(self):
+        """관측소명·측정일·검정계수·측선 데이터(측선이 없으면 유량) 해시"""
+        from .session_dedupe_service import session_content_hash
+        return session_content_hash(
+            self.station_name, self.measurement_date, self.rows_data, self.calibration_data,
+            self.estimated_discharge,
+        )
+
+    # result_key 계산에 쓰이는 컬럼
+    RESULT_FIELDS = ('station_name', 'measurement_date', 'estimated_discharge')
+
+    def compute_result_key(self):
+        """관측소명·측정일·유량 키 (결과 전용 저장의 중복 판별)"""
+        from .session_dedupe_service import session_result_key
+        return session_result_key(self.station_name, self.measurement_date, self.estimated_discharge)
+
+    # 최근접 수위관측소 연결에 쓰이는 컬럼 (setup_data 의 latitude/longitude 포함)
+    LOCATION_FIELDS = ('latitude', 'longitude', 'setup_data')
+
+    def link_nearest_station(self):
+        """좌표에서 가장 가까운 카탈로그 수위관측소 연결 (저장하지 않음)"""
+        from .session_station_link_service import link_sessions
+        return bool(link_sessions([self]))
+
+    def save(self, *args, **kwargs):
+        """저장 시 내용 해시, 최근접 수위관측소 갱신"""
+        update_fields = kwargs.get('update_fields')
+        refreshed = []
+        if update_fields is None or set(update_fields) & set(self.HASH_FIELDS):
+            self.content_hash = self.compute_content_hash()
+            refreshed.append('content_hash')
+        if update_fields is None or set(update_fields) & set(self.RESULT_FIELDS):
+            self.result_key = self.compute_result_key()
+            refreshed.append('result_key')
+        if update_fields is None or set(update_fields) & set(self.LOCATION_FIELDS):
+            self.link_nearest_station()
+            refreshed.extend(('nearest_station_code', 'nearest_station_distance'))
+        if update_fields is not None and refreshed:
+            kwargs['update_fields'] = {*update_fields, *refreshed}
+        super().save(*args, **kwargs)
+
+    # calculate_analysis_results() 가 채우는 분석결과표 컬럼 (bulk_update 대상)
+    ANALYSIS_FIELDS = (
+        'total_width', 'max_depth', 'total_area', 'wetted_perimeter', 'hydraulic_radius',
+        'velocity_verticals', 'mean_velocity', 'uncertainty', 'quality_grade',
+    )
+
     def calculate_analysis_results(self):
-        """측선 데이터로 분석결과표 항목 계산"""
+        """측선 데이터로 분석결과표 항목 계산 (저장 시점에 호출, 기존 행은 backfill_analysis_results)"""
         import math
 
         rows = self.rows_data or []
@@ -480,3 +571,129 @@ class Meter(models.Model):
             return self.coef_a + self.coef_b * (n / t)
         except (ValueError, TypeError):
             return 0
+
+
+class ExportArtifact(models.Model):
+    """보고서 내보내기 산출물 (내용 해시 캐시 + DB 작업 큐, export_service 참고)"""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, '대기'),
+        (STATUS_RUNNING, '생성 중'),
+        (STATUS_DONE, '완료'),
+        (STATUS_FAILED, '실패'),
+    ]
+    KIND_CHOICES = [
+        ('session_excel', '측정 Excel'),
+        ('session_pdf', '측정 PDF'),
+        ('baseflow_pdf', '기저유출 PDF'),
+        ('analysis_excel', '분석결과표 Excel'),
+    ]
+
+    content_hash = models.CharField(max_length=64, unique=True, verbose_name='내용 해시')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name='종류')
+    object_id = models.PositiveIntegerField(verbose_name='원본 ID')
+    params = models.JSONField(default=dict, blank=True, verbose_name='조건')  # 분석결과표 필터 조건
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name='상태')
+
+    # 산출물
+    content = models.BinaryField(null=True, blank=True, verbose_name='내용')
+    content_type = models.CharField(max_length=100, verbose_name='Content-Type')
+    filename = models.CharField(max_length=255, blank=True, verbose_name='파일명')
+    size = models.PositiveIntegerField(default=0, verbose_name='크기(bytes)')
+
+    # 작업 상태
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='시도 횟수')
+    error = models.TextField(blank=True, verbose_name='오류')
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name='export_artifacts',
+        verbose_name='요청자'
+    )
+
+    # 메타
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='생성 시작')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='생성 완료')
+    accessed_at = models.DateTimeField(null=True, blank=True, verbose_name='마지막 다운로드')
+
+    class Meta:
+        verbose_name = '내보내기 산출물'
+        verbose_name_plural = '내보내기 산출물'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='measurement_export_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.object_id} ({self.status})"
+
+
+class ExportWorker(models.Model):
+    """내보내기 작업자 생존 신호 (없거나 오래되면 웹 요청에서 직접 생성, export_service 참고)"""
+    name = models.CharField(max_length=100, unique=True, verbose_name='작업자')
+    last_seen = models.DateTimeField(db_index=True, verbose_name='마지막 신호')
+
+    class Meta:
+        verbose_name = '내보내기 작업자'
+        verbose_name_plural = '내보내기 작업자'
+
+    def __str__(self):
+        return f"{self.name} ({self.last_seen:%Y-%m-%d %H:%M:%S})"
+
+
+class TimeseriesImportJob(models.Model):
+    """수위 파일 가져오기 작업 (업로드 내용을 DB 에 두고 작업자가 처리, timeseries_import_service 참고)"""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, '대기'),
+        (STATUS_RUNNING, '가져오는 중'),
+        (STATUS_DONE, '완료'),
+        (STATUS_FAILED, '실패'),
+    ]
+
+    station = models.ForeignKey(
+        Station,
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name='import_jobs',
+        verbose_name='관측소'
+    )
+    created_station = models.BooleanField(default=False, verbose_name='업로드 시 생성한 관측소')
+    filename = models.CharField(max_length=255, verbose_name='파일명')
+    content = models.BinaryField(null=True, blank=True, verbose_name='업로드 내용')  # 완료 후 삭제
+    size = models.PositiveIntegerField(default=0, verbose_name='크기(bytes)')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name='상태')
+    stats = models.JSONField(default=dict, blank=True, verbose_name='진행 상황')
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='시도 횟수')
+    error = models.TextField(blank=True, verbose_name='오류')
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name='timeseries_import_jobs',
+        verbose_name='요청자'
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='시작')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='마지막 진행')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='완료')
+
+    class Meta:
+        verbose_name = '수위 가져오기 작업'
+        verbose_name_plural = '수위 가져오기 작업'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='measurement_import_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.status})"
@@ -3,6 +3,8 @@
 """
 import io
 from datetime import datetime
+
+import numpy as np
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -67,13 +69,13 @@ def get_method_description(method):
     return descriptions.get(method, "디지털 필터 기반 기저유출 분리 방법")
 
 
-def generate_baseflow_report(analysis, daily_data, output_buffer=None):
+def generate_baseflow_report(analysis, series, output_buffer=None):
     """
     기저유출 분석 PDF 리포트 생성
 
     Args:
         analysis: BaseflowAnalysis 모델 인스턴스
-        daily_data: 일별 데이터 QuerySet 또는 리스트
+        series: 일별 결과 배열 (BaseflowAnalysis.daily_series() 반환값)
         output_buffer: 출력 버퍼 (None이면 새로 생성)
 
     Returns:
@@ -190,24 +192,26 @@ def generate_baseflow_report(analysis, daily_data, output_buffer=None):
     story.append(Paragraph(f"<b>Method Note:</b> {method_desc}", normal_style))
     story.append(Spacer(1, 8*mm))
 
+    total_discharges = np.asarray(series['total'], dtype=float)
+    baseflows = np.asarray(series['baseflow'], dtype=float)
+    has_daily = total_discharges.size > 0
+
     # === 월별 통계 (간략) ===
-    if daily_data:
+    if has_daily:
         story.append(Paragraph("4. Monthly Statistics (월별 통계)", heading_style))
 
-        # 월별 집계
-        monthly_stats = {}
-        for d in daily_data:
-            month_key = d.date.strftime('%Y-%m')
-            if month_key not in monthly_stats:
-                monthly_stats[month_key] = {'total': 0, 'baseflow': 0, 'count': 0}
-            monthly_stats[month_key]['total'] += d.total_discharge
-            monthly_stats[month_key]['baseflow'] += d.baseflow
-            monthly_stats[month_key]['count'] += 1
+        # 월별 집계 (월 번호별 합계/개수)
+        months, month_index = np.unique(series['dates'].astype('datetime64[M]'), return_inverse=True)
+        counts = np.bincount(month_index)
+        total_sums = np.bincount(month_index, weights=total_discharges)
+        baseflow_sums = np.bincount(month_index, weights=baseflows)
 
         monthly_data = [['Month', 'Avg Q (m³/s)', 'Avg BF (m³/s)', 'BFI']]
-        for month, stats in sorted(monthly_stats.items()):
-            avg_total = stats['total'] / stats['count']
-            avg_bf = stats['baseflow'] / stats['count']
+        for month, count, total_sum, baseflow_sum in zip(
+            np.datetime_as_string(months).tolist(), counts.tolist(), total_sums.tolist(), baseflow_sums.tolist()
+        ):
+            avg_total = total_sum / count
+            avg_bf = baseflow_sum / count
             monthly_bfi = avg_bf / avg_total if avg_total > 0 else 0
             monthly_data.append([
                 month,
@@ -229,21 +233,17 @@ def generate_baseflow_report(analysis, daily_data, output_buffer=None):
         story.append(Spacer(1, 8*mm))
 
     # === 데이터 요약 ===
-    if daily_data:
+    if has_daily:
         story.append(Paragraph("5. Data Summary (데이터 요약)", heading_style))
 
-        total_discharges = [d.total_discharge for d in daily_data]
-        baseflows = [d.baseflow for d in daily_data]
-
-        import statistics
         summary_data = [
             ['Statistic', 'Total Q', 'Baseflow'],
             ['Count', str(len(total_discharges)), str(len(baseflows))],
-            ['Mean', f"{statistics.mean(total_discharges):.3f}", f"{statistics.mean(baseflows):.3f}"],
-            ['Std Dev', f"{statistics.stdev(total_discharges):.3f}" if len(total_discharges) > 1 else '-',
-                       f"{statistics.stdev(baseflows):.3f}" if len(baseflows) > 1 else '-'],
-            ['Min', f"{min(total_discharges):.3f}", f"{min(baseflows):.3f}"],
-            ['Max', f"{max(total_discharges):.3f}", f"{max(baseflows):.3f}"],
+            ['Mean', f"{total_discharges.mean():.3f}", f"{baseflows.mean():.3f}"],
+            ['Std Dev', f"{total_discharges.std(ddof=1):.3f}" if len(total_discharges) > 1 else '-',
+                       f"{baseflows.std(ddof=1):.3f}" if len(baseflows) > 1 else '-'],
+            ['Min', f"{total_discharges.min():.3f}", f"{baseflows.min():.3f}"],
+            ['Max', f"{total_discharges.max():.3f}", f"{baseflows.max():.3f}"],
         ]
 
         summary_table = Table(summary_data, colWidths=[50*mm, 55*mm, 55*mm])
@@ -0,0 +1,239 @@
+"""
+수위-유량곡선(Rating Curve) 평가 엔진
+
+관측소의 전체 RatingCurve(연도별, 곡선유형별, h_min~h_max 구간별)를 한 번 조회하여
+정렬된 경계표(연도 → 수위구간)로 컴파일하고, (시각, 수위) 배열을 이진 탐색(np.searchsorted)으로
+각 시각에 유효한 곡선 구간에 대응시켜 Q = a * (h - h0)^b 를 일괄 계산한다.
+
+곡선 선택 규칙:
+- 연도: 해당 연도 곡선, 없으면 직전 연도 곡선, 그 이전이면 가장 오래된 곡선
+- 곡선유형: 요청한 유형(기본 'open')이 그 연도에 있으면 사용, 없으면 그 연도의 전체 곡선
+- 수위구간: h_min <= h 인 마지막 구간 (범위 밖이면 가장 가까운 구간으로 외삽)
+
+컴파일된 경계표는 관측소별로 캐시된다. 같은 프로세스의 저장/삭제는 시그널로 즉시 무효화하고,
+다른 프로세스의 변경은 CHECK_INTERVAL 마다 관측소 곡선의 (개수, 최종 수정 시각)을 확인해 반영한다.
+(updated_at 을 바꾸지 않는 queryset.update() 는 invalidate_station 을 함께 호출해야 한다)
+"""
+import logging
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# 품질 플래그 코드 (DischargeTimeSeries.quality_flag 와 대응)
+FLAG_GOOD, FLAG_EXTRAPOLATED, FLAG_SUSPECT = 0, 1, 2
+FLAG_NAMES = np.array(['good', 'extrapolated', 'suspect'])
+
+DEFAULT_CURVE_TYPE = 'open'
+
+# 곡선 변경 확인 간격 (초)
+CHECK_INTERVAL = 5.0
+
+# 관측소별 컴파일 캐시 {(station_id, curve_type): (CompiledRating, 서명, 확인 시각)}
+_compiled_cache = {}
+_cache_lock = threading.Lock()
+
+# 관측소별 무효화 세대 {station_id: int} - 조회 도중 무효화된 결과를 캐시에 넣지 않기 위함
+_generations = {}
+
+
+class CompiledRating:
+    """
+    관측소 Rating Curve 경계표
+
+    구간 배열은 (연도, h_min) 순으로 정렬되며, year_starts[i] ~ year_starts[i+1] 이
+    years[i] 연도의 구간 범위이다.
+    """
+
+    def __init__(self, curves, curve_type=DEFAULT_CURVE_TYPE):
+        """
+        Args:
+            curves: RatingCurve 목록 (또는 같은 속성을 가진 객체)
+            curve_type: 우선 적용할 곡선유형
+        """
+        by_year = {}
+        for curve in curves:
+            by_year.setdefault(curve.year, []).append(curve)
+
+        segments = []
+        year_starts = []
+        for year in sorted(by_year):
+            year_curves = by_year[year]
+            preferred = [c for c in year_curves if c.curve_type == curve_type]
+            year_starts.append(len(segments))
+            segments.extend(sorted(preferred or year_curves, key=lambda c: (c.h_min, c.h_max)))
+        year_starts.append(len(segments))
+
+        self.curve_type = curve_type
+        self.segments = segments
+        self.years = np.array(sorted(by_year), dtype=np.int64)
+        self.year_starts = np.array(year_starts, dtype=np.int64)
+        self.curve_ids = np.array([c.pk for c in segments], dtype=object)
+        self.h_min = np.array([c.h_min for c in segments], dtype=float)
+        self.h_max = np.array([c.h_max for c in segments], dtype=float)
+        self.coef_a = np.array([c.coef_a for c in segments], dtype=float)
+        self.coef_b = np.array([c.coef_b for c in segments], dtype=float)
+        self.coef_h0 = np.array([c.coef_h0 for c in segments], dtype=float)
+
+    def __bool__(self):
+        return bool(self.segments)
+
+    def latest_segments(self):
+        """가장 최근 연도의 곡선 구간 목록"""
+        if not self.segments:
+            return []
+        return self.segments[self.year_starts[-2]:self.year_starts[-1]]
+
+    def equation_display(self):
+        """가장 최근 연도 곡선 수식 (구간이 여럿이면 구간별로 표시)"""
+        latest = self.latest_segments()
+        if len(latest) == 1:
+            c = latest[0]
+            return f"Q = {c.coef_a}(h - {c.coef_h0})^{c.coef_b}"
+        return ', '.join(
+            f"[{c.h_min}~{c.h_max}m] Q = {c.coef_a}(h - {c.coef_h0})^{c.coef_b}" for c in latest
+        )
+
+    def segment_index(self, years, stages):
+        """
+        각 (연도, 수위) 에 적용할 구간 인덱스
+
+        Returns:
+            ndarray: 구간 인덱스 (곡선이 없으면 -1)
+        """
+        years = np.asarray(years, dtype=np.int64)
+        stages = np.asarray(stages, dtype=float)
+        index = np.full(stages.shape, -1, dtype=np.int64)
+        if not self.segments:
+            return index
+
+        # 연도 경계 이진 탐색 (이전 연도 곡선 사용, 최초 연도 이전은 최초 곡선)
+        year_idx = np.clip(np.searchsorted(self.years, years, side='right') - 1, 0, len(self.years) - 1)
+
+        # 연도별 수위 구간 이진 탐색
+        for yi in np.unique(year_idx):
+            rows = year_idx == yi
+            start, end = self.year_starts[yi], self.year_starts[yi + 1]
+            seg = np.searchsorted(self.h_min[start:end], stages[rows], side='right') - 1
+            index[rows] = start + np.clip(seg, 0, end - start - 1)
+        return index
+
+    def evaluate(self, years, stages):
+        """
+        수위 배열 → 유량 배열
+
+        - h - h0 <= 0: 유량 0, 'suspect'
+        - 구간 h_min ~ h_max 밖: 'extrapolated'
+        - 적용 곡선 없음: 유량 NaN, 'suspect'
+
+        Args:
+            years: 연도 배열 (각 수위의 측정 연도)
+            stages: 수위 배열 (m)
+
+        Returns:
+            tuple: (유량 배열, 플래그 코드 배열, 구간 인덱스 배열)
+        """
+        stages = np.asarray(stages, dtype=float)
+        seg = self.segment_index(years, stages)
+        has_curve = seg >= 0
+
+        discharge = np.full(stages.shape, np.nan)
+        flags = np.full(stages.shape, FLAG_SUSPECT, dtype=np.int8)
+        if not has_curve.any():
+            return discharge, flags, seg
+
+        s = seg[has_curve]
+        h = stages[has_curve]
+        h_diff = h - self.coef_h0[s]
+        positive = h_diff > 0
+
+        q = np.zeros_like(h)
+        q[positive] = self.coef_a[s][positive] * np.power(h_diff[positive], self.coef_b[s][positive])
+        f = np.full(h.shape, FLAG_SUSPECT, dtype=np.int8)
+        f[positive] = np.where(
+            (h[positive] < self.h_min[s][positive]) | (h[positive] > self.h_max[s][positive]),
+            FLAG_EXTRAPOLATED,
+            FLAG_GOOD,
+        )
+
+        discharge[has_curve] = q
+        flags[has_curve] = f
+        return discharge, flags, seg
+
+    def evaluate_at(self, timestamps, stages):
+        """시각 목록 기준 평가 (datetime/date, 시간대가 있으면 현지 시각 연도 사용)"""
+        return self.evaluate(years_of(timestamps), stages)
+
+
+def years_of(timestamps):
+    """datetime/date 목록 → 연도 배열 (aware datetime 은 현지 시각 기준)"""
+    return np.fromiter(
+        (
+            timezone.localtime(t).year if isinstance(t, datetime) and timezone.is_aware(t) else t.year
+            for t in timestamps
+        ),
+        dtype=np.int64,
+        count=len(timestamps),
+    )
+
+
+def compile_curves(curves, curve_type=DEFAULT_CURVE_TYPE):
+    """RatingCurve 목록 컴파일 (캐시 없이, 특정 곡선만 적용할 때 사용)"""
+    return CompiledRating(list(curves), curve_type)
+
+
+def get_station_rating(station_id, curve_type=DEFAULT_CURVE_TYPE):
+    """
+    관측소 컴파일 경계표 조회 (캐시)
+
+    Args:
+        station_id: 관측소 ID
+        curve_type: 우선 적용할 곡선유형
+
+    Returns:
+        CompiledRating: 곡선이 없으면 빈 경계표 (bool 값 False)
+    """
+    from django.db.models import Count, Max
+    from .models import RatingCurve
+
+    station_id = int(station_id)
+    key = (station_id, curve_type)
+    now = time.monotonic()
+    entry = _compiled_cache.get(key)
+    if entry is not None and now - entry[2] < CHECK_INTERVAL:
+        return entry[0]
+
+    # 서명을 곡선 조회보다 먼저 읽어, 조회 도중 바뀐 곡선은 다음 확인 때 다시 컴파일되게 한다
+    generation = _generations.get(station_id, 0)
+    curves = RatingCurve.objects.filter(station_id=station_id)
+    totals = curves.aggregate(count=Count('pk'), updated=Max('updated_at'))
+    signature = (totals['count'], totals['updated'])
+    if entry is not None and entry[1] == signature:
+        compiled = entry[0]
+    else:
+        compiled = CompiledRating(list(curves.order_by('year', 'h_min')), curve_type)
+
+    with _cache_lock:
+        if _generations.get(station_id, 0) == generation:
+            _compiled_cache[key] = (compiled, signature, now)
+    return compiled
+
+
+def invalidate_station(station_id):
+    """관측소 경계표 캐시 무효화"""
+    with _cache_lock:
+        _generations[station_id] = _generations.get(station_id, 0) + 1
+        for key in [k for k in _compiled_cache if k[0] == station_id]:
+            del _compiled_cache[key]
+
+
+@receiver([post_save, post_delete], sender='measurement.RatingCurve')
+def _invalidate_on_change(sender, instance, **kwargs):
+    """RatingCurve 저장/삭제 시 해당 관측소 캐시 무효화"""
+    invalidate_station(instance.station_id)
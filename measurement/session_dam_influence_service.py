@@ -0,0 +1,115 @@
+"""
+측정 세션 댐 방류 영향 일괄 판정
+
+세션의 관측소 코드(setup_data.station_code, 없으면 자동 연결된 최근접 수위관측소)와
+측정일로 상류 댐 방류 영향을 판정한다. 세션에는 측정 시각이 없어 측정일 전체
+(00:00 ~ 23:59:59) 중 어느 때든 방류 영향이 있었는지 본다.
+
+여러 세션은 hydro.dam_discharge_service.check_dam_influence_batch 한 번으로 처리한다
+(로컬 방류 사본의 메모리 구간 조회, 요청 중 API 조회 없음). 사본에 아직 없는 날짜는
+unsynced_dates 로 알리고, sync_dam_releases --sessions 명령어(주기 실행)가 채운다.
+"""
+from datetime import datetime, time, timedelta
+
+MAX_SESSIONS = 1000
+SESSION_FIELDS = ('pk', 'station_name', 'measurement_date', 'setup_data', 'nearest_station_code')
+
+
+def session_station_code(session):
+    """세션 관측소 코드 (입력한 코드 우선, 없으면 최근접 수위관측소)"""
+    setup = session.setup_data or {}
+    return str(setup.get('station_code') or '').strip() or session.nearest_station_code or ''
+
+
+def session_window(session):
+    """측정일 전체 기간 (현지 naive datetime) 또는 None"""
+    if session.measurement_date is None:
+        return None
+    start = datetime.combine(session.measurement_date, time.min)
+    return start, start + timedelta(days=1) - timedelta(seconds=1)
+
+
+def _serialize(influence):
+    return {
+        'is_influenced': influence['is_influenced'],
+        'influencing_dams': [
+            {
+                'dam_name': d['dam_name'],
+                'river': d['river'],
+                'start_time': d['start_time'].strftime('%Y-%m-%d %H:%M') if d['start_time'] else None,
+                'end_time': d['end_time'].strftime('%Y-%m-%d %H:%M') if d['end_time'] else None,
+                'affect_area': d['affect_area'],
+                'travel_time_hours': d['travel_time_hours'],
+            }
+            for d in influence['influencing_dams']
+        ],
+        'message': influence['message'],
+    }
+
+
+def _queries(sessions):
+    """세션별 (관측소 코드, 측정일 기간) 과 판정 질의 [(코드, 시작, 종료), ...]"""
+    targets = []
+    queries = []
+    for session in sessions:
+        code = session_station_code(session)
+        window = session_window(session)
+        targets.append((code, window))
+        if code and window:
+            queries.append((code, *window))
+    return targets, queries
+
+
+def session_queries(sessions):
+    """세션들의 댐 방류 영향 판정 질의 (sync_dam_releases --sessions 동기화 대상)"""
+    return _queries(sessions)[1]
+
+
+def unsynced_dates(sessions):
+    """
+    판정에 필요한 방류정보 중 로컬 사본에 아직 없는 날짜 구간
+
+    Returns:
+        list: [{'start': 'YYYY-MM-DD', 'end': 'YYYY-MM-DD'}, ...] (end 포함)
+    """
+    from hydro.dam_discharge_service import unsynced_release_ranges
+
+    return [
+        {'start': start.isoformat(), 'end': (end - timedelta(days=1)).isoformat()}
+        for start, end in unsynced_release_ranges(session_queries(sessions))
+    ]
+
+
+def annotate_dam_influence(sessions):
+    """
+    세션별 댐 방류 영향 (저장하지 않음, 로컬 방류 사본만 사용)
+
+    Returns:
+        list: 세션 순서대로 {session_id, station_name, station_code, measurement_date,
+              is_influenced, influencing_dams, message}
+              관측소 코드나 측정일이 없으면 is_influenced None
+    """
+    from hydro.dam_discharge_service import check_dam_influence_batch
+
+    sessions = list(sessions)
+    targets, queries = _queries(sessions)
+
+    influences = iter(check_dam_influence_batch(queries, sync=False))
+    results = []
+    for session, (code, window) in zip(sessions, targets):
+        result = {
+            'session_id': session.pk,
+            'station_name': session.station_name,
+            'station_code': code,
+            'measurement_date': session.measurement_date.isoformat() if session.measurement_date else None,
+        }
+        if code and window:
+            result.update(_serialize(next(influences)))
+        else:
+            result.update({
+                'is_influenced': None,
+                'influencing_dams': [],
+                'message': '관측소 코드 없음' if not code else '측정일 없음',
+            })
+        results.append(result)
+    return results
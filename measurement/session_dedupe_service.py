@@ -0,0 +1,109 @@
+"""
+측정 세션 내용 해시 (중복 저장/가져오기 판별)
+
+관측소명, 측정일, 검정계수, 측선 데이터를 정규화해 SHA-256 으로 묶는다.
+측선 데이터가 없는 결과 전용 세션은 유량값을 함께 넣는다.
+결과 키(관측소명 + 측정일 + 유량)는 측선 데이터와 관계없이 같은 결과를 찾는 데 쓴다.
+
+정규화:
+    - 숫자와 숫자 문자열은 소수 6자리 float (1.20 == "1.2", -0.0 == 0.0)
+    - 빈 값(None, '')과 행 번호(id)는 제외, 키는 정렬
+    - 측선 순서는 유지
+"""
+import hashlib
+import json
+
+HASH_VERSION = 1
+ROUND_DIGITS = 6
+IGNORED_ROW_KEYS = ('id',)
+
+
+def _normalize_value(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return round(float(value), ROUND_DIGITS) + 0.0
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            return round(float(value), ROUND_DIGITS) + 0.0
+        except ValueError:
+            return value
+    if isinstance(value, dict):
+        return _normalize_mapping(value)
+    if isinstance(value, (list, tuple)):
+        return [_normalize_value(v) for v in value]
+    return value
+
+
+def _normalize_mapping(mapping, ignored=()):
+    return {
+        str(key): _normalize_value(value)
+        for key, value in sorted(mapping.items())
+        if key not in ignored and value not in (None, '')
+    }
+
+
+def normalize_rows(rows_data):
+    """측선 데이터 정규화 (행 번호·빈 값 제외)"""
+    return [_normalize_mapping(row, IGNORED_ROW_KEYS) for row in (rows_data or []) if isinstance(row, dict)]
+
+
+def session_content_hash(station_name, measurement_date, rows_data, calibration_data, estimated_discharge=None):
+    """
+    측정 세션 내용 해시
+
+    Returns:
+        str: SHA-256 hex (64자)
+    """
+    rows = normalize_rows(rows_data)
+    payload = [
+        HASH_VERSION,
+        (station_name or '').strip(),
+        measurement_date.isoformat() if measurement_date else None,
+        _normalize_mapping(calibration_data or {}),
+        rows,
+        None if rows or estimated_discharge is None else _normalize_value(estimated_discharge),
+    ]
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def session_result_key(station_name, measurement_date, estimated_discharge):
+    """
+    결과 키 (관측소명 + 측정일 + 유량값)
+
+    측선 데이터와 무관하게 같은 결과를 가리키는 세션(자동 저장 세션과 결과 전용 저장)을
+    float 비교 없이 찾기 위한 키. 유량은 내용 해시와 같은 자릿수로 반올림한다.
+
+    Returns:
+        str: SHA-256 hex (64자), 관측소명·측정일·유량 중 하나라도 없으면 ''
+    """
+    station_name = (station_name or '').strip()
+    if not station_name or not measurement_date or estimated_discharge in (None, ''):
+        return ''
+    discharge = _normalize_value(estimated_discharge)
+    if not isinstance(discharge, float):
+        return ''
+    payload = [HASH_VERSION, station_name, measurement_date.isoformat(), discharge]
+    encoded = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def existing_sessions(hashes):
+    """
+    해시 목록 중 이미 저장된 세션 (IN 쿼리 1회)
+
+    Returns:
+        dict: {content_hash: 가장 먼저 저장된 세션 ID}
+    """
+    from .models import MeasurementSession
+
+    found = {}
+    rows = (
+        MeasurementSession.objects.filter(content_hash__in=set(hashes))
+        .order_by('pk').values_list('content_hash', 'pk')
+    )
+    for content_hash, pk in rows:
+        found.setdefault(content_hash, pk)
+    return found
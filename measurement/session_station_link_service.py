@@ -0,0 +1,101 @@
+"""
+측정 세션 ↔ 최근접 수위관측소 자동 연결
+
+세션 좌표(latitude/longitude 컬럼, 없으면 setup_data 의 latitude/longitude)에서
+LINK_MAX_DISTANCE_KM 안의 가장 가까운 카탈로그 수위관측소 코드와 거리를 세션에 채운다.
+여러 세션은 KD-tree 조회 한 번으로 연결한다 (hydro.station_spatial_service).
+
+저장 시 save() 에서 갱신하고, 기존 세션은 link_nearest_stations 명령어로 일괄 연결한다.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+LINK_MAX_DISTANCE_KM = 10.0
+LINK_FIELDS = ('nearest_station_code', 'nearest_station_distance')
+
+
+def session_coordinates(session):
+    """세션 좌표 (위도, 경도) 또는 None"""
+    from hydro.station_spatial_service import valid_coordinate
+
+    lat, lon = session.latitude, session.longitude
+    if lat is None or lon is None:
+        setup = session.setup_data or {}
+        lat, lon = setup.get('latitude'), setup.get('longitude')
+    if not valid_coordinate(lat, lon):
+        return None
+    return float(lat), float(lon)
+
+
+def link_sessions(sessions, max_distance_km=LINK_MAX_DISTANCE_KM):
+    """
+    세션 목록의 최근접 수위관측소 채우기 (저장하지 않음)
+
+    좌표가 없거나 max_distance_km 안에 관측소가 없으면 연결을 비운다.
+    관측소 데이터 파일이 없으면 기존 값을 그대로 둔다.
+
+    Returns:
+        int: 연결된 세션 수
+    """
+    from hydro.station_spatial_service import nearest_gauges
+
+    located = []
+    for session in sessions:
+        coordinates = session_coordinates(session)
+        if coordinates is None:
+            session.nearest_station_code = ''
+            session.nearest_station_distance = None
+        else:
+            located.append((session, coordinates))
+    if not located:
+        return 0
+
+    try:
+        codes, distances = nearest_gauges(
+            [lat for _, (lat, _) in located], [lon for _, (_, lon) in located], max_distance_km,
+        )
+    except FileNotFoundError as e:
+        logger.warning("최근접 관측소 연결 생략: %s", e)
+        return 0
+
+    linked = 0
+    for (session, _), code, distance in zip(located, codes, distances):
+        session.nearest_station_code = code
+        session.nearest_station_distance = round(float(distance), 3) if code else None
+        linked += bool(code)
+    return linked
+
+
+def backfill_station_links(sessions=None, relink=False, batch_size=2000):
+    """
+    기존 세션 최근접 수위관측소 일괄 연결 (pk 순 묶음, bulk_update, updated_at 유지)
+
+    Args:
+        sessions: 대상 QuerySet (기본: 전체)
+        relink: False 이면 연결되지 않은 세션만
+        batch_size: 묶음 크기
+
+    Returns:
+        int: 연결된 세션 수
+    """
+    from .models import MeasurementSession
+
+    if sessions is None:
+        sessions = MeasurementSession.objects.all()
+    if not relink:
+        sessions = sessions.filter(nearest_station_code='')
+
+    sessions = sessions.only('pk', 'latitude', 'longitude', 'setup_data', *LINK_FIELDS).order_by('pk')
+    linked = 0
+    last_pk = 0
+    while True:
+        batch = list(sessions.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        linked += link_sessions(batch)
+        MeasurementSession.objects.bulk_update(batch, LINK_FIELDS)
+
+    logger.info("최근접 관측소 일괄 연결: %d개 세션", linked)
+    return linked
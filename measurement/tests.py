@@ -1,3 +1,903 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from . import export_service
+from .baseflow_service import CLAMP_PASS, DEFAULT_REFLECT, eckhardt, estimate_recession, lyne_hollick
+from .session_dedupe_service import session_result_key
+
+
+def loop_lyne_hollick(discharge, alpha):
+    """기존 run_baseflow_analysis 의 Lyne-Hollick 반복문"""
+    baseflow = np.zeros_like(discharge)
+    baseflow[0] = discharge[0] * 0.5
+    for i in range(1, len(discharge)):
+        baseflow[i] = alpha * baseflow[i-1] + (1 - alpha) / 2 * (discharge[i] + discharge[i-1])
+        baseflow[i] = min(baseflow[i], discharge[i])
+    return baseflow
+
+
+def loop_lyne_hollick_passes(discharge, alpha, passes, reflect):
+    """반사 패딩 + 전진/후진 반복문 통과"""
+    x = np.pad(discharge, reflect, mode='reflect')
+    for n in range(passes):
+        x = loop_lyne_hollick(x[::-1], alpha)[::-1] if n % 2 else loop_lyne_hollick(x, alpha)
+    return x[reflect:x.size - reflect]
+
+
+def loop_eckhardt(discharge, alpha, bfi_max):
+    """기존 run_baseflow_analysis 의 Eckhardt 반복문"""
+    baseflow = np.zeros_like(discharge)
+    baseflow[0] = discharge[0] * bfi_max
+    for i in range(1, len(discharge)):
+        baseflow[i] = ((1 - bfi_max) * alpha * baseflow[i-1] +
+                       (1 - alpha) * bfi_max * discharge[i]) / (1 - alpha * bfi_max)
+        baseflow[i] = min(baseflow[i], discharge[i])
+    return baseflow
+
+
+def synthetic_hydrographs(seed=0):
+    """감수 + 홍수 첨두 일유량, 무작위 유량 (제한이 자주 걸리는 경우)"""
+    rng = np.random.default_rng(seed)
+    days = 365 * 10
+    season = 5 * np.exp(np.sin(np.arange(days) / 365 * 2 * np.pi))
+    storms = (rng.random(days) < 0.04) * rng.exponential(80, days)
+    yield season + np.convolve(storms, 0.7 ** np.arange(15))[:days]
+    yield noisy_storm_hydrograph(6000, rng)
+    yield rng.exponential(5, 2000)
+    yield np.array([3.0, 1.0])
+
+
+def noisy_storm_hydrograph(hours, rng):
+    """시간 유량 홍수 수문곡선 + 1% 계측 잡음 (제한이 촘촘하게 걸리는 경우)"""
+    t = np.arange(hours)
+    season = 20 + 10 * np.sin(t / (365 * 24) * 2 * np.pi)
+    storms = (rng.random(hours) < 0.002) * rng.exponential(300, hours)
+    flow = season + np.convolve(storms, 0.97 ** np.arange(24 * 10))[:hours]
+    return flow * (1 + 0.01 * rng.standard_normal(hours))
+
+
+class BaseflowKernelTests(SimpleTestCase):
+    """lfilter 커널이 기존 반복문(재귀 내부 제한)과 같은 결과를 내는지"""
+
+    def test_lyne_hollick_matches_loop(self):
+        for q in synthetic_hydrographs():
+            for alpha in (0.9, 0.925, 0.98):
+                np.testing.assert_allclose(lyne_hollick(q, alpha), loop_lyne_hollick(q, alpha), rtol=1e-10)
+
+    def test_eckhardt_matches_loop(self):
+        for q in synthetic_hydrographs():
+            for alpha in (0.925, 0.98):
+                for bfi_max in (0.5, 0.8):
+                    np.testing.assert_allclose(
+                        eckhardt(q, alpha, bfi_max), loop_eckhardt(q, alpha, bfi_max), rtol=1e-10,
+                    )
+
+    def test_dense_clamps_match_loop(self):
+        rng = np.random.default_rng(1)
+        q = noisy_storm_hydrograph(20000, rng)
+        for alpha in (0.925, 0.98):
+            np.testing.assert_allclose(lyne_hollick(q, alpha), loop_lyne_hollick(q, alpha), rtol=1e-10)
+            np.testing.assert_allclose(
+                lyne_hollick(q, alpha, passes=3),
+                loop_lyne_hollick_passes(q, alpha, 3, DEFAULT_REFLECT),
+                rtol=1e-10,
+            )
+
+    def test_pass_clamp_is_opt_in(self):
+        q = next(synthetic_hydrographs())
+        per_pass = lyne_hollick(q, 0.98, clamp=CLAMP_PASS)
+        self.assertFalse(np.allclose(per_pass, loop_lyne_hollick(q, 0.98)))
+        self.assertTrue(np.all((per_pass >= 0) & (per_pass <= q)))
+
+
+def two_reservoir_flow(baseflow_k, quickflow_k=0.7, days=3650, seed=0):
+    """기저유출(감수 baseflow_k) + 직접유출(감수 quickflow_k) 두 저류지 일유량"""
+    rng = np.random.default_rng(seed)
+    rain = (rng.random(days) < 0.08) * rng.exponential(20, days)
+    flow = np.empty(days)
+    base, quick = 5.0, 0.0
+    for i, r in enumerate(rain):
+        base = baseflow_k * base + 0.15 * r
+        quick = quickflow_k * quick + 0.85 * r
+        flow[i] = base + quick
+    return flow
+
+
+class RecessionEstimateTests(SimpleTestCase):
+    """감수 초기 직접유출에 끌려가지 않고 기저유출 감수 상수를 찾는지"""
+
+    def test_recovers_baseflow_constant(self):
+        for seed in range(3):
+            result = estimate_recession(two_reservoir_flow(0.98, seed=seed))
+            self.assertAlmostEqual(result['k'], 0.98, delta=0.005)
+            self.assertLessEqual(result['alpha_ci'][0], result['alpha'])
+            self.assertGreaterEqual(result['alpha_ci'][1], result['alpha'])
+
+    def test_out_of_range_is_refused(self):
+        with self.assertRaisesRegex(ValueError, '범위'):
+            estimate_recession(two_reservoir_flow(0.8, quickflow_k=0.5))
+
+
+class SessionResultKeyTests(SimpleTestCase):
+    """결과 키는 반올림한 유량으로 비교 (float 오차·문자열 입력 무시)"""
+
+    def test_rounded_discharge_matches(self):
+        day = date(2025, 5, 1)
+        key = session_result_key('가평', day, 0.3)
+        self.assertEqual(session_result_key(' 가평 ', day, 0.1 + 0.2), key)
+        self.assertEqual(session_result_key('가평', day, '0.30'), key)
+        self.assertNotEqual(session_result_key('가평', day, 0.31), key)
+
+    def test_incomplete_result_has_no_key(self):
+        self.assertEqual(session_result_key('', date(2025, 5, 1), 0.3), '')
+        self.assertEqual(session_result_key('가평', None, 0.3), '')
+        self.assertEqual(session_result_key('가평', date(2025, 5, 1), 'abc'), '')
+
+
+class ExportInlineRecoveryTests(TestCase):
+    """작업자가 없을 때 요청 중 생성이 중단되어 running 으로 남은 작업을 다시 생성하는지"""
+
+    def stuck_artifact(self, age, attempts=0):
+        from .models import ExportArtifact
+        return ExportArtifact.objects.create(
+            content_hash='a' * 64, kind=export_service.KIND_SESSION_PDF, object_id=1,
+            content_type=export_service.CONTENT_TYPE_PDF, status=ExportArtifact.STATUS_RUNNING,
+            started_at=timezone.now() - age, attempts=attempts,
+        )
+
+    def renderers(self):
+        return mock.patch.dict(export_service.RENDERERS, {
+            export_service.KIND_SESSION_PDF: (lambda artifact: artifact.object_id, lambda obj: (b'%PDF', 'a.pdf'), export_service.CONTENT_TYPE_PDF),
+        })
+
+    def test_stale_running_is_reclaimed(self):
+        artifact = self.stuck_artifact(timedelta(hours=3))
+        with self.renderers():
+            artifact = export_service.process_now(artifact)
+        self.assertEqual(artifact.status, artifact.STATUS_DONE)
+        self.assertEqual(bytes(artifact.content), b'%PDF')
+
+    def test_recent_running_is_left_alone(self):
+        artifact = self.stuck_artifact(timedelta(minutes=1))
+        with self.renderers():
+            artifact = export_service.process_now(artifact)
+        self.assertEqual(artifact.status, artifact.STATUS_RUNNING)
+
+    def test_repeated_interruptions_fail(self):
+        artifact = self.stuck_artifact(timedelta(hours=3), attempts=export_service.MAX_ATTEMPTS - 1)
+        with self.renderers():
+            artifact = export_service.process_now(artifact)
+        self.assertEqual(artifact.status, artifact.STATUS_FAILED)
+
+
+class ExportHeartbeatTests(SimpleTestCase):
+    """생성 중에도 생존 신호가 백그라운드 스레드에서 계속 기록되는지"""
+
+    def test_heartbeat_runs_until_stopped(self):
+        import time
+
+        with mock.patch.object(export_service, 'heartbeat') as beat, \
+                mock.patch('django.db.connection.close'):
+            thread = export_service._Heartbeat('test', interval=0.01)
+            thread.start()
+            time.sleep(0.1)  # 긴 생성 작업 중
+            thread.stop()
+            calls = beat.call_count
+            time.sleep(0.05)
+        self.assertGreater(calls, 3)
+        self.assertEqual(beat.call_count, calls)
+        self.assertFalse(thread.is_alive())
+
+
+class AnalysisExportQueueTests(TestCase):
+    """분석결과표 Excel 은 필터 조건으로 작업을 등록하고 같은 조건이면 산출물을 재사용하는지"""
+
+    def test_filter_is_queued_and_reused(self):
+        params = export_service.analysis_filter('가평', '2025-01-01', '')
+        artifact = export_service.request_export(export_service.KIND_ANALYSIS_EXCEL, params)
+        self.assertEqual(artifact.params, params)
+        self.assertEqual(artifact.status, artifact.STATUS_PENDING)
+
+        artifact = export_service.process_now(artifact)
+        self.assertEqual(artifact.status, artifact.STATUS_DONE)
+        self.assertEqual(bytes(artifact.content[:2]), b'PK')
+
+        again = export_service.request_export(export_service.KIND_ANALYSIS_EXCEL, dict(params))
+        self.assertEqual(again.pk, artifact.pk)
+        other = export_service.request_export(
+            export_service.KIND_ANALYSIS_EXCEL, export_service.analysis_filter('청송'),
+        )
+        self.assertNotEqual(other.pk, artifact.pk)
+
+
+class TimeseriesUploadTests(TestCase):
+    """업로드는 작업으로 등록되고, 형식이 맞지 않는 업로드로 새 관측소가 남지 않는지"""
+
+    def setUp(self):
+        from .models import ExportWorker
+
+        # 작업자 신호가 있으면 웹 프로세스 스레드를 띄우지 않음 (작업은 시험에서 직접 처리)
+        ExportWorker.objects.create(name='test', last_seen=timezone.now())
+
+    def upload(self, content, name='logger.csv'):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.urls import reverse
+
+        return self.client.post(reverse('measurement:timeseries_upload'), {
+            'file': SimpleUploadedFile(name, content),
+            'new_station_name': '시험 관측소',
+        })
+
+    def test_unreadable_file_creates_no_station(self):
+        from .models import Station
+
+        response = self.upload('설명,비고\n가,나\n'.encode('utf-8'))
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Station.objects.filter(name='시험 관측소').exists())
+
+    def test_upload_is_queued_and_imported_by_worker(self):
+        from .models import Station, TimeseriesImportJob, WaterLevelTimeSeries
+        from .timeseries_import_service import claim_next_import, process_import
+
+        response = self.upload(b'timestamp,stage\n2025-01-01 00:00,1.20\n2025-01-01 00:10,1.25\n')
+        self.assertEqual(response.status_code, 202)
+        payload = response.json()
+        self.assertEqual(payload['status'], 'pending')
+        station = Station.objects.get(name='시험 관측소')
+        self.assertFalse(WaterLevelTimeSeries.objects.filter(station=station).exists())
+
+        self.assertTrue(process_import(claim_next_import()))
+        self.assertEqual(WaterLevelTimeSeries.objects.filter(station=station).count(), 2)
+        status = self.client.get(payload['status_url']).json()
+        self.assertEqual(status['status'], 'done')
+        self.assertEqual(status['rows_imported'], 2)
+        self.assertIsNone(TimeseriesImportJob.objects.get(pk=payload['job_id']).content)
+
+    def test_empty_import_removes_created_station(self):
+        from .models import Station
+        from .timeseries_import_service import claim_next_import, process_import
+
+        # 앞부분은 읽히지만 뒤에서 전부 걸러지는 경우는 형식 확인으로 막을 수 없으므로 작업에서 정리
+        with mock.patch('measurement.timeseries_import_service.sniff_waterlevel_file'):
+            response = self.upload(b'timestamp,stage\nx,y\n')
+        self.assertEqual(response.status_code, 202)
+        self.assertFalse(process_import(claim_next_import()))
+        self.assertFalse(Station.objects.filter(name='시험 관측소').exists())
+        status = self.client.get(response.json()['status_url']).json()
+        self.assertEqual(status['status'], 'failed')
+
+
+SECTION_ROWS = [
+    {'distance': 0, 'depth': 0.2, 'velocity': 0.1},
+    {'distance': 2, 'depth': 0.6, 'velocity': 0.4},
+    {'distance': 4, 'depth': 0.8, 'velocity': 0.5},
+    {'distance': 6, 'depth': 0.3, 'velocity': 0.2},
+]
+
+
+def legacy_session(rows, station_name='가평'):
+    """저장 시점 계산 도입 전처럼 분석 항목이 비어 있는 세션"""
+    from .models import MeasurementSession
+
+    session = MeasurementSession.objects.create(station_name=station_name, rows_data=rows, estimated_discharge=1.2)
+    MeasurementSession.objects.filter(pk=session.pk).update(
+        **{field: None for field in MeasurementSession.ANALYSIS_FIELDS if field != 'quality_grade'},
+        quality_grade='',
+    )
+    return session
+
+
+class AnalysisBackfillTests(TestCase):
+    """저장 시점 계산 도입 전 세션(분석 항목 비어 있음)을 명령어·데이터 마이그레이션이 채우는지"""
+
+    def test_command_fills_legacy_sessions(self):
+        from django.core.management import call_command
+
+        from .models import MeasurementSession
+
+        session = legacy_session(SECTION_ROWS)
+        fresh = MeasurementSession(rows_data=SECTION_ROWS, estimated_discharge=1.2)
+        fresh.calculate_analysis_results()
+        call_command('backfill_analysis_results', stdout=mock.Mock())
+        session.refresh_from_db()
+        self.assertAlmostEqual(session.wetted_perimeter, fresh.wetted_perimeter)
+        self.assertEqual(session.velocity_verticals, 4)
+        self.assertEqual(session.quality_grade, 'P')
+
+    def test_migration_matches_model_and_skips_bad_rows(self):
+        import importlib
+
+        from django.apps import apps as django_apps
+
+        from .models import MeasurementSession
+
+        migration = importlib.import_module('measurement.migrations.0019_backfill_analysis_results')
+        session = legacy_session(SECTION_ROWS)
+        broken = legacy_session([{'distance': 'x', 'depth': 0.5, 'velocity': 0.1}])
+        migration.fill_analysis_results(django_apps, None)
+
+        session.refresh_from_db()
+        fresh = MeasurementSession(rows_data=SECTION_ROWS, estimated_discharge=1.2)
+        fresh.calculate_analysis_results()
+        for field in MeasurementSession.ANALYSIS_FIELDS:
+            self.assertEqual(getattr(session, field), getattr(fresh, field), field)
+        broken.refresh_from_db()
+        self.assertIsNone(broken.wetted_perimeter)
+
+
+class AnalysisWorkbookTests(TestCase):
+    """분석 항목이 비어 있는 세션도 Excel 에는 rows_data 로 계산한 값이 들어가는지"""
+
+    def test_missing_fields_are_computed(self):
+        import io
+
+        from openpyxl import load_workbook
+
+        from .analysis_export_service import write_analysis_workbook
+        from .models import MeasurementSession
+
+        legacy_session(SECTION_ROWS, station_name='가평천 보상류')
+        fresh = MeasurementSession(rows_data=SECTION_ROWS, estimated_discharge=1.2)
+        fresh.calculate_analysis_results()
+
+        fp = io.BytesIO()
+        with mock.patch('measurement.chart_service.session_chart_paths', return_value={}):
+            write_analysis_workbook(MeasurementSession.objects.all(), fp, max_workers=1)
+        fp.seek(0)
+        rows = {row[0]: row for row in load_workbook(fp).active.iter_rows(values_only=True) if row and row[0]}
+        self.assertIn('윤변', rows)
+        values = [v for v in rows['윤변'][1:] if isinstance(v, (int, float))]
+        self.assertEqual(values, [round(fresh.wetted_perimeter, 3)])
+        self.assertEqual(MeasurementSession.objects.get().wetted_perimeter, None)
+
+
+class ArchiveDirMixin:
+    """시험마다 임시 TIMESERIES_ARCHIVE_DIR"""
+
+    def setUp(self):
+        import tempfile
+
+        from django.test import override_settings
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings = override_settings(TIMESERIES_ARCHIVE_DIR=tmp.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+
+class ArchivedDischargeTests(ArchiveDirMixin, TestCase):
+    """아카이브된 수위 월의 유량은 DB 가 아니라 유량 아카이브 월 파일에 기록되는지"""
+
+    def test_archived_month_goes_to_discharge_archive(self):
+        from datetime import datetime
+        from zoneinfo import ZoneInfo
+
+        from .discharge_series_service import generate_discharge_series
+        from .models import DischargeTimeSeries, RatingCurve, Station, WaterLevelTimeSeries
+        from .timeseries_archive_service import DISCHARGE, WATERLEVEL, archive_month, read_archive
+
+        tz = ZoneInfo('Asia/Seoul')
+        station = Station.objects.create(name='가평')
+        RatingCurve.objects.create(station=station, year=2024, h_min=0, h_max=5, coef_a=2, coef_b=1.5)
+        old = [datetime(2024, 1, 10, hour, tzinfo=tz) for hour in range(3)]
+        recent = datetime(2024, 3, 1, tzinfo=tz)
+        WaterLevelTimeSeries.objects.bulk_create(
+            [WaterLevelTimeSeries(station=station, timestamp=ts, stage=1.0) for ts in old]
+            + [WaterLevelTimeSeries(station=station, timestamp=recent, stage=2.0)]
+        )
+        self.assertEqual(archive_month(WATERLEVEL, station.pk, 2024, 1), 3)
+
+        stats = generate_discharge_series(station)
+        self.assertEqual((stats['count'], stats['archived']), (4, 3))
+        self.assertEqual(list(DischargeTimeSeries.objects.values_list('timestamp', flat=True)), [recent])
+        archived = read_archive(DISCHARGE, station.pk)
+        self.assertEqual(len(archived), 3)
+        self.assertAlmostEqual(archived['discharge'].iloc[0], 2.0)
+
+        # 다시 생성해도 같은 시각은 교체 (중복 없음)
+        generate_discharge_series(station)
+        self.assertEqual(len(read_archive(DISCHARGE, station.pk)), 3)
+
+
+class SessionChartTests(TestCase):
+    """숫자로 변환되지 않는 측선 값이 있는 세션은 차트만 건너뛰고 나머지는 그리는지"""
+
+    def test_bad_rows_skip_only_that_chart(self):
+        import tempfile
+
+        from django.test import override_settings
+
+        from .chart_service import session_chart_paths
+        from .models import MeasurementSession
+
+        good = MeasurementSession.objects.create(station_name='가평', rows_data=SECTION_ROWS)
+        bad = MeasurementSession.objects.create(
+            station_name='가평', rows_data=[{'distance': '2,5', 'depth': 0.4}, {'distance': 4, 'depth': 0.5}],
+        )
+        with tempfile.TemporaryDirectory() as tmp, override_settings(CHART_CACHE_DIR=tmp), \
+                mock.patch('measurement.chart_service.render_chart', return_value=b'\x89PNG'), \
+                self.assertLogs('measurement.chart_service', 'WARNING'):
+            paths = session_chart_paths(MeasurementSession.objects.order_by('pk'), max_workers=1)
+        self.assertIn(good.pk, paths)
+        self.assertNotIn(bad.pk, paths)
+
+
+class SessionDamInfluenceTests(TestCase):
+    """세션 댐 방류 영향은 로컬 사본만으로 판정하고, 사본에 없는 날짜는 unsynced 로 알리는지"""
+
+    def setUp(self):
+        from datetime import datetime
+        from zoneinfo import ZoneInfo
+
+        from hydro.dam_release_service import invalidate_index
+        from hydro.models import DamReleaseEvent, DamReleaseFetchedRange
+
+        tz = ZoneInfo('Asia/Seoul')
+        DamReleaseEvent.objects.create(
+            dam_name='팔당댐', start=datetime(2025, 5, 1, 6, tzinfo=tz), end=datetime(2025, 5, 3, 6, tzinfo=tz),
+        )
+        DamReleaseFetchedRange.objects.create(start=date(2025, 4, 20), end=date(2025, 5, 10))
+        invalidate_index()
+        self.addCleanup(invalidate_index)
+
+    def test_sessions_are_matched_without_fetching(self):
+        import json
+
+        from django.urls import reverse
+
+        from .models import MeasurementSession
+
+        def session(day):
+            return MeasurementSession.objects.create(
+                station_name='한강대교', measurement_date=day, setup_data={'station_code': '1018683'},
+            ).pk
+
+        ids = [session(date(2025, 5, 2)), session(date(2025, 5, 5)), session(date(2025, 6, 15))]
+        with mock.patch('hydro.dam_release_service._fetch_window') as fetch:
+            response = self.client.post(
+                reverse('measurement:api_session_dam_influence'),
+                json.dumps({'ids': ids}), content_type='application/json',
+            )
+        fetch.assert_not_called()
+        payload = response.json()
+        self.assertEqual([r['is_influenced'] for r in payload['results']], [True, False, False])
+        self.assertEqual(payload['results'][0]['influencing_dams'][0]['dam_name'], '팔당댐')
+        # 6/15 판정에 필요한 날짜: 도달시간 2시간 + 룩백(가장 긴 방류 2일)
+        self.assertEqual(payload['unsynced'], [{'start': '2025-06-12', 'end': '2025-06-15'}])
+
+
+class DischargeBatchTests(SimpleTestCase):
+    """일괄 계산(측선 상세 생략)이 세션별 단일 계산과 같은 요약값을 내는지"""
+
+    def test_batch_matches_single(self):
+        from .discharge_service import calculate_discharge, calculate_discharge_batch
+
+        rows_list = [
+            [dict(row, method='1', n_06d=30, t_06d=60) for row in SECTION_ROWS],
+            [dict(row, method='2', n_02d=40, t_02d=60, n_08d=20, t_08d=60) for row in SECTION_ROWS[:3]],
+        ]
+        calibration = {'a': 0.0116, 'b': 0.2505}
+        batch = calculate_discharge_batch(rows_list, calibration, include_verticals=False)
+        for rows, result in zip(rows_list, batch):
+            single = calculate_discharge(rows, calibration)
+            self.assertGreater(single['discharge'], 0)
+            self.assertEqual(result['verticals'], [])
+            self.assertEqual({k: v for k, v in result.items() if k != 'verticals'},
+                             {k: v for k, v in single.items() if k != 'verticals'})
+
+
+def rating_curve(pk, year, h_min, h_max, a, b, h0=0.0, curve_type='open'):
+    from types import SimpleNamespace
+
+    return SimpleNamespace(
+        pk=pk, year=year, curve_type=curve_type, h_min=h_min, h_max=h_max, coef_a=a, coef_b=b, coef_h0=h0,
+    )
+
+
+class RatingEngineTests(SimpleTestCase):
+    """연도·곡선유형·수위구간별 곡선 선택과 외삽/의심 플래그"""
+
+    def test_segments_years_and_flags(self):
+        from .rating_service import FLAG_EXTRAPOLATED, FLAG_GOOD, FLAG_SUSPECT, compile_curves
+
+        rating = compile_curves([
+            rating_curve(1, 2020, 0.0, 1.0, 2.0, 1.0),
+            rating_curve(2, 2020, 1.0, 3.0, 3.0, 2.0, h0=0.5),
+            rating_curve(3, 2022, 0.0, 3.0, 5.0, 1.0),
+            rating_curve(4, 2022, 0.0, 3.0, 9.0, 1.0, curve_type='ice'),
+        ])
+        years = [2019, 2020, 2021, 2021, 2022, 2023, 2020]
+        stages = [0.5, 2.0, 0.5, 4.0, 1.0, 1.0, -0.1]
+        discharge, flags, seg = rating.evaluate(years, stages)
+
+        # 2019 → 최초 곡선, 2021 → 직전(2020) 곡선, 2023 → 2022 open 곡선
+        self.assertEqual(rating.curve_ids[seg].tolist(), [1, 2, 1, 2, 3, 3, 1])
+        np.testing.assert_allclose(discharge, [1.0, 3.0 * 1.5 ** 2, 1.0, 3.0 * 3.5 ** 2, 5.0, 5.0, 0.0])
+        self.assertEqual(flags.tolist(), [
+            FLAG_GOOD, FLAG_GOOD, FLAG_GOOD, FLAG_EXTRAPOLATED, FLAG_GOOD, FLAG_GOOD, FLAG_SUSPECT,
+        ])
+
+    def test_no_curves(self):
+        from .rating_service import FLAG_SUSPECT, compile_curves
+
+        rating = compile_curves([])
+        self.assertFalse(rating)
+        discharge, flags, _ = rating.evaluate([2020], [1.0])
+        self.assertTrue(np.isnan(discharge[0]))
+        self.assertEqual(flags[0], FLAG_SUSPECT)
+
+
+class StationRatingCacheTests(TestCase):
+    """관측소 경계표 캐시가 곡선 저장 시 바로 다시 컴파일되는지"""
+
+    def test_save_invalidates(self):
+        from .models import RatingCurve, Station
+        from .rating_service import get_station_rating
+
+        station = Station.objects.create(name='가평')
+        curve = RatingCurve.objects.create(station=station, year=2024, h_min=0, h_max=5, coef_a=2, coef_b=1)
+        first = get_station_rating(station.pk)
+        self.assertIs(get_station_rating(station.pk), first)
+
+        curve.coef_a = 4
+        curve.save()
+        discharge, _, _ = get_station_rating(station.pk).evaluate([2024], [1.0])
+        self.assertEqual(discharge.tolist(), [4.0])
+
+
+class TimeseriesSeriesApiTests(TestCase):
+    """차트 API 가 요청 점 수 이하로 구간 집계하고, 커서로 구간 확대 조회하는지"""
+
+    def setUp(self):
+        from datetime import datetime
+        from zoneinfo import ZoneInfo
+
+        from .models import Station, WaterLevelTimeSeries
+
+        self.station = Station.objects.create(name='가평')
+        start = datetime(2025, 1, 1, tzinfo=ZoneInfo('Asia/Seoul'))
+        WaterLevelTimeSeries.objects.bulk_create([
+            WaterLevelTimeSeries(station=self.station, timestamp=start + timedelta(hours=i), stage=1 + (i % 10) / 10)
+            for i in range(200)
+        ])
+
+    def get(self, **params):
+        from django.urls import reverse
+
+        return self.client.get(
+            reverse('measurement:api_timeseries_series', args=[self.station.pk]), params,
+        ).json()
+
+    def test_bucket_and_zoom(self):
+        result = self.get(points=20)
+        self.assertEqual(result['resolution'], 'bucket')
+        self.assertEqual(result['count'], 200)
+        self.assertLessEqual(len(result['points']), 20)
+        self.assertEqual(sum(p['count'] for p in result['points']), 200)
+        self.assertEqual(min(p['stage_min'] for p in result['points']), 1.0)
+        self.assertEqual(max(p['stage_max'] for p in result['points']), 1.9)
+
+        zoomed = self.get(points=1000, cursor=result['cursor'], **{'from': 0, 'to': 0})
+        self.assertEqual(zoomed['resolution'], 'raw')
+        self.assertEqual(len(zoomed['points']), result['points'][0]['count'])
+
+    def test_lttb_keeps_ends_and_peak(self):
+        from .timeseries_query_service import lttb_indices
+
+        y = np.zeros(1000)
+        y[537] = 10.0
+        idx = lttb_indices(np.arange(1000.0), y, 50)
+        self.assertEqual(len(idx), 50)
+        self.assertEqual((idx[0], idx[-1]), (0, 999))
+        self.assertIn(537, idx)
+
+
+class TimeseriesArchiveTests(ArchiveDirMixin, TestCase):
+    """월 아카이브 후 DB + 아카이브 통합 조회가 원래 자료와 같고, 같은 시각은 DB 값이 우선하는지"""
+
+    def test_round_trip(self):
+        from datetime import datetime
+        from zoneinfo import ZoneInfo
+
+        from .models import Station, WaterLevelTimeSeries
+        from .timeseries_archive_service import (
+            WATERLEVEL, archive_month, load_series, month_path, station_months, total_count,
+        )
+
+        tz = ZoneInfo('Asia/Seoul')
+        station = Station.objects.create(name='가평')
+        # 1월 1일 00:30 KST 는 UTC 로 12월이지만 현지 월 기준 1월 파일에 들어가야 함
+        times = [datetime(2024, 1, 1, 0, 30, tzinfo=tz) + timedelta(hours=6 * i) for i in range(124)]
+        WaterLevelTimeSeries.objects.bulk_create([
+            WaterLevelTimeSeries(station=station, timestamp=ts, stage=i / 100, quality_flag='good')
+            for i, ts in enumerate(times)
+        ])
+        january = sum(1 for ts in times if ts.month == 1)
+
+        self.assertEqual(archive_month(WATERLEVEL, station.pk, 2024, 1), january)
+        self.assertEqual(station_months(WATERLEVEL, station.pk), [(2024, 1)])
+        self.assertEqual(WaterLevelTimeSeries.objects.filter(station=station).count(), 124 - january)
+        self.assertEqual(total_count(WATERLEVEL, station.pk), 124)
+
+        frame = load_series(WATERLEVEL, station.pk)
+        self.assertEqual([ts.to_pydatetime() for ts in frame['timestamp']], times)
+        np.testing.assert_allclose(frame['stage'], np.arange(124) / 100)
+
+        # 아카이브된 시각을 DB 에 다시 넣으면 DB 값 우선
+        WaterLevelTimeSeries.objects.create(station=station, timestamp=times[0], stage=9.0)
+        frame = load_series(WATERLEVEL, station.pk, times[0], times[1])
+        self.assertEqual(frame['stage'].tolist(), [9.0, 0.01])
+
+        # 관측소 삭제 시 커밋 후 아카이브 파일도 삭제
+        path = month_path(WATERLEVEL, station.pk, 2024, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            station.delete()
+        self.assertFalse(path.exists())
+
+    def test_archiving_needs_persistent_dir(self):
+        from django.core.exceptions import ImproperlyConfigured
+        from django.test import override_settings
+
+        from .timeseries_archive_service import WATERLEVEL, archive_month
+
+        with override_settings(TIMESERIES_ARCHIVE_DIR=None), self.assertRaises(ImproperlyConfigured):
+            archive_month(WATERLEVEL, 1, 2024, 1)
+
+
+class BaseflowSweepTests(SimpleTestCase):
+    """일괄 보정이 관측소별 격자를 단일 분리와 같게 계산하고, 자료 부족/오류 관측소는 오류로 남기는지"""
+
+    def test_grid_matches_single_runs(self):
+        import io
+
+        from . import baseflow_batch_service
+        from .baseflow_service import separate, statistics
+
+        days = [date(2024, 1, 1) + timedelta(days=i) for i in range(400)]
+        flows = {1: two_reservoir_flow(0.97, days=400), 2: two_reservoir_flow(0.98, days=400, seed=1)}
+        flows[2][:5] = np.nan  # 결측일 제외
+
+        def load_source(source, start, end):
+            pk = source['station_id']
+            if pk == 9:
+                raise ValueError('관측소를 찾을 수 없습니다.')
+            q = flows.get(pk, np.ones(10))
+            return {'station': str(pk), 'station_name': f'관측소{pk}', 'source': 'internal',
+                    'dates': days[:len(q)], 'discharge': q}
+
+        with mock.patch.object(baseflow_batch_service, 'load_source', load_source):
+            results = baseflow_batch_service.run_sweep(
+                [{'station_id': pk} for pk in (1, 2, 3, 9)], None, None, 'eckhardt',
+                alphas=[0.95, 0.98], bfi_maxes=[0.5, 0.8], max_workers=1,
+            )
+
+        self.assertEqual([r['station'] for r in results], ['1', '2', '3', '9'])
+        self.assertEqual(results[1]['days'], 395)
+        self.assertIn('최소', results[2]['error'])
+        self.assertIn('찾을 수 없습니다', results[3]['error'])
+        for entry, q in ((results[0], flows[1]), (results[1], flows[2][5:])):
+            self.assertEqual(len(entry['grid']), 4)
+            for row in entry['grid']:
+                expected = statistics(q, separate(q, 'eckhardt', alpha=row['alpha'], bfi_max=row['bfi_max']))
+                self.assertEqual(row['bfi'], expected['bfi'])
+
+        out = io.StringIO()
+        baseflow_batch_service.write_csv(results, out)
+        self.assertEqual(len(out.getvalue().strip().splitlines()), 1 + 8)
+
+    def test_grid_limit(self):
+        from .baseflow_batch_service import MAX_GRID, run_sweep
+
+        with self.assertRaisesRegex(ValueError, str(MAX_GRID)):
+            run_sweep([], None, None, 'lyne_hollick', alphas=[0.9] * (MAX_GRID + 1))
+
+
+class ServerBaseflowTests(TestCase):
+    """서버 분석이 저장된 유량 시계열을 현지 날짜로 일평균해 분리하고 결과를 압축 저장하는지"""
+
+    def test_discharge_source(self):
+        from datetime import datetime
+        from zoneinfo import ZoneInfo
+
+        from .baseflow_analysis_service import SOURCE_DISCHARGE, run_station_analysis
+        from .baseflow_service import separate, statistics
+        from .models import DischargeTimeSeries, Station
+
+        tz = ZoneInfo('Asia/Seoul')
+        station = Station.objects.create(name='가평')
+        q = two_reservoir_flow(0.97, days=60)
+        first = datetime(2024, 3, 1, tzinfo=tz)
+        # 하루 4회 같은 유량 (00시 KST 는 UTC 전날이므로 현지 날짜로 묶여야 함)
+        DischargeTimeSeries.objects.bulk_create([
+            DischargeTimeSeries(station=station, timestamp=first + timedelta(days=d, hours=h), stage=1.0, discharge=q[d])
+            for d in range(60) for h in (0, 6, 12, 18)
+        ])
+
+        analysis, result = run_station_analysis(
+            station, first, first + timedelta(days=60), 'lyne_hollick', alpha=0.95, source=SOURCE_DISCHARGE,
+        )
+        self.assertEqual(result['dates'][0], date(2024, 3, 1))
+        np.testing.assert_allclose(result['discharge'], q)
+        expected = separate(q, 'lyne_hollick', alpha=0.95)
+        np.testing.assert_allclose(result['baseflow'], expected)
+        self.assertEqual(analysis.bfi, statistics(q, expected)['bfi'])
+
+        analysis.refresh_from_db()
+        daily = analysis.daily_series()
+        self.assertEqual(len(daily['dates']), 60)
+        np.testing.assert_allclose(daily['baseflow'], expected, rtol=1e-6)
+
+    def test_too_few_days(self):
+        from .baseflow_analysis_service import SOURCE_DISCHARGE, run_station_analysis
+        from .models import Station
+
+        station = Station.objects.create(name='가평')
+        now = timezone.now()
+        with self.assertRaisesRegex(ValueError, '최소'):
+            run_station_analysis(station, now - timedelta(days=90), now, 'lyne_hollick', source=SOURCE_DISCHARGE)
+
+
+class BaseflowPackedStorageTests(TestCase):
+    """일별 결과 압축 저장 왕복과, 이전 BaseflowDaily 행을 0010 마이그레이션이 압축 배열로 옮기는지"""
+
+    def test_pack_round_trip_with_gaps(self):
+        from .baseflow_storage_service import pack_daily, unpack_daily
+
+        days = [date(2024, 1, 3), date(2024, 1, 1), date(2024, 1, 7)]
+        origin, packed = pack_daily(days, [3.0, 1.0, 7.0], [1.5, 0.5, 3.5], [1.5, 0.5, 3.5])
+        self.assertEqual(origin, date(2024, 1, 1))
+        self.assertEqual(len(packed), 3 * 7 * 4)  # 7일 격자 × float32 3행
+        series = unpack_daily(origin, packed)
+        self.assertEqual(series['dates'].astype(str).tolist(), ['2024-01-01', '2024-01-03', '2024-01-07'])
+        self.assertEqual(series['total'].tolist(), [1.0, 3.0, 7.0])
+        self.assertEqual(pack_daily([], [], [], []), (None, None))
+
+    def test_migration_packs_legacy_rows(self):
+        import importlib
+
+        from django.apps import apps as django_apps
+
+        from .models import BaseflowAnalysis, BaseflowDaily, Station
+
+        migration = importlib.import_module('measurement.migrations.0010_baseflow_packed_daily')
+        station = Station.objects.create(name='가평')
+        analysis = BaseflowAnalysis.objects.create(
+            station=station, start_date=date(2024, 1, 1), end_date=date(2024, 1, 3), method='lyne_hollick',
+        )
+        BaseflowDaily.objects.bulk_create([
+            BaseflowDaily(analysis=analysis, date=date(2024, 1, d), total_discharge=d, baseflow=d / 2, direct_runoff=d / 2)
+            for d in (1, 2, 3)
+        ])
+        legacy = analysis.daily_series()
+
+        migration.pack_existing_rows(django_apps, None)
+        analysis.refresh_from_db()
+        self.assertFalse(BaseflowDaily.objects.exists())
+        packed = analysis.daily_series()
+        for name in ('dates', 'total', 'baseflow', 'direct_runoff'):
+            np.testing.assert_array_equal(packed[name], legacy[name].astype(packed[name].dtype))
+
+
+class SessionHashMigrationTests(TestCase):
+    """0013/0016 마이그레이션의 고정 해시 사본이 현재 서비스와 같은 값을 채우는지"""
+
+    def test_backfilled_hashes_match_service(self):
+        import importlib
+
+        from django.apps import apps as django_apps
+
+        from .models import MeasurementSession
+        from .session_dedupe_service import session_content_hash
+
+        sessions = [
+            MeasurementSession.objects.create(
+                station_name='가평', measurement_date=date(2025, 5, 1), rows_data=SECTION_ROWS,
+                calibration_data={'a': 0.0116, 'b': 0.2505}, estimated_discharge=1.2,
+            ),
+            MeasurementSession.objects.create(station_name='청송', estimated_discharge=0.3),
+        ]
+        MeasurementSession.objects.update(content_hash='', result_key='')
+
+        importlib.import_module('measurement.migrations.0013_measurementsession_content_hash') \
+            .fill_content_hash(django_apps, None)
+        importlib.import_module('measurement.migrations.0016_measurementsession_result_key') \
+            .fill_result_key(django_apps, None)
+
+        for session in sessions:
+            stored = MeasurementSession.objects.get(pk=session.pk)
+            self.assertEqual(stored.content_hash, session_content_hash(
+                session.station_name, session.measurement_date, session.rows_data,
+                session.calibration_data, session.estimated_discharge,
+            ))
+            self.assertEqual(
+                stored.result_key,
+                session_result_key(session.station_name, session.measurement_date, session.estimated_discharge),
+            )
+        self.assertNotEqual(MeasurementSession.objects.get(pk=sessions[0].pk).result_key, '')
+
+
+def spatial_catalog(mtime_ns=1):
+    """수위관측소 2개(한강대교, 청송교)와 강수량관측소 1개 카탈로그"""
+    from hydro.station_data import StationCatalog
+
+    return StationCatalog({'stations': {
+        'waterlevel': [
+            {'name': '한강대교', 'code': '1018683', 'river': '한강', 'lat': 37.5172, 'lon': 126.9590},
+            {'name': '청송군(청송교)', 'code': '2004640', 'river': '낙동강', 'lat': 36.4353, 'lon': 129.0570},
+        ],
+        'rainfall': [
+            {'name': '용산', 'code': '10184100', 'river': '한강', 'lat': 37.5300, 'lon': 126.9650},
+        ],
+    }}, mtime_ns)
+
+
+class SessionStationLinkTests(TestCase):
+    def setUp(self):
+        from hydro import station_spatial_service
+
+        catalog = spatial_catalog()
+        patcher = mock.patch.multiple(station_spatial_service, get_catalog=lambda: catalog, _index=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_save_links_nearest_gauge(self):
+        from .models import MeasurementSession
+
+        session = MeasurementSession.objects.create(station_name='한강대교', latitude=37.5180, longitude=126.9600)
+        session.refresh_from_db()
+        self.assertEqual(session.nearest_station_code, '1018683')
+        self.assertLess(session.nearest_station_distance, 1.0)
+
+        # setup_data 좌표로 대체, update_fields 에 연결 컬럼이 함께 저장됨
+        session.latitude = session.longitude = None
+        session.setup_data = {'latitude': '36.44', 'longitude': '129.05'}
+        session.save(update_fields=['latitude', 'longitude', 'setup_data'])
+        session.refresh_from_db()
+        self.assertEqual(session.nearest_station_code, '2004640')
+
+        # 연결 거리(10km) 밖이거나 좌표가 없으면 연결을 비움
+        session.setup_data = {'latitude': 33.46, 'longitude': 126.33}
+        session.save()
+        session.refresh_from_db()
+        self.assertEqual((session.nearest_station_code, session.nearest_station_distance), ('', None))
+
+    def test_unrelated_update_keeps_link(self):
+        from .models import MeasurementSession
+
+        session = MeasurementSession.objects.create(station_name='한강대교', latitude=37.5180, longitude=126.9600)
+        with mock.patch('hydro.station_spatial_service.nearest_gauges') as nearest:
+            session.station_name = '한강대교(수정)'
+            session.save(update_fields=['station_name'])
+        nearest.assert_not_called()
+
+    def test_backfill_links_unlinked_sessions(self):
+        from .models import MeasurementSession
+        from .session_station_link_service import backfill_station_links
+
+        session = MeasurementSession.objects.create(station_name='한강대교', latitude=37.5180, longitude=126.9600)
+        MeasurementSession.objects.filter(pk=session.pk).update(nearest_station_code='', nearest_station_distance=None)
+        self.assertEqual(backfill_station_links(), 1)
+        session.refresh_from_db()
+        self.assertEqual(session.nearest_station_code, '1018683')
+
+    def test_nearest_api(self):
+        from django.urls import reverse
+
+        url = reverse('hydro:api_station_nearest')
+        data = self.client.get(url, {'lat': 37.52, 'lon': 126.96, 'k': 5, 'types': 'waterlevel'}).json()
+        self.assertEqual([s['code'] for s in data['stations']['waterlevel']], ['1018683', '2004640'])
+        self.assertEqual(set(data['stations']), {'waterlevel'})
+
+        response = self.client.post(url, {'points': [[37.52, 126.96], [999, 0]], 'k': 1, 'max_distance': 5},
+                                    content_type='application/json')
+        results = response.json()['results']
+        self.assertEqual([s['code'] for s in results[0]['stations']['rainfall']], ['10184100'])
+        self.assertIsNone(results[1]['stations'])
+
+        self.assertEqual(self.client.get(url, {'lat': 37.52, 'lon': 126.96, 'types': 'river'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'lat': 91, 'lon': 0}).status_code, 400)
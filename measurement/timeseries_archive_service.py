@@ -0,0 +1,485 @@
+"""
+시계열 Parquet 아카이브 서비스
+
+마감된 월의 WaterLevelTimeSeries / DischargeTimeSeries 행을 관측소/연도 파티션 Parquet 파일로
+옮기고(DB 에서는 삭제), DB(최근 자료)와 아카이브(과거 자료)를 합쳐 읽는 조회 계층을 제공한다.
+
+파일 구조:
+    {TIMESERIES_ARCHIVE_DIR}/{kind}/station={id}/year={YYYY}/{YYYY}-{MM}.parquet
+
+- kind: 'waterlevel' 또는 'discharge'
+- 월 경계는 settings.TIME_ZONE 현지 시각 기준, 저장 시각은 UTC
+- 같은 시각이 DB 와 아카이브에 모두 있으면 DB 값을 우선한다
+- TIMESERIES_ARCHIVE_DIR 미설정이면 아카이브가 없는 것으로 보고 읽으며, 옮기기(DB 삭제)는 거부한다
+- 관측소가 삭제되면 해당 관측소의 아카이브 파일도 삭제한다 (MeasurementConfig.ready 에서 시그널 연결)
+"""
+import logging
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+WATERLEVEL = 'waterlevel'
+DISCHARGE = 'discharge'
+
+# 종류별 저장 컬럼 (timestamp 제외)
+ARCHIVE_COLUMNS = {
+    WATERLEVEL: ['stage', 'quality_flag'],
+    DISCHARGE: ['stage', 'discharge', 'rating_curve_id', 'quality_flag'],
+}
+
+ARCHIVE_SCHEMAS = {
+    WATERLEVEL: pa.schema([
+        ('timestamp', pa.timestamp('us', tz='UTC')),
+        ('stage', pa.float64()),
+        ('quality_flag', pa.string()),
+    ]),
+    DISCHARGE: pa.schema([
+        ('timestamp', pa.timestamp('us', tz='UTC')),
+        ('stage', pa.float64()),
+        ('discharge', pa.float64()),
+        ('rating_curve_id', pa.int64()),
+        ('quality_flag', pa.string()),
+    ]),
+}
+
+
+def _model(kind):
+    from .models import WaterLevelTimeSeries, DischargeTimeSeries
+    return {WATERLEVEL: WaterLevelTimeSeries, DISCHARGE: DischargeTimeSeries}[kind]
+
+
+def archive_root():
+    """아카이브 루트 디렉토리 (미설정이면 None)"""
+    root = getattr(settings, 'TIMESERIES_ARCHIVE_DIR', None)
+    return Path(root) if root else None
+
+
+def require_archive_root():
+    """
+    DB 행을 옮기기 전 아카이브 경로 확인
+
+    Raises:
+        ImproperlyConfigured: TIMESERIES_ARCHIVE_DIR 미설정
+    """
+    root = archive_root()
+    if root is None:
+        raise ImproperlyConfigured(
+            'TIMESERIES_ARCHIVE_DIR 가 설정되지 않았습니다. 재배포 후에도 유지되는 영구 저장소(볼륨) 경로를 '
+            '지정해야 시계열을 아카이브할 수 있습니다 (DEPLOYMENT.md 참고).'
+        )
+    return root
+
+
+def month_path(kind, station_id, year, month):
+    """월 파일 경로"""
+    return archive_root() / kind / f'station={station_id}' / f'year={year}' / f'{year}-{month:02d}.parquet'
+
+
+def month_bounds(year, month, tz=None):
+    """현지 시각 기준 월 [시작, 다음 달 시작)"""
+    tz = tz or ZoneInfo(settings.TIME_ZONE)
+    start = datetime(year, month, 1, tzinfo=tz)
+    end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=tz)
+    return start, end
+
+
+def station_months(kind, station_id):
+    """아카이브된 (연, 월) 목록 (오름차순)"""
+    root = archive_root()
+    base = root / kind / f'station={station_id}' if root else None
+    if base is None or not base.exists():
+        return []
+
+    months = []
+    for path in base.glob('year=*/*.parquet'):
+        try:
+            year, month = path.stem.split('-')
+            months.append((int(year), int(month)))
+        except ValueError:
+            continue
+    return sorted(months)
+
+
+def archived_station_ids(kind):
+    """월 파일이 하나 이상 있는 관측소 ID 집합"""
+    root = archive_root()
+    base = root / kind if root else None
+    if base is None or not base.exists():
+        return set()
+
+    station_ids = set()
+    for path in base.glob('station=*'):
+        try:
+            station_id = int(path.name.split('=', 1)[1])
+        except ValueError:
+            continue
+        if next(path.glob('year=*/*.parquet'), None) is not None:
+            station_ids.add(station_id)
+    return station_ids
+
+
+def _months_between(start, end, tz):
+    """기간과 겹치는 (연, 월) 목록"""
+    start, end = start.astimezone(tz), end.astimezone(tz)
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def read_archive(kind, station_id, start=None, end=None, columns=None):
+    """
+    아카이브 조회 (필요 월 파일과 컬럼만 읽음)
+
+    Args:
+        kind: 'waterlevel' / 'discharge'
+        station_id: 관측소 ID
+        start, end: 조회 기간 (aware datetime, None 이면 전체)
+        columns: 읽을 컬럼 (None 이면 전체, timestamp 는 항상 포함)
+
+    Returns:
+        DataFrame: timestamp(UTC) 오름차순
+    """
+    months = _overlapping_months(kind, station_id, start, end)
+
+    columns = ['timestamp'] + [c for c in (columns or ARCHIVE_COLUMNS[kind]) if c != 'timestamp']
+    filters = []
+    if start is not None:
+        filters.append(('timestamp', '>=', pd.Timestamp(start).tz_convert('UTC')))
+    if end is not None:
+        filters.append(('timestamp', '<=', pd.Timestamp(end).tz_convert('UTC')))
+
+    tables = [
+        pq.read_table(month_path(kind, station_id, y, m), columns=columns, filters=filters or None)
+        for y, m in months
+    ]
+    if not tables:
+        schema = ARCHIVE_SCHEMAS[kind]
+        return pa.schema([schema.field(c) for c in columns]).empty_table().to_pandas()
+
+    return pa.concat_tables(tables).to_pandas().sort_values('timestamp', ignore_index=True)
+
+
+def archive_count(kind, station_id):
+    """아카이브 행 수 (Parquet 메타데이터만 읽음)"""
+    return sum(
+        pq.ParquetFile(month_path(kind, station_id, y, m)).metadata.num_rows
+        for y, m in station_months(kind, station_id)
+    )
+
+
+def archive_range(kind, station_id):
+    """아카이브 (최초, 최종) 시각 - 첫/마지막 월 파일의 timestamp 컬럼만 읽음"""
+    months = station_months(kind, station_id)
+    if not months:
+        return None, None
+
+    first = pq.read_table(month_path(kind, station_id, *months[0]), columns=['timestamp'])['timestamp']
+    last = pq.read_table(month_path(kind, station_id, *months[-1]), columns=['timestamp'])['timestamp']
+    return pc.min(first).as_py(), pc.max(last).as_py()
+
+
+def _overlapping_months(kind, station_id, start=None, end=None):
+    """기간과 겹치는 아카이브 (연, 월) 목록"""
+    months = station_months(kind, station_id)
+    if not months or (start is None and end is None):
+        return months
+
+    tz = ZoneInfo(settings.TIME_ZONE)
+    lo = start or month_bounds(*months[0], tz)[0]
+    hi = end or month_bounds(*months[-1], tz)[1]
+    wanted = set(_months_between(lo, hi, tz))
+    return [m for m in months if m in wanted]
+
+
+def has_archive(kind, station_id, start=None, end=None):
+    """기간과 겹치는 아카이브 파일 존재 여부"""
+    return bool(_overlapping_months(kind, station_id, start, end))
+
+
+def _hot_frame(kind, station_id, start=None, end=None, columns=None, quality_flag=None):
+    """DB(최근 자료) 조회 → DataFrame"""
+    columns = ['timestamp'] + [c for c in (columns or ARCHIVE_COLUMNS[kind]) if c != 'timestamp']
+    queryset = _model(kind).objects.filter(station_id=station_id)
+    if start is not None:
+        queryset = queryset.filter(timestamp__gte=start)
+    if end is not None:
+        queryset = queryset.filter(timestamp__lte=end)
+    if quality_flag:
+        queryset = queryset.filter(quality_flag=quality_flag)
+
+    frame = pd.DataFrame.from_records(
+        queryset.order_by('timestamp').values_list(*columns).iterator(chunk_size=10000),
+        columns=columns,
+    )
+    frame['timestamp'] = pd.to_datetime(frame['timestamp'], utc=True)
+    return frame
+
+
+def load_series(kind, station_id, start=None, end=None, columns=None, quality_flag=None):
+    """
+    DB + 아카이브 통합 조회
+
+    Args:
+        kind: 'waterlevel' / 'discharge'
+        station_id: 관측소 ID
+        start, end: 조회 기간 (aware datetime)
+        columns: 필요한 컬럼
+        quality_flag: 지정 시 해당 품질플래그만
+
+    Returns:
+        DataFrame: timestamp(UTC) 오름차순, 중복 시각은 DB 값 우선
+    """
+    read_columns = list(columns or ARCHIVE_COLUMNS[kind])
+    if quality_flag and 'quality_flag' not in read_columns:
+        read_columns.append('quality_flag')
+
+    hot = _hot_frame(kind, station_id, start, end, read_columns, quality_flag)
+    if not has_archive(kind, station_id, start, end):
+        return hot
+
+    cold = read_archive(kind, station_id, start, end, read_columns)
+    if quality_flag:
+        cold = cold[cold['quality_flag'] == quality_flag]
+
+    frames = [f for f in (cold, hot) if len(f)]
+    if not frames:
+        return hot
+    combined = pd.concat(frames, ignore_index=True)
+    combined = combined.drop_duplicates(subset='timestamp', keep='last')
+    return combined.sort_values('timestamp', ignore_index=True)
+
+
+def daily_mean(kind, station_id, start, end, column, quality_flag=None):
+    """
+    일평균 값 (DB + 아카이브)
+
+    기간이 아카이브와 겹치지 않으면 DB 에서 TruncDate/Avg 로 집계하고,
+    겹치면 통합 조회 후 현지 날짜 기준으로 평균한다.
+
+    Args:
+        kind: 'waterlevel' / 'discharge'
+        column: 평균할 컬럼 ('stage', 'discharge')
+        quality_flag: 지정 시 해당 품질플래그만
+
+    Returns:
+        list: [(date, 평균), ...] (날짜 순)
+    """
+    from django.db.models import Avg
+    from django.db.models.functions import TruncDate
+
+    if not has_archive(kind, station_id, start, end):
+        queryset = _model(kind).objects.filter(
+            station_id=station_id, timestamp__gte=start, timestamp__lte=end,
+        )
+        if quality_flag:
+            queryset = queryset.filter(quality_flag=quality_flag)
+        return list(
+            queryset.annotate(date=TruncDate('timestamp'))
+            .values('date').annotate(avg=Avg(column)).order_by('date')
+            .values_list('date', 'avg')
+        )
+
+    frame = load_series(kind, station_id, start, end, columns=[column], quality_flag=quality_flag)
+    if frame.empty:
+        return []
+    local_dates = frame['timestamp'].dt.tz_convert(settings.TIME_ZONE).dt.date
+    daily = frame.groupby(local_dates)[column].mean()
+    return [(day, float(value)) for day, value in daily.items()]
+
+
+def daily_mean_stage(station_id, start, end, quality_flag='good'):
+    """
+    일평균 수위 (DB + 아카이브)
+
+    Returns:
+        list: [{'date': date, 'avg_stage': float}, ...] (날짜 순)
+    """
+    return [
+        {'date': day, 'avg_stage': value}
+        for day, value in daily_mean(WATERLEVEL, station_id, start, end, 'stage', quality_flag)
+    ]
+
+
+def latest_rows(kind, station_id, limit=100, columns=None):
+    """최신 limit 개 행 (DB 우선, 부족하면 최근 아카이브 월에서 보충) - 시각 내림차순"""
+    columns = ['timestamp'] + [c for c in (columns or ARCHIVE_COLUMNS[kind]) if c != 'timestamp']
+    rows = list(
+        _model(kind).objects.filter(station_id=station_id)
+        .order_by('-timestamp').values(*columns)[:limit]
+    )
+    oldest_hot = rows[-1]['timestamp'] if rows else None
+
+    for year, month in reversed(station_months(kind, station_id)):
+        if len(rows) >= limit:
+            break
+        frame = pd.read_parquet(month_path(kind, station_id, year, month), columns=columns)
+        if oldest_hot is not None:
+            frame = frame[frame['timestamp'] < pd.Timestamp(oldest_hot)]
+        frame = frame.sort_values('timestamp', ascending=False).head(limit - len(rows))
+        for record in frame.to_dict('records'):
+            record['timestamp'] = record['timestamp'].to_pydatetime()
+            rows.append(record)
+    return rows
+
+
+def total_count(kind, station_id):
+    """
+    DB + 아카이브 전체 행 수 (메타데이터 기준 표시용)
+
+    아카이브된 월을 재생성하여 DB 에 같은 시각이 생기면 다음 아카이브 실행 전까지는 중복 집계된다.
+    """
+    return _model(kind).objects.filter(station_id=station_id).count() + archive_count(kind, station_id)
+
+
+def _write_month(kind, path, frame):
+    """월 파일 기록 (기존 파일과 병합, 임시 파일 작성 후 교체)"""
+    schema = ARCHIVE_SCHEMAS[kind]
+    if path.exists():
+        existing = pq.read_table(path).to_pandas()
+        frame = pd.concat([existing, frame], ignore_index=True)
+        frame = frame.drop_duplicates(subset='timestamp', keep='last')
+    frame = frame.sort_values('timestamp', ignore_index=True)
+
+    table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.parquet.tmp')
+    pq.write_table(table, tmp_path, compression='zstd', use_dictionary=['quality_flag'])
+    os.replace(tmp_path, path)
+    return len(frame)
+
+
+def merge_month(kind, station_id, year, month, frame):
+    """
+    아카이브된 월 파일에 행 병합 (같은 시각은 새 값으로 교체) - 아카이브 월을 재계산할 때 DB 를 거치지 않음
+
+    Args:
+        frame: timestamp(UTC) + ARCHIVE_COLUMNS[kind] 컬럼 DataFrame
+
+    Returns:
+        int: 병합 후 월 파일 행 수
+    """
+    require_archive_root()
+    return _write_month(kind, month_path(kind, station_id, year, month), frame)
+
+
+def archive_month(kind, station_id, year, month):
+    """
+    한 관측소의 한 달 자료를 Parquet 로 옮김
+
+    파일 기록이 끝난 뒤 같은 조건의 DB 행을 삭제한다.
+
+    Returns:
+        int: 아카이브로 옮긴 행 수
+    """
+    require_archive_root()
+    start, end = month_bounds(year, month)
+    columns = ['timestamp'] + ARCHIVE_COLUMNS[kind]
+    queryset = _model(kind).objects.filter(station_id=station_id, timestamp__gte=start, timestamp__lt=end)
+
+    with transaction.atomic():
+        frame = pd.DataFrame.from_records(
+            queryset.order_by('timestamp').values_list(*columns).iterator(chunk_size=10000),
+            columns=columns,
+        )
+        if frame.empty:
+            return 0
+        frame['timestamp'] = pd.to_datetime(frame['timestamp'], utc=True)
+        if 'rating_curve_id' in frame:
+            frame['rating_curve_id'] = frame['rating_curve_id'].astype('Int64')
+
+        _write_month(kind, month_path(kind, station_id, year, month), frame)
+        queryset.delete()
+
+    logger.info("시계열 아카이브: %s station=%s %d-%02d (%d행)", kind, station_id, year, month, len(frame))
+    return len(frame)
+
+
+def closed_months(kind, station_id, keep_months=1, now=None):
+    """
+    아카이브 대상 (연, 월) 목록 - 최근 keep_months 개월(이번 달 포함)을 제외한 DB 자료의 월
+
+    Args:
+        keep_months: DB 에 남길 개월 수 (1 이면 이번 달만 유지)
+    """
+    from django.db.models import Min
+
+    tz = ZoneInfo(settings.TIME_ZONE)
+    now = (now or timezone.now()).astimezone(tz)
+    index = now.year * 12 + now.month - 1 - (max(keep_months, 1) - 1)
+    cutoff = datetime(index // 12, index % 12 + 1, 1, tzinfo=tz)
+
+    first = _model(kind).objects.filter(station_id=station_id, timestamp__lt=cutoff).aggregate(
+        first=Min('timestamp'),
+    )['first']
+    if first is None:
+        return []
+    return [m for m in _months_between(first, cutoff, tz) if month_bounds(*m, tz)[1] <= cutoff]
+
+
+def archive_closed_months(station_ids=None, keep_months=1, kinds=(WATERLEVEL, DISCHARGE), progress=None):
+    """
+    마감된 월 일괄 아카이브
+
+    Args:
+        station_ids: 대상 관측소 ID 목록 (None 이면 전체)
+        keep_months: DB 에 남길 최근 개월 수
+        kinds: 대상 종류
+        progress: 콜백 progress(kind, station_id, year, month, count)
+
+    Returns:
+        int: 아카이브로 옮긴 전체 행 수
+    """
+    from .models import Station
+
+    require_archive_root()
+
+    if station_ids is None:
+        station_ids = list(Station.objects.values_list('pk', flat=True))
+
+    total = 0
+    for kind in kinds:
+        for station_id in station_ids:
+            for year, month in closed_months(kind, station_id, keep_months):
+                count = archive_month(kind, station_id, year, month)
+                total += count
+                if progress:
+                    progress(kind, station_id, year, month, count)
+    return total
+
+
+def remove_station_archive(station_id):
+    """
+    관측소 아카이브 파일 삭제 (수위/유량 모두)
+
+    Returns:
+        int: 삭제한 월 파일 수
+    """
+    root = archive_root()
+    if root is None:
+        return 0
+
+    removed = 0
+    for kind in (WATERLEVEL, DISCHARGE):
+        base = root / kind / f'station={station_id}'
+        if base.exists():
+            removed += sum(1 for _ in base.glob('year=*/*.parquet'))
+            shutil.rmtree(base, ignore_errors=True)
+    if removed:
+        logger.info("관측소 삭제로 아카이브 파일 삭제: station=%s (%d개)", station_id, removed)
+    return removed
@@ -0,0 +1,482 @@
+"""
+수위 시계열 스트리밍 가져오기 서비스
+
+자동계측 로거 CSV/Parquet 파일을 일정 크기 청크 단위로 읽어
+WaterLevelTimeSeries 에 업서트(bulk_create update_conflicts)한다.
+파일 전체를 메모리에 올리지 않으므로 수년치 10분 자료(수백만 행)도 일정한 메모리로 처리된다.
+
+웹 업로드는 요청 안에서 가져오지 않는다. 업로드 내용을 TimeseriesImportJob 에 저장하고
+내보내기 작업자(run_export_worker)가 DB 큐에서 꺼내 처리하며, 진행 상황은 작업 상태 조회로 확인한다.
+작업자 신호가 없으면 웹 프로세스의 백그라운드 스레드가 처리한다 (요청은 기다리지 않음).
+"""
+import logging
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# 인코딩 후보 (scripts/csv_to_parquet.py 와 동일한 순서)
+DEFAULT_ENCODINGS = ['cp949', 'euc-kr', 'utf-8', 'utf-8-sig']
+
+# 컬럼명 후보 (앞쪽 우선, 대소문자 무시)
+TIMESTAMP_COLUMNS = ['timestamp', 'Date&Time', 'datetime', 'date_time', '일시', '측정시각', '시각']
+STAGE_COLUMNS = ['stage', '수위(m)', '수위', 'water_level', 'wl']
+
+# 청크 크기 (파일 읽기 행 수 / DB 배치 크기)
+DEFAULT_CHUNK_SIZE = 50000
+DEFAULT_BATCH_SIZE = 5000
+
+# 인코딩 판별용 샘플 크기 (bytes)
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+# 가져오기 전 형식 확인에 읽는 행 수
+SNIFF_ROWS = 1000
+
+# 가져오기 작업: 진행 기록 없이 이 시간이 지나면 중단으로 보고 재등록, 최대 시도 횟수
+IMPORT_STALE_AFTER = timedelta(minutes=10)
+IMPORT_MAX_ATTEMPTS = 3
+
+
+class TimeseriesImportError(ValueError):
+    """가져오기 파일 형식 오류"""
+
+
+def _read_sample(source, size=ENCODING_SAMPLE_SIZE):
+    """파일 앞부분 바이트 읽기 (파일 객체는 위치 복원)"""
+    if isinstance(source, (str, Path)):
+        with open(source, 'rb') as f:
+            return f.read(size)
+
+    position = source.tell()
+    sample = source.read(size)
+    source.seek(position)
+    return sample
+
+
+def is_parquet(source, filename=None):
+    """Parquet 파일 여부 (확장자 또는 매직 바이트 'PAR1')"""
+    name = filename or (str(source) if isinstance(source, (str, Path)) else getattr(source, 'name', ''))
+    if name and str(name).lower().endswith('.parquet'):
+        return True
+    return _read_sample(source, 4) == b'PAR1'
+
+
+def detect_encoding(source, encoding=None):
+    """
+    CSV 인코딩 판별
+
+    앞부분 샘플을 후보 인코딩으로 디코딩해보고 처음 성공한 인코딩을 반환한다.
+    UTF-8 BOM 이 있으면 utf-8-sig 를 우선한다.
+
+    Args:
+        source: 파일 경로 또는 바이너리 파일 객체
+        encoding: 우선 시도할 인코딩
+
+    Returns:
+        str: 인코딩 이름
+    """
+    sample = _read_sample(source)
+    if sample.startswith(b'\xef\xbb\xbf'):
+        return 'utf-8-sig'
+
+    # 샘플 끝에서 잘린 멀티바이트 문자를 제외하기 위해 마지막 줄바꿈까지만 사용
+    if len(sample) >= ENCODING_SAMPLE_SIZE and b'\n' in sample:
+        sample = sample[:sample.rindex(b'\n')]
+
+    encodings = ([encoding] if encoding else []) + DEFAULT_ENCODINGS
+    for enc in encodings:
+        try:
+            sample.decode(enc)
+            return enc
+        except (UnicodeDecodeError, UnicodeError, LookupError):
+            continue
+
+    raise TimeseriesImportError('지원되는 인코딩을 찾을 수 없습니다.')
+
+
+def _match_column(columns, candidates, explicit=None):
+    """컬럼 목록에서 후보명과 일치하는 컬럼 찾기"""
+    if explicit:
+        if explicit not in columns:
+            raise TimeseriesImportError(f'컬럼을 찾을 수 없습니다: {explicit}')
+        return explicit
+
+    lowered = {str(c).strip().lower(): c for c in columns}
+    for candidate in candidates:
+        if candidate.lower() in lowered:
+            return lowered[candidate.lower()]
+    return None
+
+
+def resolve_columns(columns, timestamp_column=None, stage_column=None):
+    """
+    시각/수위 컬럼 결정
+
+    후보명이 없으면 앞의 두 컬럼을 (시각, 수위) 로 사용한다 (timestamp,stage 기본 형식).
+
+    Returns:
+        tuple: (시각 컬럼명, 수위 컬럼명)
+    """
+    columns = list(columns)
+    ts_col = _match_column(columns, TIMESTAMP_COLUMNS, timestamp_column)
+    stage_col = _match_column(columns, STAGE_COLUMNS, stage_column)
+
+    if ts_col is None and stage_col is None and len(columns) >= 2:
+        return columns[0], columns[1]
+    if ts_col is None or stage_col is None:
+        raise TimeseriesImportError(
+            f'시각/수위 컬럼을 찾을 수 없습니다. (컬럼: {", ".join(map(str, columns))})'
+        )
+    return ts_col, stage_col
+
+
+def iter_frames(source, filename=None, chunk_size=DEFAULT_CHUNK_SIZE, encoding=None,
+                timestamp_column=None, stage_column=None, nrows=None):
+    """
+    파일을 청크 단위 DataFrame(timestamp, stage) 으로 읽기
+
+    CSV 는 pandas chunksize, Parquet 은 pyarrow iter_batches 로 필요한 두 컬럼만 읽는다.
+    nrows 를 주면 앞 nrows 행만 한 청크로 읽는다 (CSV 는 파일 객체를 닫지 않음 - 형식 확인용).
+
+    Yields:
+        DataFrame: 'timestamp', 'stage' 컬럼 (원본 값)
+    """
+    if is_parquet(source, filename):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(source)
+        ts_col, stage_col = resolve_columns(parquet_file.schema_arrow.names, timestamp_column, stage_column)
+        for batch in parquet_file.iter_batches(batch_size=nrows or chunk_size, columns=[ts_col, stage_col]):
+            frame = batch.to_pandas()
+            yield frame.rename(columns={ts_col: 'timestamp', stage_col: 'stage'})
+            if nrows:
+                break
+        return
+
+    enc = detect_encoding(source, encoding)
+    header = pd.read_csv(source, encoding=enc, nrows=0)
+    if not isinstance(source, (str, Path)):
+        source.seek(0)
+    ts_col, stage_col = resolve_columns(header.columns, timestamp_column, stage_column)
+
+    reader = pd.read_csv(
+        source,
+        encoding=enc,
+        usecols=[ts_col, stage_col],
+        dtype={ts_col: str},
+        **({'nrows': nrows} if nrows else {'chunksize': chunk_size}),
+    )
+    for frame in ([reader] if nrows else reader):
+        yield frame.rename(columns={ts_col: 'timestamp', stage_col: 'stage'})
+
+
+def sniff_waterlevel_file(source, filename=None, encoding=None, timestamp_column=None, stage_column=None):
+    """
+    가져오기 전 형식 확인 (앞 SNIFF_ROWS 행을 읽어 시각/수위로 변환되는 행이 있는지)
+
+    파일 객체는 확인 후 처음 위치로 되돌린다.
+
+    Returns:
+        int: 앞부분에서 변환된 행 수
+
+    Raises:
+        TimeseriesImportError: 읽을 수 없는 파일, 컬럼 없음, 변환되는 행 없음
+    """
+    try:
+        frames = iter_frames(
+            source, filename=filename, encoding=encoding,
+            timestamp_column=timestamp_column, stage_column=stage_column, nrows=SNIFF_ROWS,
+        )
+        frame = next(frames, None)
+        rows = len(normalize_frame(frame)[0]) if frame is not None else 0
+    except TimeseriesImportError:
+        raise
+    except Exception as e:
+        raise TimeseriesImportError(f'파일을 읽을 수 없습니다: {e}') from e
+    finally:
+        if not isinstance(source, (str, Path)):
+            source.seek(0)
+
+    if not rows:
+        raise TimeseriesImportError('시각/수위로 읽을 수 있는 행이 없습니다. 파일 형식을 확인해주세요.')
+    return rows
+
+
+def normalize_frame(frame, tz=None):
+    """
+    청크 정규화: 시각/수위 변환, 변환 불가 행 제거, 청크 내 중복 시각은 마지막 값 사용
+
+    시간대 정보가 없는 시각은 settings.TIME_ZONE 기준으로 해석한다.
+
+    Returns:
+        tuple: (정규화된 DataFrame, 제외된 행 수)
+    """
+    tz = tz or ZoneInfo(settings.TIME_ZONE)
+    total = len(frame)
+
+    timestamps = pd.to_datetime(frame['timestamp'], errors='coerce')
+    if timestamps.dt.tz is None:
+        timestamps = timestamps.dt.tz_localize(tz, ambiguous='NaT', nonexistent='NaT')
+    stages = pd.to_numeric(frame['stage'], errors='coerce')
+
+    clean = pd.DataFrame({'timestamp': timestamps, 'stage': stages}).dropna()
+    clean = clean.drop_duplicates(subset='timestamp', keep='last')
+    return clean, total - len(clean)
+
+
+def _upsert_chunk(station, frame, quality_flag, batch_size):
+    """정규화된 청크를 WaterLevelTimeSeries 에 업서트"""
+    from .models import WaterLevelTimeSeries
+
+    objects = [
+        WaterLevelTimeSeries(station=station, timestamp=ts, stage=stage, quality_flag=quality_flag)
+        for ts, stage in zip(frame['timestamp'].dt.to_pydatetime(), frame['stage'].tolist())
+    ]
+    with transaction.atomic():
+        WaterLevelTimeSeries.objects.bulk_create(
+            objects,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['station', 'timestamp'],
+            update_fields=['stage', 'quality_flag'],
+        )
+    return len(objects)
+
+
+def iter_import_waterlevel(station, source, filename=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                           batch_size=DEFAULT_BATCH_SIZE, encoding=None, quality_flag='good',
+                           timestamp_column=None, stage_column=None):
+    """
+    수위 파일 스트리밍 가져오기 (청크마다 진행 상황 반환)
+
+    각 청크는 별도 트랜잭션으로 저장되며, 같은 (관측소, 시각) 은 수위/품질플래그가 갱신된다.
+
+    Args:
+        station: Station 인스턴스
+        source: 파일 경로 또는 바이너리 파일 객체 (CSV/Parquet)
+        filename: 원본 파일명 (형식 판별용)
+        chunk_size: 파일 읽기 청크 행 수
+        batch_size: bulk_create 배치 크기
+        encoding: CSV 우선 인코딩
+        quality_flag: 저장할 품질플래그
+
+    Yields:
+        dict: 누적 진행 상황 {chunks, rows_read, rows_imported, rows_skipped, first_timestamp, last_timestamp}
+    """
+    tz = ZoneInfo(settings.TIME_ZONE)
+    stats = {
+        'chunks': 0,
+        'rows_read': 0,
+        'rows_imported': 0,
+        'rows_skipped': 0,
+        'first_timestamp': None,
+        'last_timestamp': None,
+    }
+
+    frames = iter_frames(
+        source, filename=filename, chunk_size=chunk_size, encoding=encoding,
+        timestamp_column=timestamp_column, stage_column=stage_column,
+    )
+    for frame in frames:
+        clean, skipped = normalize_frame(frame, tz)
+        imported = _upsert_chunk(station, clean, quality_flag, batch_size) if len(clean) else 0
+
+        stats['chunks'] += 1
+        stats['rows_read'] += len(frame)
+        stats['rows_imported'] += imported
+        stats['rows_skipped'] += skipped
+        if imported:
+            first, last = clean['timestamp'].min(), clean['timestamp'].max()
+            if stats['first_timestamp'] is None or first < stats['first_timestamp']:
+                stats['first_timestamp'] = first
+            if stats['last_timestamp'] is None or last > stats['last_timestamp']:
+                stats['last_timestamp'] = last
+
+        yield dict(stats)
+
+    logger.info(
+        "수위 가져오기 완료: station=%s, rows=%d, imported=%d, skipped=%d",
+        station.pk, stats['rows_read'], stats['rows_imported'], stats['rows_skipped'],
+    )
+
+
+def import_waterlevel_file(station, source, progress=None, **kwargs):
+    """
+    수위 파일 가져오기 (iter_import_waterlevel 를 끝까지 실행)
+
+    Args:
+        station: Station 인스턴스
+        source: 파일 경로 또는 바이너리 파일 객체
+        progress: 청크마다 호출할 콜백 progress(stats)
+        **kwargs: iter_import_waterlevel 옵션
+
+    Returns:
+        dict: 최종 진행 상황
+    """
+    stats = {'chunks': 0, 'rows_read': 0, 'rows_imported': 0, 'rows_skipped': 0,
+             'first_timestamp': None, 'last_timestamp': None}
+    for stats in iter_import_waterlevel(station, source, **kwargs):
+        if progress:
+            progress(stats)
+    return stats
+
+
+def format_stats(stats):
+    """진행 상황 dict 를 JSON 직렬화 가능한 형태로 변환"""
+    result = dict(stats)
+    for key in ('first_timestamp', 'last_timestamp'):
+        if result.get(key) is not None:
+            result[key] = result[key].isoformat()
+    return result
+
+
+# ============================================
+# 가져오기 작업 (DB 큐)
+# ============================================
+
+def enqueue_import(station, upload, created_station=False, user=None):
+    """
+    업로드 파일을 가져오기 작업으로 등록 (내용은 DB 에 저장 - 작업자가 다른 서버여도 읽을 수 있음)
+
+    Args:
+        station: 가져올 Station
+        upload: 업로드 파일 (UploadedFile)
+        created_station: 업로드하면서 만든 관측소인지 (저장된 행이 없으면 작업이 관측소를 삭제)
+        user: 요청자
+
+    Returns:
+        TimeseriesImportJob
+    """
+    from .models import TimeseriesImportJob
+
+    upload.seek(0)
+    content = b''.join(upload.chunks())
+    job = TimeseriesImportJob.objects.create(
+        station=station,
+        created_station=created_station,
+        filename=upload.name,
+        content=content,
+        size=len(content),
+        requested_by=user if user is not None and user.is_authenticated else None,
+    )
+    logger.info("수위 가져오기 작업 등록: #%s %s (%d bytes)", job.pk, job.filename, job.size)
+    return job
+
+
+def claim_next_import():
+    """대기 중인 가져오기 작업 하나 선점 (오래된 순, 상태 조건부 UPDATE)"""
+    from .models import TimeseriesImportJob
+
+    pending = TimeseriesImportJob.objects.filter(status=TimeseriesImportJob.STATUS_PENDING).order_by('created_at')
+    for pk in pending.values_list('pk', flat=True)[:10]:
+        if _claim_import(pk):
+            return TimeseriesImportJob.objects.defer('content').get(pk=pk)
+    return None
+
+
+def _claim_import(pk):
+    from .models import TimeseriesImportJob
+
+    return TimeseriesImportJob.objects.filter(pk=pk, status=TimeseriesImportJob.STATUS_PENDING).update(
+        status=TimeseriesImportJob.STATUS_RUNNING, started_at=timezone.now(),
+    )
+
+
+def requeue_stale_imports(stale_after=IMPORT_STALE_AFTER):
+    """진행 기록이 끊긴 running 작업 재등록 (업서트이므로 처음부터 다시 가져와도 같은 결과)"""
+    from .models import TimeseriesImportJob
+
+    return TimeseriesImportJob.objects.filter(
+        status=TimeseriesImportJob.STATUS_RUNNING, updated_at__lt=timezone.now() - stale_after,
+    ).update(status=TimeseriesImportJob.STATUS_PENDING)
+
+
+def _fail_import(job, message, attempts, retry):
+    """실패 기록 (재시도 가능하면 대기로) + 저장된 행이 없으면 업로드 시 만든 관측소 삭제"""
+    from .models import Station, TimeseriesImportJob
+
+    failed = not retry or attempts >= IMPORT_MAX_ATTEMPTS
+    fields = {'attempts': attempts, 'error': message[:1000]}
+    if failed:
+        fields.update(status=TimeseriesImportJob.STATUS_FAILED, content=None, finished_at=timezone.now())
+    else:
+        fields['status'] = TimeseriesImportJob.STATUS_PENDING
+    TimeseriesImportJob.objects.filter(pk=job.pk).update(**fields)
+    if failed and job.created_station and job.station_id and not (job.stats or {}).get('rows_imported'):
+        Station.objects.filter(pk=job.station_id).delete()
+
+
+def process_import(job):
+    """
+    선점한 가져오기 작업 처리 (청크마다 진행 상황 기록)
+
+    Returns:
+        bool: 성공 여부
+    """
+    from .models import TimeseriesImportJob
+
+    job = TimeseriesImportJob.objects.select_related('station').get(pk=job.pk)
+    if job.station is None:
+        _fail_import(job, '관측소가 삭제되었습니다.', job.attempts + 1, retry=False)
+        return False
+
+    suffix = Path(job.filename).suffix
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(bytes(job.content or b''))
+        job.stats = {}
+        for stats in iter_import_waterlevel(job.station, path, filename=job.filename):
+            job.stats = format_stats(stats)
+            TimeseriesImportJob.objects.filter(pk=job.pk).update(stats=job.stats, updated_at=timezone.now())
+        if not job.stats.get('rows_imported'):
+            raise TimeseriesImportError('저장된 수위 자료가 없습니다. 파일 형식을 확인해주세요.')
+    except Exception as e:
+        logger.exception("수위 가져오기 실패: #%s %s", job.pk, job.filename)
+        _fail_import(job, str(e), job.attempts + 1, retry=not isinstance(e, TimeseriesImportError))
+        return False
+    finally:
+        os.unlink(path)
+
+    TimeseriesImportJob.objects.filter(pk=job.pk).update(
+        status=TimeseriesImportJob.STATUS_DONE, content=None, error='', finished_at=timezone.now(),
+    )
+    return True
+
+
+def _process_in_thread(pk):
+    from django.db import connection
+    from .models import TimeseriesImportJob
+
+    try:
+        process_import(TimeseriesImportJob.objects.defer('content').get(pk=pk))
+    finally:
+        connection.close()
+
+
+def start_import(job):
+    """
+    작업자 신호가 없으면 웹 프로세스 백그라운드 스레드에서 처리 시작 (요청은 기다리지 않음)
+
+    Returns:
+        bool: 스레드를 시작했는지
+    """
+    from .export_service import worker_alive
+
+    if worker_alive():
+        return False
+    requeue_stale_imports()
+    if not _claim_import(job.pk):
+        return False
+    logger.warning("작업자 신호 없음 - 웹 프로세스 스레드에서 수위 가져오기: #%s", job.pk)
+    threading.Thread(target=_process_in_thread, args=(job.pk,), name=f'timeseries-import-{job.pk}', daemon=True).start()
+    return True
@@ -0,0 +1,389 @@
+"""
+수위/유량 시계열 조회 서비스 (차트용 다운샘플링)
+
+임의 기간의 시계열을 요청 해상도(최대 점 수)로 줄여 반환한다.
+- bucket: DB 에서 시간 구간(bucket)별 min/max/mean 집계 (GROUP BY)
+- lttb: Largest-Triangle-Three-Buckets 로 형태를 보존하는 대표점 선택
+
+기간 전체가 요청 점 수 이하이면 원자료를 그대로 반환한다.
+기간이 Parquet 아카이브(timeseries_archive_service)와 겹치면 DB 와 아카이브를 합쳐 pandas 로 집계한다.
+응답의 cursor 는 현재 기간과 구간 크기를 서명한 토큰으로, 구간 번호 범위를 함께 보내면 해당 구간으로 확대 조회한다.
+"""
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import numpy as np
+import pandas as pd
+from django.core import signing
+from django.db.models import Avg, Count, FloatField, Func, Max, Min, Value
+from django.db.models.functions import Floor
+from django.utils import timezone
+
+# 응답 점 수 (기본 / 최대)
+DEFAULT_POINTS = 1000
+MAX_POINTS = 5000
+
+CURSOR_SALT = 'measurement.timeseries_query'
+
+
+class EpochSeconds(Func):
+    """DateTimeField → Unix epoch 초 (DB 별 SQL)"""
+    output_field = FloatField()
+    template = 'EXTRACT(EPOCH FROM %(expressions)s)'
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template="CAST(strftime('%%%%s', %(expressions)s) AS REAL)",
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template='UNIX_TIMESTAMP(%(expressions)s)', **extra_context)
+
+
+def encode_cursor(station_id, start, end, bucket_seconds):
+    """확대 조회용 커서 생성"""
+    return signing.dumps(
+        [station_id, start.timestamp(), end.timestamp(), bucket_seconds],
+        salt=CURSOR_SALT, compress=True,
+    )
+
+
+def decode_cursor(cursor, bucket_from, bucket_to):
+    """
+    커서 + 구간 번호 범위 → 확대할 기간
+
+    Returns:
+        tuple: (station_id, start, end)
+
+    Raises:
+        ValueError: 커서가 유효하지 않은 경우
+    """
+    try:
+        station_id, start_ts, end_ts, bucket_seconds = signing.loads(cursor, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        raise ValueError('유효하지 않은 cursor 입니다.')
+
+    bucket_to = max(bucket_to, bucket_from)
+    start = max(start_ts, start_ts + bucket_from * bucket_seconds)
+    end = min(end_ts, start_ts + (bucket_to + 1) * bucket_seconds)
+    return (
+        station_id,
+        datetime.fromtimestamp(start, tz=dt_timezone.utc),
+        datetime.fromtimestamp(end, tz=dt_timezone.utc),
+    )
+
+
+def data_range(queryset):
+    """쿼리셋의 (최초, 최종) 시각"""
+    bounds = queryset.aggregate(first=Min('timestamp'), last=Max('timestamp'))
+    return bounds['first'], bounds['last']
+
+
+def _bucket_seconds(start, end, points):
+    """기간을 points 개 이하 구간으로 나누는 구간 크기 (초, 정수)"""
+    span = (end - start).total_seconds() + 1  # 종료 시각 포함
+    return max(int(math.ceil(span / points)), 1)
+
+
+def bucket_aggregate(queryset, field, start, bucket_seconds):
+    """
+    DB 구간 집계 (구간별 시작시각, min, max, mean, 개수)
+
+    Args:
+        queryset: start ~ end 로 필터링된 시계열 쿼리셋
+        field: 집계 필드명 ('stage' / 'discharge')
+        start: 구간 기준 시각
+        bucket_seconds: 구간 크기 (초)
+
+    Returns:
+        list: [{bucket, first, min, max, mean, count}, ...] (구간 순)
+    """
+    bucket = Floor(
+        (EpochSeconds('timestamp') - Value(start.timestamp())) / Value(float(bucket_seconds)),
+        output_field=FloatField(),
+    )
+    rows = (
+        queryset
+        .annotate(bucket=bucket)
+        .values('bucket')
+        .annotate(
+            first=Min('timestamp'),
+            min=Min(field),
+            max=Max(field),
+            mean=Avg(field),
+            count=Count('id'),
+        )
+        .order_by('bucket')
+    )
+    return [dict(row, bucket=int(row['bucket'])) for row in rows]
+
+
+def lttb_indices(x, y, threshold):
+    """
+    LTTB(Largest-Triangle-Three-Buckets) 대표점 인덱스
+
+    첫/마지막 점을 유지하고, 나머지 구간마다 이전 선택점과 다음 구간 평균점으로 이루는
+    삼각형 넓이가 최대인 점을 고른다.
+
+    Args:
+        x, y: 1차원 배열 (x 오름차순)
+        threshold: 선택할 점 수
+
+    Returns:
+        ndarray: 선택된 인덱스 (오름차순)
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    prev = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = edges[i + 1], (edges[i + 2] if i + 2 < len(edges) else n)
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+
+        area = np.abs(
+            (x[prev] - avg_x) * (y[lo:hi] - y[prev])
+            - (x[prev] - x[lo:hi]) * (avg_y - y[prev])
+        )
+        prev = lo + int(np.argmax(area)) if hi > lo else lo
+        selected[i + 1] = prev
+
+    return selected
+
+
+def _format_time(value):
+    return timezone.localtime(value).strftime('%Y-%m-%d %H:%M')
+
+
+def _discharge_for_stages(rating, timestamps, stages):
+    """수위 → 유량 (Rating Curve 엔진, 곡선이 없거나 h <= h0 이면 None)"""
+    from .rating_service import FLAG_SUSPECT
+
+    if not rating or not len(stages):
+        return [None] * len(stages)
+    q, flags, _ = rating.evaluate_at(timestamps, stages)
+    return [
+        round(value, 4) if flag != FLAG_SUSPECT else None
+        for value, flag in zip(q.tolist(), flags.tolist())
+    ]
+
+
+def _round(value, digits):
+    return round(value, digits) if value is not None else None
+
+
+def frame_buckets(frame, field, start, bucket_seconds):
+    """
+    DataFrame 구간 집계 (아카이브 포함 조회용, bucket_aggregate 와 같은 형식)
+
+    Args:
+        frame: timestamp, field 컬럼을 가진 DataFrame
+    """
+    if frame.empty:
+        return []
+
+    offset = (frame['timestamp'] - pd.Timestamp(start)).dt.total_seconds()
+    grouped = frame.assign(bucket=np.floor(offset / bucket_seconds).astype(np.int64)).groupby('bucket')
+    agg = grouped.agg(
+        first=('timestamp', 'min'),
+        min=(field, 'min'),
+        max=(field, 'max'),
+        mean=(field, 'mean'),
+        count=(field, 'size'),
+    )
+    return [
+        {
+            'bucket': int(bucket),
+            'first': row['first'].to_pydatetime(),
+            'min': float(row['min']),
+            'max': float(row['max']),
+            'mean': float(row['mean']),
+            'count': int(row['count']),
+        }
+        for bucket, row in agg.iterrows()
+    ]
+
+
+class _TableSource:
+    """DB 테이블 조회 (구간 집계는 DB GROUP BY)"""
+
+    def __init__(self, station, start, end):
+        from .models import WaterLevelTimeSeries, DischargeTimeSeries
+
+        self.stages = WaterLevelTimeSeries.objects.filter(station=station, timestamp__gte=start, timestamp__lte=end)
+        self.discharges = DischargeTimeSeries.objects.filter(station=station, timestamp__gte=start, timestamp__lte=end)
+
+    def count(self):
+        return self.stages.count()
+
+    def has_discharge(self):
+        return self.discharges.exists()
+
+    def stage_rows(self):
+        rows = list(self.stages.order_by('timestamp').values_list('timestamp', 'stage'))
+        return [r[0] for r in rows], np.fromiter((r[1] for r in rows), dtype=float, count=len(rows))
+
+    def discharge_map(self):
+        return dict(self.discharges.values_list('timestamp', 'discharge'))
+
+    def buckets(self, kind, start, bucket_seconds):
+        if kind == 'stage':
+            return bucket_aggregate(self.stages, 'stage', start, bucket_seconds)
+        return bucket_aggregate(self.discharges, 'discharge', start, bucket_seconds)
+
+
+class _ArchiveSource:
+    """DB + Parquet 아카이브 통합 조회 (구간 집계는 pandas)"""
+
+    def __init__(self, station, start, end):
+        from .timeseries_archive_service import load_series, WATERLEVEL, DISCHARGE
+
+        self.stages = load_series(WATERLEVEL, station.pk, start, end, columns=['stage'])
+        self.discharges = load_series(DISCHARGE, station.pk, start, end, columns=['discharge'])
+
+    def count(self):
+        return len(self.stages)
+
+    def has_discharge(self):
+        return not self.discharges.empty
+
+    def stage_rows(self):
+        return list(self.stages['timestamp'].dt.to_pydatetime()), self.stages['stage'].to_numpy(dtype=float)
+
+    def discharge_map(self):
+        return dict(zip(self.discharges['timestamp'].dt.to_pydatetime(), self.discharges['discharge'].tolist()))
+
+    def buckets(self, kind, start, bucket_seconds):
+        if kind == 'stage':
+            return frame_buckets(self.stages, 'stage', start, bucket_seconds)
+        return frame_buckets(self.discharges, 'discharge', start, bucket_seconds)
+
+
+def series_range(station):
+    """관측소 수위 자료 (최초, 최종) 시각 (DB + 아카이브)"""
+    from .models import WaterLevelTimeSeries
+    from .timeseries_archive_service import archive_range, WATERLEVEL
+
+    bounds = [
+        data_range(WaterLevelTimeSeries.objects.filter(station=station)),
+        archive_range(WATERLEVEL, station.pk),
+    ]
+    firsts = [b[0] for b in bounds if b[0] is not None]
+    lasts = [b[1] for b in bounds if b[1] is not None]
+    return (min(firsts) if firsts else None), (max(lasts) if lasts else None)
+
+
+def query_series(station, start=None, end=None, points=DEFAULT_POINTS, method='bucket'):
+    """
+    차트용 수위/유량 시계열 조회
+
+    유량은 DischargeTimeSeries 가 있으면 그 값을, 없으면 수위에 Rating Curve 를 적용한 값을 사용한다.
+    기간이 Parquet 아카이브와 겹치면 DB 와 아카이브를 합쳐 조회한다.
+
+    Args:
+        station: Station 인스턴스
+        start, end: 조회 기간 (aware datetime, None 이면 전체 기간)
+        points: 최대 점 수 (MAX_POINTS 이하)
+        method: 'bucket' (구간 min/max/mean) 또는 'lttb'
+
+    Returns:
+        dict: {resolution, start, end, bucket_seconds, cursor, count, points: [...]}
+    """
+    from .rating_service import get_station_rating
+    from .timeseries_archive_service import has_archive, WATERLEVEL, DISCHARGE
+
+    points = max(2, min(int(points), MAX_POINTS))
+
+    if start is None or end is None:
+        first, last = series_range(station)
+        start = start or first
+        end = end or last
+    if start is None or end is None:
+        return {'resolution': 'raw', 'start': None, 'end': None, 'bucket_seconds': None,
+                'cursor': None, 'count': 0, 'points': []}
+
+    archived = has_archive(WATERLEVEL, station.pk, start, end) or has_archive(DISCHARGE, station.pk, start, end)
+    source = (_ArchiveSource if archived else _TableSource)(station, start, end)
+    total = source.count()
+    has_discharge = source.has_discharge()
+    rating = None if has_discharge else get_station_rating(station.pk)
+
+    result = {
+        'start': _format_time(start),
+        'end': _format_time(end),
+        'count': total,
+        'bucket_seconds': None,
+        'cursor': None,
+    }
+
+    # 원자료 (요청 점 수 이하) 또는 LTTB
+    if total <= points or method == 'lttb':
+        timestamps, stage_values = source.stage_rows()
+
+        if total > points:
+            x = np.fromiter((t.timestamp() for t in timestamps), dtype=float, count=len(timestamps))
+            idx = lttb_indices(x, stage_values, points)
+            timestamps = [timestamps[i] for i in idx]
+            stage_values = stage_values[idx]
+            result['resolution'] = 'lttb'
+        else:
+            result['resolution'] = 'raw'
+
+        if has_discharge:
+            q_map = source.discharge_map()
+            q_values = [q_map.get(t) for t in timestamps]
+        else:
+            q_values = _discharge_for_stages(rating, timestamps, stage_values)
+
+        result['points'] = [
+            {'timestamp': _format_time(t), 'stage': round(h, 3), 'discharge': q}
+            for t, h, q in zip(timestamps, stage_values.tolist(), q_values)
+        ]
+        return result
+
+    # 구간 집계
+    bucket_seconds = _bucket_seconds(start, end, points)
+    stage_buckets = source.buckets('stage', start, bucket_seconds)
+
+    if has_discharge:
+        q_buckets = {b['bucket']: b for b in source.buckets('discharge', start, bucket_seconds)}
+    else:
+        # Rating Curve 는 수위에 대해 단조 증가하므로 구간 min/max 수위로 유량 범위 계산
+        firsts = [b['first'] for b in stage_buckets]
+        q_min = _discharge_for_stages(rating, firsts, np.array([b['min'] for b in stage_buckets]))
+        q_max = _discharge_for_stages(rating, firsts, np.array([b['max'] for b in stage_buckets]))
+        q_mean = _discharge_for_stages(rating, firsts, np.array([b['mean'] for b in stage_buckets]))
+        q_buckets = {
+            b['bucket']: {'min': lo, 'max': hi, 'mean': mean}
+            for b, lo, hi, mean in zip(stage_buckets, q_min, q_max, q_mean)
+        }
+
+    result.update({
+        'resolution': 'bucket',
+        'bucket_seconds': bucket_seconds,
+        'cursor': encode_cursor(station.pk, start, end, bucket_seconds),
+    })
+    result['points'] = []
+    for b in stage_buckets:
+        q = q_buckets.get(b['bucket'], {})
+        bucket_start = start + timedelta(seconds=b['bucket'] * bucket_seconds)
+        result['points'].append({
+            'bucket': b['bucket'],
+            'timestamp': _format_time(bucket_start),
+            'count': b['count'],
+            'stage': _round(b['mean'], 3),
+            'stage_min': _round(b['min'], 3),
+            'stage_max': _round(b['max'], 3),
+            'discharge': _round(q.get('mean'), 4),
+            'discharge_min': _round(q.get('min'), 4),
+            'discharge_max': _round(q.get('max'), 4),
+        })
+    return result
@@ -24,6 +24,8 @@ urlpatterns = [
     # 내보내기
     path('export/excel/', views.export_excel, name='export_excel'),
     path('export/pdf/', views.export_pdf, name='export_pdf'),
+    path('export/jobs/<int:pk>/', views.export_job_status, name='export_job_status'),
+    path('export/jobs/<int:pk>/download/', views.export_job_download, name='export_job_download'),
 
     # 수위-유량곡선 (Rating Curve)
     path('rating-curve/', views.rating_curve_list, name='rating_curve_list'),
@@ -35,8 +37,10 @@ urlpatterns = [
     # 시계열 데이터
     path('timeseries/', views.timeseries_list, name='timeseries_list'),
     path('timeseries/upload/', views.timeseries_upload, name='timeseries_upload'),
+    path('timeseries/imports/<int:pk>/', views.timeseries_import_status, name='timeseries_import_status'),
     path('timeseries/<int:station_id>/', views.timeseries_detail, name='timeseries_detail'),
     path('timeseries/generate-discharge/', views.generate_discharge_series, name='generate_discharge_series'),
+    path('api/timeseries/<int:station_id>/series/', views.api_timeseries_series, name='api_timeseries_series'),
 
     # 기저유출 분석
     path('baseflow/', views.baseflow_list, name='baseflow_list'),
@@ -45,12 +49,17 @@ urlpatterns = [
     path('baseflow/<int:pk>/pdf/', views.export_baseflow_pdf, name='export_baseflow_pdf'),
     path('baseflow/run/', views.run_baseflow_analysis, name='run_baseflow_analysis'),
     path('baseflow/save/', views.save_baseflow_analysis, name='save_baseflow_analysis'),
+    path('baseflow/sweep/', views.api_baseflow_sweep, name='api_baseflow_sweep'),
+    path('baseflow/run-station/', views.api_baseflow_run_station, name='api_baseflow_run_station'),
 
     # 측정 데이터 자동저장 및 히스토리 API
     path('api/session/autosave/', views.api_measurement_autosave, name='api_measurement_autosave'),
     path('api/session/history/', views.api_measurement_history, name='api_measurement_history'),
     path('api/session/<int:session_id>/load/', views.api_measurement_load, name='api_measurement_load'),
     path('api/session/<int:session_id>/delete/', views.api_measurement_delete, name='api_measurement_delete'),
+    path('api/session/<int:session_id>/boundary/', views.api_session_boundary, name='api_session_boundary'),
+    path('api/session/boundaries/', views.api_session_boundaries, name='api_session_boundaries'),
+    path('api/session/dam-influence/', views.api_session_dam_influence, name='api_session_dam_influence'),
     path('api/result/save/', views.api_result_save, name='api_result_save'),
 
     # 관측소 및 H-Q 곡선 API
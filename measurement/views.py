@@ -3,9 +3,11 @@ from django.http import HttpResponse, JsonResponse
 from django.views.decorators.http import require_http_methods, require_GET, require_POST
 from django.views.decorators.csrf import csrf_exempt
 from io import BytesIO
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta
 import json
-import math
+
+# 유량 계산 엔진 (NumPy 컬럼 연산, 일괄 계산 지원)
+from .discharge_service import calculate_discharge
 
 
 def measurement_list(request):
@@ -146,6 +148,7 @@ def result(request):
             session.setup_data['final_discharge'] = result_data['discharge']
             session.setup_data['final_uncertainty'] = result_data['uncertainty']
             session.setup_data['final_avg_velocity'] = result_data['avg_velocity']
+            session.calculate_analysis_results()
             session.save()
 
             return render(request, 'measurement/result.html', result_data)
@@ -182,595 +185,127 @@ def result(request):
     return render(request, 'measurement/result.html')
 
 
-def calculate_discharge(rows, calibration, meters=None):
-    """
-    유량 계산 (ISO 748 중앙단면법)
-
-    Args:
-        rows: 측선 데이터 리스트
-        calibration: 기본 검정계수 (단일 유속계 사용 시)
-        meters: 유속계 목록 (다중 유속계 사용 시) [{'id': 'M1', 'a': 0.0012, 'b': 0.2534, 'uncertainty': 1.0}, ...]
-
-    Returns dict with:
-    - discharge: 총 유량 (m³/s)
-    - area: 총 단면적 (m²)
-    - avg_velocity: 평균유속 (m/s)
-    - uncertainty: 불확실도 (%)
-    - verticals: 각 측선별 상세 결과
-    """
-    # 기본 검정계수
-    default_a = calibration.get('a', 0.0012)
-    default_b = calibration.get('b', 0.2534)
-
-    # 유속계 목록을 딕셔너리로 변환 (빠른 조회용)
-    meters_dict = {}
-    if meters:
-        for m in meters:
-            meters_dict[m.get('id')] = {
-                'a': m.get('a', default_a),
-                'b': m.get('b', default_b),
-                'uncertainty': m.get('uncertainty', 1.0)
-            }
+def pre_uncertainty(request):
+    """사전 불확실도 분석"""
+    return render(request, 'measurement/pre_uncertainty.html')
 
-    def get_calibration(meter_id):
-        """유속계별 검정계수 조회"""
-        if meter_id and meter_id in meters_dict:
-            m = meters_dict[meter_id]
-            return m['a'], m['b'], m['uncertainty']
-        return default_a, default_b, 1.0
 
-    def calc_velocity(n, t, a, b):
-        """프로펠러 유속계 유속 계산: V = a + b * (N/T)"""
-        try:
-            n = float(n) if n else 0
-            t = float(t) if t else 0
-            if n == 0 or t == 0:
-                return 0
-            return a + b * (n / t)
-        except (ValueError, TypeError):
-            return 0
-
-    # 각 측선별 유속 계산
-    verticals = []
-    meter_uncertainties_list = []  # 유속계별 검정 불확실도 수집
-
-    for i, row in enumerate(rows):
-        method = row.get('method', '1')
-        meter_id = row.get('meter_id')
-        velocity = 0
-
-        # 측선별 유속계 검정계수 조회
-        a, b, meter_uncertainty = get_calibration(meter_id)
-        meter_uncertainties_list.append(meter_uncertainty)
-
-        if method == '1':  # 1점법
-            velocity = calc_velocity(row.get('n_06d'), row.get('t_06d'), a, b)
-        elif method == '2':  # 2점법
-            v02 = calc_velocity(row.get('n_02d'), row.get('t_02d'), a, b)
-            v08 = calc_velocity(row.get('n_08d'), row.get('t_08d'), a, b)
-            if v02 and v08:
-                velocity = (v02 + v08) / 2
-        elif method == '3':  # 3점법
-            v02 = calc_velocity(row.get('n_02d'), row.get('t_02d'), a, b)
-            v06 = calc_velocity(row.get('n_06d'), row.get('t_06d'), a, b)
-            v08 = calc_velocity(row.get('n_08d'), row.get('t_08d'), a, b)
-            if v02 and v06 and v08:
-                velocity = (v02 + 2 * v06 + v08) / 4
-
-        # 각도/index 보정 적용 (cos(θ) 또는 직접 index)
-        # index_value: 0.6~1.0 범위 (1.0이면 보정 없음)
-        index_value = float(row.get('index_value', 1.0) or 1.0)
-        angle_deg = float(row.get('angle_deg', 0) or 0)
-
-        # 각도가 입력되었으면 cos(θ) 계산, 아니면 index_value 사용
-        if angle_deg > 0:
-            angle_rad = math.radians(angle_deg)
-            index_value = math.cos(angle_rad)
-
-        if velocity > 0:
-            velocity = velocity * index_value
-
-        verticals.append({
-            'id': i + 1,
-            'distance': float(row.get('distance', 0) or 0),
-            'depth': float(row.get('depth', 0) or 0),
-            'meter_id': meter_id,
-            'angle_deg': angle_deg,
-            'index_value': round(index_value, 4),
-            'velocity': velocity,
-            'method': method,
-            'area': 0,
-            'discharge': 0,
-            'ratio': 0
-        })
+def meters(request):
+    """유속계 관리"""
+    return render(request, 'measurement/meters.html')
 
-    # 중앙단면법으로 유량 계산
-    total_discharge = 0
-    total_area = 0
-
-    for i in range(1, len(verticals)):
-        prev = verticals[i - 1]
-        curr = verticals[i]
-
-        width = curr['distance'] - prev['distance']
-        avg_depth = (curr['depth'] + prev['depth']) / 2
-        avg_velocity = (curr['velocity'] + prev['velocity']) / 2
-
-        section_area = width * avg_depth
-        section_discharge = section_area * avg_velocity
-
-        # 현재 측선에 값 저장 (중앙단면법에서 각 구간의 값)
-        curr['width'] = width
-        curr['area'] = section_area
-        curr['discharge'] = section_discharge
-
-        total_area += section_area
-        total_discharge += section_discharge
-
-    # 비율 계산
-    for v in verticals:
-        if total_discharge > 0:
-            v['ratio'] = (v['discharge'] / total_discharge) * 100
-
-    # 평균유속
-    avg_velocity = total_discharge / total_area if total_area > 0 else 0
-
-    # 최대/최소 유속 (0이 아닌 값 중에서)
-    velocities = [v['velocity'] for v in verticals if v['velocity'] > 0]
-    max_velocity = max(velocities) if velocities else 0
-    min_velocity = min(velocities) if velocities else 0
-
-    # 하폭
-    distances = [v['distance'] for v in verticals]
-    total_width = max(distances) - min(distances) if distances else 0
-
-    # 평균수심
-    avg_depth = total_area / total_width if total_width > 0 else 0
-
-    # ============================================
-    # ISO 748 불확실도 계산 (완전 구현)
-    # ============================================
-    n_verticals = len([v for v in verticals if v['velocity'] > 0])
-    methods = [v['method'] for v in verticals if v['method'] in ['1', '2', '3']]
-
-    # ----- X1Q: 랜덤 불확실도 (Random Uncertainty) -----
-
-    # Xm: 측선수 불확실도 (ISO 748 Table 1 기반)
-    # 측선수가 많을수록 불확실도 감소
-    if n_verticals >= 25:
-        Xm = 0.5
-    elif n_verticals >= 20:
-        Xm = 1.0
-    elif n_verticals >= 15:
-        Xm = 1.5
-    elif n_verticals >= 10:
-        Xm = 2.0
-    elif n_verticals >= 5:
-        Xm = 3.0
-    else:
-        Xm = 5.0
-
-    # Xp: 측점수 불확실도 (측정법별)
-    # 1점법: 15%, 2점법: 7%, 3점법: 6.33%
-    method_xp = {'1': 15.0, '2': 7.0, '3': 6.33}
-    if methods:
-        Xp_values = [method_xp.get(m, 15.0) for m in methods]
-        Xp = sum(Xp_values) / len(Xp_values)
-    else:
-        Xp = 15.0
 
-    # Xc: 유속계 검정 불확실도 (각 측선별 유속계의 불확실도 평균)
-    valid_meter_uncertainties = [u for i, u in enumerate(meter_uncertainties_list)
-                                  if i < len(verticals) and verticals[i]['velocity'] > 0]
-    if valid_meter_uncertainties:
-        Xc = sum(valid_meter_uncertainties) / len(valid_meter_uncertainties)
-    else:
-        Xc = 1.0
-
-    # Xe: 측점 불확실도 (노출시간, 유속에 따라 변동)
-    # 간략화: 평균유속에 따라 결정
-    if avg_velocity >= 1.0:
-        Xe = 1.5  # 고유속: 낮은 불확실도
-    elif avg_velocity >= 0.5:
-        Xe = 2.0  # 중유속
-    elif avg_velocity >= 0.2:
-        Xe = 3.0  # 저유속
-    else:
-        Xe = 5.0  # 극저유속: 높은 불확실도
+def _export_file_response(artifact):
+    """완료된 산출물 → 파일 응답"""
+    import urllib.parse
+    from .export_service import mark_accessed
 
-    # X1Q: 랜덤 불확실도 합성
-    # X1Q = sqrt(Xm² + (Xe² + Xp² + Xc²) / n)
-    if n_verticals > 0:
-        random_component = (Xe**2 + Xp**2 + Xc**2) / n_verticals
-        X1Q = math.sqrt(Xm**2 + random_component)
-    else:
-        X1Q = math.sqrt(Xm**2 + Xe**2 + Xp**2 + Xc**2)
-
-    # ----- X2Q: 계통 불확실도 (Systematic Uncertainty) -----
-    X2b = 0.5   # 폭 측정 불확실도
-    X2d = 0.5   # 수심 측정 불확실도
-    X2c = 1.0   # 기타 계통 불확실도
-    X2Q = math.sqrt(X2b**2 + X2d**2 + X2c**2)  # = 1.22%
-
-    # ----- 총 불확실도 -----
-    # XQ = sqrt(X1Q² + X2Q²)
-    combined_uncertainty = math.sqrt(X1Q**2 + X2Q**2)
-
-    # 확장불확실도 (95%, k=2)
-    expanded_uncertainty = combined_uncertainty * 2
-    uncertainty_abs = total_discharge * expanded_uncertainty / 100
-
-    # 유량등급 결정 (ISO 748)
-    if expanded_uncertainty <= 5:
-        quality_grade = 'E'  # Excellent
-    elif expanded_uncertainty <= 8:
-        quality_grade = 'G'  # Good
-    elif expanded_uncertainty <= 10:
-        quality_grade = 'F'  # Fair
-    else:
-        quality_grade = 'P'  # Poor
+    mark_accessed(artifact)
+    response = HttpResponse(bytes(artifact.content), content_type=artifact.content_type)
+    response['Content-Disposition'] = f"attachment; filename*=UTF-8''{urllib.parse.quote(artifact.filename)}"
+    return response
 
-    # 유량 일 단위 환산 (m³/s → m³/d)
-    discharge_daily = round(total_discharge * 86400, 0)
 
-    return {
-        'discharge': round(total_discharge, 3),
-        'discharge_daily': f"{discharge_daily:,.0f}",  # 천 단위 구분 포맷
-        'area': round(total_area, 2),
-        'avg_velocity': round(avg_velocity, 3),
-        'max_velocity': round(max_velocity, 3),
-        'min_velocity': round(min_velocity, 3),
-        'width': round(total_width, 1),
-        'avg_depth': round(avg_depth, 2),
-        'uncertainty': round(expanded_uncertainty, 1),
-        'uncertainty_abs': round(uncertainty_abs, 3),
-        # 불확실도 상세 구성요소
-        'Xe': round(Xe, 2),
-        'Xp': round(Xp, 2),
-        'Xc': round(Xc, 2),
-        'Xm': round(Xm, 2),
-        'X1Q': round(X1Q, 2),  # 랜덤 불확실도
-        'X2Q': round(X2Q, 2),  # 계통 불확실도
-        'combined_uncertainty': round(combined_uncertainty, 2),
-        'quality_grade': quality_grade,
-        'verticals': verticals,
-        'n_verticals': n_verticals,
+def _export_job_payload(artifact):
+    """작업 상태 JSON"""
+    from django.urls import reverse
+
+    payload = {
+        'job_id': artifact.pk,
+        'kind': artifact.kind,
+        'status': artifact.status,
+        'status_url': reverse('measurement:export_job_status', args=[artifact.pk]),
     }
+    if artifact.status == artifact.STATUS_DONE:
+        payload['download_url'] = reverse('measurement:export_job_download', args=[artifact.pk])
+        payload['filename'] = artifact.filename
+        payload['size'] = artifact.size
+    elif artifact.status == artifact.STATUS_FAILED:
+        payload['error'] = artifact.error
+    return payload
 
 
-def pre_uncertainty(request):
-    """사전 불확실도 분석"""
-    return render(request, 'measurement/pre_uncertainty.html')
+def _serve_export(request, kind, obj):
+    """
+    산출물 요청 처리
 
+    캐시된 산출물이 있으면 바로 파일로 내려주고, 없으면 작업을 등록한 뒤 202 + 상태 URL 을 반환한다.
+    생존 신호를 보낸 작업자가 없으면 등록한 작업을 이 요청에서 직접 생성한다.
+    ?async=1 이면 완료 여부와 관계없이 작업 상태 JSON 을 반환한다 (화면의 다운로드 버튼).
+    """
+    from .export_service import process_now, request_export, worker_alive
 
-def meters(request):
-    """유속계 관리"""
-    return render(request, 'measurement/meters.html')
+    artifact = request_export(kind, obj, request.user)
+    if artifact.status in (artifact.STATUS_PENDING, artifact.STATUS_RUNNING) and not worker_alive():
+        artifact = process_now(artifact)
+    if request.GET.get('async'):
+        return JsonResponse(_export_job_payload(artifact), status=200 if artifact.status == 'done' else 202)
+    if artifact.status == artifact.STATUS_DONE:
+        return _export_file_response(artifact)
+    return JsonResponse(_export_job_payload(artifact), status=202)
 
 
 def export_excel(request):
-    """Excel 다운로드 - session_id로 DB에서 데이터 로드"""
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+    """Excel 다운로드 - session_id로 DB에서 데이터 로드 (내용 해시 캐시, 없으면 작업 등록)"""
+    from .export_service import KIND_SESSION_EXCEL
     from .models import MeasurementSession
 
     session_id = request.GET.get('session_id')
-
-    if session_id:
-        try:
-            session = MeasurementSession.objects.get(pk=session_id)
-            calibration = session.calibration_data or {'a': 0.0012, 'b': 0.2534}
-
-            if session.rows_data:
-                result = calculate_discharge(session.rows_data, calibration)
-                rows = []
-                for v in result.get('verticals', []):
-                    rows.append({
-                        'no': v['id'],
-                        'distance': v['distance'],
-                        'depth': v['depth'],
-                        'velocity': round(v['velocity'], 3),
-                        'area': round(v.get('area', 0), 3),
-                        'discharge': round(v.get('discharge', 0), 3),
-                        'ratio': round(v.get('ratio', 0), 1),
-                    })
-                data = {
-                    'station_name': session.station_name or '미지정',
-                    'date': session.measurement_date.strftime('%Y-%m-%d') if session.measurement_date else '-',
-                    'discharge': result['discharge'],
-                    'uncertainty': result['uncertainty'],
-                    'area': result['area'],
-                    'avg_velocity': result['avg_velocity'],
-                    'rows': rows,
-                }
-            else:
-                setup = session.setup_data or {}
-                data = {
-                    'station_name': session.station_name or '미지정',
-                    'date': session.measurement_date.strftime('%Y-%m-%d') if session.measurement_date else '-',
-                    'discharge': session.estimated_discharge or 0,
-                    'uncertainty': setup.get('final_uncertainty', 0),
-                    'area': session.total_area or 0,
-                    'avg_velocity': setup.get('final_avg_velocity', 0),
-                    'rows': [],
-                }
-        except MeasurementSession.DoesNotExist:
-            return HttpResponse('세션을 찾을 수 없습니다.', status=404)
-    else:
+    if not session_id:
         return HttpResponse('session_id 파라미터가 필요합니다.', status=400)
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "유량측정 결과"
-
-    # 스타일 정의
-    header_font = Font(bold=True, size=12)
-    title_font = Font(bold=True, size=14)
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_font_white = Font(bold=True, color="FFFFFF")
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    center_align = Alignment(horizontal='center', vertical='center')
-
-    # 제목
-    ws['A1'] = "유량측정 결과 보고서"
-    ws['A1'].font = title_font
-    ws.merge_cells('A1:G1')
-
-    # 기본 정보
-    ws['A3'] = "지점명"
-    ws['B3'] = data['station_name']
-    ws['A4'] = "측정일"
-    ws['B4'] = data['date']
-    ws['D3'] = "유량 (m³/s)"
-    ws['E3'] = data['discharge']
-    ws['D4'] = "불확실도 (%)"
-    ws['E4'] = f"± {data['uncertainty']}"
-
-    # 데이터 테이블 헤더 (7행부터)
-    headers = ['측선', '거리 (m)', '수심 (m)', '유속 (m/s)', '단면적 (m²)', '유량 (m³/s)', '비율 (%)']
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=7, column=col, value=header)
-        cell.font = header_font_white
-        cell.fill = header_fill
-        cell.alignment = center_align
-        cell.border = thin_border
-
-    # 데이터 행
-    for row_idx, row_data in enumerate(data['rows'], 8):
-        ws.cell(row=row_idx, column=1, value=row_data['no']).border = thin_border
-        ws.cell(row=row_idx, column=2, value=row_data['distance']).border = thin_border
-        ws.cell(row=row_idx, column=3, value=row_data['depth']).border = thin_border
-        ws.cell(row=row_idx, column=4, value=row_data['velocity']).border = thin_border
-        ws.cell(row=row_idx, column=5, value=row_data['area']).border = thin_border
-        ws.cell(row=row_idx, column=6, value=row_data['discharge']).border = thin_border
-        ws.cell(row=row_idx, column=7, value=row_data['ratio']).border = thin_border
-        for col in range(1, 8):
-            ws.cell(row=row_idx, column=col).alignment = center_align
-
-    # 합계 행
-    sum_row = 8 + len(data['rows'])
-    ws.cell(row=sum_row, column=1, value='합계').font = Font(bold=True)
-    ws.merge_cells(f'A{sum_row}:D{sum_row}')
-    ws.cell(row=sum_row, column=5, value=data['area']).font = Font(bold=True)
-    ws.cell(row=sum_row, column=6, value=data['discharge']).font = Font(bold=True)
-    ws.cell(row=sum_row, column=7, value=100.0).font = Font(bold=True)
-    for col in range(1, 8):
-        ws.cell(row=sum_row, column=col).border = thin_border
-        ws.cell(row=sum_row, column=col).alignment = center_align
-
-    # 열 너비 조정
-    ws.column_dimensions['A'].width = 10
-    ws.column_dimensions['B'].width = 12
-    ws.column_dimensions['C'].width = 12
-    ws.column_dimensions['D'].width = 12
-    ws.column_dimensions['E'].width = 14
-    ws.column_dimensions['F'].width = 14
-    ws.column_dimensions['G'].width = 12
-
-    # 응답 생성
-    buffer = BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
-
-    filename = f"measurement_result_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-    response = HttpResponse(
-        buffer.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    return response
+    try:
+        session = MeasurementSession.objects.get(pk=session_id)
+    except MeasurementSession.DoesNotExist:
+        return HttpResponse('세션을 찾을 수 없습니다.', status=404)
+
+    return _serve_export(request, KIND_SESSION_EXCEL, session)
 
 
 def export_pdf(request):
-    """PDF 출력 - session_id로 DB에서 데이터 로드"""
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import mm
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-    from reportlab.pdfbase import pdfmetrics
-    from reportlab.pdfbase.ttfonts import TTFont
+    """PDF 출력 - session_id로 DB에서 데이터 로드 (내용 해시 캐시, 없으면 작업 등록)"""
+    from .export_service import KIND_SESSION_PDF
     from .models import MeasurementSession
-    import os
-    from django.conf import settings
-
-    # 한글 폰트 등록
-    font_path = os.path.join(settings.BASE_DIR, 'static', 'fonts', 'NotoSansKR-Regular.ttf')
-    if os.path.exists(font_path):
-        try:
-            pdfmetrics.registerFont(TTFont('NotoSansKR', font_path))
-            KOREAN_FONT = 'NotoSansKR'
-        except:
-            KOREAN_FONT = 'Helvetica'
-    else:
-        KOREAN_FONT = 'Helvetica'
 
     session_id = request.GET.get('session_id')
+    if not session_id:
+        return HttpResponse('session_id 파라미터가 필요합니다.', status=400)
 
-    if session_id:
-        try:
-            session = MeasurementSession.objects.get(pk=session_id)
-            calibration = session.calibration_data or {'a': 0.0012, 'b': 0.2534}
+    try:
+        session = MeasurementSession.objects.get(pk=session_id)
+    except MeasurementSession.DoesNotExist:
+        return HttpResponse('세션을 찾을 수 없습니다.', status=404)
 
-            if session.rows_data:
-                result = calculate_discharge(session.rows_data, calibration)
-                rows = []
-                for v in result.get('verticals', []):
-                    rows.append([
-                        v['id'],
-                        v['distance'],
-                        round(v['depth'], 2),
-                        round(v['velocity'], 3),
-                        round(v.get('area', 0), 3),
-                        round(v.get('discharge', 0), 3),
-                        f"{round(v.get('ratio', 0), 1)}%",
-                    ])
-                data = {
-                    'station_name': session.station_name or '미지정',
-                    'date': session.measurement_date.strftime('%Y-%m-%d') if session.measurement_date else '-',
-                    'discharge': result['discharge'],
-                    'uncertainty': result['uncertainty'],
-                    'area': result['area'],
-                    'avg_velocity': result['avg_velocity'],
-                    'rows': rows,
-                }
-            else:
-                setup = session.setup_data or {}
-                data = {
-                    'station_name': session.station_name or '미지정',
-                    'date': session.measurement_date.strftime('%Y-%m-%d') if session.measurement_date else '-',
-                    'discharge': session.estimated_discharge or 0,
-                    'uncertainty': setup.get('final_uncertainty', 0),
-                    'area': session.total_area or 0,
-                    'avg_velocity': setup.get('final_avg_velocity', 0),
-                    'rows': [],
-                }
-        except MeasurementSession.DoesNotExist:
-            return HttpResponse('세션을 찾을 수 없습니다.', status=404)
-    else:
-        return HttpResponse('session_id 파라미터가 필요합니다.', status=400)
+    return _serve_export(request, KIND_SESSION_PDF, session)
 
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=20*mm, bottomMargin=20*mm)
-    elements = []
-
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'Title',
-        parent=styles['Heading1'],
-        fontName=KOREAN_FONT,
-        fontSize=16,
-        spaceAfter=12,
-        alignment=1  # center
-    )
-    normal_style = ParagraphStyle(
-        'Normal',
-        parent=styles['Normal'],
-        fontName=KOREAN_FONT,
-        fontSize=10,
-        spaceAfter=6
-    )
-    # 한글 폰트가 적용된 Heading2 스타일
-    heading2_style = ParagraphStyle(
-        'Heading2Korean',
-        parent=styles['Heading2'],
-        fontName=KOREAN_FONT,
-        fontSize=12,
-        spaceAfter=6
-    )
 
-    # 제목
-    elements.append(Paragraph("Discharge Measurement Report", title_style))
-    elements.append(Paragraph("유량측정 결과 보고서", title_style))
-    elements.append(Spacer(1, 10*mm))
+@require_GET
+def export_job_status(request, pk):
+    """내보내기 작업 상태 (대기 중이거나 중단된 작업인데 작업자 신호가 없으면 이 요청에서 생성)"""
+    from .export_service import process_now, worker_alive
+    from .models import ExportArtifact
 
-    # 기본 정보 테이블
-    info_data = [
-        ['Station', data['station_name'], 'Date', data['date']],
-        ['Discharge', f"{data['discharge']} m³/s", 'Uncertainty', f"± {data['uncertainty']}%"],
-        ['Area', f"{data['area']} m²", 'Avg. Velocity', f"{data['avg_velocity']} m/s"],
-    ]
-    info_table = Table(info_data, colWidths=[35*mm, 55*mm, 35*mm, 45*mm])
-    info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.Color(0.9, 0.9, 0.9)),
-        ('BACKGROUND', (2, 0), (2, -1), colors.Color(0.9, 0.9, 0.9)),
-        ('FONTNAME', (0, 0), (-1, -1), KOREAN_FONT),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 6),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
-    elements.append(info_table)
-    elements.append(Spacer(1, 10*mm))
-
-    # 상세 데이터 테이블
-    elements.append(Paragraph("Detailed Results by Vertical", heading2_style))
-    elements.append(Spacer(1, 5*mm))
-
-    table_data = [['No.', 'Distance(m)', 'Depth(m)', 'Velocity(m/s)', 'Area(m²)', 'Discharge(m³/s)', 'Ratio']]
-    table_data.extend(data['rows'])
-    table_data.append(['Total', '', '', '', data['area'], data['discharge'], '100%'])
-
-    detail_table = Table(table_data, colWidths=[15*mm, 25*mm, 22*mm, 28*mm, 22*mm, 32*mm, 20*mm])
-    detail_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.Color(0.27, 0.45, 0.77)),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('FONTNAME', (0, 0), (-1, -1), KOREAN_FONT),
-        ('FONTSIZE', (0, 0), (-1, 0), 9),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.Color(0.9, 0.9, 0.9)),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(detail_table)
-    elements.append(Spacer(1, 10*mm))
-
-    # 불확실도 정보
-    elements.append(Paragraph("Uncertainty Analysis (ISO 748)", heading2_style))
-    elements.append(Spacer(1, 5*mm))
-
-    unc_data = [
-        ['Component', 'Value', 'Description'],
-        ['Xe', '1.8%', 'Limited number of verticals'],
-        ['Xp', '2.1%', 'Depth measurement uncertainty'],
-        ['Xc', '1.0%', 'Calibration uncertainty'],
-        ['Xm', '2.8%', 'Velocity measurement uncertainty'],
-        ['u(Q)', '4.2%', 'Combined standard uncertainty (RSS)'],
-    ]
-    unc_table = Table(unc_data, colWidths=[30*mm, 25*mm, 80*mm])
-    unc_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.Color(0.27, 0.45, 0.77)),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('FONTNAME', (0, 0), (-1, -1), KOREAN_FONT),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('ALIGN', (0, 0), (1, -1), 'CENTER'),
-        ('ALIGN', (2, 0), (2, -1), 'LEFT'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.Color(0.85, 0.92, 0.98)),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(unc_table)
-
-    doc.build(elements)
-    buffer.seek(0)
-
-    filename = f"measurement_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-    response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    return response
+    try:
+        artifact = ExportArtifact.objects.defer('content').get(pk=pk)
+    except ExportArtifact.DoesNotExist:
+        return JsonResponse({'error': '작업을 찾을 수 없습니다.'}, status=404)
+    if artifact.status in (ExportArtifact.STATUS_PENDING, ExportArtifact.STATUS_RUNNING) and not worker_alive():
+        artifact = process_now(artifact)
+    return JsonResponse(_export_job_payload(artifact))
+
+
+@require_GET
+def export_job_download(request, pk):
+    """완료된 내보내기 산출물 다운로드"""
+    from .models import ExportArtifact
+
+    try:
+        artifact = ExportArtifact.objects.get(pk=pk)
+    except ExportArtifact.DoesNotExist:
+        return HttpResponse('작업을 찾을 수 없습니다.', status=404)
+    if artifact.status != ExportArtifact.STATUS_DONE:
+        return JsonResponse(_export_job_payload(artifact), status=409)
+    return _export_file_response(artifact)
 
 
 def rating_curve_list(request):
@@ -995,29 +530,41 @@ def api_rating_curve_save(request):
 def timeseries_list(request):
     """시계열 데이터 관리"""
     from .models import Station, WaterLevelTimeSeries, RatingCurve
+    from .timeseries_archive_service import WATERLEVEL, archive_count, archive_range, archived_station_ids
     from django.db.models import Count, Min, Max
 
-    # DB에서 수위 시계열 데이터가 있는 관측소 조회
-    stations_with_data = WaterLevelTimeSeries.objects.values('station').annotate(
-        data_count=Count('id'),
-        first_time=Min('timestamp'),
-        last_time=Max('timestamp'),
-    )
+    # DB(최근 자료)에서 수위 시계열 데이터가 있는 관측소 조회
+    hot = {
+        item['station']: item
+        for item in WaterLevelTimeSeries.objects.values('station').annotate(
+            data_count=Count('id'),
+            first_time=Min('timestamp'),
+            last_time=Max('timestamp'),
+        )
+    }
 
-    stations = []
-    for item in stations_with_data:
-        station = Station.objects.get(pk=item['station'])
-        has_rating = RatingCurve.objects.filter(station=station).exists()
+    # Parquet 아카이브로 옮겨진 관측소도 포함 (건수/기간은 DB + 아카이브)
+    station_ids = set(hot) | archived_station_ids(WATERLEVEL)
+    station_map = Station.objects.in_bulk(station_ids)
+    rated = set(RatingCurve.objects.filter(station_id__in=station_ids).values_list('station_id', flat=True))
 
-        first_time = item['first_time']
-        last_time = item['last_time']
+    stations = []
+    for station_id in sorted(station_map):
+        station = station_map[station_id]
+        item = hot.get(station_id, {})
+        archive_first, archive_last = archive_range(WATERLEVEL, station_id)
+
+        first_candidates = [t for t in (item.get('first_time'), archive_first) if t]
+        last_candidates = [t for t in (item.get('last_time'), archive_last) if t]
+        first_time = min(first_candidates) if first_candidates else None
+        last_time = max(last_candidates) if last_candidates else None
         period = f"{first_time.strftime('%Y-%m-%d')} ~ {last_time.strftime('%Y-%m-%d')}" if first_time and last_time else '-'
 
         stations.append({
             'id': station.pk,
             'name': station.name,
-            'has_rating_curve': has_rating,
-            'data_count': item['data_count'],
+            'has_rating_curve': station_id in rated,
+            'data_count': item.get('data_count', 0) + archive_count(WATERLEVEL, station_id),
             'last_update': last_time.strftime('%Y-%m-%d %H:%M') if last_time else '-',
             'period': period,
         })
@@ -1027,13 +574,60 @@ def timeseries_list(request):
     })
 
 
+def _import_job_payload(job):
+    """가져오기 작업 상태 JSON"""
+    from django.urls import reverse
+
+    job.refresh_from_db(fields=['status', 'stats', 'error', 'station'])
+    return {
+        'job_id': job.pk,
+        'status': job.status,
+        'station_id': job.station_id,
+        'error': job.error,
+        'status_url': reverse('measurement:timeseries_import_status', args=[job.pk]),
+        **(job.stats or {}),
+    }
+
+
 def timeseries_upload(request):
     """수위 데이터 업로드"""
     from .models import Station, RatingCurve
 
     if request.method == 'POST':
-        # CSV 파싱 및 저장 로직 (추후 구현)
-        return JsonResponse({'success': True, 'message': '업로드 완료'})
+        from .timeseries_import_service import (
+            TimeseriesImportError, enqueue_import, sniff_waterlevel_file, start_import,
+        )
+
+        upload = request.FILES.get('file')
+        if not upload:
+            return JsonResponse({'error': '파일을 선택해주세요.'}, status=400)
+
+        station_id = request.POST.get('station_id')
+        new_station_name = request.POST.get('new_station_name', '').strip()
+        if not station_id and not new_station_name:
+            return JsonResponse({'error': '관측소를 선택해주세요.'}, status=400)
+
+        # 관측소를 만들기 전에 파일 앞부분으로 형식 확인 (잘못된 파일로 빈 관측소가 남지 않도록)
+        try:
+            sniff_waterlevel_file(upload.file, filename=upload.name)
+        except TimeseriesImportError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        created = False
+        if station_id:
+            station = get_object_or_404(Station, pk=station_id)
+        else:
+            station = Station.objects.create(
+                user=request.user if request.user.is_authenticated else None,
+                name=new_station_name,
+                river_name=request.POST.get('new_station_river', '').strip(),
+            )
+            created = True
+
+        # 가져오기는 작업자가 처리 (요청은 작업 등록 후 바로 상태 URL 반환)
+        job = enqueue_import(station, upload, created_station=created, user=request.user)
+        start_import(job)
+        return JsonResponse(_import_job_payload(job), status=202)
 
     # 관측소 및 H-Q 곡선 목록
     stations = Station.objects.all().order_by('name')
@@ -1045,28 +639,42 @@ def timeseries_upload(request):
     })
 
 
+@require_GET
+def timeseries_import_status(request, pk):
+    """수위 가져오기 작업 상태 (대기 중인데 작업자 신호가 없으면 백그라운드 스레드로 시작)"""
+    from .models import TimeseriesImportJob
+    from .timeseries_import_service import start_import
+
+    try:
+        job = TimeseriesImportJob.objects.defer('content').get(pk=pk)
+    except TimeseriesImportJob.DoesNotExist:
+        return JsonResponse({'error': '작업을 찾을 수 없습니다.'}, status=404)
+    if job.status in (TimeseriesImportJob.STATUS_PENDING, TimeseriesImportJob.STATUS_RUNNING):
+        start_import(job)
+    return JsonResponse(_import_job_payload(job))
+
+
 @require_GET
 def api_stations_search(request):
-    """관측소 검색 API"""
+    """관측소 검색 API (검색어가 있으면 초성·오타 허용 색인 검색, 점수 순)"""
     from .models import Station
 
     query = request.GET.get('q', '').strip()
     limit = int(request.GET.get('limit', 20))
 
-    stations = Station.objects.all()
-
     if query:
-        stations = stations.filter(name__icontains=query)
-
-    stations = stations.order_by('name')[:limit]
+        from hydro.station_search_service import search_station_table
 
-    results = []
-    for s in stations:
-        results.append({
-            'id': s.pk,
-            'name': s.name,
-            'river_name': s.river_name or '',
-        })
+        stations = search_station_table(query, limit)
+        results = [
+            {'id': s['id'], 'name': s['name'], 'river_name': s['river_name']}
+            for s in stations
+        ]
+    else:
+        results = [
+            {'id': s.pk, 'name': s.name, 'river_name': s.river_name or ''}
+            for s in Station.objects.order_by('name')[:limit]
+        ]
 
     return JsonResponse({
         'stations': results,
@@ -1099,41 +707,44 @@ def api_rating_curves_by_station(request, station_id):
 
 
 def timeseries_detail(request, station_id):
-    """관측소별 시계열 상세 - DB에서 데이터 로드"""
-    from .models import Station, WaterLevelTimeSeries, RatingCurve
+    """관측소별 시계열 상세 - DB + Parquet 아카이브에서 데이터 로드"""
+    from django.utils import timezone
+    from .models import Station
+    from .rating_service import get_station_rating, FLAG_SUSPECT
+    from .timeseries_archive_service import latest_rows, total_count as series_count, WATERLEVEL
 
     station = get_object_or_404(Station, pk=station_id)
 
-    # 수위 시계열 데이터 조회 (최신순 1000개)
-    water_levels = WaterLevelTimeSeries.objects.filter(
-        station=station
-    ).order_by('-timestamp')[:1000]
+    # 최근 수위 데이터 (표 표시용, 차트는 api_timeseries_series 에서 다운샘플링 조회)
+    water_levels = latest_rows(WATERLEVEL, station.pk, limit=100, columns=['stage'])
 
-    total_count = WaterLevelTimeSeries.objects.filter(station=station).count()
+    total_count = series_count(WATERLEVEL, station.pk)
 
-    # Rating Curve 조회 (가장 최신)
-    rating_curve = RatingCurve.objects.filter(station=station).order_by('-year').first()
+    # Rating Curve 경계표 (관측소 전체 곡선, 시각별 유효 곡선 적용)
+    rating = get_station_rating(station.pk)
 
     # 시계열 데이터 변환
-    data = []
-    for wl in water_levels:
-        discharge = None
-        if rating_curve and wl.stage is not None:
-            # Q = a * (h - h0) ^ b
-            h_diff = wl.stage - rating_curve.coef_h0
-            if h_diff > 0:
-                discharge = round(rating_curve.coef_a * (h_diff ** rating_curve.coef_b), 4)
+    discharges = [None] * len(water_levels)
+    if rating and water_levels:
+        q, flags, _ = rating.evaluate_at(
+            [wl['timestamp'] for wl in water_levels],
+            [wl['stage'] for wl in water_levels],
+        )
+        discharges = [
+            round(value, 4) if flag != FLAG_SUSPECT else None
+            for value, flag in zip(q.tolist(), flags.tolist())
+        ]
 
+    data = []
+    for wl, discharge in zip(water_levels, discharges):
         data.append({
-            'timestamp': wl.timestamp.strftime('%Y-%m-%d %H:%M'),
-            'stage': wl.stage,
+            'timestamp': timezone.localtime(wl['timestamp']).strftime('%Y-%m-%d %H:%M'),
+            'stage': wl['stage'],
             'discharge': discharge,
         })
 
     # Rating Curve 수식 생성
-    rating_curve_eq = None
-    if rating_curve:
-        rating_curve_eq = f"Q = {rating_curve.coef_a}(h - {rating_curve.coef_h0})^{rating_curve.coef_b}"
+    rating_curve_eq = rating.equation_display() if rating else None
 
     station_data = {
         'id': station.pk,
@@ -1143,83 +754,108 @@ def timeseries_detail(request, station_id):
 
     return render(request, 'measurement/timeseries_detail.html', {
         'station': station_data,
-        'data': data[:100],  # 최근 100개만 템플릿에 전달
+        'data': data,
         'total_count': total_count,
     })
 
 
+@require_GET
+def api_timeseries_series(request, station_id):
+    """
+    차트용 수위/유량 시계열 API (다운샘플링)
+
+    GET 파라미터:
+        start, end: 조회 기간 (YYYY-MM-DD 또는 YYYY-MM-DD HH:MM, 생략 시 전체 기간)
+        points: 최대 점 수 (기본 1000, 최대 5000)
+        method: bucket (구간 min/max/mean, 기본) 또는 lttb
+        cursor, from, to: 이전 응답의 cursor 와 구간 번호 범위로 확대 조회
+    """
+    from django.utils import timezone
+    from .models import Station
+    from .timeseries_query_service import query_series, decode_cursor, DEFAULT_POINTS
+
+    station = get_object_or_404(Station, pk=station_id)
+
+    def parse_time(value, end_of_day=False):
+        if not value:
+            return None
+        for fmt in ('%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M', '%Y-%m-%d'):
+            try:
+                parsed = datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            raise ValueError(f'날짜 형식이 올바르지 않습니다: {value}')
+        if end_of_day and fmt == '%Y-%m-%d':
+            parsed += timedelta(days=1) - timedelta(microseconds=1)
+        return timezone.make_aware(parsed)
+
+    try:
+        points = int(request.GET.get('points', DEFAULT_POINTS))
+        method = request.GET.get('method', 'bucket')
+        if method not in ('bucket', 'lttb'):
+            return JsonResponse({'error': 'method 는 bucket 또는 lttb 입니다.'}, status=400)
+
+        cursor = request.GET.get('cursor')
+        if cursor:
+            cursor_station, start, end = decode_cursor(
+                cursor, int(request.GET.get('from', 0)), int(request.GET.get('to', 0)),
+            )
+            if cursor_station != station.pk:
+                return JsonResponse({'error': '유효하지 않은 cursor 입니다.'}, status=400)
+        else:
+            start = parse_time(request.GET.get('start'))
+            end = parse_time(request.GET.get('end'), end_of_day=True)
+
+        result = query_series(station, start, end, points=points, method=method)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    return JsonResponse({
+        'success': True,
+        'station_id': station.pk,
+        'station_name': station.name,
+        **result,
+    })
+
+
 @require_http_methods(["POST"])
 def generate_discharge_series(request):
     """Rating Curve 적용하여 유량 시계열 생성 (AJAX)"""
-    from .models import Station, WaterLevelTimeSeries, RatingCurve, DischargeTimeSeries
+    from .models import Station, WaterLevelTimeSeries, RatingCurve
+    from .discharge_series_service import generate_discharge_series as build_discharge_series
+    from .timeseries_archive_service import WATERLEVEL, has_archive
 
     try:
         data = json.loads(request.body)
         station_id = data.get('station_id')
         rating_curve_id = data.get('rating_curve_id')
 
-        if not station_id or not rating_curve_id:
-            return JsonResponse({'error': 'station_id와 rating_curve_id가 필요합니다.'}, status=400)
+        if not station_id:
+            return JsonResponse({'error': 'station_id가 필요합니다.'}, status=400)
 
-        # 관측소 및 Rating Curve 조회
+        # 관측소 및 Rating Curve 조회 (곡선 미지정 시 관측소 전체 곡선을 시각별로 적용)
         station = get_object_or_404(Station, pk=station_id)
-        rating_curve = get_object_or_404(RatingCurve, pk=rating_curve_id)
-
-        # 수위 시계열 조회
-        water_levels = WaterLevelTimeSeries.objects.filter(station=station)
+        rating_curve = get_object_or_404(RatingCurve, pk=rating_curve_id) if rating_curve_id else None
+        if rating_curve is None and not RatingCurve.objects.filter(station=station).exists():
+            return JsonResponse({'error': '해당 관측소에 Rating Curve가 없습니다.'}, status=400)
 
-        if not water_levels.exists():
+        # 수위 시계열 확인 (DB 또는 아카이브)
+        if not (WaterLevelTimeSeries.objects.filter(station=station).exists()
+                or has_archive(WATERLEVEL, station.pk)):
             return JsonResponse({'error': '수위 시계열 데이터가 없습니다.'}, status=400)
 
-        # 기존 유량 시계열 삭제 (같은 station + rating_curve 조합)
-        DischargeTimeSeries.objects.filter(
-            station=station,
-            rating_curve=rating_curve
-        ).delete()
-
-        # 유량 계산 및 저장
-        created_count = 0
-        extrapolated_count = 0
-
-        discharge_records = []
-        for wl in water_levels:
-            if wl.stage is None:
-                continue
-
-            # Q = a * (h - h0) ^ b
-            h_diff = wl.stage - rating_curve.coef_h0
-
-            if h_diff <= 0:
-                # 수위가 h0 이하면 유량 0
-                discharge = 0
-                quality_flag = 'suspect'
-            else:
-                discharge = rating_curve.coef_a * (h_diff ** rating_curve.coef_b)
-
-                # 외삽 여부 확인
-                if wl.stage < rating_curve.h_min or wl.stage > rating_curve.h_max:
-                    quality_flag = 'extrapolated'
-                    extrapolated_count += 1
-                else:
-                    quality_flag = 'good'
-
-            discharge_records.append(DischargeTimeSeries(
-                station=station,
-                timestamp=wl.timestamp,
-                stage=wl.stage,
-                discharge=round(discharge, 4),
-                rating_curve=rating_curve,
-                quality_flag=quality_flag,
-            ))
-            created_count += 1
-
-        # 일괄 생성
-        DischargeTimeSeries.objects.bulk_create(discharge_records, batch_size=1000)
+        # 청크 단위 유량 계산 및 업서트 (같은 시각의 기존 유량은 갱신)
+        stats = build_discharge_series(station, rating_curve)
+        created_count = stats['count']
+        extrapolated_count = stats['extrapolated']
 
         return JsonResponse({
             'success': True,
             'message': f'유량 시계열 생성 완료 ({created_count}개)',
             'count': created_count,
+            'archived': stats['archived'],
             'extrapolated': extrapolated_count,
         })
 
@@ -1232,7 +868,7 @@ def baseflow_list(request):
     from .models import BaseflowAnalysis
 
     # DB에서 분석 목록 조회
-    db_analyses = BaseflowAnalysis.objects.select_related('station').order_by('-created_at')
+    db_analyses = BaseflowAnalysis.objects.select_related('station').defer('daily_packed').order_by('-created_at')
 
     analyses = []
     for a in db_analyses:
@@ -1267,10 +903,13 @@ def baseflow_new(request):
         except Station.DoesNotExist:
             pass
 
-    # 내부 관측소 목록 (시계열 데이터가 있는 것만)
+    # 내부 관측소 목록 (시계열 데이터가 있는 것만 - DB 또는 아카이브)
+    from django.db.models import Q
     from .models import WaterLevelTimeSeries
+    from .timeseries_archive_service import WATERLEVEL, archived_station_ids
     internal_stations = Station.objects.filter(
-        pk__in=WaterLevelTimeSeries.objects.values('station_id').distinct()
+        Q(pk__in=WaterLevelTimeSeries.objects.values('station_id').distinct())
+        | Q(pk__in=archived_station_ids(WATERLEVEL))
     )
 
     return render(request, 'measurement/baseflow_new.html', {
@@ -1282,8 +921,8 @@ def baseflow_new(request):
 
 @require_GET
 def api_hrfco_discharge(request):
-    """HRFCO API에서 유량 데이터 가져오기"""
-    from hydro.services import get_waterlevel_history
+    """HRFCO 유량 데이터 (로컬 사본에 없는 구간만 API 에서 받아 채움)"""
+    from hydro.hrfco_history_service import daily_mean_flow, sync_history
     from datetime import datetime, timedelta
 
     station_code = request.GET.get('station_code')
@@ -1305,27 +944,12 @@ def api_hrfco_discharge(request):
         else:
             start_dt = datetime.strptime(start_date, '%Y-%m-%d')
 
-        # HRFCO API 호출
-        data = get_waterlevel_history(station_code, start_dt, end_dt)
-
-        # 일별 평균 유량으로 집계 (기저유출 분석용)
-        daily_data = {}
-        for item in data:
-            if item.get('fw') is not None:  # 유량 데이터가 있는 경우만
-                date_key = item['datetime'].strftime('%Y-%m-%d') if item.get('datetime') else None
-                if date_key:
-                    if date_key not in daily_data:
-                        daily_data[date_key] = []
-                    daily_data[date_key].append(item['fw'])
-
-        # 일평균 계산
-        discharge_series = []
-        dates = []
-        for date_key in sorted(daily_data.keys()):
-            values = daily_data[date_key]
-            avg_discharge = sum(values) / len(values)
-            dates.append(date_key)
-            discharge_series.append(round(avg_discharge, 4))
+        # 빠진 구간만 HRFCO API 호출 후 일별 평균 유량 집계 (기저유출 분석용)
+        sync_history(station_code, start_dt, end_dt)
+        daily = daily_mean_flow(station_code, start_dt, end_dt)
+
+        dates = [day.strftime('%Y-%m-%d') for day, _ in daily]
+        discharge_series = [round(avg, 4) for _, avg in daily]
 
         return JsonResponse({
             'success': True,
@@ -1343,10 +967,10 @@ def api_hrfco_discharge(request):
 
 @require_GET
 def api_internal_discharge(request):
-    """내부 관측소(WaterLevelTimeSeries)에서 유량 데이터 가져오기"""
-    from .models import Station, WaterLevelTimeSeries, RatingCurve
-    from django.db.models import Avg
-    from django.db.models.functions import TruncDate
+    """내부 관측소(WaterLevelTimeSeries + Parquet 아카이브)에서 유량 데이터 가져오기"""
+    from .models import Station
+    from .rating_service import get_station_rating
+    from .discharge_series_service import daily_discharge
 
     station_id = request.GET.get('station_id')
     start_date = request.GET.get('start_date')
@@ -1358,9 +982,9 @@ def api_internal_discharge(request):
     try:
         station = Station.objects.get(pk=station_id)
 
-        # Rating Curve 조회 (가장 최신)
-        rating_curve = RatingCurve.objects.filter(station=station).order_by('-year').first()
-        if not rating_curve:
+        # Rating Curve 경계표 (연도별 유효 곡선 적용)
+        rating = get_station_rating(station.pk)
+        if not rating:
             return JsonResponse({'error': '해당 관측소에 Rating Curve가 없습니다.'}, status=400)
 
         # 기간 설정
@@ -1375,42 +999,20 @@ def api_internal_discharge(request):
         else:
             start_dt = datetime.strptime(start_date, '%Y-%m-%d')
 
-        # 수위 시계열 조회 (일평균)
         from django.utils import timezone
         start_aware = timezone.make_aware(start_dt) if timezone.is_naive(start_dt) else start_dt
         end_aware = timezone.make_aware(end_dt) if timezone.is_naive(end_dt) else end_dt
 
-        daily_stages = WaterLevelTimeSeries.objects.filter(
-            station=station,
-            timestamp__gte=start_aware,
-            timestamp__lte=end_aware,
-            quality_flag='good'
-        ).annotate(
-            date=TruncDate('timestamp')
-        ).values('date').annotate(
-            avg_stage=Avg('stage')
-        ).order_by('date')
-
-        # 수위 → 유량 변환 (Rating Curve 적용)
-        dates = []
-        discharge_series = []
-        a, b, h0 = rating_curve.coef_a, rating_curve.coef_b, rating_curve.coef_h0
-
-        for item in daily_stages:
-            h_diff = item['avg_stage'] - h0
-            if h_diff > 0:
-                discharge = a * (h_diff ** b)
-            else:
-                discharge = 0
-
-            dates.append(item['date'].strftime('%Y-%m-%d'))
-            discharge_series.append(round(discharge, 4))
+        # 일평균 수위 → 유량 변환 (Rating Curve 적용)
+        days, q = daily_discharge(station, start_aware, end_aware)
+        dates = [day.strftime('%Y-%m-%d') for day in days]
+        discharge_series = [round(value, 4) for value in q.tolist()]
 
         return JsonResponse({
             'success': True,
             'station_id': station_id,
             'station_name': station.name,
-            'rating_curve': f"Q = {a}(h - {h0})^{b}",
+            'rating_curve': rating.equation_display(),
             'dates': dates,
             'discharge': discharge_series,
             'count': len(discharge_series),
@@ -1431,18 +1033,21 @@ def baseflow_detail(request, pk):
     try:
         # DB에서 분석 결과 조회
         analysis_obj = BaseflowAnalysis.objects.select_related('station').get(pk=pk)
-        daily_results = analysis_obj.daily_results.all().order_by('date')
-
-        # 일별 데이터 변환
-        daily_data = []
-        for d in daily_results:
-            direct = d.total_discharge - d.baseflow if d.total_discharge and d.baseflow else 0
-            daily_data.append({
-                'date': d.date.strftime('%Y-%m-%d'),
-                'total': round(d.total_discharge, 3) if d.total_discharge else 0,
-                'baseflow': round(d.baseflow, 3) if d.baseflow else 0,
-                'direct': round(max(0, direct), 3),
-            })
+        series = analysis_obj.daily_series()
+
+        # 일별 데이터 변환 (압축 배열 → 표시용 값)
+        import numpy as np
+        total = series['total'].astype(float)
+        baseflow = series['baseflow'].astype(float)
+        daily_data = [
+            {'date': day, 'total': t, 'baseflow': b, 'direct': d}
+            for day, t, b, d in zip(
+                np.datetime_as_string(series['dates']).tolist(),
+                np.round(total, 3).tolist(),
+                np.round(baseflow, 3).tolist(),
+                np.round(np.maximum(total - baseflow, 0), 3).tolist(),
+            )
+        ]
 
         # 분석 결과 객체 (템플릿에서 .pk 접근 가능)
         class AnalysisWrapper:
@@ -1477,58 +1082,120 @@ def baseflow_detail(request, pk):
 def run_baseflow_analysis(request):
     """기저유출 분석 실행 (AJAX)"""
     import numpy as np
+    from .baseflow_service import METHODS, estimate_recession, separate, statistics
 
     try:
         data = json.loads(request.body)
         method = data.get('method', 'lyne_hollick')
         alpha = float(data.get('alpha', 0.925))
-        discharge = np.array(data.get('discharge', []))
+        bfi_max = float(data.get('bfi_max') or 0.80)
+        passes = int(data.get('passes', 1))
+        discharge = np.array(data.get('discharge', []), dtype=float)
 
         if len(discharge) < 30:
             return JsonResponse({'error': '최소 30일 이상의 데이터가 필요합니다.'}, status=400)
 
-        # Lyne-Hollick 디지털 필터
-        if method == 'lyne_hollick':
-            baseflow = np.zeros_like(discharge)
-            baseflow[0] = discharge[0] * 0.5
-
-            for i in range(1, len(discharge)):
-                # b(i) = α * b(i-1) + (1-α)/2 * (Q(i) + Q(i-1))
-                baseflow[i] = alpha * baseflow[i-1] + (1 - alpha) / 2 * (discharge[i] + discharge[i-1])
-                baseflow[i] = min(baseflow[i], discharge[i])
-
-        # Eckhardt 필터
-        elif method == 'eckhardt':
-            bfi_max = float(data.get('bfi_max', 0.80))
-            baseflow = np.zeros_like(discharge)
-            baseflow[0] = discharge[0] * bfi_max
+        if method not in METHODS:
+            return JsonResponse({'error': '지원하지 않는 분석 방법입니다.'}, status=400)
 
-            for i in range(1, len(discharge)):
-                baseflow[i] = ((1 - bfi_max) * alpha * baseflow[i-1] +
-                               (1 - alpha) * bfi_max * discharge[i]) / (1 - alpha * bfi_max)
-                baseflow[i] = min(baseflow[i], discharge[i])
+        if passes not in (1, 3):
+            return JsonResponse({'error': '통과 횟수는 1 또는 3이어야 합니다.'}, status=400)
 
-        else:
-            return JsonResponse({'error': '지원하지 않는 분석 방법입니다.'}, status=400)
+        # 감수 상수 자동 추정 (권장 α / BFImax 적용)
+        recession = None
+        if data.get('estimate'):
+            recession = estimate_recession(discharge)
+            alpha, bfi_max = recession['alpha'], recession['bfi_max']
 
-        # 결과 계산
+        # Lyne-Hollick (1회/3회 통과) 또는 Eckhardt 필터
+        baseflow = separate(discharge, method, alpha=alpha, bfi_max=bfi_max, passes=passes)
         direct_runoff = discharge - baseflow
-        total_sum = float(np.sum(discharge))
-        baseflow_sum = float(np.sum(baseflow))
-        bfi = baseflow_sum / total_sum if total_sum > 0 else 0
 
         return JsonResponse({
             'success': True,
             'baseflow': baseflow.tolist(),
             'direct_runoff': direct_runoff.tolist(),
-            'statistics': {
-                'total_runoff': round(total_sum, 2),
-                'baseflow': round(baseflow_sum, 2),
-                'direct_runoff': round(float(np.sum(direct_runoff)), 2),
-                'bfi': round(bfi, 4),
-            }
+            'statistics': statistics(discharge, baseflow),
+            'recession': recession,
+        })
+
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@require_http_methods(["POST"])
+def api_baseflow_sweep(request):
+    """
+    기저유출 매개변수 일괄 분석 (여러 관측소 × α/BFImax 격자)
+
+    Body (JSON):
+        stations: [{'station_id': 1}, {'station_code': '1018683'}, ...]
+        start_date, end_date: 'YYYY-MM-DD' (기본: 최근 1년)
+        method: 'lyne_hollick' / 'eckhardt'
+        alphas: α 후보 목록, bfi_maxes: BFImax 후보 목록 (Eckhardt)
+        passes: Lyne-Hollick 통과 횟수 (1 또는 3)
+        format: 'json' (기본) 또는 'csv'
+
+    관측소는 MAX_WEB_STATIONS 개까지 (더 많으면 baseflow_sweep 관리 명령 사용)
+    """
+    from datetime import datetime, timedelta
+    from django.http import HttpResponse
+    from django.utils import timezone
+    from .baseflow_batch_service import MAX_WEB_STATIONS, run_sweep, write_csv
+    from .baseflow_service import METHODS
+
+    try:
+        data = json.loads(request.body)
+        stations = data.get('stations') or []
+        method = data.get('method', 'lyne_hollick')
+        alphas = [float(a) for a in data.get('alphas') or [0.925]]
+        bfi_maxes = [float(b) for b in data.get('bfi_maxes') or [0.80]]
+        passes = int(data.get('passes', 1))
+
+        if not stations:
+            return JsonResponse({'error': '관측소 목록이 필요합니다.'}, status=400)
+        if len(stations) > MAX_WEB_STATIONS:
+            return JsonResponse({
+                'error': f'웹에서는 관측소를 최대 {MAX_WEB_STATIONS}개까지 분석할 수 있습니다. '
+                         f'더 많은 관측소는 python manage.py baseflow_sweep 명령을 사용하세요.',
+            }, status=400)
+        if method not in METHODS:
+            return JsonResponse({'error': '지원하지 않는 분석 방법입니다.'}, status=400)
+        if passes not in (1, 3):
+            return JsonResponse({'error': '통과 횟수는 1 또는 3이어야 합니다.'}, status=400)
+
+        end_dt = datetime.strptime(data['end_date'], '%Y-%m-%d') if data.get('end_date') else datetime.now()
+        start_dt = (
+            datetime.strptime(data['start_date'], '%Y-%m-%d') if data.get('start_date')
+            else end_dt - timedelta(days=365)
+        )
+
+        results = run_sweep(
+            stations, timezone.make_aware(start_dt), timezone.make_aware(end_dt),
+            method, alphas, bfi_maxes, passes=passes,
+            max_workers=1,  # 웹 요청마다 spawn 프로세스 풀을 만들지 않음 (대량 분석은 baseflow_sweep 명령)
+        )
+
+        if data.get('format') == 'csv':
+            response = HttpResponse(content_type='text/csv; charset=utf-8')
+            response['Content-Disposition'] = 'attachment; filename="baseflow_sweep.csv"'
+            response.write('\ufeff')
+            write_csv(results, response)
+            return response
+
+        return JsonResponse({
+            'success': True,
+            'method': method,
+            'passes': passes,
+            'alphas': alphas,
+            'bfi_maxes': bfi_maxes if method == 'eckhardt' else [],
+            'results': results,
         })
 
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
@@ -1536,7 +1203,7 @@ def run_baseflow_analysis(request):
 @require_http_methods(["POST"])
 def save_baseflow_analysis(request):
     """기저유출 분석 결과 저장"""
-    from .models import Station, BaseflowAnalysis, BaseflowDaily
+    from .models import Station, BaseflowAnalysis
     from datetime import datetime
 
     # 로그인 체크
@@ -1576,8 +1243,8 @@ def save_baseflow_analysis(request):
         if not station:
             return JsonResponse({'error': '관측소 정보가 필요합니다.'}, status=400)
 
-        # BaseflowAnalysis 생성
-        analysis = BaseflowAnalysis.objects.create(
+        # BaseflowAnalysis 생성 (일별 결과는 압축 배열로 같은 행에 저장)
+        analysis = BaseflowAnalysis(
             user=request.user,  # 사용자 연결
             station=station,
             start_date=datetime.strptime(start_date, '%Y-%m-%d').date(),
@@ -1590,6 +1257,14 @@ def save_baseflow_analysis(request):
             direct_runoff=statistics.get('direct_runoff'),
             bfi=statistics.get('bfi'),
         )
+        if daily_data:
+            analysis.set_daily_series(
+                [d['date'] for d in daily_data],
+                [d['total'] for d in daily_data],
+                [d['baseflow'] for d in daily_data],
+                [d['direct'] for d in daily_data],
+            )
+        analysis.save()
 
         # 활동 로그 기록
         from core.tracking import log_activity
@@ -1602,20 +1277,6 @@ def save_baseflow_analysis(request):
             extra_data={'method': method, 'bfi': statistics.get('bfi')}
         )
 
-        # 일별 데이터 저장
-        daily_objects = []
-        for d in daily_data:
-            daily_objects.append(BaseflowDaily(
-                analysis=analysis,
-                date=datetime.strptime(d['date'], '%Y-%m-%d').date(),
-                total_discharge=d['total'],
-                baseflow=d['baseflow'],
-                direct_runoff=d['direct'],
-            ))
-
-        if daily_objects:
-            BaseflowDaily.objects.bulk_create(daily_objects)
-
         return JsonResponse({
             'success': True,
             'analysis_id': analysis.id,
@@ -1626,48 +1287,111 @@ def save_baseflow_analysis(request):
         return JsonResponse({'error': str(e)}, status=500)
 
 
-@require_GET
-def export_baseflow_pdf(request, pk):
-    """기저유출 분석 PDF 리포트 다운로드"""
-    from django.http import HttpResponse
-    from .models import BaseflowAnalysis
-    from .pdf_service import generate_baseflow_report
-    import urllib.parse
+@require_http_methods(["POST"])
+def api_baseflow_run_station(request):
+    """
+    서버 측 기저유출 분석 (DB 일유량 집계 → 필터 → 저장)
+
+    Body (JSON):
+        station_id: 내부 관측소 ID
+        start_date, end_date: 'YYYY-MM-DD' (기본: 최근 1년)
+        method, alpha, bfi_max, passes: 필터 매개변수
+        source: 'waterlevel' (수위 + Rating Curve, 기본) 또는 'discharge' (저장된 유량 시계열)
+        estimate: true 이면 감수 상수를 추정하여 α / BFImax 로 사용
+        save: false 이면 저장하지 않고 결과만 반환 (기본 true, 로그인 필요)
+    """
+    from datetime import datetime, timedelta
+    from django.utils import timezone
+    from .baseflow_analysis_service import SOURCE_WATERLEVEL, run_station_analysis
+    from .models import Station
 
     try:
-        analysis = BaseflowAnalysis.objects.select_related('station').get(pk=pk)
-        daily_data = list(analysis.daily_results.all().order_by('date'))
-
-        # PDF 생성
-        pdf_buffer = generate_baseflow_report(analysis, daily_data)
+        data = json.loads(request.body)
+        save = data.get('save', True)
+        if save and not request.user.is_authenticated:
+            return JsonResponse({'error': '로그인이 필요합니다.'}, status=401)
 
-        # 안전한 파일명 생성
-        station_name = analysis.station.name if analysis.station else 'unknown'
-        safe_filename = urllib.parse.quote(f"baseflow_{station_name}_{analysis.start_date}.pdf")
+        station_id = data.get('station_id')
+        if not station_id:
+            return JsonResponse({'error': '관측소 ID가 필요합니다.'}, status=400)
+        station = Station.objects.get(pk=station_id)
 
-        # 응답 생성
-        response = HttpResponse(pdf_buffer.read(), content_type='application/pdf')
-        response['Content-Disposition'] = f"attachment; filename*=UTF-8''{safe_filename}"
+        method = data.get('method', 'lyne_hollick')
+        alpha = float(data.get('alpha', 0.925))
+        bfi_max = float(data.get('bfi_max') or 0.80)
+        passes = int(data.get('passes', 1))
+        source = data.get('source', SOURCE_WATERLEVEL)
+
+        end_dt = datetime.strptime(data['end_date'], '%Y-%m-%d') if data.get('end_date') else datetime.now()
+        start_dt = (
+            datetime.strptime(data['start_date'], '%Y-%m-%d') if data.get('start_date')
+            else end_dt - timedelta(days=365)
+        )
+        analysis, result = run_station_analysis(
+            station, timezone.make_aware(start_dt), timezone.make_aware(end_dt),
+            method, alpha=alpha, bfi_max=bfi_max, passes=passes, source=source,
+            estimate=bool(data.get('estimate')), user=request.user if save else None, save=save,
+        )
 
-        # 활동 로그 기록
-        if request.user.is_authenticated:
+        if analysis:
             from core.tracking import log_activity
             log_activity(
                 user=request.user,
-                action_type='export_pdf',
-                detail=f'기저유출 PDF 다운로드: {station_name}',
+                action_type='save',
+                detail=f'기저유출 분석 저장: {station.name} ({analysis.start_date}~{analysis.end_date})',
                 related_object=analysis,
-                request=request
+                request=request,
+                extra_data={'method': method, 'bfi': analysis.bfi, 'source': source}
             )
 
-        return response
+        return JsonResponse({
+            'success': True,
+            'analysis_id': analysis.id if analysis else None,
+            'station_id': station.pk,
+            'station_name': station.name,
+            'source': source,
+            'dates': [day.strftime('%Y-%m-%d') for day in result['dates']],
+            'discharge': [round(v, 4) for v in result['discharge'].tolist()],
+            'baseflow': [round(v, 4) for v in result['baseflow'].tolist()],
+            'direct_runoff': [round(v, 4) for v in result['direct_runoff'].tolist()],
+            'statistics': result['statistics'],
+            'recession': result['recession'],
+        })
 
+    except Station.DoesNotExist:
+        return JsonResponse({'error': '관측소를 찾을 수 없습니다.'}, status=404)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@require_GET
+def export_baseflow_pdf(request, pk):
+    """기저유출 분석 PDF 리포트 다운로드 (내용 해시 캐시, 없으면 작업 등록)"""
+    from .export_service import KIND_BASEFLOW_PDF
+    from .models import BaseflowAnalysis
+
+    try:
+        analysis = BaseflowAnalysis.objects.select_related('station').get(pk=pk)
     except BaseflowAnalysis.DoesNotExist:
         return HttpResponse('Analysis not found', status=404)
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return HttpResponse(f'Error generating PDF: {str(e)}', status=500)
+
+    response = _serve_export(request, KIND_BASEFLOW_PDF, analysis)
+
+    # 활동 로그 기록
+    if request.user.is_authenticated:
+        from core.tracking import log_activity
+        station_name = analysis.station.name if analysis.station else 'unknown'
+        log_activity(
+            user=request.user,
+            action_type='export_pdf',
+            detail=f'기저유출 PDF 다운로드: {station_name}',
+            related_object=analysis,
+            request=request
+        )
+
+    return response
 
 
 # ============================================
@@ -1732,10 +1456,9 @@ def api_measurement_autosave(request):
             session.total_width = total_width
             session.max_depth = max_depth
             session.total_area = total_area
-            session.save()
         else:
             # 새 세션 생성
-            session = MeasurementSession.objects.create(
+            session = MeasurementSession(
                 user=user,
                 session_key=session_key,
                 station_name=station_name,
@@ -1750,6 +1473,10 @@ def api_measurement_autosave(request):
                 total_area=total_area,
             )
 
+        # 분석결과표 항목은 저장 시점에 계산
+        session.calculate_analysis_results()
+        session.save()
+
         return JsonResponse({
             'success': True,
             'session_id': session.pk,
@@ -1766,11 +1493,12 @@ def api_result_save(request):
 
     중복 저장 방지:
     - session_id가 있으면 해당 세션만 업데이트
-    - session_id가 없으면 동일 데이터 중복 체크 후 저장
+    - session_id가 없으면 내용 해시(content_hash) 또는 결과 키(result_key: 관측소 + 날짜 + 유량값)로 중복 체크 후 저장
     - 트랜잭션 + select_for_update로 race condition 방지
     """
     from .models import MeasurementSession
     from django.db import transaction
+    from django.db.models import Q
 
     try:
         data = json.loads(request.body)
@@ -1807,6 +1535,7 @@ def api_result_save(request):
                     session.setup_data['final_discharge'] = discharge
                     session.setup_data['final_uncertainty'] = uncertainty
                     session.setup_data['final_avg_velocity'] = avg_velocity
+                    session.calculate_analysis_results()
                     session.save()
 
                     return JsonResponse({
@@ -1824,15 +1553,29 @@ def api_result_save(request):
             request.session.create()
             session_key = request.session.session_key
 
+        session = MeasurementSession(
+            user=user,
+            session_key=session_key,
+            station_name=station_name,
+            measurement_date=parsed_date,
+            estimated_discharge=discharge,
+            total_area=area,
+            setup_data={
+                'final_discharge': discharge,
+                'final_uncertainty': uncertainty,
+                'final_avg_velocity': avg_velocity,
+            }
+        )
+
         # 트랜잭션 내에서 중복 체크 및 생성 (race condition 방지)
         with transaction.atomic():
-            # 중복 체크: 동일 관측소 + 날짜 + 유량값이 있으면 기존 세션 반환
-            if station_name and parsed_date and discharge:
+            # 중복 체크: 내용 해시가 같거나, 측선 데이터가 있는 세션(자동 저장 등)이라도
+            # 동일 관측소 + 날짜 + 유량값이면 기존 세션 반환 (결과 저장에는 측선 데이터가 없음)
+            result_key = session.compute_result_key()
+            if result_key:
                 existing = MeasurementSession.objects.select_for_update().filter(
-                    station_name=station_name,
-                    measurement_date=parsed_date,
-                    estimated_discharge=discharge
-                ).first()
+                    Q(content_hash=session.compute_content_hash()) | Q(result_key=result_key)
+                ).only('pk').order_by('pk').first()
 
                 if existing:
                     return JsonResponse({
@@ -1843,19 +1586,7 @@ def api_result_save(request):
                     })
 
             # 새 세션 생성
-            session = MeasurementSession.objects.create(
-                user=user,
-                session_key=session_key,
-                station_name=station_name,
-                measurement_date=parsed_date,
-                estimated_discharge=discharge,
-                total_area=area,
-                setup_data={
-                    'final_discharge': discharge,
-                    'final_uncertainty': uncertainty,
-                    'final_avg_velocity': avg_velocity,
-                }
-            )
+            session.save()
 
         return JsonResponse({
             'success': True,
@@ -1955,6 +1686,114 @@ def api_measurement_delete(request, session_id):
         return JsonResponse({'error': '세션을 찾을 수 없습니다.'}, status=404)
 
 
+def _session_boundaries(sessions):
+    """세션별 좌표와 행정구역 (좌표가 없으면 boundary None)"""
+    from hydro.boundary_service import reverse_geocode
+    from .session_station_link_service import session_coordinates
+
+    coordinates = [session_coordinates(session) for session in sessions]
+    boundaries = reverse_geocode(point or (None, None) for point in coordinates)
+    return [
+        {
+            'session_id': session.pk,
+            'station_name': session.station_name,
+            'lat': point[0] if point else None,
+            'lon': point[1] if point else None,
+            'boundary': boundary,
+        }
+        for session, point, boundary in zip(sessions, coordinates, boundaries)
+    ]
+
+
+@require_GET
+def api_session_boundary(request, session_id):
+    """측정 세션 위치의 행정구역 (시도/시군구/읍면동/리) API"""
+    from .models import MeasurementSession
+
+    try:
+        session = MeasurementSession.objects.only(
+            'pk', 'station_name', 'latitude', 'longitude', 'setup_data',
+        ).get(pk=session_id)
+    except MeasurementSession.DoesNotExist:
+        return JsonResponse({'error': '세션을 찾을 수 없습니다.'}, status=404)
+
+    try:
+        result = _session_boundaries([session])[0]
+    except FileNotFoundError as e:
+        return JsonResponse({'error': str(e)}, status=503)
+    return JsonResponse(result)
+
+
+@require_http_methods(["POST"])
+def api_session_boundaries(request):
+    """
+    여러 측정 세션의 행정구역 API
+
+    POST (JSON): {"ids": [세션 ID, ...]}
+    """
+    from hydro.boundary_service import MAX_POINTS
+    from .models import MeasurementSession
+
+    try:
+        params = json.loads(request.body or b'{}')
+        ids = [int(pk) for pk in params['ids']]
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return JsonResponse({'error': 'ids 목록(정수)이 필요합니다.'}, status=400)
+    if len(ids) > MAX_POINTS:
+        return JsonResponse({'error': f'한 번에 최대 {MAX_POINTS:,}개 세션까지 조회할 수 있습니다.'}, status=400)
+
+    sessions = MeasurementSession.objects.filter(pk__in=ids).only(
+        'pk', 'station_name', 'latitude', 'longitude', 'setup_data',
+    ).in_bulk()
+    found = [sessions[pk] for pk in ids if pk in sessions]
+    try:
+        results = _session_boundaries(found)
+    except FileNotFoundError as e:
+        return JsonResponse({'error': str(e)}, status=503)
+
+    return JsonResponse({
+        'results': results,
+        'count': len(results),
+        'not_found': [pk for pk in ids if pk not in sessions],
+    })
+
+
+@require_http_methods(["POST"])
+def api_session_dam_influence(request):
+    """
+    여러 측정 세션의 댐 방류 영향 API (측정일 기준, 한 번에 판정)
+
+    POST (JSON): {"ids": [세션 ID, ...]}
+
+    방류정보는 로컬 사본만 사용한다. 사본에 없는 날짜는 unsynced 로 돌려주며
+    (그 날짜의 판정은 방류 없음으로 나올 수 있음) sync_dam_releases 명령어가 채운다.
+    """
+    from .models import MeasurementSession
+    from .session_dam_influence_service import (
+        MAX_SESSIONS, SESSION_FIELDS, annotate_dam_influence, unsynced_dates,
+    )
+
+    try:
+        params = json.loads(request.body or b'{}')
+        ids = [int(pk) for pk in params['ids']]
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return JsonResponse({'error': 'ids 목록(정수)이 필요합니다.'}, status=400)
+    if len(ids) > MAX_SESSIONS:
+        return JsonResponse({'error': f'한 번에 최대 {MAX_SESSIONS:,}개 세션까지 조회할 수 있습니다.'}, status=400)
+
+    sessions = MeasurementSession.objects.filter(pk__in=ids).only(*SESSION_FIELDS).in_bulk()
+    found = [sessions[pk] for pk in ids if pk in sessions]
+    results = annotate_dam_influence(found)
+
+    return JsonResponse({
+        'results': results,
+        'count': len(results),
+        'influenced': sum(1 for result in results if result['is_influenced']),
+        'not_found': [pk for pk in ids if pk not in sessions],
+        'unsynced': unsynced_dates(found),
+    })
+
+
 @csrf_exempt
 def api_create_mock_data(request):
     """개발용: 모의 데이터 생성 API"""
@@ -2223,44 +2062,42 @@ def api_meters_delete(request, meter_id):
 # ============================================================
 
 def api_analysis_summary(request):
-    """분석결과표 API - 측정 세션 종합 요약"""
-    from .models import MeasurementSession
+    """
+    분석결과표 API - 측정 세션 종합 요약 (읽기 전용, 키셋 페이지)
 
-    # 필터 파라미터
-    station_name = request.GET.get('station', '')
-    start_date = request.GET.get('start_date', '')
-    end_date = request.GET.get('end_date', '')
+    GET params:
+        station, start_date, end_date: 필터
+        limit: 페이지 크기 (기본 200, 최대 1000)
+        cursor: 이전 응답의 next_cursor (없으면 첫 페이지 + 전체 요약 포함)
+    """
+    from .analysis_summary_service import DEFAULT_LIMIT, filter_sessions, summary_page, summary_totals
 
     # 쿼리 생성 (로그인 여부와 관계없이 모든 데이터 표시)
-    sessions = MeasurementSession.objects.all()
-
-    if station_name:
-        sessions = sessions.filter(station_name__icontains=station_name)
-
-    if start_date:
-        sessions = sessions.filter(measurement_date__gte=start_date)
-
-    if end_date:
-        sessions = sessions.filter(measurement_date__lte=end_date)
-
-    # 측정일 기준 정렬
-    sessions = sessions.order_by('measurement_date', 'station_name')
-
-    # 분석 결과 계산 및 저장
-    results = []
-    for session in sessions:
-        # 아직 계산되지 않은 경우 계산
-        if session.wetted_perimeter is None and session.rows_data:
-            session.calculate_analysis_results()
-            session.save()
+    sessions = filter_sessions(
+        request.GET.get('station', ''),
+        request.GET.get('start_date', ''),
+        request.GET.get('end_date', ''),
+    )
+    cursor = request.GET.get('cursor') or None
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        return JsonResponse({'error': 'limit 은 정수여야 합니다.'}, status=400)
 
-        results.append(session.to_summary_dict())
+    try:
+        results, next_cursor = summary_page(sessions, cursor=cursor, limit=limit)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
 
-    return JsonResponse({
+    response = {
         'success': True,
         'count': len(results),
         'results': results,
-    })
+        'next_cursor': next_cursor,
+    }
+    if cursor is None:
+        response['summary'] = summary_totals(sessions)
+    return JsonResponse(response)
 
 
 def api_analysis_recalculate(request, session_id):
@@ -2283,489 +2120,28 @@ def api_analysis_recalculate(request, session_id):
 
 
 def api_analysis_export(request):
-    """분석결과표 Excel 다운로드 - 피벗 형식 (지역별 시트, 날짜별 열) + 차트"""
+    """
+    분석결과표 다운로드 - CSV, 또는 Excel 피벗 형식 (지역별 시트, 날짜별 열) + 차트
+
+    Excel 은 내보내기 작업(analysis_excel)으로 등록해 작업자가 차트를 병렬로 그려 만들고,
+    같은 조건·같은 세션이면 캐시된 파일을 그대로 내려준다 (?async=1 은 작업 상태 JSON).
+    """
     import csv
-    from collections import defaultdict
     from django.http import HttpResponse
-    from .models import MeasurementSession
-
-    # 차트 생성 함수
-    def generate_chart_image(session):
-        """세션 데이터로 단면/유속 차트 이미지 생성"""
-        import traceback
-        try:
-            import matplotlib
-            matplotlib.use('Agg')
-            import matplotlib.pyplot as plt
-            from io import BytesIO
-
-            # 한글 폰트 설정 시도
-            try:
-                import matplotlib.font_manager as fm
-                import os
-                from django.conf import settings
-
-                # 프로젝트 static 폴더의 NotoSansKR 폰트 우선 사용
-                noto_font_path = os.path.join(settings.BASE_DIR, 'static', 'fonts', 'NotoSansKR-Regular.ttf')
-
-                font_paths = [
-                    noto_font_path,  # 프로젝트 내 한글 폰트 우선
-                    '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
-                    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
-                    'C:/Windows/Fonts/malgun.ttf',
-                ]
-                font_set = False
-                for fp in font_paths:
-                    try:
-                        if os.path.exists(fp):
-                            fm.fontManager.addfont(fp)
-                            font_prop = fm.FontProperties(fname=fp)
-                            plt.rcParams['font.family'] = font_prop.get_name()
-                            font_set = True
-                            print(f"Chart font set to: {fp}")
-                            break
-                    except Exception as e:
-                        print(f"Font {fp} failed: {e}")
-                        pass
-                if not font_set:
-                    plt.rcParams['font.family'] = 'DejaVu Sans'
-                    print("Using fallback font: DejaVu Sans")
-            except Exception as font_err:
-                print(f"Font setup warning: {font_err}")
-                plt.rcParams['font.family'] = 'DejaVu Sans'
-
-            plt.rcParams['axes.unicode_minus'] = False
-
-            rows = session.rows_data or []
-            if not rows or len(rows) < 2:
-                print(f"No rows data for session {session.id}")
-                return None
-
-            distances = [float(r.get('distance') or 0) for r in rows]
-            depths = [-float(r.get('depth') or 0) for r in rows]
-            velocities = [float(r.get('velocity') or 0) for r in rows]
-
-            if not distances or max(depths) == min(depths) == 0:
-                print(f"Invalid data for session {session.id}")
-                return None
-
-            fig, ax1 = plt.subplots(figsize=(15, 4.5), dpi=100)  # 가로 3배, 세로 1.5배
-
-            # 유속 (왼쪽 Y축)
-            ax1.plot(distances, velocities, color='#ef4444', linewidth=2, marker='o', markersize=4, label='Velocity')
-            ax1.set_xlabel('Distance (m)', fontsize=9)
-            ax1.set_ylabel('Velocity (m/s)', color='#ef4444', fontsize=9)
-            ax1.tick_params(axis='y', labelcolor='#ef4444')
-            max_vel = max(velocities) if velocities else 1
-            ax1.set_ylim(0, max_vel * 1.3 if max_vel > 0 else 1)
-            ax1.grid(True, linestyle='--', alpha=0.5, color='gray')
-            ax1.set_axisbelow(True)
-
-            # 수심 (오른쪽 Y축)
-            ax2 = ax1.twinx()
-            ax2.fill_between(distances, depths, 0, alpha=0.3, color='#1e3a5f', label='Depth')
-            ax2.plot(distances, depths, color='#1e3a5f', linewidth=2)
-            ax2.set_ylabel('Depth (m)', color='#1e3a5f', fontsize=9)
-            ax2.tick_params(axis='y', labelcolor='#1e3a5f')
-            min_depth = min(depths) if depths else -1
-            ax2.set_ylim(min_depth * 1.2 if min_depth < 0 else -1, 0.1)
-            ax2.axhline(y=0, color='#3b82f6', linewidth=1.5)
-
-            # 제목 (관측소명 + 날짜)
-            loc_desc = session.setup_data.get('location_desc', '') if session.setup_data else ''
-            date_str = session.measurement_date.strftime('%Y-%m-%d') if session.measurement_date else ''
-            title = f"{session.station_name or 'Station'}"
-            if loc_desc:
-                title += f" ({loc_desc})"
-            if date_str:
-                title += f" - {date_str}"
-            ax1.set_title(title, fontsize=10, fontweight='bold')
-
-            # 범례 (오른쪽 아래)
-            lines1, labels1 = ax1.get_legend_handles_labels()
-            lines2, labels2 = ax2.get_legend_handles_labels()
-            ax1.legend(lines1 + lines2, labels1 + labels2, loc='lower right', fontsize=10)
-
-            plt.tight_layout()
-
-            img_buffer = BytesIO()
-            plt.savefig(img_buffer, format='png', bbox_inches='tight', facecolor='white')
-            plt.close(fig)
-            img_buffer.seek(0)
-
-            # 버퍼 크기 확인
-            img_buffer.seek(0, 2)  # 끝으로 이동
-            size = img_buffer.tell()
-            img_buffer.seek(0)  # 다시 처음으로
-            print(f"Chart generated for session {session.id}: {size} bytes")
-
-            return img_buffer
-        except Exception as e:
-            print(f"Chart generation error for session {getattr(session, 'id', 'unknown')}: {e}")
-            traceback.print_exc()
-            return None
+    from .export_service import KIND_ANALYSIS_EXCEL, analysis_filter, analysis_sessions
 
-    # 필터
-    station_name = request.GET.get('station', '')
-    start_date = request.GET.get('start_date', '')
-    end_date = request.GET.get('end_date', '')
-    export_format = request.GET.get('format', 'csv')
-
-    sessions = MeasurementSession.objects.all()
-
-    if request.user.is_authenticated:
-        sessions = sessions.filter(user=request.user)
-
-    if station_name:
-        sessions = sessions.filter(station_name__icontains=station_name)
-    if start_date:
-        sessions = sessions.filter(measurement_date__gte=start_date)
-    if end_date:
-        sessions = sessions.filter(measurement_date__lte=end_date)
-
-    sessions = sessions.order_by('station_name', 'measurement_date')
-
-    # Excel 피벗 형식
-    if export_format == 'excel':
-        try:
-            from openpyxl import Workbook
-            from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-            from openpyxl.utils import get_column_letter
-            from openpyxl.drawing.image import Image as XLImage
-
-            wb = Workbook()
-            wb.remove(wb.active)
-
-            # 하천명별 그룹화 (station_name에서 하천명만 추출)
-            stations_data = defaultdict(list)
-            for session in sessions:
-                if session.wetted_perimeter is None and session.rows_data:
-                    session.calculate_analysis_results()
-                    session.save()
-                # 하천명 추출: "대종천 보상류" -> "대종천"
-                full_name = session.station_name or '미지정'
-                name_parts = full_name.split()
-                if len(name_parts) > 1 and any(loc in name_parts[-1] for loc in ['상류', '하류', '보']):
-                    river_name = ' '.join(name_parts[:-1])  # 마지막 부분(위치) 제외
-                else:
-                    river_name = full_name
-                stations_data[river_name or '미지정'].append(session)
-
-            # 스타일
-            header_fill = PatternFill(start_color='FFFFCC', end_color='FFFFCC', fill_type='solid')
-            yellow_fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
-            thin_border = Border(
-                left=Side(style='thin'), right=Side(style='thin'),
-                top=Side(style='thin'), bottom=Side(style='thin')
-            )
-            center_align = Alignment(horizontal='center', vertical='center')
-
-            # 항목 행 정의
-            row_items = [
-                ('수면폭', 'total_width', 'm', 3),
-                ('단면적', 'total_area', 'm²', 2),
-                ('윤변', 'wetted_perimeter', 'm', 3),
-                ('동수반경', 'hydraulic_radius', 'm', 3),
-                ('수위', 'stage', 'm', 3),
-                ('평균유속', 'mean_velocity', 'm/s', 3),
-                ('평균유량', 'estimated_discharge', 'm³/s', 3),
-                ('유속측선수', 'velocity_verticals', '개', 0),
-                ('불확실도', 'uncertainty', '%', 2),
-                ('수위고도', 'stage_elevation', 'El.m', 2),
-                ('유량조사 등급', 'quality_grade', '', 0),
-            ]
-
-            for stn_name, station_sessions in stations_data.items():
-                sheet_name = stn_name[:31].replace('[', '').replace(']', '').replace('/', '-')
-                ws = wb.create_sheet(title=sheet_name)
-
-                # 날짜별, 위치별 그룹화
-                date_location_data = defaultdict(dict)
-                date_objects = {}  # 날짜 문자열 -> 실제 날짜 객체 매핑
-                locations_set = set()
-
-                for s in station_sessions:
-                    if s.measurement_date:
-                        date_str = f"{s.measurement_date.month}/{s.measurement_date.day}/{s.measurement_date.year}"
-                        date_objects[date_str] = s.measurement_date
-                    else:
-                        date_str = '미지정'
-                        date_objects[date_str] = None
-
-                    # 위치 정보 추출: setup_data > station_name에서 파싱
-                    loc = s.setup_data.get('location', '') if s.setup_data else ''
-                    if not loc:
-                        loc = s.setup_data.get('location_desc', '') if s.setup_data else ''
-                    if not loc:
-                        # station_name에서 위치 추출 (예: "대종천 보상류" -> "보상류")
-                        name_parts = (s.station_name or '').split()
-                        if len(name_parts) > 1:
-                            loc = name_parts[-1]  # 마지막 부분이 위치
-
-                    if '상류' in loc:
-                        loc_key = '보 상류'
-                    elif '하류' in loc:
-                        loc_key = '보 하류'
-                    else:
-                        loc_key = loc or f'측정{s.session_number}'
-
-                    locations_set.add(loc_key)
-                    date_location_data[date_str][loc_key] = s
-
-                # 날짜순 정렬 (실제 날짜 객체로 정렬)
-                dates = sorted(date_objects.keys(), key=lambda d: date_objects[d] or date.min)
-                locations = sorted(locations_set) or ['측정1']
-
-                # 헤더
-                ws.cell(row=1, column=1, value='항목').border = thin_border
-                ws.cell(row=1, column=1).fill = header_fill
-                ws.cell(row=2, column=1, value='구분').border = thin_border
-                ws.cell(row=2, column=1).fill = header_fill
-
-                col = 2
-                for date in dates:
-                    num_locs = len(locations)
-                    ws.cell(row=1, column=col, value=date).border = thin_border
-                    ws.cell(row=1, column=col).fill = header_fill
-                    ws.cell(row=1, column=col).alignment = center_align
-                    if num_locs > 1:
-                        ws.merge_cells(start_row=1, start_column=col, end_row=1, end_column=col + num_locs - 1)
-
-                    for i, loc in enumerate(locations):
-                        ws.cell(row=2, column=col + i, value=loc).border = thin_border
-                        ws.cell(row=2, column=col + i).fill = header_fill
-                        ws.cell(row=2, column=col + i).alignment = center_align
-                    col += num_locs
-
-                unit_col = col
-                ws.cell(row=1, column=unit_col, value='단위').border = thin_border
-                ws.cell(row=1, column=unit_col).fill = header_fill
-                ws.merge_cells(start_row=1, start_column=unit_col, end_row=2, end_column=unit_col)
-
-                # 데이터 행
-                for row_idx, (item_name, attr, unit, decimals) in enumerate(row_items, start=3):
-                    ws.cell(row=row_idx, column=1, value=item_name).border = thin_border
-                    if item_name == '평균유량':
-                        ws.cell(row=row_idx, column=1).fill = yellow_fill
-
-                    col = 2
-                    for date in dates:
-                        for loc in locations:
-                            session = date_location_data.get(date, {}).get(loc)
-                            value = ''
-                            if session and attr:
-                                raw_value = getattr(session, attr, None)
-                                if raw_value is not None:
-                                    if decimals > 0 and isinstance(raw_value, (int, float)):
-                                        value = round(raw_value, decimals)
-                                    else:
-                                        value = raw_value
-
-                            cell = ws.cell(row=row_idx, column=col, value=value)
-                            cell.border = thin_border
-                            cell.alignment = center_align
-                            if item_name == '평균유량':
-                                cell.fill = yellow_fill
-                            col += 1
-
-                    ws.cell(row=row_idx, column=unit_col, value=unit).border = thin_border
-                    ws.cell(row=row_idx, column=unit_col).alignment = center_align
-
-                # 컬럼 너비
-                ws.column_dimensions['A'].width = 14
-                for i in range(2, unit_col + 1):
-                    ws.column_dimensions[get_column_letter(i)].width = 12
-
-                # ========== 수질/위치 상세 테이블 추가 ==========
-                wq_start_row = len(row_items) + 5
-                wq_headers = ['공번', '위도', '경도', '유량 (m³/d)', 'PH', 'ORP', '수온', 'EC', 'TDS']
-
-                # 헤더
-                for i, h in enumerate(wq_headers):
-                    ws.cell(row=wq_start_row, column=i+1, value=h).fill = header_fill
-                    ws.cell(row=wq_start_row, column=i+1).border = thin_border
-                    ws.cell(row=wq_start_row, column=i+1).alignment = center_align
-
-                # 데이터 행
-                wq_row = wq_start_row + 1
-                for idx, s in enumerate(station_sessions, start=1):
-                    # 공번 생성
-                    code = f"{stn_name[:4]}-{idx}" if len(stn_name) >= 4 else f"ST-{idx}"
-
-                    ws.cell(row=wq_row, column=1, value=code).border = thin_border
-                    ws.cell(row=wq_row, column=2, value=s.latitude if s.latitude else '').border = thin_border
-                    ws.cell(row=wq_row, column=3, value=s.longitude if s.longitude else '').border = thin_border
-
-                    # 유량 m³/d 변환
-                    discharge_day = round(s.estimated_discharge * 86400, 2) if s.estimated_discharge else ''
-                    ws.cell(row=wq_row, column=4, value=discharge_day).border = thin_border
-
-                    ws.cell(row=wq_row, column=5, value=s.ph if s.ph else '').border = thin_border
-                    ws.cell(row=wq_row, column=6, value=s.orp if s.orp else '').border = thin_border
-                    ws.cell(row=wq_row, column=7, value=s.water_temp if s.water_temp else '').border = thin_border
-                    ws.cell(row=wq_row, column=8, value=s.ec if s.ec else '').border = thin_border
-                    ws.cell(row=wq_row, column=9, value=s.tds if s.tds else '').border = thin_border
-
-                    for col in range(1, 10):
-                        ws.cell(row=wq_row, column=col).alignment = center_align
-
-                    wq_row += 1
-
-                # 차트 이미지 삽입
-                chart_start_row = wq_row + 3
-                chart_count = 0
-
-                for date in dates:
-                    for loc in locations:
-                        session = date_location_data.get(date, {}).get(loc)
-                        if session:
-                            img_buffer = generate_chart_image(session)
-                            if img_buffer:
-                                img = XLImage(img_buffer)
-                                img.width = 1200   # 3배 확대
-                                img.height = 360   # 1.5배 확대
-                                row_offset = chart_count * 22  # 차트 세로로 배치
-                                col_offset = 0
-                                cell_ref = f"{get_column_letter(1 + col_offset)}{chart_start_row + row_offset}"
-                                ws.add_image(img, cell_ref)
-                                chart_count += 1
-
-                # ========== 통계 요약 테이블 추가 ==========
-                import statistics
-
-                # 위치별 유량 데이터 수집
-                loc_discharge_data = defaultdict(list)
-                all_ph = []
-                all_orp = []
-                all_water_temp = []
-                all_ec = []
-                all_tds = []
-                all_discharge = []
-
-                for s in station_sessions:
-                    # 위치 추출
-                    loc_name = s.setup_data.get('location', '') if s.setup_data else ''
-                    if not loc_name:
-                        name_parts = (s.station_name or '').split()
-                        if len(name_parts) > 1:
-                            loc_name = name_parts[-1]
-
-                    if '상류' in loc_name:
-                        loc_key = '보상류'
-                    elif '하류' in loc_name:
-                        loc_key = '보하류'
-                    else:
-                        loc_key = loc_name or '기타'
-
-                    if s.estimated_discharge:
-                        loc_discharge_data[loc_key].append(s.estimated_discharge)
-                        all_discharge.append(s.estimated_discharge)
-
-                    # 수질 데이터 수집
-                    if s.ph:
-                        all_ph.append(s.ph)
-                    if s.orp:
-                        all_orp.append(s.orp)
-                    if s.water_temp:
-                        all_water_temp.append(s.water_temp)
-                    if s.ec:
-                        all_ec.append(s.ec)
-                    if s.tds:
-                        all_tds.append(s.tds)
-
-                # 통계 계산 함수
-                def calc_stats(data):
-                    if not data or len(data) < 1:
-                        return {'min': None, 'q1': None, 'median': None, 'mean': None, 'q3': None, 'max': None}
-                    sorted_data = sorted(data)
-                    n = len(sorted_data)
-                    return {
-                        'min': min(data),
-                        'q1': sorted_data[n // 4] if n >= 4 else sorted_data[0],
-                        'median': statistics.median(data),
-                        'mean': statistics.mean(data),
-                        'q3': sorted_data[(3 * n) // 4] if n >= 4 else sorted_data[-1],
-                        'max': max(data)
-                    }
-
-                # 통계 테이블 시작 위치 (차트 아래)
-                stats_start_row = chart_start_row + chart_count * 22 + 5
-
-                # 1. 위치별 유량 통계 테이블
-                ws.cell(row=stats_start_row, column=1, value='구분').fill = header_fill
-                ws.cell(row=stats_start_row, column=1).border = thin_border
-                ws.merge_cells(start_row=stats_start_row, start_column=2, end_row=stats_start_row, end_column=4)
-                ws.cell(row=stats_start_row, column=2, value='단위: m³/s').alignment = center_align
-                ws.cell(row=stats_start_row, column=2).border = thin_border
-                ws.merge_cells(start_row=stats_start_row, start_column=5, end_row=stats_start_row, end_column=7)
-                ws.cell(row=stats_start_row, column=5, value='단위: m³/day').alignment = center_align
-                ws.cell(row=stats_start_row, column=5).border = thin_border
-
-                stats_start_row += 1
-                for i, label in enumerate(['', '최소', '최대', '평균', '최소', '최대', '평균']):
-                    ws.cell(row=stats_start_row, column=i+1, value=label).border = thin_border
-                    ws.cell(row=stats_start_row, column=i+1).fill = header_fill
-                    ws.cell(row=stats_start_row, column=i+1).alignment = center_align
-
-                stats_start_row += 1
-                for loc_key in ['보상류', '보하류']:
-                    data = loc_discharge_data.get(loc_key, [])
-                    if data:
-                        min_v, max_v, mean_v = min(data), max(data), statistics.mean(data)
-                        ws.cell(row=stats_start_row, column=1, value=loc_key).border = thin_border
-                        ws.cell(row=stats_start_row, column=2, value=round(min_v, 3)).border = thin_border
-                        ws.cell(row=stats_start_row, column=3, value=round(max_v, 3)).border = thin_border
-                        ws.cell(row=stats_start_row, column=4, value=round(mean_v, 3)).border = thin_border
-                        # m³/day 변환 (× 86400)
-                        ws.cell(row=stats_start_row, column=5, value=round(min_v * 86400, 0)).border = thin_border
-                        ws.cell(row=stats_start_row, column=6, value=round(max_v * 86400, 0)).border = thin_border
-                        ws.cell(row=stats_start_row, column=7, value=round(mean_v * 86400, 0)).border = thin_border
-                        stats_start_row += 1
-
-                # 2. 전체 통계 테이블 (Min, 1st Qu, Median, Mean, 3rd Qu, Max)
-                stats_start_row += 2
-                stat_headers = ['항목', 'Min', '1st Qu.', 'Median', 'Mean', '3rd Qu.', 'Max.']
-                for i, h in enumerate(stat_headers):
-                    ws.cell(row=stats_start_row, column=i+1, value=h).fill = header_fill
-                    ws.cell(row=stats_start_row, column=i+1).border = thin_border
-                    ws.cell(row=stats_start_row, column=i+1).alignment = center_align
-
-                stat_items = [
-                    ('유량 (m³/s)', all_discharge),
-                    ('PH', all_ph),
-                    ('ORP', all_orp),
-                    ('수온 (℃)', all_water_temp),
-                    ('EC (μS/cm)', all_ec),
-                    ('TDS (mg/L)', all_tds),
-                ]
-
-                for item_name, item_data in stat_items:
-                    if item_data:
-                        stats_start_row += 1
-                        stats = calc_stats(item_data)
-                        ws.cell(row=stats_start_row, column=1, value=item_name).border = thin_border
-                        if item_name == '유량 (m³/s)':
-                            ws.cell(row=stats_start_row, column=1).fill = yellow_fill
-                        for j, key in enumerate(['min', 'q1', 'median', 'mean', 'q3', 'max']):
-                            val = stats[key]
-                            if val is not None:
-                                ws.cell(row=stats_start_row, column=j+2, value=round(val, 4)).border = thin_border
-                            ws.cell(row=stats_start_row, column=j+2).alignment = center_align
-                            if item_name == '유량 (m³/s)':
-                                ws.cell(row=stats_start_row, column=j+2).fill = yellow_fill
-
-            response = HttpResponse(
-                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-            )
-            response['Content-Disposition'] = 'attachment; filename="analysis_summary.xlsx"'
-            wb.save(response)
-            return response
+    params = analysis_filter(
+        request.GET.get('station', ''),
+        request.GET.get('start_date', ''),
+        request.GET.get('end_date', ''),
+        request.user,
+    )
+    if request.GET.get('format', 'csv') == 'excel':
+        return _serve_export(request, KIND_ANALYSIS_EXCEL, params)
 
-        except ImportError as e:
-            print(f"Import error: {e}")
-            export_format = 'csv'
+    sessions = analysis_sessions(params)
 
-    # CSV 폴백
+    # CSV
     headers = ['측정일', '지점명', '회차', '위치', '수위(m)', '수면폭(m)', '단면적(m²)',
                '윤변(m)', '동수반경(m)', '평균유속(m/s)', '유량(m³/s)', '유속측선수', '불확실도(%)', '등급']
     rows = []
@@ -2968,6 +2344,8 @@ def api_batch_import_csv(request):
     파일명 형식: {하천명}_{날짜}_{위치}.csv (예: 대종천_20250501_보상류.csv)
     """
     from .models import MeasurementSession, Meter
+    from .discharge_service import calculate_discharge_batch
+    from .session_dedupe_service import existing_sessions, session_content_hash
     import re
 
     try:
@@ -2989,6 +2367,8 @@ def api_batch_import_csv(request):
 
         results = []
         errors = []
+        pending = []  # 파싱 완료, 저장 대기 파일
+        pending_hashes = set()
 
         for file in files:
             filename = file.name
@@ -3071,35 +2451,64 @@ def api_batch_import_csv(request):
                     errors.append({'filename': filename, 'error': '유효한 데이터가 없습니다.'})
                     continue
 
-                # 중복 체크: 같은 관측소 + 날짜가 이미 존재하면 skip
-                if station_name and measurement_date:
-                    existing = MeasurementSession.objects.filter(
-                        station_name=station_name,
-                        measurement_date=measurement_date
-                    ).first()
-                    if existing:
-                        errors.append({
-                            'filename': filename,
-                            'error': f'중복 데이터 (이미 존재: {station_name}, {measurement_date})',
-                            'duplicate': True,
-                            'existing_session_id': existing.pk
-                        })
-                        continue
+                # 같은 요청 내 중복 파일 (관측소 + 날짜 + 측선 데이터 내용 해시)
+                content_hash = session_content_hash(station_name, measurement_date, rows, calibration)
+                if content_hash in pending_hashes:
+                    errors.append({
+                        'filename': filename,
+                        'error': f'중복 데이터 (이미 존재: {station_name}, {measurement_date})',
+                        'duplicate': True,
+                    })
+                    continue
+                pending_hashes.add(content_hash)
+
+                pending.append({
+                    'filename': filename,
+                    'station_name': station_name,
+                    'measurement_date': measurement_date,
+                    'river_name': river_name,
+                    'location': location,
+                    'rows': rows,
+                    'content_hash': content_hash,
+                })
+
+            except Exception as e:
+                errors.append({'filename': filename, 'error': str(e)})
+
+        # 이미 저장된 파일 제외 (전체 파일 해시를 IN 쿼리 1회로 확인)
+        existing = existing_sessions(pending_hashes)
+        if existing:
+            for item in pending:
+                if item['content_hash'] in existing:
+                    errors.append({
+                        'filename': item['filename'],
+                        'error': f"중복 데이터 (이미 존재: {item['station_name']}, {item['measurement_date']})",
+                        'duplicate': True,
+                        'existing_session_id': existing[item['content_hash']],
+                    })
+            pending = [item for item in pending if item['content_hash'] not in existing]
 
-                # 유량 계산
-                result_data = calculate_discharge(rows, calibration)
+        # 유량 일괄 계산 (파싱된 전체 파일을 한 번에)
+        batch_results = calculate_discharge_batch(
+            [item['rows'] for item in pending], calibration, include_verticals=False
+        )
 
+        for item, result_data in zip(pending, batch_results):
+            filename = item['filename']
+            station_name = item['station_name']
+            measurement_date = item['measurement_date']
+            try:
                 # MeasurementSession 생성
-                session = MeasurementSession.objects.create(
+                session = MeasurementSession(
                     user=user,
                     session_key=session_key,
                     station_name=station_name,
                     measurement_date=measurement_date,
-                    rows_data=rows,
+                    rows_data=item['rows'],
                     calibration_data=calibration,
                     setup_data={
-                        'river_name': river_name,
-                        'location': location,
+                        'river_name': item['river_name'],
+                        'location': item['location'],
                         'source_file': filename,
                         'final_discharge': result_data.get('discharge'),
                         'final_uncertainty': result_data.get('uncertainty'),
@@ -3111,7 +2520,7 @@ def api_batch_import_csv(request):
                     total_area=result_data.get('area'),
                 )
 
-                # 분석 결과 계산 및 저장
+                # 분석결과표 항목 계산 후 저장 (INSERT 1회)
                 session.calculate_analysis_results()
                 session.save()
 